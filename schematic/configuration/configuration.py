@@ -1,6 +1,7 @@
 """Configuration singleton for the Schematic Package"""
 
 import os
+import tempfile
 from typing import Any, Optional
 
 import yaml
@@ -129,6 +130,137 @@ class Configuration:
         """
         self._synapse_config.master_fileview_id = synapse_id
 
+    @property
+    def synapse_fileview_cache_folder(self) -> str:
+        """
+        Returns:
+            str: Location where file view snapshots are stored, relative paths
+              are placed in the system temporary directory
+        """
+        return normalize_path(
+            self._synapse_config.fileview_cache_folder, tempfile.gettempdir()
+        )
+
+    @property
+    def synapse_fileview_cache_max_age(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: Number of seconds a file view snapshot is used for before it is
+              refreshed, None if file view snapshots are disabled
+        """
+        return self._synapse_config.fileview_cache_max_age
+
+    @property
+    def synapse_entity_cache_size(self) -> int:
+        """
+        Returns:
+            int: Number of Synapse entities kept between requests, 0 if the cache is disabled
+        """
+        return self._synapse_config.entity_cache_size
+
+    @property
+    def synapse_max_concurrent_requests(self) -> int:
+        """
+        Returns:
+            int: Maximum number of concurrent requests made to Synapse by async methods
+        """
+        return self._synapse_config.max_concurrent_requests
+
+    @property
+    def synapse_requests_per_second(self) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: Maximum average number of requests started per second by async
+              methods, None if there is no maximum
+        """
+        return self._synapse_config.requests_per_second
+
+    @property
+    def synapse_request_max_retries(self) -> int:
+        """
+        Returns:
+            int: Number of times a request throttled by Synapse is retried
+        """
+        return self._synapse_config.request_max_retries
+
+    @property
+    def synapse_bulk_annotation_upload(self) -> bool:
+        """
+        Returns:
+            bool: Whether file annotations are stored in bulk through a temporary file view
+        """
+        return self._synapse_config.bulk_annotation_upload
+
+    @property
+    def synapse_cache_max_size(self) -> float:
+        """
+        Returns:
+            float: Maximum size of the Synapse cache in GB
+        """
+        return self._synapse_config.cache_max_size
+
+    @property
+    def synapse_cache_janitor_interval(self) -> int:
+        """
+        Returns:
+            int: Number of seconds between scans of the Synapse cache
+        """
+        return self._synapse_config.cache_janitor_interval
+
+    @property
+    def synapse_cache_min_age(self) -> int:
+        """
+        Returns:
+            int: Number of minutes a file in the Synapse cache is kept after its last use
+        """
+        return self._synapse_config.cache_min_age
+
+    @property
+    def synapse_session_ttl(self) -> int:
+        """
+        Returns:
+            int: Number of seconds a logged in Synapse client is reused for, 0 if clients are
+              not reused
+        """
+        return self._synapse_config.session_ttl
+
+    @property
+    def synapse_manifest_cache_folder(self) -> str:
+        """
+        Returns:
+            str: Location where downloaded manifests are stored, relative paths
+              are placed in the system temporary directory
+        """
+        return normalize_path(
+            self._synapse_config.manifest_cache_folder, tempfile.gettempdir()
+        )
+
+    @property
+    def synapse_manifest_cache_max_size(self) -> int:
+        """
+        Returns:
+            int: Maximum size in MB of the stored manifests, 0 if they are not stored
+        """
+        return self._synapse_config.manifest_cache_max_size
+
+    @property
+    def synapse_endpoint(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: Base URL of the Synapse server, None for the endpoints of the
+              Synapse configuration file
+        """
+        return self._synapse_config.endpoint
+
+    @property
+    def synapse_annotation_view_refresh_interval(self) -> int:
+        """
+        Returns:
+            int: Number of seconds the file view of a dataset is reused for before it is
+              refreshed, 0 if a temporary file view is created for every request
+        """
+        return self._synapse_config.annotation_view_refresh_interval
+
     @property
     def manifest_folder(self) -> str:
         """
@@ -154,6 +286,50 @@ class Configuration:
         """
         return self._manifest_config.data_type
 
+    @property
+    def validation_cache_folder(self) -> str:
+        """
+        Returns:
+            str: Location where manifest validation results are cached, relative paths
+              are placed in the system temporary directory
+        """
+        return normalize_path(
+            self._manifest_config.validation_cache_folder, tempfile.gettempdir()
+        )
+
+    @property
+    def validation_cache_ttl(self) -> int:
+        """
+        Returns:
+            int: Number of seconds a cached validation result can be reused for,
+              0 if the validation cache is disabled
+        """
+        return self._manifest_config.validation_cache_ttl
+
+    @property
+    def validation_max_messages(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: Maximum number of errors and warnings returned by validation
+        """
+        return self._manifest_config.validation_max_messages
+
+    @property
+    def validation_max_errors_per_column(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: Number of errors after which validation of a column stops
+        """
+        return self._manifest_config.validation_max_errors_per_column
+
+    @property
+    def validation_max_workers(self) -> int:
+        """
+        Returns:
+            int: Number of threads the columns of a manifest are validated with
+        """
+        return self._manifest_config.validation_max_workers
+
     @property
     def model_location(self) -> str:
         """
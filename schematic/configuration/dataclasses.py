@@ -2,6 +2,7 @@
 
 import re
 from dataclasses import field
+from typing import Optional
 
 from pydantic import ConfigDict, Extra, validator
 from pydantic.dataclasses import dataclass
@@ -16,11 +17,48 @@ class SynapseConfig:
     config_basename: Path to the synapse config file, either absolute or relative to this file
     manifest_basename: the name of downloaded manifest files
     master_fileview_id: Synapse ID of the file view listing all project data assets.
+    fileview_cache_folder: name of the folder snapshots of the file view are stored in
+    fileview_cache_max_age: number of seconds a file view snapshot is used for before it is
+     refreshed, None disables the file view snapshots
+    entity_cache_size: number of Synapse entities kept between requests, 0 disables the cache
+    max_concurrent_requests: maximum number of concurrent requests made by async methods
+    requests_per_second: maximum average number of requests started per second by async
+     methods, None for no maximum
+    request_max_retries: number of times a request throttled by Synapse is retried
+    bulk_annotation_upload: whether file annotations are stored in bulk through a temporary
+     file view, instead of one entity at a time
+    cache_max_size: maximum size of the Synapse cache in GB, kept by a background janitor
+    cache_janitor_interval: number of seconds between scans of the Synapse cache
+    cache_min_age: number of minutes a file in the Synapse cache is kept after its last use
+    session_ttl: number of seconds a logged in Synapse client is reused for by the requests
+     made with the same credentials, 0 disables the reuse
+    manifest_cache_folder: name of the folder downloaded manifests are stored in
+    manifest_cache_max_size: maximum size in MB of the stored manifests, 0 disables the store
+    endpoint: base URL of the Synapse server, such as a local stand-in for testing, None for
+     the endpoints of the Synapse configuration file
+    annotation_view_refresh_interval: number of seconds the file view of a dataset, used to
+     get the annotations of its files, is reused for before it is refreshed, 0 creates a
+     temporary file view for every request
     """
 
     config: str = ".synapseConfig"
     manifest_basename: str = "synapse_storage_manifest"
     master_fileview_id: str = "syn23643253"
+    fileview_cache_folder: str = "fileview_cache"
+    fileview_cache_max_age: Optional[int] = None
+    entity_cache_size: int = 0
+    max_concurrent_requests: int = 25
+    requests_per_second: Optional[float] = None
+    request_max_retries: int = 5
+    bulk_annotation_upload: bool = False
+    cache_max_size: float = 1
+    cache_janitor_interval: int = 300
+    cache_min_age: int = 15
+    session_ttl: int = 0
+    manifest_cache_folder: str = "manifest_cache"
+    manifest_cache_max_size: int = 0
+    endpoint: Optional[str] = None
+    annotation_view_refresh_interval: int = 0
 
     @validator("master_fileview_id")
     @classmethod
@@ -40,7 +78,58 @@ class SynapseConfig:
             raise ValueError(f"{value} is not a valid Synapse id")
         return value
 
-    @validator("config", "manifest_basename")
+    @validator(
+        "fileview_cache_max_age",
+        "entity_cache_size",
+        "request_max_retries",
+        "cache_min_age",
+        "session_ttl",
+        "manifest_cache_max_size",
+        "annotation_view_refresh_interval",
+    )
+    @classmethod
+    def validate_is_not_negative(cls, value: Optional[int]) -> Optional[int]:
+        """Check if integer is not negative, if set
+
+        Args:
+            value (Optional[int]): An integer or None
+
+        Raises:
+            ValueError: If the value is negative
+
+        Returns:
+            (Optional[int]): The input value
+        """
+        if value is not None and value < 0:
+            raise ValueError(f"{value} is negative")
+        return value
+
+    @validator(
+        "max_concurrent_requests",
+        "requests_per_second",
+        "cache_max_size",
+        "cache_janitor_interval",
+    )
+    @classmethod
+    def validate_is_positive(cls, value: Optional[float]) -> Optional[float]:
+        """Check if number is positive, if set
+
+        Args:
+            value (Optional[float]): A number or None
+
+        Raises:
+            ValueError: If the value is zero or negative
+
+        Returns:
+            (Optional[float]): The input value
+        """
+        if value is not None and value <= 0:
+            raise ValueError(f"{value} is not positive")
+        return value
+
+    @validator(
+        "config", "manifest_basename", "fileview_cache_folder", "manifest_cache_folder"
+    )
     @classmethod
     def validate_string_is_not_empty(cls, value: str) -> str:
         """Check if string  is not empty(has at least one char)
@@ -66,13 +155,69 @@ class ManifestConfig:
     title: Title or title prefix given to generated manifest(s)
     data_type: Data types of manifests to be generated or data type (singular) to validate
      manifest against
+    validation_cache_folder: name of the folder validation results are cached in, so that
+     a manifest validated through /model/validate is not validated again on submission
+    validation_cache_ttl: number of seconds a cached validation result can be reused for,
+     0 disables the validation cache
+    validation_max_messages: maximum number of errors and warnings returned by validation,
+     None for no maximum
+    validation_max_errors_per_column: number of errors after which validation of a column
+     stops, None for no maximum
+    validation_max_workers: number of threads the columns of a manifest are validated with,
+     1 validates the columns one after another. Defaults to 1, parallel validation is
+     opt in.
     """
 
     manifest_folder: str = "manifests"
     title: str = "example"
     data_type: list[str] = field(default_factory=lambda: ["Biospecimen", "Patient"])
+    validation_cache_folder: str = "validation_cache"
+    validation_cache_ttl: int = 600
+    validation_max_messages: Optional[int] = None
+    validation_max_errors_per_column: Optional[int] = None
+    validation_max_workers: int = 1
+
+    @validator("validation_cache_ttl")
+    @classmethod
+    def validate_is_not_negative(cls, value: int) -> int:
+        """Check if integer is not negative
+
+        Args:
+            value (int): An integer
+
+        Raises:
+            ValueError: If the value is negative
+
+        Returns:
+            (int): The input value
+        """
+        if value < 0:
+            raise ValueError(f"{value} is negative")
+        return value
+
+    @validator(
+        "validation_max_messages",
+        "validation_max_errors_per_column",
+        "validation_max_workers",
+    )
+    @classmethod
+    def validate_is_positive(cls, value: Optional[int]) -> Optional[int]:
+        """Check if integer is positive, if set
+
+        Args:
+            value (Optional[int]): An integer or None
+
+        Raises:
+            ValueError: If the value is zero or negative
+
+        Returns:
+            (Optional[int]): The input value
+        """
+        if value is not None and value < 1:
+            raise ValueError(f"{value} is not positive")
+        return value
 
-    @validator("title", "manifest_folder")
+    @validator("title", "manifest_folder", "validation_cache_folder")
     @classmethod
     def validate_string_is_not_empty(cls, value: str) -> str:
         """Check if string  is not empty(has at least one char)
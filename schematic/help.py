@@ -100,9 +100,9 @@ manifest_commands = {
             ),
             "dry_run": (
                 "This is a boolean flag. If flag is provided when command line utility is executed, "
-                "a dry run will be performed. No manifests will be re-uploaded and no entities will be migrated, "
-                "but archival folders will still be created. "
-                "Migration information for testing purposes will be logged to the INFO level."
+                "a dry run will be performed. No manifests will be re-uploaded, no entities will be migrated "
+                "and no archival folders will be created. "
+                "The planned moves, and an estimate of how long they take, will be logged to the INFO level."
             ),
         },
         "download": {
@@ -203,6 +203,14 @@ model_commands = {
             "dataset_scope": (
                 "Specify a dataset to validate against for filename validation."
             ),
+            "incremental": (
+                "This is a boolean flag. If flag is provided, rows that are unchanged since the last incremental validation "
+                "of a manifest of the same data type and dataset are not validated again by the rules that only depend on the row, "
+                "and their previous errors and warnings are reused. Rows are matched by their entityId, Filename or <Component>_id value."
+            ),
+            "dataset_id": (
+                "Specify the synID of the dataset the manifest belongs to. Incremental validation results are kept per dataset."
+            ),
             "data_model_labels": DATA_MODEL_LABELS_HELP,
         },
     }
@@ -3,7 +3,7 @@ import os
 import uuid
 
 # allows specifying explicit variable types
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 from great_expectations.core import ExpectationSuite
@@ -23,6 +23,7 @@ from opentelemetry import trace
 
 import great_expectations as ge
 from schematic.models.validate_attribute import GenerateError
+from schematic.models.validation_error_collector import ValidationErrorCollector
 from schematic.schemas.data_model_graph import DataModelGraphExplorer
 from schematic.utils.schema_utils import extract_component_validation_rules
 from schematic.utils.validate_utils import (
@@ -185,9 +186,6 @@ class GreatExpectationsHelpers(object):
             args = {}
             meta = {}
 
-            # remove trailing/leading whitespaces from manifest
-            self.manifest.map(lambda x: x.strip() if isinstance(x, str) else x)
-
             validation_rules = self.dmge.get_node_validation_rules(
                 node_display_name=col
             )
@@ -441,6 +439,7 @@ class GreatExpectationsHelpers(object):
         errors: List,
         warnings: List,
         dmge: DataModelGraphExplorer,
+        error_collector: Optional[ValidationErrorCollector] = None,
     ):
         """
         Purpose:
@@ -454,6 +453,9 @@ class GreatExpectationsHelpers(object):
                 list of errors
             warnings:
                 list of warnings
+            error_collector:
+                if given, errors and warnings are added to the collector, along with
+                the rule that generated them, instead of the errors and warnings lists
         Returns:
             errors:
                 list of errors
@@ -471,6 +473,8 @@ class GreatExpectationsHelpers(object):
         for result_dict in validation_results[0]["results"]:
             indices = []
             values = []
+            result_errors = []
+            result_warnings = []
 
             # if the expectaion failed, get infromation to generate error message
             if not result_dict["success"]:
@@ -524,9 +528,9 @@ class GreatExpectationsHelpers(object):
                             dmge=dmge,
                         )
                         if vr_errors:
-                            errors.append(vr_errors)
+                            result_errors.append(vr_errors)
                         if vr_warnings:
-                            warnings.append(vr_warnings)
+                            result_warnings.append(vr_warnings)
                 elif validation_types[rule.split(" ")[0]]["type"] == "regex_validation":
                     expression = result_dict["expectation_config"]["kwargs"]["regex"]
                     for row, value in zip(indices, values):
@@ -540,9 +544,9 @@ class GreatExpectationsHelpers(object):
                             dmge=dmge,
                         )
                         if vr_errors:
-                            errors.append(vr_errors)
+                            result_errors.append(vr_errors)
                         if vr_warnings:
-                            warnings.append(vr_warnings)
+                            result_warnings.append(vr_warnings)
                 elif (
                     validation_types[rule.split(" ")[0]]["type"] == "content_validation"
                 ):
@@ -554,15 +558,21 @@ class GreatExpectationsHelpers(object):
                         dmge=self.dmge,
                     )
                     if vr_errors:
-                        errors.append(vr_errors)
+                        result_errors.append(vr_errors)
                         if rule.startswith("protectAges"):
                             self.censor_ages(vr_errors, errColumn)
 
                     if vr_warnings:
-                        warnings.append(vr_warnings)
+                        result_warnings.append(vr_warnings)
                         if rule.startswith("protectAges"):
                             self.censor_ages(vr_warnings, errColumn)
 
+                if error_collector is not None:
+                    error_collector.add_results(result_errors, result_warnings, rule)
+                else:
+                    errors.extend(result_errors)
+                    warnings.extend(result_warnings)
+
         return errors, warnings
 
     def get_age_limits(
@@ -195,6 +195,10 @@ def submit_manifest(
             f"File at '{manifest_path}' was successfully associated "
             f"with dataset '{dataset_id}'."
         )
+        logger.info(
+            "Unchanged data not written to Synapse: "
+            f"{metadata_model.submission_summary}"
+        )
 
 
 # prototype based on validateModelManifest()
@@ -240,6 +244,16 @@ def submit_manifest(
     default=None,
     help=query_dict(model_commands, ("model", "validate", "dataset_scope")),
 )
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=query_dict(model_commands, ("model", "validate", "incremental")),
+)
+@click.option(
+    "--dataset_id",
+    default=None,
+    help=query_dict(model_commands, ("model", "validate", "dataset_id")),
+)
 @click.option(
     "--data_model_labels",
     "-dml",
@@ -256,6 +270,8 @@ def validate_manifest(
     restrict_rules: Optional[bool],
     project_scope: Optional[list[str]],
     dataset_scope: Optional[str],
+    incremental: bool,
+    dataset_id: Optional[str],
     data_model_labels: Optional[str],
 ):
     """
@@ -292,6 +308,8 @@ def validate_manifest(
         restrict_rules=restrict_rules,
         project_scope=project_scope,
         dataset_scope=dataset_scope,
+        incremental=incremental,
+        dataset_id=dataset_id,
     )
 
     if not errors:
@@ -11,13 +11,15 @@ from opentelemetry import trace
 
 from schematic.manifest.generator import ManifestGenerator
 from schematic.models.validate_manifest import validate_all
+from schematic.models.validation_cache import ValidationCache
+from schematic.models.validation_snapshot import ValidationSnapshot
 from schematic.schemas.data_model_graph import DataModelGraph, DataModelGraphExplorer
 from schematic.schemas.data_model_json_schema import DataModelJSONSchema
 from schematic.schemas.data_model_parser import DataModelParser
 
 # TODO: This module should only be aware of the store interface
 # we shouldn't need to expose Synapse functionality explicitly
-from schematic.store.synapse import SynapseStorage
+from schematic.store.synapse import SubmissionSummary, SynapseStorage
 from schematic.utils.df_utils import load_df
 
 logger = logging.getLogger(__name__)
@@ -58,6 +60,9 @@ class MetadataModel(object):
         # self.inputMModelLocation remains for backwards compatibility
         self.inputMModelLocation = inputMModelLocation
         self.path_to_json_ld = inputMModelLocation
+        self.data_model_labels = data_model_labels
+        # summary of what the last submission did not write, as it did not change
+        self.submission_summary: Optional[SubmissionSummary] = None
 
         data_model_parser = DataModelParser(path_to_data_model=self.inputMModelLocation)
         # Parse Model
@@ -202,6 +207,8 @@ class MetadataModel(object):
         project_scope: Optional[List] = None,
         dataset_scope: Optional[str] = None,
         access_token: Optional[str] = None,
+        incremental: bool = False,
+        dataset_id: Optional[str] = None,
     ) -> tuple[list, list]:
         """Check if provided annotations manifest dataframe satisfies all model requirements.
 
@@ -209,6 +216,11 @@ class MetadataModel(object):
             rootNode: a schema node label (i.e. term).
             manifestPath: a path to the manifest csv file containing annotations.
             restrict_rules: bypass great expectations and restrict rule options to those implemented in house
+            incremental: only validate the rows that changed since the last incremental validation
+              of a manifest of the same component and dataset with the row local rules, reusing the
+              errors and warnings of the other rows
+            dataset_id: the dataset the manifest belongs to, incremental validation results are
+              kept per dataset and user
 
         Returns:
             A validation status message; if there is an error the message.
@@ -274,6 +286,19 @@ class MetadataModel(object):
 
             return errors, warnings
 
+        snapshot_key = None
+        if incremental:
+            snapshot_key = ValidationSnapshot.build_key(
+                model_path=self.inputMModelLocation,
+                data_model_labels=self.data_model_labels,
+                component=rootNode,
+                restrict_rules=restrict_rules,
+                project_scope=project_scope,
+                dataset_scope=dataset_scope,
+                dataset_id=dataset_id,
+                access_token=access_token,
+            )
+
         errors, warnings, manifest = validate_all(
             self,
             errors=errors,
@@ -286,9 +311,44 @@ class MetadataModel(object):
             project_scope=project_scope,
             dataset_scope=dataset_scope,
             access_token=access_token,
+            component=rootNode,
+            snapshot_key=snapshot_key,
         )
         return errors, warnings
 
+    def get_validation_cache_key(  # pylint: disable=too-many-arguments
+        self,
+        manifest_path: str,
+        root_node: str,
+        restrict_rules: bool,
+        project_scope: Optional[List] = None,
+        dataset_scope: Optional[str] = None,
+        access_token: Optional[str] = None,
+    ) -> str:
+        """Get the key the validation result of a manifest is cached under.
+
+        Args:
+            manifest_path: a path to the manifest csv file containing annotations.
+            root_node: a schema node label (i.e. term).
+            restrict_rules: bypass great expectations and restrict rule options to those implemented in house
+            project_scope: projects used for cross manifest validation
+            dataset_scope: dataset used for filename validation
+            access_token: the access token of the user
+
+        Returns:
+            str: the validation cache key
+        """
+        return ValidationCache.build_key(
+            manifest_path=manifest_path,
+            model_path=self.inputMModelLocation,
+            data_model_labels=self.data_model_labels,
+            component=root_node,
+            restrict_rules=restrict_rules,
+            project_scope=project_scope,
+            dataset_scope=dataset_scope,
+            access_token=access_token,
+        )
+
     def populateModelManifest(
         self, title, manifestPath: str, rootNode: str, return_excel=False
     ) -> str:
@@ -334,6 +394,7 @@ class MetadataModel(object):
         table_manipulation: str = "replace",
         table_column_names: str = "class_label",
         annotation_keys: str = "class_label",
+        validation_receipt: Optional[str] = None,
     ) -> str:
         """
         Wrap methods that are responsible for validation of manifests for a given component,
@@ -357,13 +418,17 @@ class MetadataModel(object):
             table_manipulation (str, optional): Defaults to "replace".
             table_column_names (str, optional): Defaults to "class_label".
             annotation_keys (str, optional): Defaults to "class_label".
+            validation_receipt (Optional[str], optional): Receipt id of an earlier validation
+              of the same manifest. If the cached result of that validation is still valid,
+              the manifest is not validated again. Defaults to None.
 
         Raises:
             ValueError: When validate_component is provided, but it cannot be found in the schema.
             ValidationError: If validation against data model was not successful.
 
         Returns:
-            str: If both validation and association were successful.
+            str: If both validation and association were successful. The summary of what
+              was not written because it did not change is set as self.submission_summary.
         """
         # TODO: avoid explicitly exposing Synapse store functionality
         # just instantiate a Store class and let it decide at runtime/config
@@ -389,15 +454,40 @@ class MetadataModel(object):
                     f"in the schema here '{self.path_to_json_ld}'"
                 ) from exc
 
-            # automatic JSON schema generation and validation with that JSON schema
-            val_errors, _ = self.validateModelManifest(
-                manifestPath=manifest_path,
-                rootNode=validate_component,
-                restrict_rules=restrict_rules,
-                project_scope=project_scope,
-                dataset_scope=dataset_scope,
-                access_token=access_token,
-            )
+            cached_result = None
+            if validation_receipt:
+                cached_result = ValidationCache().lookup(
+                    receipt_id=validation_receipt,
+                    key=self.get_validation_cache_key(
+                        manifest_path=manifest_path,
+                        root_node=validate_component,
+                        restrict_rules=restrict_rules,
+                        project_scope=project_scope,
+                        dataset_scope=dataset_scope,
+                        access_token=access_token,
+                    ),
+                )
+
+            if cached_result is not None:
+                logger.info(
+                    f"Manifest was already validated (receipt id {validation_receipt}), "
+                    "skipping validation."
+                )
+                val_errors = cached_result.errors
+                # the censored manifest is written during validation, restore it
+                if cached_result.censored_manifest is not None:
+                    with open(censored_manifest_path, "w", encoding="utf-8") as file:
+                        file.write(cached_result.censored_manifest)
+            else:
+                # automatic JSON schema generation and validation with that JSON schema
+                val_errors, _ = self.validateModelManifest(
+                    manifestPath=manifest_path,
+                    rootNode=validate_component,
+                    restrict_rules=restrict_rules,
+                    project_scope=project_scope,
+                    dataset_scope=dataset_scope,
+                    access_token=access_token,
+                )
 
             # if there are no errors in validation process
             if val_errors == []:
@@ -430,6 +520,7 @@ class MetadataModel(object):
                 )
 
                 logger.info("No validation errors occured during validation.")
+                self.submission_summary = syn_store.submission_summary
                 return manifest_id
 
             else:
@@ -470,4 +561,5 @@ class MetadataModel(object):
             "Optional validation was not performed on manifest before association."
         )
 
+        self.submission_summary = syn_store.submission_summary
         return manifest_id
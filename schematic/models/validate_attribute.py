@@ -16,6 +16,7 @@ from synapseclient import File
 from synapseclient.core.exceptions import SynapseNoCredentialsError
 
 from schematic.schemas.data_model_graph import DataModelGraphExplorer
+from schematic.store.manifest_cache import load_manifest_df
 from schematic.store.synapse import SynapseStorage
 from schematic.utils.df_utils import read_csv
 from schematic.utils.validate_rules_utils import validation_rule_info
@@ -726,8 +727,6 @@ class GenerateError:
             - error_message: str, error message string
             - error_val: str, erroneous value
             - message_level: str, message level to raise, if its an unchanging level.
-        Raises:
-            logger.error or logger.warning or no message
         Returns:
             error_list: list of errors
             warning_list: list of warnings
@@ -747,8 +746,9 @@ class GenerateError:
         if message_level is None:
             return error_list, warning_list
 
-        message_logger = getattr(logger, message_level)
-        message_logger(error_message)
+        # Messages are only logged at debug level, a summary per attribute and rule is
+        # logged by the ValidationErrorCollector
+        logger.debug(error_message)
 
         if error_val == "No Invalid Entry Recorded":
             error_val = None
@@ -869,7 +869,7 @@ class ValidateAttribute(object):
             entity: File = self.synStore.getDatasetManifest(
                 datasetId=dataset_id, downloadFile=True
             )
-            manifests.append(read_csv(entity.path))
+            manifests.append(load_manifest_df(entity, reader=read_csv))
         return dict(zip(manifest_ids, manifests))
 
     def get_target_manifests(
@@ -1,24 +1,32 @@
+import contextvars
 import json
 import logging
 import uuid
-from numbers import Number
+from concurrent.futures import ThreadPoolExecutor
 from time import perf_counter
 
 # allows specifying explicit variable types
 from typing import List, Optional, Tuple
 
-import numpy as np
 import pandas as pd
 from jsonschema import Draft7Validator, exceptions
 from opentelemetry import trace
 
+from schematic.configuration.configuration import CONFIG
 from schematic.models.GE_Helpers import GreatExpectationsHelpers
 from schematic.models.validate_attribute import GenerateError, ValidateAttribute
+from schematic.models.validation_error_collector import ValidationErrorCollector
+from schematic.models.validation_snapshot import (
+    ROW_LOCAL_RULES,
+    IncrementalValidation,
+    ValidationSnapshot,
+)
 from schematic.schemas.data_model_graph import DataModelGraphExplorer
 from schematic.utils.schema_utils import extract_component_validation_rules
 from schematic.utils.validate_rules_utils import validation_rule_info
 from schematic.utils.validate_utils import (
-    convert_nan_entries_to_empty_strings,
+    get_json_schema_view,
+    normalize_manifest,
     rule_in_rule_list,
 )
 
@@ -93,6 +101,104 @@ class ValidateManifest(object):
             )
         return errors
 
+    def _validate_column(
+        self,
+        validate_attribute: ValidateAttribute,
+        validation_types: dict,
+        manifest_col: pd.Series,
+        rules: list[tuple[int, str]],
+        project_scope: list[str],
+        access_token: Optional[str],
+        error_limit: Optional[int] = None,
+    ) -> tuple[Optional[pd.Series], list[tuple[int, str, list, list]]]:
+        """Run the in house validation rules of a single column, in order.
+        Args:
+            validate_attribute, ValidateAttribute: object used to run the rules
+            validation_types, dict: validation rule info
+            manifest_col, pd.Series: the manifest column being validated
+            rules, list[tuple[int, str]]: index and rule string of the rules to run
+            project_scope, list[str]: projects used for cross manifest validation
+            access_token, Optional[str]: the access token of the user
+            error_limit, Optional[int]: number of errors after which the remaining rules
+                are not run, None for no limit
+        Returns:
+            parsed_col, Optional[pd.Series]: the column changed to lists if a 'list' rule was run,
+                otherwise None
+            results, list[tuple[int, str, list, list]]: rule index, rule, errors and warnings
+                of each rule that was run
+        """
+        results = []
+        error_count = 0
+        parsed_col = None
+        for rule_index, rule in rules:
+            if error_limit is not None and error_count >= error_limit:
+                logger.info(
+                    f"Maximum number of errors reached for attribute {manifest_col.name}, "
+                    "its remaining validation rules will not be run."
+                )
+                break
+
+            if logger.isEnabledFor(logging.DEBUG):
+                t_indiv_rule = perf_counter()
+
+            # Validate for each individual validation rule.
+            validation_type = rule.split(" ")[0]
+            validation_method = getattr(
+                validate_attribute, validation_types[validation_type]["type"]
+            )
+
+            if validation_type == "list":
+                vr_errors, vr_warnings, manifest_col = validation_method(
+                    rule,
+                    manifest_col,
+                )
+                parsed_col = manifest_col
+            elif validation_type.lower().startswith("match"):
+                vr_errors, vr_warnings = validation_method(
+                    rule, manifest_col, project_scope, access_token
+                )
+            else:
+                vr_errors, vr_warnings = validation_method(
+                    rule,
+                    manifest_col,
+                )
+            results.append((rule_index, rule, vr_errors, vr_warnings))
+            error_count += len(vr_errors)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Rule {rule} elapsed time: {perf_counter()-t_indiv_rule}")
+        return parsed_col, results
+
+    @staticmethod
+    def _merge_incremental_results(
+        incremental: IncrementalValidation,
+        result_key: str,
+        rule: str,
+        errors: list,
+        warnings: list,
+    ) -> tuple[list, list]:
+        """Merge the results of a rule run on the changed rows with the stored results
+            of the other rows.
+        Args:
+            incremental, IncrementalValidation: tracks the changed rows
+            result_key, str: identifies the column and rule
+            rule, str: the validation rule
+            errors, list: errors of the rule for the changed rows
+            warnings, list: warnings of the rule for the changed rows
+        Returns:
+            errors, list: errors of the rule for all rows
+            warnings, list: warnings of the rule for all rows
+        """
+        merged = incremental.merge(
+            result_key,
+            [("error", rule, error) for error in errors]
+            + [("warning", rule, warning) for warning in warnings],
+        )
+        return (
+            [message for level, _, message in merged if level == "error"],
+            [message for level, _, message in merged if level == "warning"],
+        )
+
     @tracer.start_as_current_span("ValidateManifest::validate_manifest_rules")
     def validate_manifest_rules(
         self,
@@ -102,7 +208,9 @@ class ValidateManifest(object):
         project_scope: list[str],
         dataset_scope: Optional[str] = None,
         access_token: Optional[str] = None,
-    ) -> Tuple[pd.DataFrame, list[list[str]]]:
+        error_collector: Optional[ValidationErrorCollector] = None,
+        incremental: Optional[IncrementalValidation] = None,
+    ) -> Tuple[pd.DataFrame, list[list[str]], list[list[str]]]:
         """
         Purpose:
             Take validation rules set for a particular attribute
@@ -113,6 +221,14 @@ class ValidateManifest(object):
                 contains metadata input from user for each attribute.
             dmge: DataModelGraphExplorer
                 initialized within models/metadata.py
+            error_collector: ValidationErrorCollector
+                collector the errors and warnings are added to, one is created
+                from the configuration if not given. Once an attribute reaches the
+                collector's maximum number of errors, its remaining rules are skipped.
+            incremental: IncrementalValidation
+                if given, columns with only row local in house rules are validated
+                for the changed rows only, and the stored messages of the other rows
+                are reused. All rules of these columns are run.
         Returns:
             manifest: pd.DataFrame
                 If a 'list' validatior is run, the manifest needs to be
@@ -122,6 +238,9 @@ class ValidateManifest(object):
                 If any errors are generated they will be added to an errors
                 list log recording the following information:
                 [error_row, error_col, error_message, error_val]
+                All errors held by the error collector are returned.
+            warnings: List[List[str]]
+                Same as errors, for warnings.
         TODO:
             -Investigate why a :: delimiter is breaking up the
                 validation rules without me having to do anything...
@@ -158,9 +277,9 @@ class ValidateManifest(object):
             "filenameExists",
         ]
 
-        # initialize error and warning handling lists.
-        errors = []
-        warnings = []
+        # initialize error and warning handling.
+        if error_collector is None:
+            error_collector = ValidationErrorCollector.from_config()
 
         if not restrict_rules:
             if logger.isEnabledFor(logging.DEBUG):
@@ -206,12 +325,13 @@ class ValidateManifest(object):
                 validation_results = results.list_validation_results()
 
                 # parse validation results dict and generate errors
-                errors, warnings = ge_helpers.generate_errors(
-                    errors=errors,
-                    warnings=warnings,
+                ge_helpers.generate_errors(
+                    errors=[],
+                    warnings=[],
                     validation_results=validation_results,
                     validation_types=validation_types,
                     dmge=dmge,
+                    error_collector=error_collector,
                 )
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"GE elapsed time {perf_counter()-t_GE}")
@@ -224,9 +344,11 @@ class ValidateManifest(object):
         # Instantiate Validate Attribute
         validate_attribute = ValidateAttribute(dmge=dmge)
 
-        for col in manifest.columns:
-            # remove trailing/leading whitespaces from manifest
-            manifest.map(lambda x: x.strip() if isinstance(x, str) else x)
+        # Resolve the in house rules to run for each column. Results are keyed by
+        # (column index, rule index) so they can be merged in a deterministic order.
+        column_rules: dict[str, list[tuple[int, str]]] = {}
+        rule_results: dict[tuple[int, int], tuple[str, list, list]] = {}
+        for col_index, col in enumerate(manifest.columns):
             validation_rules = dmge.get_node_validation_rules(node_display_name=col)
 
             # Parse the validation rules
@@ -237,13 +359,17 @@ class ValidateManifest(object):
                 )
 
             # Check for max rule allowance
-            errors = self.check_max_rule_num(
-                validation_rules=validation_rules, col=col, errors=errors
+            rule_results[(col_index, -1)] = (
+                "Multiple Rules",
+                self.check_max_rule_num(
+                    validation_rules=validation_rules, col=col, errors=[]
+                ),
+                [],
             )
 
             # Given a validation rule, run validation. Skip validations already performed by GE
-            for rule in validation_rules:
-                validation_type = rule.split(" ")[0]
+            column_rules[col] = []
+            for rule_index, rule in enumerate(validation_rules):
                 if rule_in_rule_list(rule, unimplemented_expectations) or (
                     rule_in_rule_list(rule, in_house_rules) and restrict_rules
                 ):
@@ -255,75 +381,175 @@ class ValidateManifest(object):
                             f"Validation rule {rule.split(' ')[0]} has not been implemented in house and cannnot be validated without Great Expectations."
                         )
                         continue
-
-                    if logger.isEnabledFor(logging.DEBUG):
-                        t_indiv_rule = perf_counter()
-                    # Validate for each individual validation rule.
-                    validation_method = getattr(
-                        validate_attribute, validation_types[validation_type]["type"]
+                    column_rules[col].append((rule_index, rule))
+
+        # Columns are independent of each other, but the rules of a column run in order,
+        # as a 'list' rule changes the column for the rules after it. Columns with cross
+        # manifest rules share one task, as these rules share the Synapse login of
+        # validate_attribute. filenameExists needs the whole manifest and runs afterwards.
+        column_tasks = []
+        cross_manifest_task = []
+        row_local_columns = set()
+        for col_index, col in enumerate(manifest.columns):
+            column_rule_types = [
+                rule.split(" ")[0]
+                for _, rule in column_rules[col]
+                if rule.split(" ")[0] != "filenameExists"
+            ]
+            if not column_rule_types:
+                continue
+            if (
+                incremental is not None
+                and incremental.enabled
+                and all(rule_type in ROW_LOCAL_RULES for rule_type in column_rule_types)
+            ):
+                row_local_columns.add(col)
+            column_task = (col_index, col)
+            if any(
+                rule_type.lower().startswith("match") for rule_type in column_rule_types
+            ):
+                cross_manifest_task.append(column_task)
+            else:
+                column_tasks.append([column_task])
+        if cross_manifest_task:
+            column_tasks.append(cross_manifest_task)
+
+        def run_column_task(
+            task: list[tuple[int, str]], task_frame: Optional[pd.DataFrame] = None
+        ) -> list:
+            task_results = []
+            for position, (col_index, col) in enumerate(task):
+                if task_frame is not None:
+                    manifest_col = task_frame.iloc[:, position]
+                else:
+                    manifest_col = manifest.iloc[:, col_index]
+                error_limit = None
+                if col in row_local_columns:
+                    # all rules run, so that the messages of all rows can be stored
+                    manifest_col = incremental.select_rows(manifest_col)
+                elif error_collector.max_errors_per_column is not None:
+                    error_limit = (
+                        error_collector.max_errors_per_column
+                        - error_collector.column_error_counts.get(col, 0)
+                        - len(rule_results[(col_index, -1)][1])
                     )
-
-                    if validation_type == "list":
-                        vr_errors, vr_warnings, manifest_col = validation_method(
-                            rule,
-                            manifest[col],
-                        )
-                        manifest[col] = manifest_col
-                    elif validation_type.lower().startswith("match"):
-                        vr_errors, vr_warnings = validation_method(
-                            rule, manifest[col], project_scope, access_token
-                        )
-                    elif validation_type == "filenameExists":
-                        vr_errors, vr_warnings = validation_method(
-                            rule,
-                            manifest,
-                            access_token,
-                            dataset_scope,
-                            project_scope,
-                        )
-                    else:
-                        vr_errors, vr_warnings = validation_method(
-                            rule,
-                            manifest[col],
-                        )
-                    # Check for validation rule errors and add them to other errors.
-                    if vr_errors:
-                        errors.extend(vr_errors)
-                    if vr_warnings:
-                        warnings.extend(vr_warnings)
-
-                    if logger.isEnabledFor(logging.DEBUG):
-                        logger.debug(
-                            f"Rule {rule} elapsed time: {perf_counter()-t_indiv_rule}"
+                task_results.append(
+                    (
+                        col_index,
+                        col,
+                        self._validate_column(
+                            validate_attribute=validate_attribute,
+                            validation_types=validation_types,
+                            manifest_col=manifest_col,
+                            rules=[
+                                (rule_index, rule)
+                                for rule_index, rule in column_rules[col]
+                                if rule.split(" ")[0] != "filenameExists"
+                            ],
+                            project_scope=project_scope,
+                            access_token=access_token,
+                            error_limit=error_limit,
+                        ),
+                    )
+                )
+            return task_results
+
+        max_workers = min(CONFIG.validation_max_workers, len(column_tasks))
+        if max_workers > 1:
+            # Each task gets its own copy of its columns, with a new index. Tasks must
+            # not share a Series or an Index, as pandas builds the lookup tables of an
+            # index lazily, and building them from several threads at once raises
+            # KeyErrors. Serial runs use the columns of the manifest, without copies.
+            task_frames = [
+                manifest.iloc[:, [col_index for col_index, _ in task]]
+                .copy()
+                .reset_index(drop=True)
+                for task in column_tasks
+            ]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # copy the context, so that tracing spans are linked to the current one
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        run_column_task,
+                        task,
+                        task_frame,
+                    )
+                    for task, task_frame in zip(column_tasks, task_frames)
+                ]
+                task_outputs = [future.result() for future in futures]
+        else:
+            task_outputs = [run_column_task(task) for task in column_tasks]
+
+        error_counts: dict[str, int] = {}
+        for task_output in task_outputs:
+            for col_index, col, (parsed_col, column_results) in task_output:
+                # a 'list' rule changes the column values to lists
+                if parsed_col is not None:
+                    manifest[col] = parsed_col.set_axis(manifest.index)
+                for rule_index, rule, vr_errors, vr_warnings in column_results:
+                    if col in row_local_columns:
+                        vr_errors, vr_warnings = self._merge_incremental_results(
+                            incremental=incremental,
+                            result_key=f"{col_index}:{rule_index}",
+                            rule=rule,
+                            errors=vr_errors,
+                            warnings=vr_warnings,
                         )
+                    rule_results[(col_index, rule_index)] = (rule, vr_errors, vr_warnings)
+                    error_counts[col] = error_counts.get(col, 0) + len(vr_errors)
+
+        for col_index, col in enumerate(manifest.columns):
+            for rule_index, rule in column_rules[col]:
+                if rule.split(" ")[0] != "filenameExists":
+                    continue
+                if error_collector.max_errors_per_column is not None and (
+                    error_collector.column_error_counts.get(col, 0)
+                    + error_counts.get(col, 0)
+                    + len(rule_results[(col_index, -1)][1])
+                    >= error_collector.max_errors_per_column
+                ):
+                    break
+                vr_errors, vr_warnings = validate_attribute.filename_validation(
+                    rule,
+                    manifest,
+                    access_token,
+                    dataset_scope,
+                    project_scope,
+                )
+                rule_results[(col_index, rule_index)] = (rule, vr_errors, vr_warnings)
+
+        # Add errors of all rules to the other errors, in column and rule order.
+        for key in sorted(rule_results):
+            rule, vr_errors, vr_warnings = rule_results[key]
+            error_collector.add_results(vr_errors, vr_warnings, rule)
 
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"In House validation elapsed time {perf_counter()-t_err}")
-        return manifest, errors, warnings
+        return manifest, error_collector.errors, error_collector.warnings
 
     def validate_manifest_values(
         self,
         manifest,
         jsonSchema,
         dmge,
+        error_collector: Optional[ValidationErrorCollector] = None,
+        incremental: Optional[IncrementalValidation] = None,
     ) -> Tuple[List[List[str]], List[List[str]]]:
         t_json_schema = perf_counter()
 
-        errors = []
-        warnings = []
-
-        manifest = convert_nan_entries_to_empty_strings(manifest=manifest)
+        if error_collector is None:
+            error_collector = ValidationErrorCollector.from_config()
 
-        # numerical values need to be type string for the jsonValidator
-        for col in manifest.select_dtypes(
-            include=[int, np.int64, float, np.float64]
-        ).columns:
-            manifest[col] = manifest[col].astype("string")
-        manifest = manifest.map(
-            lambda x: str(x) if isinstance(x, Number) else x, na_action="ignore"
-        )
+        # nans need to be empty strings and numerical values need to be type string
+        # for the jsonValidator
+        json_schema_view = get_json_schema_view(manifest)
+        if incremental is not None:
+            # rows are selected after the conversion, as it depends on all rows of a column
+            json_schema_view = incremental.select_rows(json_schema_view)
 
-        annotations = json.loads(manifest.to_json(orient="records"))
+        messages = []
+        annotations = json.loads(json_schema_view.to_json(orient="records"))
         for i, annotation in enumerate(annotations):
             v = Draft7Validator(jsonSchema)
             for sorted_error in sorted(
@@ -350,14 +576,20 @@ class ValidateManifest(object):
                     dmge=dmge,
                 )
 
+                rule = f"JSON Schema {sorted_error.validator}"
                 if val_errors:
-                    errors.append(val_errors)
+                    messages.append(("error", rule, val_errors))
                 if val_warnings:
-                    warnings.append(val_warnings)
+                    messages.append(("warning", rule, val_warnings))
+
+        if incremental is not None:
+            messages = incremental.merge("JSON Schema", messages)
+        for level, rule, message in messages:
+            error_collector.add(message, level, rule)
         logger.debug(
             f"JSON Schema validation elapsed time {perf_counter()-t_json_schema}"
         )
-        return errors, warnings
+        return error_collector.errors, error_collector.warnings
 
 
 def validate_all(
@@ -372,23 +604,55 @@ def validate_all(
     project_scope: List,
     dataset_scope: str,
     access_token: str,
+    component: Optional[str] = None,
+    snapshot_key: Optional[str] = None,
 ):
+    # Normalize the manifest once, the normalized manifest is shared by GE,
+    # the in house rules and JSON Schema validation
+    manifest = normalize_manifest(manifest)
+
+    # With a snapshot key, the row local validation steps only validate the rows that
+    # changed since the last validation stored under that key
+    incremental = None
+    if snapshot_key is not None:
+        validation_snapshot = ValidationSnapshot()
+        incremental = IncrementalValidation(
+            manifest=manifest,
+            component=component,
+            previous_snapshot=validation_snapshot.load(snapshot_key),
+        )
+
+    # Errors and warnings of all validation steps are collected, and summarized
+    # in the logs per attribute and rule
+    error_collector = ValidationErrorCollector.from_config()
+
     # Run Validation Rules
     vm = ValidateManifest(errors, manifest, manifestPath, dmge, jsonSchema)
-    manifest, vmr_errors, vmr_warnings = vm.validate_manifest_rules(
-        manifest, dmge, restrict_rules, project_scope, dataset_scope, access_token
+    manifest, _, _ = vm.validate_manifest_rules(
+        manifest,
+        dmge,
+        restrict_rules,
+        project_scope,
+        dataset_scope,
+        access_token,
+        error_collector=error_collector,
+        incremental=incremental,
     )
 
-    if vmr_errors:
-        errors.extend(vmr_errors)
-    if vmr_warnings:
-        warnings.extend(vmr_warnings)
-
     # Run JSON Schema Validation
-    vmv_errors, vmv_warnings = vm.validate_manifest_values(manifest, jsonSchema, dmge)
-    if vmv_errors:
-        errors.extend(vmv_errors)
-    if vmv_warnings:
-        warnings.extend(vmv_warnings)
+    vm.validate_manifest_values(
+        manifest,
+        jsonSchema,
+        dmge,
+        error_collector=error_collector,
+        incremental=incremental,
+    )
+
+    if incremental is not None and incremental.enabled:
+        validation_snapshot.save(snapshot_key, incremental.get_snapshot())
+
+    error_collector.log_summary()
+    errors.extend(error_collector.errors)
+    warnings.extend(error_collector.warnings)
 
     return errors, warnings, manifest
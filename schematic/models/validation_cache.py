@@ -0,0 +1,263 @@
+"""Cache of manifest validation results
+
+Used so that a manifest validated through /model/validate is not validated again when the
+same manifest is submitted through /model/submit shortly after. Results are stored as
+files so that they are shared between API worker processes, in a folder only the user
+running schematic can access.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from schematic.configuration.configuration import CONFIG
+from schematic.utils.io_utils import make_private_folder
+
+logger = logging.getLogger(__name__)
+
+RECEIPT_SUFFIX = ".json"
+
+
+def _hash_file(path: str) -> str:
+    """Returns the sha256 hex digest of the contents of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ValidationResult:
+    """
+    A cached validation result
+
+    errors: the validation errors
+    warnings: the validation warnings
+    censored_manifest: contents of the censored manifest written during validation, if any
+    """
+
+    errors: list
+    warnings: list
+    censored_manifest: Optional[str] = None
+
+
+class ValidationCache:
+    """
+    File based cache of manifest validation results, with a time to live.
+
+    Each result is stored under a random receipt id. A result is only returned for a
+    receipt id when the key computed for the submitted manifest matches the key the
+    result was stored with, and the result has not expired.
+    """
+
+    def __init__(
+        self, cache_folder: Optional[str] = None, ttl: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            cache_folder: folder the results are stored in, defaults to
+              CONFIG.validation_cache_folder
+            ttl: number of seconds a result can be reused for, defaults to
+              CONFIG.validation_cache_ttl. 0 disables the cache.
+        """
+        self.cache_folder = (
+            cache_folder if cache_folder is not None else CONFIG.validation_cache_folder
+        )
+        self.ttl = ttl if ttl is not None else CONFIG.validation_cache_ttl
+
+    @property
+    def enabled(self) -> bool:
+        """Whether validation results are cached"""
+        return self.ttl > 0
+
+    @staticmethod
+    def build_key(  # pylint: disable=too-many-arguments
+        manifest_path: str,
+        model_path: str,
+        data_model_labels: str,
+        component: str,
+        restrict_rules: bool,
+        project_scope: Optional[list[str]] = None,
+        dataset_scope: Optional[str] = None,
+        access_token: Optional[str] = None,
+    ) -> str:
+        """
+        Builds the key a validation result is stored under.
+
+        Cross manifest and filename validation depend on what is visible in the asset view
+          to the user, so the asset view and (a hash of) the access token are part of the key.
+
+        Args:
+            manifest_path: path to the manifest being validated
+            model_path: path to the data model the manifest is validated against
+            data_model_labels: how labels are set in the data model
+            component: the component the manifest is validated as
+            restrict_rules: whether validation is restricted to the in house rules
+            project_scope: projects used for cross manifest validation
+            dataset_scope: dataset used for filename validation
+            access_token: the access token of the user
+
+        Returns:
+            str: the key
+        """
+        key = {
+            "manifest": _hash_file(manifest_path),
+            "model": _hash_file(model_path),
+            "data_model_labels": data_model_labels,
+            "component": component,
+            "restrict_rules": bool(restrict_rules),
+            "project_scope": sorted(project_scope) if project_scope else None,
+            "dataset_scope": dataset_scope,
+            "asset_view": CONFIG.synapse_master_fileview_id,
+            "access_token": hashlib.sha256(access_token.encode()).hexdigest()
+            if access_token
+            else None,
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _check_folder(self) -> bool:
+        """
+        Returns whether the cache folder is private, creating it if it does not exist.
+          Results are neither stored in nor read from a folder other users can write to.
+        """
+        try:
+            make_private_folder(self.cache_folder)
+        except PermissionError as exc:
+            logger.warning(f"Validation results are not cached: {exc}")
+            return False
+        return True
+
+    def _get_receipt_path(self, receipt_id: str) -> Optional[str]:
+        """
+        Returns the path a result is stored at, None if the receipt id is not a
+          receipt id generated by this class
+        """
+        try:
+            receipt_id = uuid.UUID(receipt_id).hex
+        except (ValueError, AttributeError, TypeError):
+            return None
+        return os.path.join(self.cache_folder, receipt_id + RECEIPT_SUFFIX)
+
+    def store(
+        self,
+        key: str,
+        errors: list,
+        warnings: list,
+        censored_manifest_path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Stores a validation result
+
+        Args:
+            key: key built with ValidationCache.build_key
+            errors: the validation errors
+            warnings: the validation warnings
+            censored_manifest_path: path of the censored manifest written during validation,
+              its contents are stored with the result if it exists
+
+        Returns:
+            Optional[str]: the receipt id of the result, None if the cache is disabled
+              or its folder is not private
+        """
+        if not self.enabled or not self._check_folder():
+            return None
+
+        censored_manifest = None
+        if censored_manifest_path and os.path.exists(censored_manifest_path):
+            with open(censored_manifest_path, "r", encoding="utf-8") as file:
+                censored_manifest = file.read()
+
+        self.purge_expired()
+
+        receipt_id = uuid.uuid4().hex
+        entry = {
+            "key": key,
+            "created": time.time(),
+            "errors": errors,
+            "warnings": warnings,
+            "censored_manifest": censored_manifest,
+        }
+        receipt_path = self._get_receipt_path(receipt_id)
+        # write to a temporary file first, so that other workers never read a partial entry
+        temp_path = f"{receipt_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file, default=str)
+        os.replace(temp_path, receipt_path)
+        logger.debug(f"Stored validation result with receipt id {receipt_id}")
+        return receipt_id
+
+    def lookup(self, receipt_id: str, key: str) -> Optional[ValidationResult]:
+        """
+        Gets a stored validation result
+
+        Args:
+            receipt_id: the receipt id returned by ValidationCache.store
+            key: key built with ValidationCache.build_key for the manifest being submitted
+
+        Returns:
+            Optional[ValidationResult]: the stored result, None if there is no unexpired
+              result for the receipt id or it was stored for a different key
+        """
+        if not self.enabled or not self._check_folder():
+            return None
+
+        receipt_path = self._get_receipt_path(receipt_id)
+        if receipt_path is None or not os.path.exists(receipt_path):
+            logger.info(f"No validation result found for receipt id {receipt_id}")
+            return None
+
+        try:
+            with open(receipt_path, "r", encoding="utf-8") as file:
+                entry: dict[str, Any] = json.load(file)
+        except (OSError, ValueError):
+            logger.warning(f"Could not read validation result {receipt_path}")
+            return None
+
+        if time.time() - entry["created"] > self.ttl:
+            logger.info(f"Validation result for receipt id {receipt_id} has expired")
+            self._remove(receipt_path)
+            return None
+
+        if entry["key"] != key:
+            logger.info(
+                f"Validation result for receipt id {receipt_id} does not match the "
+                "submitted manifest"
+            )
+            return None
+
+        return ValidationResult(
+            errors=entry["errors"],
+            warnings=entry["warnings"],
+            censored_manifest=entry["censored_manifest"],
+        )
+
+    def purge_expired(self) -> None:
+        """Removes expired results from the cache folder"""
+        if not os.path.isdir(self.cache_folder):
+            return
+        now = time.time()
+        for file_name in os.listdir(self.cache_folder):
+            if not file_name.endswith(RECEIPT_SUFFIX):
+                continue
+            receipt_path = os.path.join(self.cache_folder, file_name)
+            try:
+                if now - os.path.getmtime(receipt_path) > self.ttl:
+                    self._remove(receipt_path)
+            except OSError:
+                continue
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Removes a file, that may already have been removed by another worker"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
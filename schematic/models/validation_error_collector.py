@@ -0,0 +1,152 @@
+"""Collector for the errors and warnings generated during manifest validation"""
+
+import logging
+from typing import Any, Optional
+
+from schematic.configuration.configuration import CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationErrorCollector:
+    """
+    Stores the errors and warnings generated while validating a manifest.
+
+    Messages are stored column wise (row, column, rule, message, value, level) and counted
+      per (column, rule, level), so that a single summary line can be logged per rule instead
+      of one log record per message.
+
+    The number of stored messages can be capped with max_messages, messages over the cap are
+      still counted. With max_errors_per_column, a column stops collecting errors once it has
+      that many, and ValidateManifest skips the remaining rules of that column.
+
+    The errors and warnings properties return the messages in the
+      [error_row, error_col, error_message, error_val] format used in API responses.
+    """
+
+    def __init__(
+        self,
+        max_messages: Optional[int] = None,
+        max_errors_per_column: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            max_messages: maximum number of errors and warnings stored, None for no maximum
+            max_errors_per_column: number of errors after which a column stops collecting
+              errors, None for no maximum
+        """
+        self.max_messages = max_messages
+        self.max_errors_per_column = max_errors_per_column
+
+        self.rows: list[Any] = []
+        self.columns: list[Any] = []
+        self.rules: list[str] = []
+        self.messages: list[str] = []
+        self.values: list[Any] = []
+        self.levels: list[str] = []
+
+        # (column, rule, level) -> number of messages, including the ones not stored
+        self.counts: dict[tuple[Any, str, str], int] = {}
+        # (column, rule, level) -> first message, used as an example in the summary
+        self.first_messages: dict[tuple[Any, str, str], str] = {}
+        self.column_error_counts: dict[Any, int] = {}
+        self.dropped_messages = 0
+
+    @classmethod
+    def from_config(cls) -> "ValidationErrorCollector":
+        """Creates a collector using the limits set in the configuration"""
+        return cls(
+            max_messages=CONFIG.validation_max_messages,
+            max_errors_per_column=CONFIG.validation_max_errors_per_column,
+        )
+
+    def column_limit_reached(self, column: Any) -> bool:
+        """
+        Args:
+            column: name of the column
+
+        Returns:
+            bool: whether the column has reached max_errors_per_column
+        """
+        if self.max_errors_per_column is None:
+            return False
+        return self.column_error_counts.get(column, 0) >= self.max_errors_per_column
+
+    def add(self, message: list, level: str, rule: str) -> None:
+        """
+        Adds a single error or warning
+
+        Args:
+            message: [error_row, error_col, error_message, error_val]
+            level: 'error' or 'warning'
+            rule: the validation rule that generated the message
+        """
+        row, column, error_message, value = message
+        key = (column, rule, level)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.first_messages.setdefault(key, error_message)
+
+        if level == "error":
+            if self.column_limit_reached(column):
+                self.dropped_messages += 1
+                return
+            self.column_error_counts[column] = (
+                self.column_error_counts.get(column, 0) + 1
+            )
+
+        if self.max_messages is not None and len(self.messages) >= self.max_messages:
+            self.dropped_messages += 1
+            return
+
+        self.rows.append(row)
+        self.columns.append(column)
+        self.rules.append(rule)
+        self.messages.append(error_message)
+        self.values.append(value)
+        self.levels.append(level)
+
+    def add_results(self, errors: list, warnings: list, rule: str) -> None:
+        """
+        Adds the errors and warnings returned by a validation function
+
+        Args:
+            errors: list of errors, each [error_row, error_col, error_message, error_val]
+            warnings: list of warnings, each [error_row, error_col, error_message, error_val]
+            rule: the validation rule that generated the messages
+        """
+        for error in errors:
+            self.add(error, "error", rule)
+        for warning in warnings:
+            self.add(warning, "warning", rule)
+
+    def _get_messages(self, level: str) -> list[list]:
+        return [
+            [row, column, message, value]
+            for row, column, message, value, message_level in zip(
+                self.rows, self.columns, self.messages, self.values, self.levels
+            )
+            if message_level == level
+        ]
+
+    @property
+    def errors(self) -> list[list]:
+        """The stored errors, each [error_row, error_col, error_message, error_val]"""
+        return self._get_messages("error")
+
+    @property
+    def warnings(self) -> list[list]:
+        """The stored warnings, each [error_row, error_col, error_message, error_val]"""
+        return self._get_messages("warning")
+
+    def log_summary(self) -> None:
+        """Logs one line per (column, rule, level)"""
+        for (column, rule, level), count in self.counts.items():
+            getattr(logger, level)(
+                f"{count} {level}(s) for rule '{rule}' on attribute '{column}', "
+                f"first {level}: {self.first_messages[(column, rule, level)]}"
+            )
+        if self.dropped_messages:
+            logger.warning(
+                f"{self.dropped_messages} error(s) and warning(s) were not stored because "
+                "the maximum number of messages was reached"
+            )
@@ -0,0 +1,336 @@
+"""Snapshots of manifest validation results, used for incremental re-validation
+
+When a manifest is validated incrementally, the hash of each row and the messages of the
+row local validation steps are stored per row key. The next time a manifest of the same
+dataset and component is validated incrementally by the same user, rows whose key and hash
+are unchanged reuse the stored messages, and only the changed or new rows are validated by
+the row local steps.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Optional
+
+import pandas as pd
+
+from schematic.configuration.configuration import CONFIG
+from schematic.models.validation_cache import _hash_file
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FOLDER = "snapshots"
+SNAPSHOT_SUFFIX = ".json"
+
+# In house rules whose messages for a row only depend on the values of that row
+ROW_LOCAL_RULES = ["int", "float", "num", "str", "regex", "url"]
+
+
+def get_row_key_column(manifest: pd.DataFrame, component: str) -> Optional[str]:
+    """
+    Gets the column that identifies the rows of a manifest between submissions
+
+    Args:
+        manifest: the manifest
+        component: the component the manifest is validated as
+
+    Returns:
+        Optional[str]: entityId, Filename or <Component>_id, the first one that has a unique
+          value in each row. None if there is no such column.
+    """
+    for column in ["entityId", "Filename", f"{component}_id"]:
+        if column not in manifest.columns:
+            continue
+        values = manifest[column]
+        if values.isna().any() or (values.astype(str) == "").any():
+            continue
+        if values.is_unique:
+            return column
+    return None
+
+
+def hash_rows(manifest: pd.DataFrame) -> list[str]:
+    """
+    Args:
+        manifest: the manifest
+
+    Returns:
+        list[str]: a hash of the values of each row of the manifest
+    """
+    return (
+        pd.util.hash_pandas_object(manifest.astype(str), index=False)
+        .astype(str)
+        .tolist()
+    )
+
+
+def renumber_message(message: list, position: int) -> list:
+    """
+    Moves a validation message to another row
+
+    Args:
+        message: [error_row, error_col, error_message, error_val]
+        position: position of the row in the manifest the message is moved to
+
+    Returns:
+        list: the message, with its row number, and the row number in its text, set to
+          the row number of position
+    """
+    row = str(position + 2)
+    error_row, error_col, error_message = message[:3]
+    if isinstance(error_message, str) and str(error_row) != row:
+        # the messages of the row local rules mention their row as "row <number>"
+        error_message = re.sub(
+            rf"(\b[Rr]ow ){re.escape(str(error_row))}\b",
+            rf"\g<1>{row}",
+            error_message,
+            count=1,
+        )
+    return [row, error_col, error_message] + list(message[3:])
+
+
+class ValidationSnapshot:
+    """
+    File based store of validation snapshots.
+
+    A snapshot is stored per key, the key identifies the data model, component and
+      validation settings, so that stored messages are only reused when the same rules
+      are run. It also identifies the dataset and the user, so that the manifests of
+      other datasets or users do not replace the snapshot.
+    """
+
+    def __init__(self, snapshot_folder: Optional[str] = None) -> None:
+        """
+        Args:
+            snapshot_folder: folder the snapshots are stored in, defaults to the snapshots
+              folder in CONFIG.validation_cache_folder
+        """
+        self.snapshot_folder = (
+            snapshot_folder
+            if snapshot_folder is not None
+            else os.path.join(CONFIG.validation_cache_folder, SNAPSHOT_FOLDER)
+        )
+
+    @staticmethod
+    def build_key(  # pylint: disable=too-many-arguments
+        model_path: str,
+        data_model_labels: str,
+        component: str,
+        restrict_rules: bool,
+        project_scope: Optional[list[str]] = None,
+        dataset_scope: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        access_token: Optional[str] = None,
+    ) -> str:
+        """
+        Builds the key a snapshot is stored under.
+
+        Args:
+            model_path: path to the data model the manifest is validated against
+            data_model_labels: how labels are set in the data model
+            component: the component the manifest is validated as
+            restrict_rules: whether validation is restricted to the in house rules
+            project_scope: projects used for cross manifest validation
+            dataset_scope: dataset used for filename validation
+            dataset_id: dataset the manifest belongs to
+            access_token: the access token of the user
+
+        Returns:
+            str: the key
+        """
+        key = {
+            "model": _hash_file(model_path),
+            "data_model_labels": data_model_labels,
+            "component": component,
+            "restrict_rules": bool(restrict_rules),
+            "project_scope": sorted(project_scope) if project_scope else None,
+            "dataset_scope": dataset_scope,
+            "dataset_id": dataset_id,
+            "access_token": hashlib.sha256(access_token.encode()).hexdigest()
+            if access_token
+            else None,
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _get_snapshot_path(self, key: str) -> str:
+        return os.path.join(self.snapshot_folder, key + SNAPSHOT_SUFFIX)
+
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Args:
+            key: key built with ValidationSnapshot.build_key
+
+        Returns:
+            Optional[dict[str, Any]]: the stored snapshot, None if there is none
+        """
+        snapshot_path = self._get_snapshot_path(key)
+        if not os.path.exists(snapshot_path):
+            return None
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            logger.warning(f"Could not read validation snapshot {snapshot_path}")
+            return None
+
+    def save(self, key: str, snapshot: dict[str, Any]) -> None:
+        """
+        Args:
+            key: key built with ValidationSnapshot.build_key
+            snapshot: the snapshot, as returned by IncrementalValidation.get_snapshot
+        """
+        os.makedirs(self.snapshot_folder, exist_ok=True)
+        snapshot_path = self._get_snapshot_path(key)
+        # write to a temporary file first, so that other workers never read a partial snapshot
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, default=str)
+        os.replace(temp_path, snapshot_path)
+
+
+class IncrementalValidation:
+    """
+    Tracks which rows of a manifest need to be validated by the row local validation steps,
+      and merges the stored messages of the other rows with the new ones.
+
+    Validation steps report messages with the row numbers of the rows they were given,
+      merge renumbers them to rows of the full manifest and adds the stored messages of
+      the unchanged rows, renumbered to their current rows, in row order, so the result is
+      the same as validating all rows.
+    """
+
+    def __init__(
+        self,
+        manifest: pd.DataFrame,
+        component: str,
+        previous_snapshot: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Args:
+            manifest: the normalized manifest being validated
+            component: the component the manifest is validated as
+            previous_snapshot: the snapshot of the last incremental validation of a manifest
+              with the same key, if any
+        """
+        self.columns = [str(column) for column in manifest.columns]
+        self.key_column = get_row_key_column(manifest, component)
+        self.row_keys: list[str] = []
+        self.row_hashes: list[str] = []
+        self.changed_positions = list(range(len(manifest)))
+        self.previous_messages: dict[str, list] = {}
+        # result key -> messages of all rows, each [row_key, level, rule, message], the
+        #   message with the row number of the row in the validated manifest
+        self.messages: dict[str, list] = {}
+
+        if self.key_column is None:
+            logger.info(
+                "The manifest has no column that identifies its rows, "
+                "all rows will be validated."
+            )
+            return
+
+        self.row_keys = manifest[self.key_column].astype(str).tolist()
+        self.row_hashes = hash_rows(manifest)
+
+        if (
+            previous_snapshot is None
+            or previous_snapshot.get("columns") != self.columns
+            or previous_snapshot.get("key_column") != self.key_column
+        ):
+            return
+
+        previous_rows = previous_snapshot["rows"]
+        self.changed_positions = [
+            position
+            for position, (row_key, row_hash) in enumerate(
+                zip(self.row_keys, self.row_hashes)
+            )
+            if previous_rows.get(row_key) != row_hash
+        ]
+        self.previous_messages = previous_snapshot["messages"]
+        logger.info(
+            f"{len(self.changed_positions)} of {len(manifest)} rows changed since the "
+            "last validation, only these will be validated by the row local rules."
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the rows of the manifest can be tracked between validations"""
+        return self.key_column is not None
+
+    @property
+    def is_partial(self) -> bool:
+        """Whether only some of the rows need to be validated"""
+        return self.enabled and len(self.changed_positions) < len(self.row_keys)
+
+    def select_rows(self, data: Any) -> Any:
+        """
+        Args:
+            data: a manifest column (pd.Series) or the manifest (pd.DataFrame)
+
+        Returns:
+            Any: the rows that need to be validated, with a new index
+        """
+        if not self.is_partial:
+            return data
+        return data.iloc[self.changed_positions].reset_index(drop=True)
+
+    def merge(self, result_key: str, messages: list[tuple[str, str, list]]) -> list:
+        """
+        Merges the messages of a validation step run on the selected rows with the stored
+          messages of the other rows.
+
+        Args:
+            result_key: identifies the validation step, ie the column and rule
+            messages: (level, rule, [error_row, error_col, error_message, error_val]) of
+              each message, with rows numbered as in the selected rows
+
+        Returns:
+            list: (level, rule, message) of each message for all rows, in row order
+        """
+        if not self.enabled:
+            return messages
+
+        merged = []
+        for level, rule, message in messages:
+            position = int(message[0]) - 2
+            if self.is_partial:
+                position = self.changed_positions[position]
+            merged.append((position, level, rule, renumber_message(message, position)))
+
+        if self.is_partial:
+            positions = {row_key: i for i, row_key in enumerate(self.row_keys)}
+            changed = set(self.changed_positions)
+            for row_key, level, rule, message in self.previous_messages.get(
+                result_key, []
+            ):
+                position = positions.get(row_key)
+                if position is None or position in changed:
+                    continue
+                merged.append(
+                    (position, level, rule, renumber_message(message, position))
+                )
+
+        # sort is stable, so the order of the messages of a row is kept
+        merged.sort(key=lambda item: item[0])
+        self.messages[result_key] = [
+            [self.row_keys[position], level, rule, message]
+            for position, level, rule, message in merged
+        ]
+        return [(level, rule, message) for _, level, rule, message in merged]
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict[str, Any]: the snapshot to store for the next validation
+        """
+        return {
+            "columns": self.columns,
+            "key_column": self.key_column,
+            "rows": dict(zip(self.row_keys, self.row_hashes)),
+            "messages": self.messages,
+        }
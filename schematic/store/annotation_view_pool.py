@@ -0,0 +1,104 @@
+"""Pool of long lived file views scoped to datasets, used to query their annotations"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from schematic.configuration.configuration import CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class AnnotationViewPool:
+    """
+    Thread safe pool of the Synapse IDs of file views scoped to datasets, keyed by
+      dataset.
+
+    Creating a file view, and waiting for Synapse to build it, takes longer than
+      querying it, so the view of a dataset is kept on Synapse and reused by all
+      requests. The view is refreshed, so that its columns include annotations added
+      since, once it is older than refresh_interval seconds. Query results are still
+      filtered by the permissions of each user.
+    """
+
+    def __init__(self, refresh_interval: Optional[float] = None) -> None:
+        """
+        Args:
+            refresh_interval: number of seconds a view is reused for before it is
+              refreshed, 0 disables the pool, defaults to
+              CONFIG.synapse_annotation_view_refresh_interval
+        """
+        self._refresh_interval = refresh_interval
+        self._views: Dict[str, Tuple[str, float]] = {}
+        self._view_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def refresh_interval(self) -> float:
+        """Number of seconds a view is reused for before it is refreshed"""
+        if self._refresh_interval is not None:
+            return self._refresh_interval
+        return CONFIG.synapse_annotation_view_refresh_interval
+
+    def _get_current(self, dataset_id: str) -> Optional[str]:
+        view = self._views.get(dataset_id)
+        if view is None:
+            return None
+        view_id, refreshed_at = view
+        if time.monotonic() - refreshed_at >= self.refresh_interval:
+            return None
+        return view_id
+
+    def get(self, dataset_id: str, refresh: Callable[[], str]) -> Tuple[str, bool]:
+        """
+        Gets the view of a dataset, creating or refreshing it if needed
+
+        Args:
+            dataset_id: Synapse ID of the dataset
+            refresh: function creating the view of the dataset, or updating it if it
+              already exists, and returning its Synapse ID
+
+        Returns:
+            Tuple[str, bool]: Synapse ID of the view, and whether it was refreshed by
+              this call
+        """
+        with self._lock:
+            view_id = self._get_current(dataset_id)
+            if view_id is not None:
+                return view_id, False
+            view_lock = self._view_locks.setdefault(dataset_id, threading.Lock())
+
+        # concurrent requests for the same dataset wait for a single refresh
+        with view_lock:
+            with self._lock:
+                view_id = self._get_current(dataset_id)
+            if view_id is not None:
+                return view_id, False
+            view_id = refresh()
+            with self._lock:
+                self._views[dataset_id] = (view_id, time.monotonic())
+                self._view_locks.pop(dataset_id, None)
+        logger.debug(f"Refreshed annotation view {view_id} of dataset {dataset_id}")
+        return view_id, True
+
+    def remove(self, dataset_id: str) -> None:
+        """
+        Removes the view of a dataset, the next request creates it again
+
+        Args:
+            dataset_id: Synapse ID of the dataset
+        """
+        with self._lock:
+            self._views.pop(dataset_id, None)
+
+    def clear(self) -> None:
+        """Removes all views"""
+        with self._lock:
+            self._views.clear()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+
+ANNOTATION_VIEW_POOL = AnnotationViewPool()
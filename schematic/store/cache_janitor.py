@@ -0,0 +1,202 @@
+"""Background janitor keeping the Synapse cache under a maximum size
+
+The size of the cache is accounted incrementally: downloads add the size of the downloaded
+file, and a periodic scan of the cache corrects the account for files added or removed by
+other means. When the cache is over its maximum size, the least recently used file handle
+folders of the cache are removed, so that the cache map of each remaining folder stays
+consistent. All of this runs in a daemon thread, never in a request.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# share of the maximum size the cache is brought down to when it is over the maximum
+TARGET_SIZE_FRACTION = 0.8
+
+JANITORS: Dict[str, "SynapseCacheJanitor"] = {}
+JANITORS_LOCK = threading.Lock()
+
+
+class SynapseCacheJanitor:
+    """
+    Keeps a Synapse cache folder under max_size bytes.
+
+    The cache is scanned every interval seconds. Files downloaded in between are added to
+      the account with record_download, and wake the janitor up when the cache goes over
+      max_size. Only file handle folders not used for min_age seconds are removed, least
+      recently used first, until the cache is under TARGET_SIZE_FRACTION of max_size.
+    """
+
+    def __init__(
+        self, cache_root: str, max_size: int, interval: float, min_age: float
+    ) -> None:
+        """
+        Args:
+            cache_root: root folder of the Synapse cache
+            max_size: maximum size of the cache in bytes
+            interval: number of seconds between scans of the cache
+            min_age: number of seconds a file handle folder is kept after its last use
+        """
+        self.cache_root = os.path.abspath(cache_root)
+        self.max_size = max_size
+        self.interval = interval
+        self.min_age = min_age
+        self.size = 0
+        self._lock = threading.Lock()
+        self._wake_up = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the janitor thread, if it is not running yet"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="synapse-cache-janitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the janitor thread"""
+        self._stop.set()
+        self._wake_up.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def record_download(self, path: str) -> None:
+        """
+        Adds a downloaded file to the size of the cache
+
+        Args:
+            path: path of the downloaded file
+        """
+        try:
+            file_size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            self.size += file_size
+            over_max_size = self.size > self.max_size
+        if over_max_size:
+            self._wake_up.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.clean()
+            except Exception:  # pylint: disable=broad-except
+                # the janitor must keep running, the next scan may succeed
+                logger.exception(f"Could not clean the Synapse cache {self.cache_root}")
+            self._wake_up.wait(self.interval)
+            self._wake_up.clear()
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """
+        Returns:
+            List[Tuple[float, int, str]]: last use time, size and path of each file handle
+              folder of the cache
+        """
+        folders = []
+        if not os.path.isdir(self.cache_root):
+            return folders
+        # the cache is organised as <cache_root>/<bucket>/<file handle id>/...
+        for bucket in os.scandir(self.cache_root):
+            if not bucket.is_dir(follow_symlinks=False):
+                continue
+            for folder in os.scandir(bucket.path):
+                if not folder.is_dir(follow_symlinks=False):
+                    continue
+                last_used, folder_size = 0.0, 0
+                for dir_path, _, file_names in os.walk(folder.path):
+                    for file_name in file_names:
+                        try:
+                            stat = os.stat(os.path.join(dir_path, file_name))
+                        except OSError:
+                            continue
+                        folder_size += stat.st_size
+                        last_used = max(last_used, stat.st_mtime, stat.st_atime)
+                folders.append((last_used, folder_size, folder.path))
+        return folders
+
+    def clean(self) -> int:
+        """
+        Scans the cache, and removes the least recently used file handle folders if the
+          cache is over its maximum size
+
+        Returns:
+            int: number of folders removed
+        """
+        folders = self._scan()
+        size = sum(folder_size for _, folder_size, _ in folders)
+        with self._lock:
+            self.size = size
+        if size <= self.max_size:
+            logger.debug(f"the total size of .synapseCache is: {size} bytes")
+            return 0
+
+        target_size = self.max_size * TARGET_SIZE_FRACTION
+        oldest_allowed = time.time() - self.min_age
+        removed = 0
+        for last_used, folder_size, path in sorted(folders):
+            if size <= target_size or last_used > oldest_allowed:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            size -= folder_size
+            removed += 1
+        with self._lock:
+            self.size = size
+        logger.info(
+            f"{removed} file handle folders have been deleted from {self.cache_root}, "
+            f"the total size of .synapseCache is: {size} bytes"
+        )
+        return removed
+
+
+def get_cache_janitor(
+    cache_root: str, max_size: int, interval: float, min_age: float
+) -> SynapseCacheJanitor:
+    """
+    Gets the janitor of a cache folder, and starts it when it is created
+
+    Args:
+        cache_root: root folder of the Synapse cache
+        max_size: maximum size of the cache in bytes
+        interval: number of seconds between scans of the cache
+        min_age: number of seconds a file handle folder is kept after its last use
+
+    Returns:
+        SynapseCacheJanitor: the janitor of the cache folder
+    """
+    cache_root = os.path.abspath(cache_root)
+    with JANITORS_LOCK:
+        janitor = JANITORS.get(cache_root)
+        if janitor is None:
+            janitor = SynapseCacheJanitor(cache_root, max_size, interval, min_age)
+            JANITORS[cache_root] = janitor
+    janitor.start()
+    return janitor
+
+
+def record_download(path: Optional[str]) -> None:
+    """
+    Adds a downloaded file to the size of the cache it was downloaded to, if that cache
+      has a janitor
+
+    Args:
+        path: path of the downloaded file
+    """
+    if not path or not JANITORS:
+        return
+    path = os.path.abspath(path)
+    for cache_root, janitor in list(JANITORS.items()):
+        if path.startswith(cache_root + os.sep):
+            janitor.record_download(path)
+            return
@@ -1,10 +1,15 @@
 """SynapseDatabase"""
 
+import logging
+
 import pandas as pd
 import synapseclient as sc  # type: ignore
 
 from schematic.store.database.synapse_database_wrapper import Synapse
 from schematic.store.synapse_tracker import SynapseEntityTracker
+from schematic.utils.df_utils import hash_table_rows
+
+logger = logging.getLogger(__name__)
 
 
 class SynapseDatabaseMissingTableAnnotationsError(Exception):
@@ -87,6 +92,9 @@ class SynapseDatabase:
     ) -> None:
         """Upserts rows into the given table
 
+        Only the rows that are new, or whose values differ from the row with the same
+          primary key in the table, are sent to Synapse.
+
         Args:
             table_id (str): The Synapse id of the table to be upserted into.
             data (pd.DataFrame): The table the rows will come from
@@ -104,24 +112,73 @@ class SynapseDatabase:
                 [primary_key],
             )
 
-        table = self._create_primary_key_table(table_id, primary_key)
+        existing_table = self._query_primary_key_table(table_id, primary_key)
         merged_table = pd.merge(
-            data, table, how="left", on=primary_key, validate="one_to_one"
+            data,
+            existing_table[["ROW_ID", "ROW_VERSION", primary_key]],
+            how="left",
+            on=primary_key,
+            validate="one_to_one",
+        )
+        changed_table = self._drop_unchanged_rows(
+            merged_table,
+            existing_table,
+            list(data.columns),
+            self.synapse.get_numeric_columns(table_id),
+        )
+        logger.info(
+            f"Upserting {len(changed_table)} of {len(merged_table)} rows into {table_id}"
         )
-        self.synapse.upsert_table_rows(table_id, merged_table)
+        if changed_table.empty:
+            return
+        self.synapse.upsert_table_rows(table_id, changed_table)
+
+    @staticmethod
+    def _drop_unchanged_rows(
+        merged_table: pd.DataFrame,
+        existing_table: pd.DataFrame,
+        columns: list[str],
+        numeric_columns: list[str],
+    ) -> pd.DataFrame:
+        """Drops the rows that are identical to the existing row they update
 
-    def _create_primary_key_table(
+        Args:
+            merged_table (pd.DataFrame): The rows to upsert, with the ROW_ID of the existing
+              row they update, if any
+            existing_table (pd.DataFrame): The rows of the table, with their ROW_ID
+            columns (list[str]): The columns of the rows to upsert
+            numeric_columns (list[str]): The columns of the table with a numeric type
+
+        Returns:
+            pd.DataFrame: The rows that are new or change an existing row
+        """
+        # a new column changes every row
+        if not set(columns).issubset(existing_table.columns):
+            return merged_table
+
+        existing_hashes = pd.Series(
+            hash_table_rows(existing_table, columns, numeric_columns).values,
+            index=existing_table["ROW_ID"].astype(float).values,
+        )
+        previous_hashes = merged_table["ROW_ID"].astype(float).map(existing_hashes)
+        unchanged = (
+            hash_table_rows(merged_table, columns, numeric_columns).values
+            == previous_hashes.values
+        )
+        return merged_table[~unchanged]
+
+    def _query_primary_key_table(
         self, table_id: str, primary_key: str
     ) -> pd.DataFrame:
-        """Creates a dataframe with just the primary key of the table
+        """Queries the table, with its row data
 
         Args:
             table_id (str): The id of the table to query
             primary_key (str): The name of the primary key
 
         Returns:
-            pd.DataFrame: The table in pandas.DataFrame form with the primary key, ROW_ID, and
-             ROW_VERSION columns
+            pd.DataFrame: The table in pandas.DataFrame form with the ROW_ID and ROW_VERSION
+             columns
 
         Raises:
             InputDataframeMissingColumn: Raised when the synapse table has no column that
@@ -134,5 +191,25 @@ class SynapseDatabase:
                 list(table.columns),
                 [primary_key],
             )
+        return table
+
+    def _create_primary_key_table(
+        self, table_id: str, primary_key: str
+    ) -> pd.DataFrame:
+        """Creates a dataframe with just the primary key of the table
+
+        Args:
+            table_id (str): The id of the table to query
+            primary_key (str): The name of the primary key
+
+        Returns:
+            pd.DataFrame: The table in pandas.DataFrame form with the primary key, ROW_ID, and
+             ROW_VERSION columns
+
+        Raises:
+            InputDataframeMissingColumn: Raised when the synapse table has no column that
+              matches the primary key argument.
+        """
+        table = self._query_primary_key_table(table_id, primary_key)
         table = table[["ROW_ID", "ROW_VERSION", primary_key]]
         return table
@@ -10,6 +10,9 @@ from opentelemetry import trace
 from schematic.store.synapse_tracker import SynapseEntityTracker
 from schematic.utils.df_utils import read_csv
 
+# column types whose values are compared as numbers
+NUMERIC_COLUMN_TYPES = frozenset(["INTEGER", "DOUBLE", "DATE"])
+
 
 class SynapseTableNameError(Exception):
     """SynapseTableNameError"""
@@ -96,6 +99,21 @@ class Synapse:  # pylint: disable=too-many-public-methods
         query = f"SELECT * FROM {synapse_id}"
         return self.execute_sql_query(query, include_row_data)
 
+    def get_numeric_columns(self, synapse_id: str) -> list[str]:
+        """Gets the columns of a table with a numeric type
+
+        Args:
+            synapse_id (str): The Synapse id of the table
+
+        Returns:
+            list[str]: The names of the columns whose type is one of NUMERIC_COLUMN_TYPES
+        """
+        return [
+            column.name
+            for column in self.syn.getTableColumns(synapse_id)
+            if column.columnType in NUMERIC_COLUMN_TYPES
+        ]
+
     def execute_sql_query(
         self, query: str, include_row_data: bool = False
     ) -> pandas.DataFrame:
@@ -0,0 +1,205 @@
+"""Resumable moves of many Synapse entities to new parents"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set
+
+from opentelemetry import trace
+from synapseclient import Synapse
+from synapseclient.api import get_entity, put_entity
+
+from schematic.store.request_limiter import RequestLimiter
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("Schematic")
+
+# number of entities moved between progress reports
+MOVE_PROGRESS_INTERVAL = 1000
+# number of entities read to estimate the duration of a dry run
+DRY_RUN_SAMPLE_SIZE = 20
+# requests made to move an entity: reading it, and updating its parent
+REQUESTS_PER_MOVE = 2
+
+
+@dataclass(frozen=True)
+class EntityMove:
+    """
+    Move of an entity to a new parent.
+
+    entity_id: Synapse ID of the entity
+    parent_id: Synapse ID of the folder the entity is moved to
+    """
+
+    entity_id: str
+    parent_id: str
+
+
+class MigrationJournal:
+    """
+    Local journal of the entities moved by a migration, one JSON line per move.
+
+    Moves are appended in batches as Synapse confirms them, so that a migration that
+      stopped part way skips them when it runs again. The journal is cleared once all
+      moves were made, so that a later migration between the same projects makes
+      them again.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: path of the journal file, created with its folder if missing
+        """
+        self.path = path
+
+    def get_completed(self) -> Set[EntityMove]:
+        """
+        Returns:
+            Set[EntityMove]: moves recorded in the journal
+        """
+        if not os.path.exists(self.path):
+            return set()
+        completed = set()
+        with open(self.path, encoding="utf-8") as journal:
+            for line in journal:
+                # the last line is incomplete when the migration was interrupted
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                completed.add(EntityMove(record["entity_id"], record["parent_id"]))
+        return completed
+
+    def record(self, moves: Iterable[EntityMove]) -> None:
+        """
+        Args:
+            moves: completed moves to append to the journal
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as journal:
+            for move in moves:
+                journal.write(
+                    json.dumps(
+                        {"entity_id": move.entity_id, "parent_id": move.parent_id}
+                    )
+                    + "\n"
+                )
+
+    def clear(self) -> None:
+        """Deletes the journal file, if any"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def _move_entity(
+    syn: Synapse, request_limiter: RequestLimiter, move: EntityMove
+) -> EntityMove:
+    entity = await request_limiter.call(
+        get_entity, entity_id=move.entity_id, synapse_client=syn
+    )
+    if entity.get("parentId") != move.parent_id:
+        entity["parentId"] = move.parent_id
+        await request_limiter.call(
+            put_entity, entity_id=move.entity_id, request=entity, synapse_client=syn
+        )
+    return move
+
+
+@tracer.start_as_current_span("entity_migration::move_entities")
+async def move_entities(
+    syn: Synapse,
+    request_limiter: RequestLimiter,
+    moves: List[EntityMove],
+    journal: Optional[MigrationJournal] = None,
+) -> List[EntityMove]:
+    """
+    Moves entities concurrently, within the limits of request_limiter
+
+    Args:
+        syn: logged in Synapse client
+        request_limiter: limits of the requests made
+        moves: moves to make
+        journal: journal of the migration, the moves it records are skipped and the
+          moves made are recorded in it. It is cleared when all moves were made.
+
+    Raises:
+        RuntimeError: when entities could not be moved, after the other moves finished
+
+    Returns:
+        List[EntityMove]: the moves made
+    """
+    completed = journal.get_completed() if journal is not None else set()
+    pending = [move for move in moves if move not in completed]
+    if len(pending) < len(moves):
+        logger.info(
+            f"Resuming migration, {len(moves) - len(pending)} of {len(moves)} "
+            "entities were already moved"
+        )
+
+    moved: List[EntityMove] = []
+    unrecorded: List[EntityMove] = []
+    errors: List[str] = []
+    start_time = time.perf_counter()
+    for result in asyncio.as_completed(
+        [_move_entity(syn, request_limiter, move) for move in pending]
+    ):
+        try:
+            move = await result
+        except Exception as exc:  # pylint: disable=broad-except
+            # the other moves are still made, and recorded
+            errors.append(str(exc))
+            continue
+        moved.append(move)
+        unrecorded.append(move)
+        if len(moved) % MOVE_PROGRESS_INTERVAL == 0:
+            if journal is not None:
+                journal.record(unrecorded)
+            unrecorded = []
+            logger.info(
+                f"Moved {len(moved)} of {len(pending)} entities "
+                f"({len(moved) / (time.perf_counter() - start_time):.1f} per second)"
+            )
+    if journal is not None:
+        journal.record(unrecorded)
+    if errors:
+        raise RuntimeError(
+            f"{len(errors)} of {len(pending)} entities could not be moved, run the "
+            f"migration again to retry them: {errors[:5]}"
+        )
+    if journal is not None:
+        journal.clear()
+    return moved
+
+
+async def estimate_duration(
+    syn: Synapse, request_limiter: RequestLimiter, moves: List[EntityMove]
+) -> float:
+    """
+    Estimates how long moving entities takes, by reading a sample of them concurrently
+
+    Args:
+        syn: logged in Synapse client
+        request_limiter: limits of the requests made
+        moves: the planned moves
+
+    Returns:
+        float: the estimated number of seconds
+    """
+    sample = moves[:DRY_RUN_SAMPLE_SIZE]
+    if not sample:
+        return 0.0
+    start_time = time.perf_counter()
+    await asyncio.gather(
+        *[
+            request_limiter.call(
+                get_entity, entity_id=move.entity_id, synapse_client=syn
+            )
+            for move in sample
+        ]
+    )
+    requests_per_second = len(sample) / (time.perf_counter() - start_time)
+    return len(moves) * REQUESTS_PER_MOVE / requests_per_second
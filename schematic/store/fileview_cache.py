@@ -0,0 +1,185 @@
+"""Local snapshot cache of Synapse fileview query results"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from opentelemetry import trace
+from synapseclient import Synapse
+
+from schematic.configuration.configuration import CONFIG
+from schematic.utils.df_utils import STR_NA_VALUES_FILTERED
+from schematic.utils.io_utils import make_private_folder
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("Schematic")
+
+SNAPSHOT_SUFFIX = ".pkl"
+# number of ids put in a single "id IN (...)" clause when querying changed rows
+QUERY_BATCH_SIZE = 500
+# above this share of changed rows, the whole fileview is queried again
+MAX_CHANGED_FRACTION = 0.5
+
+
+class FileviewSnapshotCache:
+    """
+    Local snapshot of the result of a "SELECT * FROM <fileview>" query, shared by all
+      SynapseStorage objects of a user.
+
+    A snapshot is stored per fileview, user and where clause, as query results only
+      contain the entities the user can access. Snapshots younger than max_age seconds
+      are used as they are. Older snapshots are refreshed incrementally: the id and etag
+      of all rows are queried, and only the rows that are new or whose etag changed are
+      queried in full. Rows that are no longer in the fileview are dropped.
+
+    Snapshots are pickled, so they are only read from and written to a cache folder that
+      only the user running schematic can access.
+    """
+
+    def __init__(
+        self,
+        syn: Synapse,
+        fileview_id: str,
+        cache_folder: Optional[str] = None,
+        max_age: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            syn: logged in Synapse client
+            fileview_id: Synapse ID of the fileview
+            cache_folder: folder the snapshots are stored in, defaults to
+              CONFIG.synapse_fileview_cache_folder
+            max_age: number of seconds a snapshot is used for before it is refreshed,
+              defaults to CONFIG.synapse_fileview_cache_max_age
+        """
+        self.syn = syn
+        self.fileview_id = fileview_id
+        self.cache_folder = (
+            cache_folder
+            if cache_folder is not None
+            else CONFIG.synapse_fileview_cache_folder
+        )
+        self.max_age = (
+            max_age if max_age is not None else CONFIG.synapse_fileview_cache_max_age
+        )
+
+    def _get_snapshot_path(self, where_clause: str) -> str:
+        key = {
+            "fileview": self.fileview_id,
+            "user": self.syn.credentials.owner_id,
+            "where": where_clause,
+        }
+        key_hash = hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_folder, key_hash + SNAPSHOT_SUFFIX)
+
+    def _query(
+        self, columns: str, where_clause: str, limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        where = f"WHERE {where_clause} " if where_clause else ""
+        if limit is not None:
+            where += f"LIMIT {limit} "
+        return self.syn.tableQuery(
+            query=f"SELECT {columns} FROM {self.fileview_id} {where};",
+        ).asDataFrame(na_values=STR_NA_VALUES_FILTERED, keep_default_na=False)
+
+    @tracer.start_as_current_span("FileviewSnapshotCache::get")
+    def get(self, where_clause: str = "", force_refresh: bool = False) -> pd.DataFrame:
+        """
+        Gets the rows of the fileview
+
+        Args:
+            where_clause: condition the rows are selected with, without "WHERE"
+            force_refresh: refresh the snapshot even if it is younger than max_age
+
+        Returns:
+            pd.DataFrame: the same rows as "SELECT * FROM <fileview> WHERE <where_clause>"
+        """
+        snapshot_path = self._get_snapshot_path(where_clause)
+        try:
+            make_private_folder(self.cache_folder)
+        except PermissionError as exc:
+            logger.warning(f"Fileview snapshots are not used: {exc}")
+            return self._query("*", where_clause)
+
+        snapshot = None
+        if os.path.exists(snapshot_path):
+            try:
+                snapshot = pd.read_pickle(snapshot_path)
+                snapshot_age = time.time() - os.path.getmtime(snapshot_path)
+            except (OSError, ValueError, EOFError):
+                logger.warning(f"Could not read fileview snapshot {snapshot_path}")
+
+        if snapshot is not None and not force_refresh and snapshot_age <= self.max_age:
+            logger.debug(f"Using fileview snapshot {snapshot_path}")
+            return snapshot
+
+        table = None
+        if snapshot is not None and "etag" in snapshot.columns:
+            table = self._refresh(snapshot, where_clause)
+        if table is None:
+            table = self._query("*", where_clause)
+
+        self._save(table, snapshot_path)
+        return table
+
+    def _refresh(
+        self, snapshot: pd.DataFrame, where_clause: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        Refreshes a snapshot using the etags of the rows
+
+        Returns:
+            Optional[pd.DataFrame]: the refreshed rows, None if querying the whole fileview
+              is expected to be faster
+        """
+        # a column was added to or removed from the fileview
+        if list(self._query("*", where_clause, limit=1).columns) != list(
+            snapshot.columns
+        ):
+            return None
+
+        listing = self._query("id, etag", where_clause)
+        snapshot_etags = pd.Series(snapshot["etag"].values, index=snapshot["id"].values)
+        listed_etags = pd.Series(listing["etag"].values, index=listing["id"].values)
+
+        unchanged = snapshot_etags.reindex(listed_etags.index) == listed_etags
+        changed_ids = listed_etags.index[~unchanged.values].tolist()
+        if len(changed_ids) > MAX_CHANGED_FRACTION * len(listing):
+            return None
+        logger.info(
+            f"Refreshing {len(changed_ids)} of {len(listing)} rows of fileview "
+            f"{self.fileview_id} snapshot"
+        )
+
+        changed_rows = []
+        for start in range(0, len(changed_ids), QUERY_BATCH_SIZE):
+            batch = ", ".join(
+                f"'{entity_id}'"
+                for entity_id in changed_ids[start : start + QUERY_BATCH_SIZE]
+            )
+            clause = f"id IN ({batch})"
+            if where_clause:
+                clause = f"{where_clause} AND {clause}"
+            changed_rows.append(self._query("*", clause))
+
+        kept_rows = snapshot[snapshot["id"].isin(listed_etags.index[unchanged.values])]
+        table = pd.concat([kept_rows] + changed_rows)
+
+        # keep the order of the rows of a full query
+        positions = pd.Series(np.arange(len(listing)), index=listing["id"].values)
+        order = np.argsort(positions.reindex(table["id"].values).values, kind="stable")
+        return table.iloc[order]
+
+    def _save(self, table: pd.DataFrame, snapshot_path: str) -> None:
+        # write to a temporary file first, so that other workers never read a partial snapshot
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        table.to_pickle(temp_path)
+        os.replace(temp_path, snapshot_path)
@@ -0,0 +1,211 @@
+"""Export of fileviews in pages, with constant memory"""
+
+import io
+import itertools
+import logging
+from typing import Iterator, List, Optional
+
+import pandas as pd
+from opentelemetry import trace
+from synapseclient import Synapse
+
+from schematic.utils.df_utils import STR_NA_VALUES_FILTERED
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("Schematic")
+
+# number of rows queried per page
+DEFAULT_PAGE_SIZE = 10000
+
+# media types of the export formats
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# columns returned by queries that are not columns of the view
+SYSTEM_COLUMNS = ["ROW_ID", "ROW_VERSION", "ROW_ETAG"]
+
+
+def _quote_column(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def check_where_clause(where_clause: str) -> None:
+    """
+    Checks that a condition can be put in parentheses in the WHERE clause of a query,
+      without changing the conditions it is combined with
+
+    Args:
+        where_clause: condition, without "WHERE"
+
+    Raises:
+        ValueError: if the parentheses of the condition are unbalanced, or if it has a
+          statement separator or a comment, outside of quotes
+    """
+    depth = 0
+    quote = None
+    for position, character in enumerate(where_clause):
+        if quote is not None:
+            # quotes in literals and identifiers are escaped by doubling them
+            if character == quote:
+                quote = None
+            continue
+        if character in ("'", '"'):
+            quote = character
+        elif character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+            if depth < 0:
+                break
+        elif character == ";" or where_clause.startswith(("--", "/*"), position):
+            raise ValueError(
+                f"Invalid condition {where_clause!r}, statement separators and "
+                "comments are not allowed"
+            )
+    if depth != 0 or quote is not None:
+        raise ValueError(
+            f"Invalid condition {where_clause!r}, its parentheses or quotes are "
+            "unbalanced"
+        )
+
+
+def iter_fileview_pages(
+    syn: Synapse,
+    fileview_id: str,
+    columns: Optional[List[str]] = None,
+    where_clause: str = "",
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Queries the rows of a fileview in pages, ordered by row ID
+
+    Each page is selected by the rows IDs after the last row of the previous page, so
+      that the cost of a page does not grow with the number of pages before it.
+
+    Args:
+        syn: logged in Synapse client
+        fileview_id: Synapse ID of the fileview
+        columns: columns to select, defaults to all columns
+        where_clause: condition the rows are selected with, without "WHERE"
+        page_size: maximum number of rows per page
+
+    Raises:
+        ValueError: if where_clause is not a single condition
+        RuntimeError: if the row IDs of a page do not follow those of the previous page
+
+    Yields:
+        pd.DataFrame: the rows of a page, with the selected columns
+    """
+    check_where_clause(where_clause)
+    selected = ", ".join(_quote_column(column) for column in columns or []) or "*"
+    last_row_id = None
+    while True:
+        conditions = [f"({where_clause})"] if where_clause else []
+        if last_row_id is not None:
+            conditions.append(f"ROW_ID > {last_row_id}")
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        page = syn.tableQuery(
+            query=(
+                f"SELECT {selected} FROM {fileview_id} {where}"
+                f"ORDER BY ROW_ID LIMIT {page_size};"
+            ),
+        ).asDataFrame(
+            rowIdAndVersionInIndex=False,
+            na_values=STR_NA_VALUES_FILTERED,
+            keep_default_na=False,
+        )
+        if page.empty:
+            return
+        page_row_id = int(page["ROW_ID"].iloc[-1])
+        # the same rows would be queried again, without end
+        if last_row_id is not None and page_row_id <= last_row_id:
+            raise RuntimeError(
+                f"The rows of fileview {fileview_id} after row {last_row_id} ended "
+                f"at row {page_row_id}, the export is stopped"
+            )
+        last_row_id = page_row_id
+        yield page.drop(columns=SYSTEM_COLUMNS, errors="ignore")
+        if len(page) < page_size:
+            return
+
+
+def _iter_ndjson(pages: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    for page in pages:
+        yield page.to_json(orient="records", lines=True).encode("utf-8")
+
+
+def _iter_csv(pages: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    for page_number, page in enumerate(pages):
+        yield page.to_csv(index=False, header=page_number == 0).encode("utf-8")
+
+
+def _iter_arrow(pages: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    # pyarrow is only needed by this format
+    import pyarrow  # pylint: disable=import-outside-toplevel
+
+    sink = io.BytesIO()
+    writer = None
+    for page in pages:
+        if writer is None:
+            batch = pyarrow.RecordBatch.from_pandas(page, preserve_index=False)
+            writer = pyarrow.ipc.new_stream(sink, batch.schema)
+        else:
+            # the types of the later pages follow the first
+            batch = pyarrow.RecordBatch.from_pandas(
+                page, schema=writer.schema, preserve_index=False
+            )
+        writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    if writer is not None:
+        writer.close()
+        yield sink.getvalue()
+
+
+@tracer.start_as_current_span("fileview_export::export_fileview")
+def export_fileview(
+    syn: Synapse,
+    fileview_id: str,
+    export_format: str = "ndjson",
+    columns: Optional[List[str]] = None,
+    where_clause: str = "",
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[bytes]:
+    """
+    Exports the rows of a fileview, one page at a time
+
+    The first page is queried before returning, so that invalid columns or conditions
+      raise here rather than part way through the export.
+
+    Args:
+        syn: logged in Synapse client
+        fileview_id: Synapse ID of the fileview
+        export_format: one of EXPORT_FORMATS
+        columns: columns to export, defaults to all columns
+        where_clause: condition the rows are exported with, without "WHERE"
+        page_size: maximum number of rows per page
+
+    Raises:
+        ValueError: if export_format is not one of EXPORT_FORMATS, or if where_clause
+          is not a single condition
+
+    Returns:
+        Iterator[bytes]: the export, in chunks of about a page
+    """
+    serializers = {"ndjson": _iter_ndjson, "csv": _iter_csv, "arrow": _iter_arrow}
+    if export_format not in serializers:
+        raise ValueError(
+            f"Unknown export format {export_format}, expected one of "
+            f"{list(EXPORT_FORMATS)}"
+        )
+    pages = iter_fileview_pages(syn, fileview_id, columns, where_clause, page_size)
+    first_page = next(pages, None)
+    if first_page is None:
+        logger.info(f"No rows of fileview {fileview_id} to export")
+        return iter([])
+    return serializers[export_format](itertools.chain([first_page], pages))
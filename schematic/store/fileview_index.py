@@ -0,0 +1,99 @@
+"""Index of the rows of a fileview query result"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class FileviewIndex:
+    """
+    Hash indexes over the rows of a fileview query result, so that looking rows up by id,
+      parentId or projectId does not scan the whole table.
+
+    The index of a column is built the first time the column is looked up, as scoped
+      queries may not select every column. Positions are returned in table order.
+    """
+
+    def __init__(self, table: pd.DataFrame, manifest_basename: str) -> None:
+        """
+        Args:
+            table: the fileview query result
+            manifest_basename: base name of manifest files, see CONFIG.synapse_manifest_basename
+        """
+        self.table = table
+        self.manifest_basename = manifest_basename
+        self._indices: dict[str, dict] = {}
+        self._manifest_index = None
+
+    def _get_index(self, column: str) -> dict:
+        if column not in self._indices:
+            self._indices[column] = self.table.groupby(column, sort=False).indices
+        return self._indices[column]
+
+    def get_positions(self, column: str, value: str) -> np.ndarray:
+        """
+        Args:
+            column: the column to look the value up in
+            value: the value
+
+        Returns:
+            np.ndarray: positions of the rows that have the value in the column
+        """
+        return self._get_index(column).get(value, np.array([], dtype=np.intp))
+
+    def get_rows(self, column: str, value: str) -> pd.DataFrame:
+        """
+        Args:
+            column: the column to look the value up in
+            value: the value
+
+        Returns:
+            pd.DataFrame: the rows that have the value in the column
+        """
+        return self.table.iloc[self.get_positions(column, value)]
+
+    def get_values(self, column: str) -> list:
+        """
+        Args:
+            column: a column of the table
+
+        Returns:
+            list: the distinct values of the column, without missing values
+        """
+        return list(self._get_index(column).keys())
+
+    def contains_id(self, synapse_id: str) -> bool:
+        """
+        Args:
+            synapse_id: a Synapse ID
+
+        Returns:
+            bool: whether there is a row for the entity
+        """
+        return synapse_id in self._get_index("id")
+
+    def get_manifests(self, dataset_id: str) -> pd.DataFrame:
+        """
+        Args:
+            dataset_id: Synapse ID of a dataset
+
+        Returns:
+            pd.DataFrame: the rows of the manifest files directly in the dataset
+        """
+        if self._manifest_index is None:
+            manifest_re = re.compile(
+                os.path.basename(self.manifest_basename) + ".*.[tc]sv"
+            )
+            is_manifest = self.table["name"].str.contains(manifest_re, na=False)
+            manifest_positions = np.flatnonzero(is_manifest.to_numpy())
+            self._manifest_index = {
+                parent_id: manifest_positions[positions]
+                for parent_id, positions in self.table.iloc[manifest_positions]
+                .groupby("parentId", sort=False)
+                .indices.items()
+            }
+        return self.table.iloc[
+            self._manifest_index.get(dataset_id, np.array([], dtype=np.intp))
+        ]
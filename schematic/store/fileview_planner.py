@@ -0,0 +1,220 @@
+"""Planner of the fileview queries of a SynapseStorage object"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Collection, Dict, FrozenSet, List, Optional, Set
+
+import pandas as pd
+from opentelemetry import trace
+from synapseclient import Synapse
+from synapseclient.core.exceptions import SynapseHTTPError
+
+from schematic.exceptions import AccessCredentialsError
+from schematic.store.fileview_cache import FileviewSnapshotCache
+from schematic.utils.df_utils import STR_NA_VALUES_FILTERED
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("Schematic")
+
+# columns of the fileview used by the methods of SynapseStorage, selected together so
+#   that a single query serves all of them
+FILEVIEW_COLUMNS = frozenset(
+    [
+        "id",
+        "name",
+        "parentId",
+        "projectId",
+        "path",
+        "type",
+        "contentType",
+        "etag",
+        "Component",
+    ]
+)
+
+
+@dataclass
+class FileviewResult:
+    """
+    Result of a fileview query.
+
+    table: the rows
+    columns: the selected columns, None if all columns were selected
+    snapshot: whether the rows were read from the local snapshot of the fileview
+    etags: etags of the rows by Synapse ID, built on first use
+    """
+
+    table: pd.DataFrame
+    columns: Optional[FrozenSet[str]]
+    snapshot: bool = False
+    etags: Optional[Dict[str, str]] = field(default=None, repr=False)
+
+
+class FileviewQueryPlanner:
+    """
+    Plans the queries of a fileview, so that the rows requested by methods with the same
+      conditions are queried once, with the columns all of them need.
+
+    Results are kept per set of where clauses. A request is served by the kept result
+      when it has all the requested columns. Otherwise the fileview is queried again,
+      with the columns of the kept result and the requested ones, and the new result
+      replaces the kept one.
+    """
+
+    def __init__(self, syn: Synapse, fileview_id: str) -> None:
+        """
+        Args:
+            syn: logged in Synapse client
+            fileview_id: Synapse ID of the fileview
+        """
+        self.syn = syn
+        self.fileview_id = fileview_id
+        self._results: Dict[FrozenSet[str], FileviewResult] = {}
+        self._view_columns: Optional[Set[str]] = None
+
+    def _get_view_columns(self) -> Set[str]:
+        if self._view_columns is None:
+            self._view_columns = {
+                column.name for column in self.syn.getTableColumns(self.fileview_id)
+            }
+        return self._view_columns
+
+    def get(
+        self,
+        where_clauses: Collection[str] = (),
+        columns: Optional[Collection[str]] = None,
+        optional_columns: Collection[str] = (),
+        force_requery: bool = False,
+        use_snapshot: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Gets rows of the fileview
+
+        Args:
+            where_clauses: conditions the rows are selected with, without "WHERE"
+            columns: columns the rows are needed with, None for all columns
+            optional_columns: columns the rows are also needed with, if the fileview
+              has them
+            force_requery: query the fileview even if a kept result has the columns
+            use_snapshot: query all columns through the local snapshot of the fileview
+
+        Returns:
+            pd.DataFrame: the rows, with at least the requested columns, the same
+              DataFrame is returned to all requests it serves
+        """
+        key = frozenset(where_clauses)
+        result = self._results.get(key)
+        kept_columns = None
+        if result is not None and not force_requery:
+            if result.columns is None:
+                logger.debug(f"Reusing fileview {self.fileview_id} query result")
+                return result.table
+            kept_columns = result.columns
+
+        requested: Optional[Set[str]] = None
+        if not use_snapshot and (columns is not None or optional_columns):
+            requested = set(columns or [])
+            optional = set(optional_columns)
+            # the columns of the view are only requested when they are not all kept
+            if not optional <= (kept_columns or set()):
+                optional &= self._get_view_columns()
+            requested |= optional
+            if not requested:
+                # the fileview has none of the columns
+                requested = None
+
+        if kept_columns is not None and requested is not None:
+            if requested <= kept_columns:
+                logger.debug(f"Reusing fileview {self.fileview_id} query result")
+                return result.table
+            # the kept result is replaced, so the new one has its columns as well
+            requested |= kept_columns
+
+        selected = None
+        if requested is not None:
+            # the requested columns come first, in their order
+            selected = list(columns or []) + sorted(requested - set(columns or []))
+        result = FileviewResult(
+            table=self._query(where_clauses, selected, use_snapshot, force_requery),
+            columns=frozenset(requested) if requested is not None else None,
+            snapshot=use_snapshot,
+        )
+        self._results[key] = result
+        return result.table
+
+    def get_etag(self, synapse_id: str) -> Optional[str]:
+        """
+        Gets the etag of an entity from the kept results, without querying the fileview
+
+        The rows of snapshots are not used, as they can be older than the query.
+
+        Args:
+            synapse_id: Synapse ID of the entity
+
+        Returns:
+            Optional[str]: the etag, None if no kept result has the entity and its etag
+        """
+        for result in self._results.values():
+            if result.snapshot:
+                continue
+            if result.etags is None:
+                table = result.table
+                if "id" not in table.columns or "etag" not in table.columns:
+                    continue
+                result.etags = dict(zip(table["id"], table["etag"]))
+            etag = result.etags.get(synapse_id)
+            if etag:
+                return etag
+        return None
+
+    def clear(self) -> None:
+        """Removes all kept results"""
+        self._results.clear()
+        self._view_columns = None
+
+    @tracer.start_as_current_span("FileviewQueryPlanner::query")
+    def _query(
+        self,
+        where_clauses: Collection[str],
+        columns: Optional[List[str]],
+        use_snapshot: bool,
+        force_refresh: bool,
+    ) -> pd.DataFrame:
+        where_clause = " AND ".join(where_clauses)
+        selected = ",".join(dict.fromkeys(columns)) if columns else "*"
+        where = f"WHERE {where_clause} ;" if where_clause else ";"
+        query = f"SELECT {selected} FROM {self.fileview_id} {where}"
+        try:
+            if use_snapshot:
+                table = FileviewSnapshotCache(
+                    syn=self.syn, fileview_id=self.fileview_id
+                ).get(where_clause=where_clause, force_refresh=force_refresh)
+            else:
+                table = self.syn.tableQuery(query=query).asDataFrame(
+                    na_values=STR_NA_VALUES_FILTERED, keep_default_na=False
+                )
+        except SynapseHTTPError as exc:
+            exception_text = str(exc)
+            if "Unknown column path" in exception_text:
+                raise ValueError(
+                    "The path column has not been added to the fileview. Please make sure that the fileview is up to date. You can add the path column to the fileview by follwing the instructions in the validation rules documentation."
+                )
+            elif "Unknown column" in exception_text:
+                missing_column = exception_text.split("Unknown column ")[-1]
+                raise ValueError(
+                    f"The columns {missing_column} specified in the query do not exist in the fileview. Please make sure that the column names are correct and that all expected columns have been added to the fileview."
+                )
+            else:
+                raise AccessCredentialsError(self.fileview_id)
+
+        current_span = trace.get_current_span()
+        if current_span.is_recording():
+            current_span.set_attribute("fileview.id", self.fileview_id)
+            current_span.set_attribute("fileview.query", query)
+            current_span.set_attribute("fileview.snapshot", use_snapshot)
+            current_span.set_attribute("fileview.rows", len(table))
+            current_span.set_attribute(
+                "fileview.bytes", int(table.memory_usage(deep=True).sum())
+            )
+        return table
@@ -0,0 +1,105 @@
+"""Polling of Synapse state that changes asynchronously, used instead of fixed waits"""
+
+import logging
+import time
+from typing import Callable, Optional, TypeVar
+
+from synapseclient import Synapse
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# seconds waited before the first and between later checks
+INITIAL_POLL_DELAY = 0.25
+MAX_POLL_DELAY = 5.0
+
+
+def poll_until(
+    check: Callable[[], Optional[T]],
+    timeout: float,
+    description: str,
+    initial_delay: float = INITIAL_POLL_DELAY,
+    max_delay: float = MAX_POLL_DELAY,
+) -> T:
+    """
+    Calls check until it returns something else than None, waiting longer after each
+      call, starting at initial_delay and doubling up to max_delay.
+
+    Args:
+        check: function returning None while the awaited state is not reached
+        timeout: number of seconds after which polling stops
+        description: what is waited for, used in logs and errors
+        initial_delay: number of seconds waited after the first check
+        max_delay: maximum number of seconds waited between checks
+
+    Raises:
+        TimeoutError: when the state is not reached within timeout seconds
+
+    Returns:
+        T: the first result of check that is not None
+    """
+    start = time.monotonic()
+    delay = initial_delay
+    while True:
+        result = check()
+        if result is not None:
+            logger.debug(
+                f"Waited {time.monotonic() - start:.2f} seconds for {description}"
+            )
+            return result
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            raise TimeoutError(
+                f"Timed out after {timeout} seconds waiting for {description}"
+            )
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def wait_for_table_row_count(
+    syn: Synapse, table_id: str, expected_count: int, timeout: float = 60
+) -> None:
+    """
+    Waits until the number of rows a query of the table returns is the expected one, ie
+      until Synapse has applied a row change to the table index.
+
+    Args:
+        syn: logged in Synapse client
+        table_id: Synapse ID of the table
+        expected_count: number of rows the table has once the change is applied
+        timeout: number of seconds after which polling stops
+
+    Raises:
+        TimeoutError: when the count is not reached within timeout seconds
+    """
+
+    def check() -> Optional[bool]:
+        result = syn.tableQuery(f"SELECT COUNT(*) FROM {table_id}", resultsAs="rowset")
+        count = next(iter(result)).values[0]
+        return True if int(count) == expected_count else None
+
+    poll_until(check, timeout, f"{table_id} to have {expected_count} rows")
+
+
+def wait_for_table_columns(
+    syn: Synapse, table_id: str, column_names: list[str], timeout: float = 60
+) -> None:
+    """
+    Waits until the columns of a table are the expected ones
+
+    Args:
+        syn: logged in Synapse client
+        table_id: Synapse ID of the table
+        column_names: names of the columns, in order
+        timeout: number of seconds after which polling stops
+
+    Raises:
+        TimeoutError: when the columns do not match within timeout seconds
+    """
+
+    def check() -> Optional[bool]:
+        names = [column.name for column in syn.getTableColumns(table_id)]
+        return True if names == column_names else None
+
+    poll_until(check, timeout, f"the columns of {table_id} to be updated")
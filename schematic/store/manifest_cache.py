@@ -0,0 +1,296 @@
+"""Content addressed local store of downloaded manifests and of their parsed DataFrames"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+from opentelemetry import trace
+from synapseclient import File
+from synapseclient.core.utils import md5_for_file_hex
+
+from schematic.configuration.configuration import CONFIG
+from schematic.utils.df_utils import load_df
+from schematic.utils.io_utils import make_private_folder
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("Schematic")
+
+PARSED_SUFFIX = ".pkl"
+# number of seconds an entry is kept after its last use, so that it is not removed while
+#   a request is reading it
+MIN_ENTRY_AGE = 60
+
+MANIFEST_CACHES: Dict[Tuple[str, int], "ManifestCache"] = {}
+MANIFEST_CACHES_LOCK = threading.Lock()
+
+
+class ManifestCache:
+    """
+    Local store of manifest files, keyed by the MD5 of their content, shared by all
+      requests.
+
+    Each manifest version is stored once, read-only, under <cache_folder>/<md5>/, with the
+      name of its file handle. The DataFrames parsed from a stored manifest are kept next
+      to it, one pickle per reader and set of arguments, so that later reads skip the CSV
+      parsing. Files are written to a temporary path and moved in place, so that
+      concurrent requests never read a partial file.
+
+    When the store is larger than max_size bytes, the least recently used manifests are
+      removed, with their parsed DataFrames.
+
+    The parsed DataFrames are pickled, so the store is only used when its folder is one
+      only the user running schematic can access.
+    """
+
+    def __init__(
+        self, cache_folder: Optional[str] = None, max_size: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            cache_folder: folder the manifests are stored in, defaults to
+              CONFIG.synapse_manifest_cache_folder
+            max_size: maximum size of the store in bytes, defaults to
+              CONFIG.synapse_manifest_cache_max_size MB
+        """
+        self.cache_folder = (
+            cache_folder
+            if cache_folder is not None
+            else CONFIG.synapse_manifest_cache_folder
+        )
+        self.max_size = (
+            max_size
+            if max_size is not None
+            else CONFIG.synapse_manifest_cache_max_size * 1024**2
+        )
+        self._eviction_lock = threading.Lock()
+
+    def _check_folder(self) -> bool:
+        """Returns whether the store folder is private, creating it if it does not exist"""
+        try:
+            make_private_folder(self.cache_folder)
+        except PermissionError as exc:
+            logger.warning(f"Manifests are not stored: {exc}")
+            return False
+        return True
+
+    def _get_entry_folder(self, md5: str) -> str:
+        return os.path.join(self.cache_folder, md5)
+
+    @staticmethod
+    def _get_temp_path(path: str) -> str:
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def get(self, md5: str, file_name: str) -> Optional[str]:
+        """
+        Args:
+            md5: MD5 of the content of the manifest
+            file_name: name of the manifest file
+
+        Returns:
+            Optional[str]: path of the stored manifest, None if it is not stored
+        """
+        if not self._check_folder():
+            return None
+        entry_folder = self._get_entry_folder(md5)
+        path = os.path.join(entry_folder, file_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            # the modification time of the folder is the time of the last use
+            os.utime(entry_folder)
+        except OSError:
+            return None
+        return path
+
+    def add(self, source_path: str, md5: str, file_name: str) -> Optional[str]:
+        """
+        Stores a copy of a downloaded manifest
+
+        Args:
+            source_path: path of the downloaded manifest
+            md5: expected MD5 of the content of the manifest
+            file_name: name of the manifest file
+
+        Returns:
+            Optional[str]: path of the stored manifest, None if the content of the
+              downloaded manifest does not match the MD5 or the store folder is not
+              private
+        """
+        if not self._check_folder():
+            return None
+        if md5_for_file_hex(source_path) != md5:
+            logger.warning(f"{source_path} does not match MD5 {md5}, not storing it")
+            return None
+        entry_folder = self._get_entry_folder(md5)
+        os.makedirs(entry_folder, mode=0o700, exist_ok=True)
+        path = os.path.join(entry_folder, file_name)
+        if not os.path.exists(path):
+            temp_path = self._get_temp_path(path)
+            shutil.copyfile(source_path, temp_path)
+            os.chmod(temp_path, 0o400)
+            os.replace(temp_path, path)
+        os.utime(entry_folder)
+        self.evict()
+        return path
+
+    @staticmethod
+    def _get_parsed_key(
+        reader: Callable[..., pd.DataFrame], kwargs: dict
+    ) -> Optional[str]:
+        if any(callable(value) for value in kwargs.values()):
+            return None
+        try:
+            key = json.dumps(
+                {"reader": f"{reader.__module__}.{reader.__qualname__}", **kwargs},
+                sort_keys=True,
+            )
+        except TypeError:
+            return None
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @tracer.start_as_current_span("ManifestCache::read")
+    def read(
+        self,
+        md5: str,
+        path: str,
+        reader: Callable[..., pd.DataFrame] = load_df,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        Reads a manifest, using the DataFrame parsed by a previous read with the same
+          reader and arguments if there is one
+
+        Args:
+            md5: MD5 of the content of the manifest
+            path: path of the manifest, with that content
+            reader: function parsing the manifest
+            **kwargs: keyword arguments of the reader
+
+        Returns:
+            pd.DataFrame: the parsed manifest, each read returns a new DataFrame
+        """
+        key = self._get_parsed_key(reader, kwargs)
+        if key is None or not self._check_folder():
+            return reader(path, **kwargs)
+        # manifests read from another location only have their parsed DataFrames stored
+        entry_folder = self._get_entry_folder(md5)
+        os.makedirs(entry_folder, mode=0o700, exist_ok=True)
+
+        parsed_path = os.path.join(entry_folder, key + PARSED_SUFFIX)
+        if os.path.exists(parsed_path):
+            try:
+                manifest = pd.read_pickle(parsed_path)
+                os.utime(entry_folder)
+                return manifest
+            except (OSError, ValueError, EOFError):
+                logger.warning(f"Could not read parsed manifest {parsed_path}")
+
+        manifest = reader(path, **kwargs)
+        temp_path = self._get_temp_path(parsed_path)
+        try:
+            manifest.to_pickle(temp_path)
+            os.replace(temp_path, parsed_path)
+            self.evict()
+        except OSError:
+            # the entry was removed meanwhile
+            logger.debug(f"Could not store parsed manifest {parsed_path}")
+        return manifest
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used manifests until the store is under max_size
+          bytes, manifests used in the last MIN_ENTRY_AGE seconds are kept
+
+        Returns:
+            int: number of manifests removed
+        """
+        if not self._eviction_lock.acquire(blocking=False):
+            # another thread is already evicting
+            return 0
+        try:
+            entries = []
+            for entry in os.scandir(self.cache_folder):
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    size = sum(
+                        file.stat(follow_symlinks=False).st_size
+                        for file in os.scandir(entry.path)
+                    )
+                    entries.append((entry.stat().st_mtime, size, entry.path))
+                except OSError:
+                    # removed meanwhile
+                    continue
+            total_size = sum(size for _, size, _ in entries)
+
+            oldest_allowed = time.time() - MIN_ENTRY_AGE
+            removed = 0
+            for last_used, size, path in sorted(entries):
+                if total_size <= self.max_size or last_used > oldest_allowed:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total_size -= size
+                removed += 1
+            if removed:
+                logger.info(
+                    f"{removed} manifests have been removed from {self.cache_folder}"
+                )
+            return removed
+        finally:
+            self._eviction_lock.release()
+
+
+def get_manifest_cache() -> Optional[ManifestCache]:
+    """
+    Returns:
+        Optional[ManifestCache]: the manifest store of the configured folder, None if it
+          is disabled
+    """
+    if CONFIG.synapse_manifest_cache_max_size <= 0:
+        return None
+    key = (CONFIG.synapse_manifest_cache_folder, CONFIG.synapse_manifest_cache_max_size)
+    with MANIFEST_CACHES_LOCK:
+        if key not in MANIFEST_CACHES:
+            MANIFEST_CACHES[key] = ManifestCache()
+        return MANIFEST_CACHES[key]
+
+
+def get_manifest_md5(manifest: File) -> Optional[str]:
+    """
+    Args:
+        manifest: Synapse file entity of a manifest
+
+    Returns:
+        Optional[str]: MD5 of the content of the manifest, None if it is unknown
+    """
+    return (manifest.get("_file_handle") or {}).get("contentMd5")
+
+
+def load_manifest_df(
+    manifest: File,
+    reader: Callable[..., pd.DataFrame] = load_df,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Reads a downloaded manifest, through the manifest store if it is enabled
+
+    Args:
+        manifest: Synapse file entity of a downloaded manifest
+        reader: function parsing the manifest
+        **kwargs: keyword arguments of the reader
+
+    Returns:
+        pd.DataFrame: the parsed manifest
+    """
+    cache = get_manifest_cache()
+    md5 = get_manifest_md5(manifest)
+    if cache is None or md5 is None:
+        return reader(manifest.path, **kwargs)
+    return cache.read(md5, manifest.path, reader, **kwargs)
@@ -0,0 +1,170 @@
+"""Limits on the requests made to Synapse by async methods"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from synapseclient.core.exceptions import SynapseHTTPError
+
+from schematic.configuration.configuration import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# status codes Synapse answers with when it is throttling requests or briefly unavailable
+RETRYABLE_STATUS_CODES = [429, 503]
+
+
+def is_retryable_error(exception: BaseException) -> bool:
+    """
+    Args:
+        exception: an exception raised by a Synapse request
+
+    Returns:
+        bool: whether the request was throttled or Synapse was unavailable
+    """
+    if not isinstance(exception, SynapseHTTPError):
+        return False
+    response = getattr(exception, "response", None)
+    return getattr(response, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter for coroutines.
+
+    Tokens are added at rate per second, up to capacity. Each request takes a token, and
+      waits for one when the bucket is empty, so bursts of up to capacity requests are
+      allowed while the average rate stays below rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Args:
+            rate: number of tokens added per second
+            capacity: maximum number of tokens, defaults to rate (at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # requests get their token in the order they asked for one
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RequestLimiter:  # pylint: disable=too-many-instance-attributes
+    """
+    Limits the Synapse requests made by async methods of a SynapseStorage object.
+
+    At most max_in_flight requests run at a time, and when requests_per_second is set,
+      requests are started at that average rate. Requests that fail because Synapse is
+      throttling them (429) or is unavailable (503) are retried up to max_retries times,
+      waiting backoff * 2^attempt seconds, with jitter, before each retry.
+
+    The semaphore and token bucket are created for the running event loop, as each
+      asyncio.run call uses a new one.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            max_in_flight: maximum number of concurrent requests, defaults to
+              CONFIG.synapse_max_concurrent_requests
+            requests_per_second: maximum average number of requests started per second,
+              defaults to CONFIG.synapse_requests_per_second, None for no maximum
+            max_retries: maximum number of retries of a throttled request, defaults to
+              CONFIG.synapse_request_max_retries
+            backoff: number of seconds waited before the first retry
+        """
+        self.max_in_flight = (
+            max_in_flight
+            if max_in_flight is not None
+            else CONFIG.synapse_max_concurrent_requests
+        )
+        self.requests_per_second = (
+            requests_per_second
+            if requests_per_second is not None
+            else CONFIG.synapse_requests_per_second
+        )
+        self.max_retries = (
+            max_retries if max_retries is not None else CONFIG.synapse_request_max_retries
+        )
+        self.backoff = backoff
+        self.requests = 0
+        self.retries = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bucket: Optional[TokenBucket] = None
+
+    def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._bucket = (
+            TokenBucket(self.requests_per_second) if self.requests_per_second else None
+        )
+
+    async def call(
+        self, function: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Makes a request within the limits
+
+        Args:
+            function: the async function making the request
+            *args: positional arguments of the function
+            **kwargs: keyword arguments of the function
+
+        Raises:
+            SynapseHTTPError: when the request still fails after max_retries retries, or
+              fails for another reason than throttling
+
+        Returns:
+            Any: the result of the function
+        """
+        self._bind_to_running_loop()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                if self._bucket is not None:
+                    await self._bucket.acquire()
+                self.requests += 1
+                try:
+                    return await function(*args, **kwargs)
+                except SynapseHTTPError as exc:
+                    if not is_retryable_error(exc) or attempt >= self.max_retries:
+                        raise
+            # wait outside of the semaphore, so other requests can run meanwhile
+            delay = self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+            attempt += 1
+            self.retries += 1
+            logger.warning(
+                f"Synapse is throttling requests, retrying in {delay:.1f} seconds "
+                f"(attempt {attempt} of {self.max_retries})"
+            )
+            await asyncio.sleep(delay)
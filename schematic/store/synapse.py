@@ -2,19 +2,31 @@
 
 import asyncio
 import atexit
+import json
 import logging
 import os
 import re
 import secrets
 import shutil
+import threading
 import time
 import uuid  # used to generate unique names for entities
+from collections import OrderedDict
 from copy import deepcopy
 from dataclasses import dataclass, field
-from time import sleep
 
 # allows specifying explicit variable types
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
@@ -32,34 +44,69 @@ from synapseclient import (
     Table,
     as_table_columns,
 )
-from synapseclient.annotations import _convert_to_annotations_list
-from synapseclient.api import get_config_file, get_entity_id_bundle2
-from synapseclient.core.constants.concrete_types import PROJECT_ENTITY
+from synapseclient.annotations import (
+    _convert_to_annotations_list,
+    from_synapse_annotations,
+)
+from synapseclient.api import get_config_file, get_entity_id_bundle2, post_entity
+from synapseclient.core.constants.concrete_types import FOLDER_ENTITY, PROJECT_ENTITY
+from synapseclient.core.utils import md5_for_file_hex
 from synapseclient.core.exceptions import (
     SynapseAuthenticationError,
     SynapseHTTPError,
     SynapseUnmetAccessRestrictions,
 )
 from synapseclient.models.annotations import Annotations
-from synapseclient.table import CsvFileTable, Schema, build_table
+from synapseclient.table import CsvFileTable, PartialRowset, Schema, build_table
 from tenacity import (
     retry,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_chain,
-    wait_fixed,
+    wait_exponential,
 )
 
 from schematic.configuration.configuration import CONFIG
 from schematic.exceptions import AccessCredentialsError
 from schematic.schemas.data_model_graph import DataModelGraphExplorer
+from schematic.store.annotation_view_pool import ANNOTATION_VIEW_POOL
 from schematic.store.base import BaseStorage
+from schematic.store.cache_janitor import get_cache_janitor
 from schematic.store.database.synapse_database import SynapseDatabase
+from schematic.store.database.synapse_database_wrapper import NUMERIC_COLUMN_TYPES
+from schematic.store.entity_migration import (
+    EntityMove,
+    MigrationJournal,
+    estimate_duration,
+    move_entities,
+)
+from schematic.store.fileview_export import (
+    DEFAULT_PAGE_SIZE,
+    check_where_clause,
+    export_fileview,
+)
+from schematic.store.fileview_index import FileviewIndex
+from schematic.store.fileview_planner import FILEVIEW_COLUMNS, FileviewQueryPlanner
+from schematic.store.manifest_cache import (
+    ManifestCache,
+    get_manifest_cache,
+    get_manifest_md5,
+    load_manifest_df,
+)
+from schematic.store.job_polling import wait_for_table_columns, wait_for_table_row_count
+from schematic.store.request_limiter import RequestLimiter
+from schematic.store.synapse_session_pool import (
+    PROJECT_HEADERS_TTL,
+    SESSION_POOL,
+    SynapseSession,
+    create_requests_session,
+)
 from schematic.store.synapse_tracker import SynapseEntityTracker
 from schematic.utils.df_utils import (
     STR_NA_VALUES_FILTERED,
     col_in_dataframe,
+    hash_table_rows,
     load_df,
+    profile_df,
     update_df,
 )
 
@@ -86,6 +133,60 @@ ID_COLUMN = "Id"
 ENTITY_ID_COLUMN = "entityId"
 UUID_COLUMN = "uuid"
 
+# number of entities annotated between progress reports
+ANNOTATION_PROGRESS_INTERVAL = 500
+# number of rows sent in a single transaction when annotating entities through a file view
+VIEW_ANNOTATION_BATCH_SIZE = 1000
+# number of table rows deleted in a single request
+TABLE_ROW_BATCH_SIZE = 1000
+# namespace of the names of the folders created for the rows of manifests
+ROW_ENTITY_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://www.synapse.org/schematic")
+
+# manifests found per (user, fileview, project) by getProjectManifests, with the etags of the
+# datasets and manifests they were found for
+PROJECT_MANIFESTS_CACHE: OrderedDict = OrderedDict()
+PROJECT_MANIFESTS_CACHE_SIZE = 64
+PROJECT_MANIFESTS_CACHE_LOCK = threading.Lock()
+
+
+def _get_numeric_columns(results: CsvFileTable) -> List[str]:
+    """
+    Args:
+        results: result of a table query
+
+    Returns:
+        List[str]: the columns of the result with a numeric type
+    """
+    return [
+        header.name
+        for header in results.headers or []
+        if header.columnType in NUMERIC_COLUMN_TYPES
+    ]
+
+
+@dataclass
+class SubmissionSummary:
+    """
+    What the last manifest submission skipped writing to Synapse, because it would not
+      have changed anything.
+
+    manifest_file_skipped: whether the manifest file was not stored, its content being
+      the same as its current version
+    annotations_skipped: number of entities whose annotations were not stored
+    table_rows_skipped: number of rows of the manifest table that were not stored
+    """
+
+    manifest_file_skipped: bool = False
+    annotations_skipped: int = 0
+    table_rows_skipped: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"manifest file skipped: {'yes' if self.manifest_file_skipped else 'no'}, "
+            f"annotations skipped: {self.annotations_skipped}, "
+            f"table rows skipped: {self.table_rows_skipped}"
+        )
+
 
 @dataclass
 class ManifestDownload(object):
@@ -140,6 +241,14 @@ class ManifestDownload(object):
         if manifest_data and manifest_data.path:
             return manifest_data
 
+        # concurrent requests share the manifests stored by content, instead of each
+        #   downloading them to their own temporary folder
+        manifest_cache = get_manifest_cache() if use_temporary_folder else None
+        if manifest_cache is not None:
+            stored_manifest = self._get_stored_manifest(manifest_cache)
+            if stored_manifest is not None:
+                return stored_manifest
+
         if "SECRETS_MANAGER_SECRETS" in os.environ:
             temporary_manifest_storage = "/var/tmp/temp_manifest_download"
             cleanup_temporary_storage(
@@ -193,6 +302,46 @@ class ManifestDownload(object):
                 md5=manifest_data._file_handle.contentMd5,
             )
 
+        if manifest_cache is not None:
+            stored_path = manifest_cache.add(
+                manifest_data.path, get_manifest_md5(manifest_data), filename
+            )
+            if stored_path is not None:
+                # the tracked entity keeps its own writable copy
+                manifest_data = deepcopy(manifest_data)
+                manifest_data.path = stored_path
+
+        return manifest_data
+
+    def _get_stored_manifest(self, manifest_cache: ManifestCache) -> Optional[File]:
+        """
+        Gets the manifest from the manifest store, without downloading it
+
+        Args:
+            manifest_cache: the manifest store
+
+        Returns:
+            Optional[File]: A Synapse file entity of the stored manifest, None if this
+              version of the manifest is not stored, or the user cannot download it
+        """
+        manifest_data = self.synapse_entity_tracker.get(
+            synapse_id=self.manifest_id, syn=self.syn, download_file=False
+        )
+        md5 = get_manifest_md5(manifest_data)
+        if md5 is None:
+            return None
+        stored_path = manifest_cache.get(md5, manifest_data._file_handle.fileName)
+        if stored_path is None:
+            return None
+        # the stored copy may have been downloaded by another user, and Synapse only
+        #   checks the download permission of this user when the file is downloaded
+        permissions = self.syn.restGET(f"/entity/{manifest_data.id}/permissions")
+        if not permissions.get("canDownload"):
+            return None
+        logger.debug(f"Using stored manifest {stored_path}")
+        # the tracked entity is not pointed to the read-only stored file
+        manifest_data = deepcopy(manifest_data)
+        manifest_data.path = stored_path
         return manifest_data
 
     def _entity_type_checking(self) -> str:
@@ -268,6 +417,15 @@ class ManifestDownload(object):
 
             # get location of existing manifest. The manifest that will be renamed should live in the same folder as existing manifest.
             parent_folder = os.path.dirname(manifest_data.get("path"))
+            manifest_cache = get_manifest_cache()
+            if manifest_cache is not None and os.path.abspath(
+                os.path.dirname(parent_folder)
+            ) == os.path.abspath(manifest_cache.cache_folder):
+                # stored manifests are shared and read-only, the copy is made elsewhere
+                parent_folder = create_temp_folder(
+                    path=CONFIG.manifest_folder,
+                    prefix=f"{self.manifest_id}-{time.time()}-",
+                )
 
             new_manifest_path_name = os.path.join(parent_folder, new_manifest_filename)
 
@@ -323,17 +481,44 @@ class SynapseStorage(BaseStorage):
             synapse_cache_path (Optional[str], optional):
               Location of synapse cache.
               Defaults to None.
+            perform_query (Optional[bool], optional):
+              If True, storageFileviewTable is queried with columns and where_clauses on first use, instead of
+              with all columns. The methods of this class query the columns they need through fileview_planner.
+              Defaults to True.
         TODO:
             Consider necessity of adding "columns" and "where_clauses" params to the constructor. Currently with how `query_fileview` is implemented, these params are not needed at this step but could be useful in the future if the need for more scoped querys expands.
         """
-        self.syn = self.login(synapse_cache_path, access_token)
+        session = self.get_session(synapse_cache_path, access_token)
+        self.syn = session.syn
         self.project_scope = project_scope
         self.storageFileview = CONFIG.synapse_master_fileview_id
         self.manifest = CONFIG.synapse_manifest_basename
         self.root_synapse_cache = self.syn.cache.cache_root_dir
-        self.synapse_entity_tracker = SynapseEntityTracker()
+        self.synapse_entity_tracker = SynapseEntityTracker(
+            principal_id=self.syn.credentials.owner_id,
+            project_headers=session.project_headers,
+            project_headers_fetched_at=session.project_headers_fetched_at,
+            project_headers_ttl=PROJECT_HEADERS_TTL,
+            etag_lookup=self._get_fileview_etag,
+        )
+        self.request_limiter = RequestLimiter()
+        self.submission_summary = SubmissionSummary()
+        # the cache is kept under its maximum size in the background, not in requests
+        self.cache_janitor = get_cache_janitor(
+            self.root_synapse_cache,
+            max_size=int(CONFIG.synapse_cache_max_size * 1024**3),
+            interval=CONFIG.synapse_cache_janitor_interval,
+            min_age=CONFIG.synapse_cache_min_age * 60,
+        )
+        self._fileview_planner = None
+        self._fileview_table = None
+        self._fileview_table_set = False
+        self._fileview_index = None
+        # the fileview is queried on first use, not at initialization
+        self._pending_fileview_query = None
         if perform_query:
-            self.query_fileview(columns=columns, where_clauses=where_clauses)
+            self._pending_fileview_query = (columns, where_clauses)
+            self._build_query(columns=columns, where_clauses=list(where_clauses or []))
 
     # TODO: When moving this over to a regular cron-job the following logic should be
     # out of `manifest_download`:
@@ -378,16 +563,43 @@ class SynapseStorage(BaseStorage):
         columns: Optional[list] = None,
         where_clauses: Optional[list] = None,
         force_requery: Optional[bool] = False,
-    ) -> None:
+        store_result: bool = True,
+    ) -> pd.DataFrame:
         """
         Method to query the Synapse FileView and store the results in a pandas DataFrame. The results are stored in the storageFileviewTable attribute.
-        Is called once during initialization of the SynapseStorage object and can be called again later to specify a specific, more limited scope for validation purposes.
+        Is called on the first use of storageFileviewTable and can be called again later to specify a specific, more limited scope for validation purposes.
         Args:
             columns (Optional[list], optional): List of columns to be selected from the table. Defaults behavior is to request all columns.
             where_clauses (Optional[list], optional): List of where clauses to be used to scope the query. Defaults to None.
             force_requery (Optional[bool], optional): If True, forces a requery of the fileview. Defaults to False.
+            store_result (bool, optional): If False, the results are returned without replacing storageFileviewTable. Defaults to True.
+
+        Queries go through fileview_planner, so that a query that was already run by this object is not run again.
+        When file view snapshots are enabled in the configuration, querying all columns and rows (within the project scope) uses a
+        local snapshot of the fileview that is refreshed with the changed rows once it is older than the configured maximum age.
+
+        Returns:
+            pd.DataFrame: the query results
         """
-        self._purge_synapse_cache()
+        use_snapshot = (
+            CONFIG.synapse_fileview_cache_max_age is not None
+            and not columns
+            and not where_clauses
+        )
+        planned_where_clauses = list(where_clauses or [])
+        if self.project_scope:
+            planned_where_clauses.append(self._get_project_scope_clause())
+
+        def run_query() -> pd.DataFrame:
+            return self.fileview_planner.get(
+                where_clauses=planned_where_clauses,
+                columns=columns or None,
+                force_requery=force_requery,
+                use_snapshot=use_snapshot,
+            )
+
+        if not store_result:
+            return run_query()
 
         # Initialize to assume that the new fileview query will be different from what may already be stored. Initializes to True because generally one will not have already been performed
         self.new_query_different = True
@@ -398,29 +610,108 @@ class SynapseStorage(BaseStorage):
             previous_query = self.fileview_query
 
         # Build a query with the current given parameters and check to see if it is different from the previous
-        self._build_query(columns=columns, where_clauses=where_clauses)
+        self._build_query(columns=columns, where_clauses=list(where_clauses or []))
         if previous_query_built:
             self.new_query_different = self.fileview_query != previous_query
 
-        # Only perform the query if it is different from the previous query or we are forcing new results to be retrieved
-        if self.new_query_different or force_requery:
-            try:
-                self.storageFileviewTable = self.syn.tableQuery(
-                    query=self.fileview_query,
-                ).asDataFrame(na_values=STR_NA_VALUES_FILTERED, keep_default_na=False)
-            except SynapseHTTPError as exc:
-                exception_text = str(exc)
-                if "Unknown column path" in exception_text:
-                    raise ValueError(
-                        "The path column has not been added to the fileview. Please make sure that the fileview is up to date. You can add the path column to the fileview by follwing the instructions in the validation rules documentation."
-                    )
-                elif "Unknown column" in exception_text:
-                    missing_column = exception_text.split("Unknown column ")[-1]
-                    raise ValueError(
-                        f"The columns {missing_column} specified in the query do not exist in the fileview. Please make sure that the column names are correct and that all expected columns have been added to the fileview."
-                    )
-                else:
-                    raise AccessCredentialsError(self.storageFileview)
+        # Only perform the query if it is different from the previous query, has not been performed yet, or we are forcing new results to be retrieved
+        if self.new_query_different or force_requery or self._fileview_table is None:
+            self._fileview_table = run_query()
+            self._fileview_table_set = False
+        return self._fileview_table
+
+    @property
+    def storageFileviewTable(self) -> pd.DataFrame:
+        """Results of the last query_fileview call. The fileview is queried on first use, with the columns and
+        where clauses given at initialization.
+
+        A table that is set directly is used by all methods of this class instead of the tables of fileview_planner.
+        """
+        if self._fileview_table is None:
+            columns, where_clauses = self._pending_fileview_query or (None, None)
+            self.query_fileview(columns=columns, where_clauses=where_clauses)
+        return self._fileview_table
+
+    @storageFileviewTable.setter
+    def storageFileviewTable(self, table: pd.DataFrame) -> None:
+        self._fileview_table = table
+        self._fileview_table_set = True
+
+    @storageFileviewTable.deleter
+    def storageFileviewTable(self) -> None:
+        self._fileview_table = None
+        self._fileview_table_set = False
+
+    @property
+    def fileview_planner(self) -> FileviewQueryPlanner:
+        """Planner of the queries of the storage fileview, shared by all methods of this object."""
+        if (
+            self._fileview_planner is None
+            or self._fileview_planner.fileview_id != self.storageFileview
+        ):
+            self._fileview_planner = FileviewQueryPlanner(
+                syn=self.syn, fileview_id=self.storageFileview
+            )
+        return self._fileview_planner
+
+    def _get_fileview_etag(self, synapse_id: str) -> Optional[str]:
+        """Etag of an entity in the fileview rows already queried by this object, None if it is not in them.
+
+        Args:
+            synapse_id: Synapse ID of the entity
+
+        Returns:
+            Optional[str]: the etag
+        """
+        if self._fileview_planner is None:
+            return None
+        return self._fileview_planner.get_etag(synapse_id)
+
+    def _get_fileview(
+        self, columns: Sequence[str], force_requery: bool = False
+    ) -> pd.DataFrame:
+        """Gets the rows of the storage fileview within the project scope.
+
+        The columns used by all methods of this class are selected with the requested ones, so that the methods
+        called on this object share a single query.
+
+        Args:
+            columns: columns the calling method needs, if the fileview has them
+            force_requery: If True, forces a requery of the fileview
+
+        Returns:
+            pd.DataFrame: the rows of the fileview
+        """
+        if self._fileview_table_set:
+            return self._fileview_table
+        where_clauses = []
+        if self.project_scope:
+            where_clauses.append(self._get_project_scope_clause())
+        return self.fileview_planner.get(
+            where_clauses=where_clauses,
+            optional_columns=FILEVIEW_COLUMNS | set(columns),
+            force_requery=force_requery,
+            use_snapshot=CONFIG.synapse_fileview_cache_max_age is not None,
+        )
+
+    def _get_fileview_index(
+        self, columns: Sequence[str], force_requery: bool = False
+    ) -> FileviewIndex:
+        """Index of the rows of _get_fileview, rebuilt when they are queried again.
+
+        Args:
+            columns: columns the calling method needs, if the fileview has them
+            force_requery: If True, forces a requery of the fileview
+
+        Returns:
+            FileviewIndex: the index
+        """
+        table = self._get_fileview(columns, force_requery=force_requery)
+        if self._fileview_index is None or self._fileview_index.table is not table:
+            self._fileview_index = FileviewIndex(
+                table=table, manifest_basename=self.manifest
+            )
+        return self._fileview_index
 
     @staticmethod
     def build_clause_from_dataset_id(
@@ -446,6 +737,15 @@ class SynapseStorage(BaseStorage):
         # `dataset_id` should be provided when all files are stored directly under the dataset folder
         return f"parentId='{dataset_id}'"
 
+    def _get_project_scope_clause(self) -> str:
+        """
+        Returns:
+            str: where clause limiting a fileview query to the project scope, an empty string if there is no project scope
+        """
+        if self.project_scope:
+            return f"projectId IN {tuple(self.project_scope + [''])}"
+        return ""
+
     def _build_query(
         self, columns: Optional[list] = None, where_clauses: Optional[list] = None
     ):
@@ -464,8 +764,7 @@ class SynapseStorage(BaseStorage):
             where_clauses = []
 
         if self.project_scope:
-            project_scope_clause = f"projectId IN {tuple(self.project_scope + [''])}"
-            where_clauses.append(project_scope_clause)
+            where_clauses.append(self._get_project_scope_clause())
 
         if where_clauses:
             where_clauses = " AND ".join(where_clauses)
@@ -484,6 +783,36 @@ class SynapseStorage(BaseStorage):
 
         return
 
+    @staticmethod
+    @tracer.start_as_current_span("SynapseStorage::get_session")
+    def get_session(
+        synapse_cache_path: Optional[str] = None,
+        access_token: Optional[str] = None,
+    ) -> SynapseSession:
+        """Gets a logged in Synapse client from the session pool, logging in if the pool
+        has no current client for the credentials
+
+        Args:
+            synapse_cache_path (Optional[str]): location of synapse cache
+            access_token (Optional[str], optional): A synapse access token. Defaults to None.
+
+        Returns:
+            SynapseSession: The logged in Synapse object, and the user data cached with it
+        """
+        if not access_token:
+            access_token = os.getenv("SYNAPSE_ACCESS_TOKEN")
+        credentials = access_token or CONFIG.synapse_configuration_path
+        session = SESSION_POOL.get(
+            credentials,
+            synapse_cache_path,
+            lambda: SynapseStorage.login(synapse_cache_path, access_token),
+        )
+
+        current_span = trace.get_current_span()
+        if current_span.is_recording():
+            current_span.set_attribute("user.id", session.syn.credentials.owner_id)
+        return session
+
     @staticmethod
     @tracer.start_as_current_span("SynapseStorage::login")
     def login(
@@ -505,6 +834,16 @@ class SynapseStorage(BaseStorage):
         if not access_token:
             access_token = os.getenv("SYNAPSE_ACCESS_TOKEN")
 
+        endpoints = {}
+        if CONFIG.synapse_endpoint:
+            endpoint = CONFIG.synapse_endpoint.rstrip("/")
+            endpoints = {
+                "repoEndpoint": f"{endpoint}/repo/v1",
+                "authEndpoint": f"{endpoint}/auth/v1",
+                "fileHandleEndpoint": f"{endpoint}/file/v1",
+                "portalEndpoint": f"{endpoint}/",
+            }
+
         # login using a token
         if access_token:
             try:
@@ -513,6 +852,10 @@ class SynapseStorage(BaseStorage):
                     debug=False,
                     skip_checks=True,
                     cache_client=False,
+                    requests_session=create_requests_session(
+                        CONFIG.synapse_max_concurrent_requests
+                    ),
+                    **endpoints,
                 )
                 syn.login(authToken=access_token, silent=True)
             except SynapseHTTPError as exc:
@@ -527,6 +870,10 @@ class SynapseStorage(BaseStorage):
                 debug=False,
                 skip_checks=True,
                 cache_client=False,
+                requests_session=create_requests_session(
+                    CONFIG.synapse_max_concurrent_requests
+                ),
+                **endpoints,
             )
             syn.login(silent=True)
 
@@ -568,9 +915,46 @@ class SynapseStorage(BaseStorage):
         return wrapper
 
     def getStorageFileviewTable(self):
-        """Returns the storageFileviewTable obtained during initialization."""
+        """Returns the storageFileviewTable, queried on first use."""
         return self.storageFileviewTable
 
+    @tracer.start_as_current_span("SynapseStorage::export_fileview")
+    def export_fileview(
+        self,
+        export_format: str = "ndjson",
+        columns: Optional[list] = None,
+        where_clauses: Optional[list] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[bytes]:
+        """Exports the storage fileview one page at a time, without loading all of it.
+
+        Args:
+            export_format: one of "ndjson", "csv" and "arrow"
+            columns: columns to export, defaults to all columns
+            where_clauses: conditions the rows are exported with, in addition to the project scope
+            page_size: maximum number of rows queried per page
+
+        Raises:
+            ValueError: if a condition of where_clauses is not a single condition
+
+        Returns:
+            Iterator[bytes]: the export, in chunks of about a page
+        """
+        where_clauses = list(where_clauses or [])
+        # each condition is put in parentheses, and must not close them
+        for where_clause in where_clauses:
+            check_where_clause(where_clause)
+        if self.project_scope:
+            where_clauses.append(self._get_project_scope_clause())
+        return export_fileview(
+            self.syn,
+            self.storageFileview,
+            export_format=export_format,
+            columns=columns,
+            where_clause=" AND ".join(f"({clause})" for clause in where_clauses),
+            page_size=page_size,
+        )
+
     def getPaginatedRestResults(self, currentUserId: str) -> Dict[str, str]:
         """Gets the paginated results of the REST call to Synapse to check what projects the current user has access to.
 
@@ -611,7 +995,8 @@ class SynapseStorage(BaseStorage):
         """
 
         # get the set of all storage Synapse project accessible for this pipeline
-        storageProjects = self.storageFileviewTable["projectId"].unique()
+        fileview_index = self._get_fileview_index(["projectId"])
+        storageProjects = fileview_index.get_values("projectId")
 
         # get the set of storage Synapse project accessible for this user
         # get a list of projects from Synapse
@@ -662,16 +1047,15 @@ class SynapseStorage(BaseStorage):
 
         # select all folders and fetch their names from within the storage project;
         # if folder content type is defined, only select folders that contain datasets
-        if "contentType" in self.storageFileviewTable.columns:
-            foldersTable = self.storageFileviewTable[
-                (self.storageFileviewTable["contentType"] == "dataset")
-                & (self.storageFileviewTable["projectId"] == projectId)
-            ]
+        fileview_index = self._get_fileview_index(
+            ["id", "name", "parentId", "projectId", "type", "contentType"]
+        )
+        if "contentType" in fileview_index.table.columns:
+            foldersTable = fileview_index.get_rows("projectId", projectId)
+            foldersTable = foldersTable[foldersTable["contentType"] == "dataset"]
         else:
-            foldersTable = self.storageFileviewTable[
-                (self.storageFileviewTable["type"] == "folder")
-                & (self.storageFileviewTable["parentId"] == projectId)
-            ]
+            foldersTable = fileview_index.get_rows("parentId", projectId)
+            foldersTable = foldersTable[foldersTable["type"] == "folder"]
 
         # get an array of tuples (folderId, folderName)
         # some folders are part of datasets; others contain datasets
@@ -712,13 +1096,12 @@ class SynapseStorage(BaseStorage):
         file_list = []
 
         # Get path to dataset folder by using childern to avoid cases where the dataset is the scope of the view
-        if self.storageFileviewTable.empty:
+        fileview_index = self._get_fileview_index(["parentId", "path"])
+        if fileview_index.table.empty:
             raise ValueError(
                 f"Fileview {self.storageFileview} is empty, please check the table and the provided synID and try again."
             )
-        child_path = self.storageFileviewTable.loc[
-            self.storageFileviewTable["parentId"] == datasetId, "path"
-        ]
+        child_path = fileview_index.get_rows("parentId", datasetId)["path"]
         if child_path.empty:
             raise LookupError(
                 f"Dataset {datasetId} could not be found in fileview {self.storageFileview}."
@@ -732,12 +1115,15 @@ class SynapseStorage(BaseStorage):
         # When querying, only include files to exclude entity files and subdirectories
         where_clauses = [create_like_statement(parent), "type='file'"]
 
-        # Requery the fileview to specifically get the files in the given dataset
-        self.query_fileview(columns=["id", "path"], where_clauses=where_clauses)
+        # Requery the fileview to specifically get the files in the given dataset,
+        # the results of the other methods are kept
+        dataset_files = self.query_fileview(
+            columns=["id", "path"], where_clauses=where_clauses, store_result=False
+        )
 
         # Exclude manifest files
-        non_manifest_files = self.storageFileviewTable.loc[
-            ~self.storageFileviewTable["path"].str.contains("synapse_storage_manifest"),
+        non_manifest_files = dataset_files.loc[
+            ~dataset_files["path"].str.contains("synapse_storage_manifest"),
             :,
         ]
 
@@ -812,18 +1198,11 @@ class SynapseStorage(BaseStorage):
         """
         manifest_data = ""
 
-        # get a list of files containing the manifest for this dataset (if any)
-        all_files = self.storageFileviewTable
-
-        # construct regex based on manifest basename in the config
-        manifest_re = re.compile(os.path.basename(self.manifest) + ".*.[tc]sv")
-
-        # search manifest based on given manifest basename regex above
+        # search manifest files (names matching the manifest basename in the config) in the dataset
         # and return a dataframe containing name and id of manifests in a given asset view
-        manifest = all_files[
-            (all_files["name"].str.contains(manifest_re, regex=True))
-            & (all_files["parentId"] == datasetId)
-        ]
+        manifest = self._get_fileview_index(["id", "name", "parentId"]).get_manifests(
+            datasetId
+        )
 
         manifest = manifest[["id", "name"]]
 
@@ -857,34 +1236,31 @@ class SynapseStorage(BaseStorage):
                 return manifest_data
             return manifest_syn_id
 
-    def getDataTypeFromManifest(self, manifestId: str):
+    def getDataTypeFromManifest(self, manifestId: str, include_stats: bool = False):
         """Fetch a manifest and return data types of all columns
+
+        The columns are profiled in a single pass, and the profile of each manifest
+        version is kept in the manifest store, so that later requests skip parsing it.
+
         Args:
             manifestId: synapse ID of a manifest
+            include_stats: if True, return the null count, distinct count, min and max of
+              each column with its data type
+        Returns:
+            dict: the data type of each column, or its data type and statistics if
+              include_stats is True
         """
         # get manifest file path
         manifest_entity = self.synapse_entity_tracker.get(
             synapse_id=manifestId, syn=self.syn, download_file=True
         )
-        manifest_filepath = manifest_entity.path
-
-        # load manifest dataframe
-        manifest = load_df(
-            manifest_filepath,
-            preserve_raw_input=False,
-            data_model=False,
-        )
 
-        # convert the dataFrame to use best possible dtypes.
-        manifest_new = manifest.convert_dtypes()
+        # profile the columns of the manifest
+        profile = load_manifest_df(manifest_entity, reader=profile_df)
 
-        # get data types of columns
-        result = manifest_new.dtypes.to_frame("dtypes").reset_index()
-
-        # return the result as a dictionary
-        result_dict = result.set_index("index")["dtypes"].astype(str).to_dict()
-
-        return result_dict
+        if include_stats:
+            return profile.to_dict(orient="index")
+        return profile["dtype"].to_dict()
 
     def _get_files_metadata_from_dataset(
         self, datasetId: str, only_new_files: bool, manifest: pd.DataFrame = None
@@ -926,25 +1302,28 @@ class SynapseStorage(BaseStorage):
         )
 
         if dataset_files_dict:
-            # turn manifest dataframe back to a dictionary for operation
-            manifest_dict = manifest.to_dict("list")
+            # columns are padded to the same length when building the dataframe, values
+            #   are kept as objects so that the padding does not change their type
+            columns = {
+                column: values.reset_index(drop=True).astype(object)
+                for column, values in manifest.items()
+            }
 
             # update Filename column
             # add entityId column to the end
-            manifest_dict.update(dataset_files_dict)
+            for column, values in dataset_files_dict.items():
+                columns[column] = pd.Series(values, dtype=object)
 
             # if the component column exists in existing manifest, fill up that column
-            if "Component" in manifest_dict.keys():
-                manifest_dict["Component"] = manifest_dict["Component"] * max(
-                    1, len(manifest_dict["Filename"])
+            if "Component" in columns:
+                columns["Component"] = pd.Series(
+                    manifest["Component"].tolist()
+                    * max(1, len(dataset_files_dict["Filename"])),
+                    dtype=object,
                 )
 
-            # turn dictionary back to a dataframe
-            manifest_df_index = pd.DataFrame.from_dict(manifest_dict, orient="index")
-            manifest_df_updated = manifest_df_index.transpose()
-
             # fill na with empty string
-            manifest_df_updated = manifest_df_updated.fillna("")
+            manifest_df_updated = pd.DataFrame(columns).fillna("")
 
             # drop index
             manifest_df_updated = manifest_df_updated.reset_index(drop=True)
@@ -971,48 +1350,36 @@ class SynapseStorage(BaseStorage):
         # update manifest with additional filenames, if any
         # note that if there is an existing manifest and there are files in the dataset
         # the columns Filename and entityId are assumed to be present in manifest schema
-        # TODO: use idiomatic panda syntax
         if not dataset_files:
             manifest = manifest.fillna("")
             return dataset_files, manifest
 
-        all_files = self._get_file_entityIds(
-            dataset_files=dataset_files, only_new_files=False, manifest=manifest
-        )
-        new_files = self._get_file_entityIds(
-            dataset_files=dataset_files, only_new_files=True, manifest=manifest
-        )
+        self._check_manifest_entity_ids(manifest)
+        all_files = pd.DataFrame(dataset_files, columns=["entityId", "Filename"])[
+            ["Filename", "entityId"]
+        ]
 
-        all_files = pd.DataFrame(all_files)
-        new_files = pd.DataFrame(new_files)
+        # update manifest so that it contains new dataset files, the files whose
+        #   entityId is not in the manifest
+        new_files = all_files[~all_files["entityId"].isin(manifest["entityId"])]
+        manifest = pd.concat([manifest, new_files], sort=False, ignore_index=True)
 
-        # update manifest so that it contains new dataset files
-        manifest = (
-            pd.concat([manifest, new_files], sort=False)
-            .reset_index()
-            .drop("index", axis=1)
-        )
-
-        # Reindex manifest and new files dataframes according to entityIds to align file paths and metadata
-        manifest_reindex = manifest.set_index("entityId")
-        all_files_reindex = all_files.set_index("entityId")
-        all_files_reindex_like_manifest = all_files_reindex.reindex_like(
-            manifest_reindex
+        # look up the file path from synapse of each row by entityId, rows of entities
+        #   that are not in the dataset get no path
+        synapse_file_paths = manifest["entityId"].map(
+            all_files.set_index("entityId")["Filename"]
         )
 
         # Check if individual file paths in manifest and from synapse match
-        file_paths_match = (
-            manifest_reindex["Filename"] == all_files_reindex_like_manifest["Filename"]
-        )
+        file_paths_match = manifest["Filename"] == synapse_file_paths
 
         # If all the paths do not match, update the manifest with the filepaths from synapse
         if not file_paths_match.all():
-            manifest_reindex.loc[
-                ~file_paths_match, "Filename"
-            ] = all_files_reindex_like_manifest.loc[~file_paths_match, "Filename"]
+            manifest.loc[~file_paths_match, "Filename"] = synapse_file_paths[
+                ~file_paths_match
+            ]
 
             # reformat manifest for further use
-            manifest = manifest_reindex.reset_index()
             entityIdCol = manifest.pop("entityId")
             manifest.insert(len(manifest.columns), "entityId", entityIdCol)
 
@@ -1048,7 +1415,7 @@ class SynapseStorage(BaseStorage):
             synapse_id=manifest_id, syn=self.syn, download_file=True
         )
         manifest_filepath = manifest_entity.path
-        manifest = load_df(manifest_filepath)
+        manifest = load_manifest_df(manifest_entity)
 
         # If the manifest does not have an entityId column, trigger a new manifest to be generated
         if "entityId" not in manifest.columns:
@@ -1076,6 +1443,22 @@ class SynapseStorage(BaseStorage):
 
         return manifest_id, manifest
 
+    @staticmethod
+    def _check_manifest_entity_ids(manifest: pd.DataFrame) -> None:
+        """
+        Args:
+            manifest: metadata manifest
+
+        Raises:
+            ValueError: if the manifest does not have an entityId column
+        """
+        if "entityId" not in manifest.columns:
+            raise ValueError(
+                "The manifest in your dataset and/or top level folder must contain the 'entityId' column. "
+                "Please generate an empty manifest without annotations, manually add annotations to the "
+                "appropriate files in the manifest, and then try again."
+            )
+
     def _get_file_entityIds(
         self,
         dataset_files: List,
@@ -1100,16 +1483,12 @@ class SynapseStorage(BaseStorage):
                     "No manifest was passed in, a manifest is required when `only_new_files` is True."
                 )
 
-            if "entityId" not in manifest.columns:
-                raise ValueError(
-                    "The manifest in your dataset and/or top level folder must contain the 'entityId' column. "
-                    "Please generate an empty manifest without annotations, manually add annotations to the "
-                    "appropriate files in the manifest, and then try again."
-                )
+            self._check_manifest_entity_ids(manifest)
 
             # find new files (that are not in the current manifest) if any
+            manifest_entity_ids = set(manifest["entityId"])
             for file_id, file_name in dataset_files:
-                if not file_id in manifest["entityId"].values:
+                if file_id not in manifest_entity_ids:
                     files["Filename"].append(file_name)
                     files["entityId"].append(file_id)
         else:
@@ -1139,70 +1518,39 @@ class SynapseStorage(BaseStorage):
 
         TODO: Return manifest URI instead of Synapse ID for interoperability with other implementations of a store interface
         """
-        component = None
-        entity = None
-        manifests = []
-
         datasets = self.getStorageDatasetsInProject(projectId)
 
-        for datasetId, datasetName in datasets:
-            # encode information about the manifest in a simple list (so that R clients can unpack it)
-            # eventually can serialize differently
+        # Get synID of manifest for each dataset
+        dataset_manifests = [
+            (datasetId, datasetName, self.getDatasetManifest(datasetId))
+            for datasetId, datasetName in datasets
+        ]
 
-            # Get synID of manifest for a dataset
-            manifestId = self.getDatasetManifest(datasetId)
+        # Reuse the manifests found for the project earlier if none of its datasets or manifests changed since
+        cache_key = (self.syn.credentials.owner_id, self.storageFileview, projectId)
+        signature = self._get_project_manifests_signature(dataset_manifests)
+        with PROJECT_MANIFESTS_CACHE_LOCK:
+            cached = PROJECT_MANIFESTS_CACHE.get(cache_key)
+        if signature is not None and cached is not None and cached[0] == signature:
+            logger.debug(f"Using cached manifests of project {projectId}")
+            return list(cached[1])
 
-            # If a manifest exists, get the annotations for it, else return base 'manifest' tuple
-            if manifestId:
-                annotations = self.getFileAnnotations(manifestId)
+        manifest_ids = [manifestId for _, _, manifestId in dataset_manifests if manifestId]
+        manifest_components = asyncio.run(self._get_manifest_components(manifest_ids))
 
-                # If manifest has annotations specifying component, use that
-                if annotations and "Component" in annotations:
-                    component = annotations["Component"]
-                    entity = self.synapse_entity_tracker.get(
-                        synapse_id=manifestId, syn=self.syn, download_file=False
-                    )
-                    manifest_name = entity["properties"]["name"]
-
-                # otherwise download the manifest and parse for information
-                elif not annotations or "Component" not in annotations:
-                    logging.debug(
-                        f"No component annotations have been found for manifest {manifestId}. "
-                        "The manifest will be downloaded and parsed instead. "
-                        "For increased speed, add component annotations to manifest."
-                    )
+        manifests = []
+        for datasetId, datasetName, manifestId in dataset_manifests:
+            # encode information about the manifest in a simple list (so that R clients can unpack it)
+            # eventually can serialize differently
 
-                    manifest_info = self.getDatasetManifest(
-                        datasetId, downloadFile=True
+            # If a manifest exists, get its name and component, else return base 'manifest' tuple
+            if manifestId:
+                manifest_name, component = manifest_components[manifestId]
+                if component is None:
+                    # download the manifest and parse for information
+                    manifest_name, component = self._get_component_from_manifest_file(
+                        datasetId, manifestId
                     )
-                    manifest_name = manifest_info["properties"].get("name", "")
-
-                    if not manifest_name:
-                        logger.error(f"Failed to download manifests from {datasetId}")
-
-                    manifest_path = manifest_info["path"]
-
-                    manifest_df = load_df(manifest_path)
-
-                    # Get component from component column if it exists
-                    if (
-                        "Component" in manifest_df
-                        and not manifest_df["Component"].empty
-                    ):
-                        list(set(manifest_df["Component"]))
-                        component = list(set(manifest_df["Component"]))
-
-                        # Added to address issues raised during DCA testing
-                        if "" in component:
-                            component.remove("")
-
-                        if len(component) == 1:
-                            component = component[0]
-                        elif len(component) > 1:
-                            logging.warning(
-                                f"Manifest {manifestId} is composed of multiple components. Schematic does not support mulit-component manifests at this time."
-                                "Behavior of manifests with multiple components is undefined"
-                            )
             else:
                 manifest_name = ""
                 component = None
@@ -1228,10 +1576,148 @@ class SynapseStorage(BaseStorage):
                     ("", ""),
                 )
 
-            if manifest:
-                manifests.append(manifest)
+            manifests.append(manifest)
+
+        if signature is not None:
+            with PROJECT_MANIFESTS_CACHE_LOCK:
+                PROJECT_MANIFESTS_CACHE[cache_key] = (signature, manifests)
+                while len(PROJECT_MANIFESTS_CACHE) > PROJECT_MANIFESTS_CACHE_SIZE:
+                    PROJECT_MANIFESTS_CACHE.popitem(last=False)
+
+        return list(manifests)
+
+    def _get_project_manifests_signature(
+        self, dataset_manifests: list[tuple[str, str, str]]
+    ) -> Optional[tuple]:
+        """Gets the etags of the datasets and manifests of a project from the fileview.
+
+        Args:
+            dataset_manifests: (datasetId, datasetName, manifestId) of each dataset in the project
+
+        Returns:
+            Optional[tuple]: datasets, manifests and their etags, this changes whenever a dataset or manifest
+              (including its annotations) changes. None if the fileview has no etag column.
+        """
+        fileview_index = self._get_fileview_index(["id", "etag"])
+        if "etag" not in fileview_index.table.columns:
+            return None
+        signature = []
+        for datasetId, datasetName, manifestId in dataset_manifests:
+            entity_ids = [datasetId, manifestId] if manifestId else [datasetId]
+            etags = tuple(
+                tuple(fileview_index.get_rows("id", entity_id)["etag"])
+                for entity_id in entity_ids
+            )
+            signature.append((datasetId, datasetName, manifestId, etags))
+        return tuple(signature)
+
+    async def _get_manifest_components(
+        self, manifest_ids: list[str]
+    ) -> dict[str, tuple[str, Optional[str]]]:
+        """Gets the name and Component annotation of manifests.
+
+        The annotations are taken from the fileview when it has a Component column, the
+        annotations of the other manifests are requested concurrently, within the limits of
+        the request limiter.
+
+        Args:
+            manifest_ids: synapse IDs of manifests
+
+        Returns:
+            dict[str, tuple[str, Optional[str]]]: manifest name and component of each manifest,
+              the component is None if the manifest has no Component annotation
+        """
+        manifest_components = {}
+        fileview_index = self._get_fileview_index(["id", "name", "Component"])
+        if "Component" in fileview_index.table.columns:
+            for manifest_id in manifest_ids:
+                manifest_row = fileview_index.get_rows("id", manifest_id)
+                if manifest_row.empty:
+                    continue
+                component = manifest_row["Component"].iloc[0]
+                if isinstance(component, str) and component:
+                    manifest_components[manifest_id] = (
+                        manifest_row["name"].iloc[0],
+                        component,
+                    )
+
+        async def get_component(manifest_id: str) -> tuple[str, Optional[str]]:
+            try:
+                bundle = await self.request_limiter.call(
+                    get_entity_id_bundle2,
+                    entity_id=manifest_id,
+                    request={"includeEntity": True, "includeAnnotations": True},
+                    synapse_client=self.syn,
+                )
+            except SynapseHTTPError:
+                # the manifest will be downloaded and parsed instead
+                return "", None
+            annotations = bundle["annotations"]["annotations"]
+            if "Component" not in annotations:
+                return bundle["entity"]["name"], None
+            component = ", ".join(
+                str(value) for value in annotations["Component"]["value"]
+            )
+            return bundle["entity"]["name"], component
+
+        remaining_ids = [
+            manifest_id
+            for manifest_id in manifest_ids
+            if manifest_id not in manifest_components
+        ]
+        results = await asyncio.gather(
+            *[get_component(manifest_id) for manifest_id in remaining_ids]
+        )
+        manifest_components.update(zip(remaining_ids, results))
+        return manifest_components
+
+    def _get_component_from_manifest_file(
+        self, datasetId: str, manifestId: str
+    ) -> tuple[str, Optional[Union[str, list]]]:
+        """Downloads the manifest of a dataset and reads the component from its Component column.
+
+        Args:
+            datasetId: synapse ID of a storage dataset
+            manifestId: synapse ID of the manifest of the dataset
+
+        Returns:
+            tuple[str, Optional[Union[str, list]]]: the name of the manifest and its component, a list of
+              components if the manifest has multiple components, None if it has no Component column
+        """
+        logging.debug(
+            f"No component annotations have been found for manifest {manifestId}. "
+            "The manifest will be downloaded and parsed instead. "
+            "For increased speed, add component annotations to manifest."
+        )
+
+        manifest_info = self.getDatasetManifest(datasetId, downloadFile=True)
+        manifest_name = manifest_info["properties"].get("name", "")
 
-        return manifests
+        if not manifest_name:
+            logger.error(f"Failed to download manifests from {datasetId}")
+
+        manifest_path = manifest_info["path"]
+
+        # only the Component column is needed
+        manifest_df = load_df(manifest_path, usecols=lambda column: column == "Component")
+
+        component = None
+        # Get component from component column if it exists
+        if "Component" in manifest_df and not manifest_df["Component"].empty:
+            component = list(set(manifest_df["Component"]))
+
+            # Added to address issues raised during DCA testing
+            if "" in component:
+                component.remove("")
+
+            if len(component) == 1:
+                component = component[0]
+            elif len(component) > 1:
+                logging.warning(
+                    f"Manifest {manifestId} is composed of multiple components. Schematic does not support mulit-component manifests at this time."
+                    "Behavior of manifests with multiple components is undefined"
+                )
+        return manifest_name, component
 
     def upload_project_manifests_to_synapse(
         self, dmge: DataModelGraphExplorer, projectId: str
@@ -1255,8 +1741,7 @@ class SynapseStorage(BaseStorage):
             if manifest_info:
                 manifest_id = manifest_info["properties"]["id"]
                 manifest_name = manifest_info["properties"]["name"]
-                manifest_path = manifest_info["path"]
-                manifest_df = load_df(manifest_path)
+                manifest_df = load_manifest_df(manifest_info)
                 manifest_table_id = uploadDB(
                     dmge=dmge,
                     manifest=manifest,
@@ -1318,98 +1803,160 @@ class SynapseStorage(BaseStorage):
 
         return manifests, manifest_loaded
 
+    def _get_or_create_folder(self, name: str, parent_id: str) -> str:
+        """
+        Gets the Synapse ID of a folder, creating it if it does not exist
+
+        Args:
+            name: name of the folder
+            parent_id: Synapse ID of the parent of the folder
+
+        Returns:
+            str: Synapse ID of the folder
+        """
+        folder_id = self.syn.findEntityId(name, parent_id)
+        if folder_id is None:
+            folder = self.syn.store(Folder(name, parent=parent_id))
+            self.synapse_entity_tracker.add(synapse_id=folder.id, entity=folder)
+            folder_id = folder.id
+        return folder_id
+
+    @tracer.start_as_current_span("SynapseStorage::move_entities_to_new_project")
     def move_entities_to_new_project(
         self,
         projectId: str,
         newProjectId: str,
         returnEntities: bool = False,
         dry_run: bool = False,
+        journal_path: Optional[str] = None,
     ):
         """
         For each manifest csv in a project, look for all the entitiy ids that are associated.
         Look up the entitiy in the files, move the entity to new project.
+
+        All moves are planned before any is made, then made concurrently. The moves made
+          are recorded in a journal, so that a migration that stopped part way resumes
+          where it stopped when it runs again. The journal is cleared once all moves
+          were made. A dry run makes no changes, and logs the
+          planned moves and an estimate of how long making them takes.
+
+        Args:
+            projectId: Synapse ID of the project to migrate
+            newProjectId: Synapse ID of the archive project
+            returnEntities: move the entities back to their datasets instead
+            dry_run: only log the planned moves
+            journal_path: path of the journal of the migration, defaults to a file
+              of the migrations folder of the manifest folder
         """
 
         manifests = []
         manifest_loaded = []
         datasets = self.getStorageDatasetsInProject(projectId)
-        if datasets:
-            for datasetId, datasetName in datasets:
-                # encode information about the manifest in a simple list (so that R clients can unpack it)
-                # eventually can serialize differently
-
-                manifest = ((datasetId, datasetName), ("", ""), ("", ""))
-                manifests.append(manifest)
-
-                manifest_info = self.getDatasetManifest(datasetId, downloadFile=True)
-                if manifest_info:
-                    manifest_id = manifest_info["properties"]["id"]
-                    manifest_name = manifest_info["properties"]["name"]
-                    manifest_path = manifest_info["path"]
-                    manifest_df = load_df(manifest_path)
-
-                    manifest = (
-                        (datasetId, datasetName),
-                        (manifest_id, manifest_name),
-                        ("", ""),
-                    )
-                    manifest_loaded.append(manifest)
-
-                    annotation_entities = self.storageFileviewTable[
-                        (self.storageFileviewTable["id"].isin(manifest_df["entityId"]))
-                        & (self.storageFileviewTable["type"] == "folder")
-                    ]["id"]
-
-                    if returnEntities:
-                        for entityId in annotation_entities:
-                            if not dry_run:
-                                moved_entity = self.syn.move(entityId, datasetId)
-                                self.synapse_entity_tracker.add(
-                                    synapse_id=moved_entity.id, entity=moved_entity
-                                )
-                            else:
-                                logging.info(
-                                    f"{entityId} will be moved to folder {datasetId}."
-                                )
-                    else:
-                        # generate project folder
-                        archive_project_folder = Folder(
-                            projectId + "_archive", parent=newProjectId
-                        )
-                        archive_project_folder = self.syn.store(archive_project_folder)
-                        self.synapse_entity_tracker.add(
-                            synapse_id=archive_project_folder.id,
-                            entity=archive_project_folder,
-                        )
+        if not datasets:
+            raise LookupError(
+                f"No datasets were found in the specified project: {projectId}. Re-check specified master_fileview in CONFIG and retry."
+            )
 
-                        # generate dataset folder
-                        dataset_archive_folder = Folder(
-                            "_".join([datasetId, datasetName, "archive"]),
-                            parent=archive_project_folder.id,
-                        )
-                        dataset_archive_folder = self.syn.store(dataset_archive_folder)
-                        self.synapse_entity_tracker.add(
-                            synapse_id=dataset_archive_folder.id,
-                            entity=dataset_archive_folder,
-                        )
+        # the folders annotated by each manifest, by dataset
+        planned_entities = {}
+        for datasetId, datasetName in datasets:
+            # encode information about the manifest in a simple list (so that R clients can unpack it)
+            # eventually can serialize differently
 
-                        for entityId in annotation_entities:
-                            # move entities to folder
-                            if not dry_run:
-                                moved_entity = self.syn.move(
-                                    entityId, dataset_archive_folder.id
-                                )
-                                self.synapse_entity_tracker.add(
-                                    synapse_id=moved_entity.id, entity=moved_entity
-                                )
-                            else:
-                                logging.info(
-                                    f"{entityId} will be moved to folder {dataset_archive_folder.id}."
-                                )
+            manifest = ((datasetId, datasetName), ("", ""), ("", ""))
+            manifests.append(manifest)
+
+            manifest_info = self.getDatasetManifest(datasetId, downloadFile=True)
+            if manifest_info:
+                manifest_id = manifest_info["properties"]["id"]
+                manifest_name = manifest_info["properties"]["name"]
+                manifest_df = load_manifest_df(manifest_info)
+
+                manifest = (
+                    (datasetId, datasetName),
+                    (manifest_id, manifest_name),
+                    ("", ""),
+                )
+                manifest_loaded.append(manifest)
+                planned_entities[(datasetId, datasetName)] = manifest_df["entityId"]
+
+        if not planned_entities:
+            return manifests, manifest_loaded
+
+        # look up the folders of all manifests in the fileview at once
+        manifest_entities = pd.concat(
+            [
+                pd.DataFrame({"entityId": entity_ids, "datasetId": dataset_id})
+                for (dataset_id, _), entity_ids in planned_entities.items()
+            ]
+        ).drop_duplicates("entityId")
+        fileview = self._get_fileview(["id", "type"])
+        folders = fileview.loc[fileview["type"] == "folder", ["id"]]
+        manifest_entities = manifest_entities.merge(
+            folders, left_on="entityId", right_on="id"
+        )
+
+        if returnEntities:
+            parent_ids = dict(
+                (dataset_id, dataset_id) for dataset_id, _ in planned_entities
+            )
+        elif dry_run:
+            parent_ids = dict(
+                (dataset_id, "_".join([dataset_id, dataset_name, "archive"]))
+                for dataset_id, dataset_name in planned_entities
+            )
         else:
-            raise LookupError(
-                f"No datasets were found in the specified project: {projectId}. Re-check specified master_fileview in CONFIG and retry."
+            # generate project folder
+            archive_project_folder_id = self._get_or_create_folder(
+                projectId + "_archive", newProjectId
+            )
+            parent_ids = {}
+            for dataset_id, dataset_name in planned_entities:
+                # generate dataset folder
+                parent_ids[dataset_id] = self._get_or_create_folder(
+                    "_".join([dataset_id, dataset_name, "archive"]),
+                    archive_project_folder_id,
+                )
+
+        moves = [
+            EntityMove(entity_id, parent_ids[dataset_id])
+            for entity_id, dataset_id in zip(
+                manifest_entities["entityId"], manifest_entities["datasetId"]
+            )
+        ]
+
+        if dry_run:
+            for move in moves:
+                logging.info(
+                    f"{move.entity_id} will be moved to folder {move.parent_id}."
+                )
+            duration = asyncio.run(
+                estimate_duration(self.syn, self.request_limiter, moves)
+            )
+            logging.info(
+                f"{len(moves)} entities will be moved, in about {duration:.0f} seconds."
             )
+            return manifests, manifest_loaded
+
+        if journal_path is None:
+            journal_path = os.path.join(
+                CONFIG.manifest_folder,
+                "migrations",
+                f"{projectId}_to_{projectId if returnEntities else newProjectId}.jsonl",
+            )
+        try:
+            asyncio.run(
+                move_entities(
+                    self.syn,
+                    self.request_limiter,
+                    moves,
+                    journal=MigrationJournal(journal_path),
+                )
+            )
+        finally:
+            # the moved entities are tracked with their former parents
+            for move in moves:
+                self.synapse_entity_tracker.remove(synapse_id=move.entity_id)
         return manifests, manifest_loaded
 
     @tracer.start_as_current_span("SynapseStorage::get_synapse_table")
@@ -1692,9 +2239,11 @@ class SynapseStorage(BaseStorage):
         restrict_manifest: bool,
     ) -> File:
         """Handles a create or update of a manifest file that is going to be uploaded.
-        If we already have a copy of the Entity in memory we will update that instance,
-        otherwise create a new File instance to be created in Synapse. Once stored
-        this will add the file to the `synapse_entity_tracker` for future reference.
+        If we already have a copy of the Entity in memory, or the dataset already has
+        the manifest, we will update that instance, otherwise create a new File instance
+        to be created in Synapse. Once stored this will add the file to the
+        `synapse_entity_tracker` for future reference. A manifest with the same content
+        as its current version is not stored again.
 
         Args:
             new_file_path (str): The path to the new manifest file
@@ -1708,23 +2257,49 @@ class SynapseStorage(BaseStorage):
         """
         local_tracked_file_instance = (
             self.synapse_entity_tracker.search_local_by_parent_and_name(
-                name=existing_file_name, parent_id=dataset_id
+                name=existing_file_name, parent_id=dataset_id, syn=self.syn
             )
             or self.synapse_entity_tracker.search_local_by_parent_and_name(
-                name=file_name_new, parent_id=dataset_id
+                name=file_name_new, parent_id=dataset_id, syn=self.syn
             )
         )
 
+        # restricted manifests are always stored, so that their access requirement is
+        # created, others are compared with their current version
+        if not local_tracked_file_instance and not restrict_manifest:
+            existing_file_id = self.syn.findEntityId(
+                name=file_name_new, parent=dataset_id
+            )
+            if existing_file_id:
+                local_tracked_file_instance = self.synapse_entity_tracker.get(
+                    synapse_id=existing_file_id, syn=self.syn, download_file=False
+                )
+
+        description = "Manifest for dataset " + dataset_id
+        if (
+            local_tracked_file_instance
+            and not restrict_manifest
+            and local_tracked_file_instance.name == file_name_new
+            and local_tracked_file_instance.get("description") == description
+            and get_manifest_md5(local_tracked_file_instance)
+            == md5_for_file_hex(new_file_path)
+        ):
+            logger.info(
+                f"Manifest {local_tracked_file_instance.id} of dataset {dataset_id} "
+                "did not change, it is not uploaded again."
+            )
+            self.submission_summary.manifest_file_skipped = True
+            local_tracked_file_instance.path = new_file_path
+            return local_tracked_file_instance
+
         if local_tracked_file_instance:
             local_tracked_file_instance.path = new_file_path
-            local_tracked_file_instance.description = (
-                "Manifest for dataset " + dataset_id
-            )
+            local_tracked_file_instance.description = description
             manifest_synapse_file = local_tracked_file_instance
         else:
             manifest_synapse_file = File(
                 path=new_file_path,
-                description="Manifest for dataset " + dataset_id,
+                description=description,
                 parent=dataset_id,
                 name=file_name_new,
             )
@@ -1748,7 +2323,8 @@ class SynapseStorage(BaseStorage):
             Dict[str, Any]: The requested entity bundle matching
             <https://rest-docs.synapse.org/rest/org/sagebionetworks/repo/model/entitybundle/v2/EntityBundle.html>
         """
-        return await get_entity_id_bundle2(
+        return await self.request_limiter.call(
+            get_entity_id_bundle2,
             entity_id=synapse_id,
             request={"includeAnnotations": True},
             synapse_client=self.syn,
@@ -1771,8 +2347,8 @@ class SynapseStorage(BaseStorage):
             etag=annotation_dict["annotations"]["etag"],
             id=annotation_dict["annotations"]["id"],
         )
-        annotation_storage_result = await annotation_class.store_async(
-            synapse_client=self.syn
+        annotation_storage_result = await self.request_limiter.call(
+            annotation_class.store_async, synapse_client=self.syn
         )
         local_entity = self.synapse_entity_tracker.get(
             synapse_id=annotation_dict["annotations"]["id"],
@@ -1870,55 +2446,88 @@ class SynapseStorage(BaseStorage):
 
         return annos
 
-    @async_missing_entity_handler
-    async def format_row_annotations(
-        self,
-        dmge: DataModelGraphExplorer,
-        row: pd.Series,
-        entityId: str,
-        hideBlanks: bool,
-        annotation_keys: str,
-    ) -> Union[None, Dict[str, Any]]:
-        """Format row annotations
+    @staticmethod
+    def _get_annotation_values(
+        manifest: pd.DataFrame, annotation_keys: str
+    ) -> List[Dict[str, Any]]:
+        """Gets the annotation keys and values of each row of a manifest.
+
+        The annotation key of each column is resolved once, and long values are truncated
+        column by column, instead of handling each cell of each row.
 
         Args:
-            dmge (DataModelGraphExplorer): data moodel graph explorer object
-            row (pd.Series): row of the manifest
-            entityId (str): entity id of the manifest
-            hideBlanks (bool): when true, does not upload annotation keys with blank values. When false, upload Annotation keys with empty string values
+            manifest (pd.DataFrame): the manifest
             annotation_keys (str): display_label/class_label
 
         Returns:
-            Union[None, Dict[str,]]: if entity id is in trash can, return None. Otherwise, return the annotations
+            List[Dict[str, Any]]: the annotation values of each row, by annotation key
         """
         # prepare metadata for Synapse storage (resolve display name into a name that Synapse annotations support (e.g no spaces, parenthesis)
         # note: the removal of special characters, will apply only to annotation keys; we are not altering the manifest
         # this could create a divergence between manifest column and annotations. this should be ok for most use cases.
         # columns with special characters are outside of the schema
-        metadataSyn = {}
-        blacklist_chars = ["(", ")", ".", " ", "-"]
+        blacklist_chars = {ord(x): "" for x in ["(", ")", ".", " ", "-"]}
 
-        for k, v in row.to_dict().items():
+        positions, keys = [], []
+        for position, column in enumerate(manifest.columns):
             if annotation_keys == "display_label":
-                keySyn = str(k).translate({ord(x): "" for x in blacklist_chars})
-            elif annotation_keys == "class_label":
-                keySyn = get_class_label_from_display_name(str(k)).translate(
-                    {ord(x): "" for x in blacklist_chars}
+                keySyn = str(column).translate(blacklist_chars)
+            else:
+                keySyn = get_class_label_from_display_name(str(column)).translate(
+                    blacklist_chars
                 )
 
             # Skip `Filename` and `ETag` columns when setting annotations
             if keySyn in ["Filename", "ETag", "eTag"]:
                 continue
+            positions.append(position)
+            keys.append(keySyn)
 
+        values = manifest.iloc[:, positions].to_numpy(dtype=object)
+        for position in range(values.shape[1]):
             # truncate annotation values to 500 characters if the
             # size of values is greater than equal to 500 characters
             # add an explicit [truncatedByDataCuratorApp] message at the end
             # of every truncated message to indicate that the cell value
             # has been truncated
-            if isinstance(v, str) and len(v) >= 500:
-                v = v[0:472] + "[truncatedByDataCuratorApp]"
+            column_values = pd.Series(values[:, position])
+            is_long = column_values.astype(str).str.len().to_numpy() >= 500
+            for row_position in np.flatnonzero(is_long):
+                value = values[row_position, position]
+                if isinstance(value, str):
+                    values[row_position, position] = (
+                        value[0:472] + "[truncatedByDataCuratorApp]"
+                    )
 
-            metadataSyn[keySyn] = v
+        return [dict(zip(keys, row_values)) for row_values in values]
+
+    @async_missing_entity_handler
+    async def format_row_annotations(
+        self,
+        dmge: DataModelGraphExplorer,
+        row: Union[pd.Series, Dict[str, Any]],
+        entityId: str,
+        hideBlanks: bool,
+        annotation_keys: str,
+    ) -> Union[None, Dict[str, Any]]:
+        """Format row annotations
+
+        Args:
+            dmge (DataModelGraphExplorer): data moodel graph explorer object
+            row (Union[pd.Series, Dict[str, Any]]): row of the manifest, or the annotation values of the row as returned by _get_annotation_values
+            entityId (str): entity id of the manifest
+            hideBlanks (bool): when true, does not upload annotation keys with blank values. When false, upload Annotation keys with empty string values
+            annotation_keys (str): display_label/class_label
+
+        Returns:
+            Union[None, Dict[str,]]: if entity id is in trash can, or its annotations would not change, return None. Otherwise, return the annotations
+        """
+        if isinstance(row, pd.Series):
+            metadataSyn = self._get_annotation_values(
+                row.to_frame().T, annotation_keys
+            )[0]
+        else:
+            metadataSyn = row
 
         # This will first check if the entity is already in memory, and if so, that
         # instance is used. Unfortunately, the expected return format needs to match
@@ -1942,6 +2551,7 @@ class SynapseStorage(BaseStorage):
             }
         else:
             annos = await self.get_async_annotation(entityId)
+        current_annotations = deepcopy(annos["annotations"]["annotations"])
 
         # set annotation(s) for the various objects/items in a dataset on Synapse
         csv_list_regex = comma_separated_list_regex()
@@ -1955,7 +2565,74 @@ class SynapseStorage(BaseStorage):
             annotation_keys=annotation_keys,
         )
 
-        return annos
+        if self._annotations_match(
+            current_annotations, annos["annotations"]["annotations"]
+        ):
+            logger.debug(f"Annotations of {entityId} did not change")
+            self.submission_summary.annotations_skipped += 1
+            return None
+        return annos
+
+    @staticmethod
+    def _get_annotation_key(value: Any) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Gets the type and values of an annotation, as Synapse stores them
+
+        Args:
+            value (Any): an annotation as returned by Synapse, a dictionary of its type
+                and values, or a value to store, as set by process_row_annotations
+
+        Returns:
+            Optional[Tuple[str, Tuple[str, ...]]]: the type and string values of the
+                annotation, None if they cannot be known before storing it
+        """
+        if isinstance(value, dict):
+            return value.get("type"), tuple(value.get("value", []))
+        values = value if isinstance(value, list) else [value]
+        annotation_types, strings = set(), []
+        for item in values:
+            if isinstance(item, (bool, np.bool_)):
+                annotation_types.add("BOOLEAN")
+                strings.append(str(bool(item)).lower())
+            elif isinstance(item, (int, np.integer)):
+                annotation_types.add("LONG")
+                strings.append(str(int(item)))
+            elif isinstance(item, (float, np.floating)):
+                annotation_types.add("DOUBLE")
+                strings.append(str(float(item)))
+            elif isinstance(item, str):
+                annotation_types.add("STRING")
+                strings.append(item)
+            else:
+                return None
+        # values of mixed types are converted by Synapse
+        if len(annotation_types) != 1:
+            return None
+        return annotation_types.pop(), tuple(strings)
+
+    @classmethod
+    def _annotations_match(
+        cls, current: Dict[str, Any], updated: Dict[str, Any]
+    ) -> bool:
+        """Checks whether storing annotations would leave the annotations of an entity
+        unchanged
+
+        Args:
+            current (Dict[str, Any]): the annotations of the entity, as returned by
+                Synapse
+            updated (Dict[str, Any]): the annotations to store
+
+        Returns:
+            bool: whether they are the same, False when that cannot be known
+        """
+        if current.keys() != updated.keys():
+            return False
+        for key, value in updated.items():
+            updated_key = cls._get_annotation_key(value)
+            if updated_key is None or updated_key != cls._get_annotation_key(
+                current[key]
+            ):
+                return False
+        return True
 
     @missing_entity_handler
     @tracer.start_as_current_span("SynapseStorage::format_manifest_annotations")
@@ -2198,25 +2875,87 @@ class SynapseStorage(BaseStorage):
             table_name = "synapse_storage_manifest_table"
         return table_name, component_name
 
-    def _create_entity_id(self, idx, row, manifest, datasetId):
-        """Helper function to generate an entityId and add it to the appropriate row in the manifest.
+    @tracer.start_as_current_span("SynapseStorage::_create_row_entities")
+    async def _create_row_entities(
+        self, manifest: pd.DataFrame, positions: Sequence[int], datasetId: str
+    ) -> List[str]:
+        """Creates a folder in the dataset for each of the given rows of a manifest, and
+        fills in their entityId.
+
+        Folders are named after the dataset, the component and the Id of their row, so
+        that submitting again a manifest that failed part way reuses the folders created
+        for it instead of creating new ones, while manifests of other components in the
+        dataset get their own folders. Folders are looked up in a listing of the children
+        of the dataset, and the missing ones are created concurrently, within the limits
+        of self.request_limiter.
+
         Args:
-            row: current row of manifest being processed
-            manifest (pd.DataFrame): loaded df containing user supplied data.
+            manifest (pd.DataFrame): the manifest, updated in place
+            positions (Sequence[int]): positions of the rows to create folders for
             datasetId (str): synapse ID of folder containing the dataset
 
         Returns:
-            manifest (pd.DataFrame): manifest with entityId added to the appropriate row
-            entityId (str): Generated Entity Id.
-
+            List[str]: synapse IDs of the folders, in the order of positions
         """
-        rowEntity = Folder(str(uuid.uuid4()), parent=datasetId)
-        rowEntity = self.syn.store(rowEntity)
-        entityId = rowEntity["id"]
-        self.synapse_entity_tracker.add(synapse_id=entityId, entity=rowEntity)
-        row["entityId"] = entityId
-        manifest.loc[idx, "entityId"] = entityId
-        return manifest, entityId
+        if len(positions) == 0:
+            return []
+        if ID_COLUMN in manifest.columns:
+            row_ids = manifest[ID_COLUMN].iloc[positions].astype(str)
+            if "Component" in manifest.columns:
+                components = manifest["Component"].iloc[positions].astype(str)
+            else:
+                components = pd.Series("", index=row_ids.index)
+            # rows with the same component and Id get a folder each
+            occurrences = row_ids.groupby([components, row_ids]).cumcount().astype(str)
+            names = [
+                str(
+                    uuid.uuid5(
+                        ROW_ENTITY_NAMESPACE,
+                        f"{datasetId}/{component}/{row_id}/{count}",
+                    )
+                )
+                for component, row_id, count in zip(components, row_ids, occurrences)
+            ]
+        else:
+            names = [str(uuid.uuid4()) for _ in positions]
+
+        children = {
+            child["name"]: child["id"]
+            for child in self.syn.getChildren(datasetId, includeTypes=["folder"])
+        }
+
+        async def create_folder(name: str) -> str:
+            if name in children:
+                return children[name]
+            try:
+                entity = await self.request_limiter.call(
+                    post_entity,
+                    request={
+                        "concreteType": FOLDER_ENTITY,
+                        "name": name,
+                        "parentId": datasetId,
+                    },
+                    synapse_client=self.syn,
+                )
+            except SynapseHTTPError as exc:
+                if getattr(exc.response, "status_code", None) != 409:
+                    raise
+                # created by an earlier request that failed before answering
+                entity = await self.request_limiter.call(
+                    self.syn.rest_post_async,
+                    uri="/entity/child",
+                    body=json.dumps({"parentId": datasetId, "entityName": name}),
+                )
+            return entity["id"]
+
+        entity_ids = list(await asyncio.gather(*[create_folder(n) for n in names]))
+        manifest.loc[manifest.index[positions], ENTITY_ID_COLUMN] = entity_ids
+        logger.info(
+            f"Created {len(set(entity_ids) - set(children.values()))} folders for the "
+            f"rows of the manifest in {datasetId}, "
+            f"{len(set(entity_ids) & set(children.values()))} already existed"
+        )
+        return entity_ids
 
     async def _process_store_annos(self, requests: Set[asyncio.Task]) -> None:
         """Process annotations and store them on synapse asynchronously
@@ -2227,6 +2966,11 @@ class SynapseStorage(BaseStorage):
         Raises:
             RuntimeError: raise a run time error if a task failed to complete
         """
+        span = trace.get_current_span()
+        total = len(requests)
+        stored = 0
+        start_time = time.perf_counter()
+        retries_at_start = self.request_limiter.retries
         while requests:
             done_tasks, pending_tasks = await asyncio.wait(
                 requests, return_when=asyncio.FIRST_COMPLETED
@@ -2238,12 +2982,23 @@ class SynapseStorage(BaseStorage):
                     annos = completed_task.result()
 
                     if isinstance(annos, Annotations):
-                        logger.info(f"Successfully stored annotations for {annos.id}")
+                        logger.debug(f"Successfully stored annotations for {annos.id}")
+                        stored += 1
+                        if stored % ANNOTATION_PROGRESS_INTERVAL == 0:
+                            elapsed = time.perf_counter() - start_time
+                            logger.info(
+                                f"Stored annotations for {stored} of {total} entities "
+                                f"({stored / elapsed:.1f} per second)"
+                            )
+                            span.add_event(
+                                "annotation_progress",
+                                {"stored": stored, "total": total},
+                            )
                     else:
                         # store annotations if they are not None
                         if annos:
                             entity_id = annos["annotations"]["id"]
-                            logger.info(
+                            logger.debug(
                                 f"Obtained and processed annotations for {entity_id} entity"
                             )
                             requests.add(
@@ -2254,6 +3009,199 @@ class SynapseStorage(BaseStorage):
                 except Exception as e:
                     raise RuntimeError(f"failed with { repr(e) }.") from e
 
+        elapsed = time.perf_counter() - start_time
+        span.set_attribute("annotations.entities", total)
+        span.set_attribute("annotations.stored", stored)
+        span.set_attribute(
+            "annotations.retries", self.request_limiter.retries - retries_at_start
+        )
+        if stored:
+            span.set_attribute("annotations.per_second", stored / elapsed)
+            logger.info(
+                f"Stored annotations for {stored} entities in {elapsed:.1f} seconds"
+            )
+
+    @staticmethod
+    def _get_annotation_view_column(name: str, values: List[Any]) -> Column:
+        """Creates the file view column of an annotation, with the type of its values
+
+        Args:
+            name (str): annotation key
+            values (List[Any]): values of the annotation, None for removed annotations
+
+        Returns:
+            Column: the column
+        """
+        values = [value for value in values if value is not None]
+        if any(isinstance(value, list) for value in values):
+            return Column(
+                name=name,
+                columnType="STRING_LIST",
+                maxSize=500,
+                maxListLength=max(
+                    [len(value) for value in values if isinstance(value, list)]
+                ),
+            )
+        if values and all(isinstance(value, (bool, np.bool_)) for value in values):
+            return Column(name=name, columnType="BOOLEAN")
+        if values and all(
+            isinstance(value, (int, np.integer))
+            and not isinstance(value, (bool, np.bool_))
+            for value in values
+        ):
+            return Column(name=name, columnType="INTEGER")
+        if values and all(
+            isinstance(value, (int, float, np.number))
+            and not isinstance(value, (bool, np.bool_))
+            for value in values
+        ):
+            return Column(name=name, columnType="DOUBLE")
+        return Column(name=name, columnType="STRING", maxSize=500)
+
+    @staticmethod
+    def _format_view_value(value: Any) -> Optional[str]:
+        """Formats an annotation value as a file view cell value"""
+        if value is None:
+            return None
+        if isinstance(value, list):
+            return json.dumps([str(item) for item in value])
+        if isinstance(value, (bool, np.bool_)):
+            return str(bool(value)).lower()
+        return str(value)
+
+    @classmethod
+    def _format_view_cell(cls, value: Any) -> Optional[str]:
+        """Formats a value of a file view query result as _format_view_value formats the
+        annotation values stored in it"""
+        if isinstance(value, list):
+            return cls._format_view_value(value)
+        if pd.isna(value):
+            return None
+        if isinstance(value, (float, np.floating)) and float(value).is_integer():
+            return str(int(value))
+        return cls._format_view_value(value)
+
+    @tracer.start_as_current_span("SynapseStorage::store_annotations_through_view")
+    def store_annotations_through_view(
+        self,
+        dmge: DataModelGraphExplorer,
+        datasetId: str,
+        entity_annotations: Dict[str, Dict[str, Any]],
+        hideBlanks: bool,
+        annotation_keys: str,
+    ) -> List[str]:
+        """Annotates the entities of a dataset in bulk, by updating the rows of a file view
+        scoped to the dataset (see _get_dataset_file_view), a few transactions of
+        VIEW_ANNOTATION_BATCH_SIZE rows instead of two requests per entity.
+
+        Annotation values are processed as in format_row_annotations, blank values hidden
+        with hideBlanks remove the annotation. Columns are added to the file view for
+        annotations that no entity of the dataset has yet.
+
+        Args:
+            dmge (DataModelGraphExplorer): data model graph explorer object
+            datasetId (str): synapse ID of folder containing the dataset
+            entity_annotations (Dict[str, Dict[str, Any]]): annotation values of each entity,
+                as returned by _get_annotation_values
+            hideBlanks (bool): when true, does not upload annotation keys with blank values
+            annotation_keys (str): display_label/class_label
+
+        Returns:
+            List[str]: synapse IDs of the entities that were not annotated, because they are
+                not in the file view or the file view could not be created or updated
+        """
+        csv_list_regex = comma_separated_list_regex()
+        changes = {}
+        for entity_id, metadata_syn in entity_annotations.items():
+            annos = self.process_row_annotations(
+                dmge=dmge,
+                metadata_syn=metadata_syn,
+                hide_blanks=hideBlanks,
+                csv_list_regex=csv_list_regex,
+                annos={"annotations": {"annotations": {}}},
+                annotation_keys=annotation_keys,
+            )["annotations"]["annotations"]
+            changes[entity_id] = {key: annos.get(key) for key in metadata_syn}
+
+        not_annotated = set(entity_annotations)
+        try:
+            with self._get_dataset_file_view(datasetId) as fileview:
+                view_columns = fileview.query(tidy=False).columns
+                annotation_names = list(
+                    dict.fromkeys(key for values in changes.values() for key in values)
+                )
+                new_columns = [
+                    self._get_annotation_view_column(
+                        name, [values.get(name) for values in changes.values()]
+                    )
+                    for name in annotation_names
+                    if name not in view_columns
+                ]
+                if new_columns:
+                    fileview.view_schema.addColumns(new_columns)
+                    fileview.view_schema = self.syn.store(fileview.view_schema)
+                fileview.query(tidy=False, force=True)
+
+                current_rows = fileview.table.set_index(
+                    fileview.table["ROW_ID"].astype(int)
+                )
+                mapping = {
+                    int(entity_id[3:]): {
+                        key: self._format_view_value(value)
+                        for key, value in values.items()
+                    }
+                    for entity_id, values in changes.items()
+                    if entity_id.startswith("syn")
+                    and entity_id[3:].isdigit()
+                    and int(entity_id[3:]) in current_rows.index
+                }
+                # rows that already have the values are not sent
+                unchanged_row_ids = [
+                    row_id
+                    for row_id, values in mapping.items()
+                    if all(
+                        key in current_rows.columns
+                        and value
+                        == self._format_view_cell(current_rows.at[row_id, key])
+                        for key, value in values.items()
+                    )
+                ]
+                for row_id in unchanged_row_ids:
+                    del mapping[row_id]
+                    not_annotated.discard(f"syn{row_id}")
+                self.submission_summary.annotations_skipped += len(unchanged_row_ids)
+                row_ids = list(mapping)
+                for start in range(0, len(row_ids), VIEW_ANNOTATION_BATCH_SIZE):
+                    batch = row_ids[start : start + VIEW_ANNOTATION_BATCH_SIZE]
+                    self.syn.store(
+                        PartialRowset.from_mapping(
+                            {row_id: mapping[row_id] for row_id in batch},
+                            fileview.results,
+                        )
+                    )
+                    for row_id in batch:
+                        entity_id = f"syn{row_id}"
+                        not_annotated.discard(entity_id)
+                        # the etag of the entity changed
+                        self.synapse_entity_tracker.remove(entity_id)
+                    logger.info(
+                        f"Stored annotations for {len(entity_annotations) - len(not_annotated)} "
+                        f"of {len(entity_annotations)} entities through a file view"
+                    )
+        except (
+            SynapseHTTPError,
+            SynapseAuthenticationError,
+            ValueError,
+            KeyError,
+        ) as exc:
+            logger.warning(
+                f"Could not annotate entities through a file view of {datasetId}, "
+                f"{len(not_annotated)} entities will be annotated one by one: {exc}"
+            )
+        return [
+            entity_id for entity_id in entity_annotations if entity_id in not_annotated
+        ]
+
     @tracer.start_as_current_span("SynapseStorage::add_annotations_to_entities_files")
     async def add_annotations_to_entities_files(
         self,
@@ -2298,37 +3246,47 @@ class SynapseStorage(BaseStorage):
                 file_df, how="left", on="Filename", suffixes=["_x", None]
             ).drop("entityId_x", axis=1)
 
-        # Fill `entityId` for each row if missing and annotate entity as appropriate
-        requests = set()
-        for idx, row in manifest.iterrows():
-            if not row["entityId"] and (
-                manifest_record_type == "file_and_entities"
-                or manifest_record_type == "table_file_and_entities"
-            ):
-                manifest, entityId = self._create_entity_id(
-                    idx, row, manifest, datasetId
-                )
-            elif not row["entityId"] and manifest_record_type == "table_and_file":
-                # If not using entityIds, fill with manifest_table_id so
-                row["entityId"] = manifest_synapse_table_id
-                manifest.loc[idx, "entityId"] = manifest_synapse_table_id
-                entityId = ""
-                # If the row is the manifest table, do not add annotations
-            elif row["entityId"] == manifest_synapse_table_id:
-                entityId = ""
-            else:
-                # get the file id of the file to annotate, collected in above step.
-                entityId = row["entityId"]
+        # Fill `entityId` for each row if missing
+        missing_entity_id = ~manifest["entityId"].map(bool)
+        if (
+            manifest_record_type == "file_and_entities"
+            or manifest_record_type == "table_file_and_entities"
+        ):
+            await self._create_row_entities(
+                manifest, np.flatnonzero(missing_entity_id.to_numpy()), datasetId
+            )
+        elif manifest_record_type == "table_and_file":
+            # If not using entityIds, fill with manifest_table_id so
+            manifest.loc[missing_entity_id, "entityId"] = manifest_synapse_table_id
 
-            # Adding annotations to connected files.
-            if entityId:
-                # Format annotations for Synapse
-                annos_task = asyncio.create_task(
-                    self.format_row_annotations(
-                        dmge, row, entityId, hideBlanks, annotation_keys
-                    )
+        # Annotate the connected files, not the rows of the manifest table
+        entity_ids = manifest["entityId"]
+        to_annotate = np.flatnonzero(
+            (entity_ids.map(bool) & (entity_ids != manifest_synapse_table_id)).to_numpy()
+        )
+        annotation_values = self._get_annotation_values(
+            manifest.iloc[to_annotate], annotation_keys
+        )
+
+        entity_annotations = dict(zip(entity_ids.iloc[to_annotate], annotation_values))
+        if CONFIG.synapse_bulk_annotation_upload and entity_annotations:
+            remaining_ids = self.store_annotations_through_view(
+                dmge, datasetId, entity_annotations, hideBlanks, annotation_keys
+            )
+            entity_annotations = {
+                entity_id: entity_annotations[entity_id] for entity_id in remaining_ids
+            }
+
+        # Format annotations for Synapse, the requests they make are limited by
+        # self.request_limiter
+        requests = set()
+        for entityId, row_annotations in entity_annotations.items():
+            annos_task = asyncio.create_task(
+                self.format_row_annotations(
+                    dmge, row_annotations, entityId, hideBlanks, annotation_keys
                 )
-                requests.add(annos_task)
+            )
+            requests.add(annos_task)
         await self._process_store_annos(requests)
         return manifest
 
@@ -2653,8 +3611,11 @@ class SynapseStorage(BaseStorage):
                 name as upper camelcase, and strip blacklisted characters, display_label will strip blacklisted characters including spaces, to retain
                 display label formatting while ensuring the label is formatted properly for Synapse annotations.
         Returns:
-            manifest_synapse_file_id: SynID of manifest csv uploaded to synapse.
+            manifest_synapse_file_id: SynID of manifest csv uploaded to synapse. What was
+                not written to Synapse because it did not change is summarized in
+                self.submission_summary.
         """
+        self.submission_summary = SubmissionSummary()
         # Read new manifest CSV:
         manifest = self._read_manifest(metadataManifestPath)
         manifest = self._add_id_columns_to_manifest(manifest, dmge)
@@ -2722,6 +3683,9 @@ class SynapseStorage(BaseStorage):
             )
         else:
             raise ValueError("Please enter a valid manifest_record_type.")
+        logger.info(
+            f"Submitted manifest {manifest_synapse_file_id}, {self.submission_summary}"
+        )
         return manifest_synapse_file_id
 
     def getTableAnnotations(self, table_id: str):
@@ -2857,8 +3821,8 @@ class SynapseStorage(BaseStorage):
 
         # Non-batch mode
         if not try_batch:
-            logger.info("Using slower (non-batch) sequential mode")
-            records = [self.getFileAnnotations(i) for i in dataset_file_ids]
+            logger.info("Using slower (non-batch) concurrent mode")
+            records = asyncio.run(self._get_file_annotations_async(dataset_file_ids))
             # Remove any annotations for non-file/folders (stored as None)
             records = filter(None, records)
             table = pd.DataFrame.from_records(records)
@@ -2886,22 +3850,15 @@ class SynapseStorage(BaseStorage):
         return retry_state.outcome.result()
 
     def checkIfinAssetView(self, syn_id) -> str:
-        # get data in administrative fileview for this pipeline
-        assetViewTable = self.getStorageFileviewTable()
-        all_files = list(assetViewTable["id"])
-        if syn_id in all_files:
-            return True
-        else:
-            return False
+        # look the entity up in the administrative fileview for this pipeline
+        return self._get_fileview_index(["id"]).contains_id(syn_id)
 
     @tracer.start_as_current_span("SynapseStorage::getDatasetProject")
     @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_chain(
-            *[wait_fixed(10) for i in range(2)]
-            + [wait_fixed(15) for i in range(2)]
-            + [wait_fixed(20)]
-        ),
+        # the file view may not list a new dataset yet, poll it with growing waits:
+        # 1, 2, 4, 8, 16 then 20 seconds
+        stop=stop_after_attempt(8),
+        wait=wait_exponential(multiplier=1, min=1, max=20),
         retry=retry_if_exception_type(LookupError),
         retry_error_callback=raise_final_error,
     )
@@ -2920,16 +3877,16 @@ class SynapseStorage(BaseStorage):
         """
 
         # Subset main file view
-        dataset_index = self.storageFileviewTable["id"] == datasetId
-        dataset_row = self.storageFileviewTable[dataset_index]
+        dataset_row = self._get_fileview_index(["id", "projectId"]).get_rows(
+            "id", datasetId
+        )
 
         # re-query if no datasets found
         if dataset_row.empty:
-            sleep(5)
-            self.query_fileview(force_requery=True)
             # Subset main file view
-            dataset_index = self.storageFileviewTable["id"] == datasetId
-            dataset_row = self.storageFileviewTable[dataset_index]
+            dataset_row = self._get_fileview_index(
+                ["id", "projectId"], force_requery=True
+            ).get_rows("id", datasetId)
 
         # Return `projectId` for given row if only one found
         if len(dataset_row) == 1:
@@ -2956,14 +3913,90 @@ class SynapseStorage(BaseStorage):
             "mean that the file view's scope needs to be updated."
         )
 
+    async def _get_file_annotations_async(
+        self, file_ids: Sequence[str]
+    ) -> List[Optional[Dict[str, str]]]:
+        """Gets the annotations of files concurrently, within the limits of the request
+        limiter, formatted as by getFileAnnotations.
+
+        Args:
+            file_ids (Sequence[str]): Synapse IDs of dataset files/folders.
+
+        Returns:
+            List[Optional[Dict[str, str]]]: annotations of each file as comma-separated
+                strings, None for entities that are not files or folders, or that could
+                not be retrieved
+        """
+
+        async def get_annotations(file_id: str) -> Optional[Dict[str, str]]:
+            try:
+                bundle = await self.request_limiter.call(
+                    get_entity_id_bundle2,
+                    entity_id=file_id,
+                    request={"includeEntity": True, "includeAnnotations": True},
+                    synapse_client=self.syn,
+                )
+            except SynapseHTTPError:
+                # If an error occurs with retrieving entity, skip it
+                return None
+            entity = bundle["entity"]
+            # Skip anything that isn't a file or folder
+            if not entity["concreteType"].endswith((".FileEntity", ".Folder")):
+                return None
+            # the annotations carry the id and etag of their entity
+            annotations_raw = from_synapse_annotations(bundle["annotations"])
+            return self.getEntityAnnotations(file_id, annotations_raw, annotations_raw)
+
+        return await asyncio.gather(*[get_annotations(i) for i in file_ids])
+
+    def _get_dataset_file_view(self, datasetId: str) -> "DatasetFileView":
+        """Gets a file view scoped to a dataset. When
+        CONFIG.synapse_annotation_view_refresh_interval is set, the view is kept on
+        Synapse and reused by later requests, see AnnotationViewPool, otherwise a
+        temporary view is created, deleted on exit of a 'with' statement.
+
+        Args:
+            datasetId (str): Synapse ID for dataset folder.
+
+        Returns:
+            DatasetFileView: file view scoped to the dataset
+        """
+        if ANNOTATION_VIEW_POOL.refresh_interval <= 0:
+            return DatasetFileView(datasetId, self.syn)
+
+        refreshed_views = []
+
+        def refresh() -> str:
+            # storing the view again updates its annotation columns
+            fileview = DatasetFileView(datasetId, self.syn, temporary=False)
+            refreshed_views.append(fileview)
+            return fileview.view_schema["id"]
+
+        view_id, _ = ANNOTATION_VIEW_POOL.get(datasetId, refresh)
+        if refreshed_views:
+            return refreshed_views[0]
+        try:
+            return DatasetFileView(
+                datasetId, self.syn, temporary=False, viewId=view_id
+            )
+        except SynapseHTTPError:
+            # the view was deleted since, create it again
+            ANNOTATION_VIEW_POOL.remove(datasetId)
+            view_id, _ = ANNOTATION_VIEW_POOL.get(datasetId, refresh)
+            if refreshed_views:
+                return refreshed_views[0]
+            return DatasetFileView(
+                datasetId, self.syn, temporary=False, viewId=view_id
+            )
+
     def getDatasetAnnotationsBatch(
         self, datasetId: str, dataset_file_ids: Sequence[str] = None
     ) -> pd.DataFrame:
         """Generate table for annotations across all files in given dataset.
-        This function uses a temporary file view to generate a table
+        This function uses a file view scoped to the dataset to generate a table
         instead of iteratively querying for individual entity annotations.
         This function is expected to run much faster than
-        `self.getDatasetAnnotationsBatch` on large datasets.
+        `self.getFileAnnotations` on large datasets.
 
         Args:
             datasetId (str): Synapse ID for dataset folder.
@@ -2974,11 +4007,21 @@ class SynapseStorage(BaseStorage):
             pd.DataFrame: Table of annotations.
         """
         # Create data frame from annotations file view
-        with DatasetFileView(datasetId, self.syn) as fileview:
+        with self._get_dataset_file_view(datasetId) as fileview:
             table = fileview.query()
 
         if dataset_file_ids:
+            # a reused file view may not list the newest files yet
+            missing_file_ids = [
+                file_id for file_id in dataset_file_ids if file_id not in table.index
+            ]
             table = table.loc[table.index.intersection(dataset_file_ids)]
+            if missing_file_ids and not fileview.is_temporary:
+                records = asyncio.run(
+                    self._get_file_annotations_async(missing_file_ids)
+                )
+                missing_table = pd.DataFrame.from_records(filter(None, records))
+                table = pd.concat([table, missing_table])
 
         table = table.reset_index(drop=True)
 
@@ -3037,6 +4080,144 @@ class TableOperations:
         self.restrict = restrict
         self.synapse_entity_tracker = synapse_entity_tracker or SynapseEntityTracker()
 
+    def _get_table_columns(self, table_schema_by_cname: dict) -> List[Column]:
+        """Builds the columns of the table from the columns of the manifest
+
+        Args:
+            table_schema_by_cname: column types and sizes, by column name
+
+        Returns:
+            List[Column]: the columns of the table, in manifest order
+        """
+        cols = []
+        for col in self.tableToLoad.columns:
+            if col in table_schema_by_cname:
+                col_type = table_schema_by_cname[col]["columnType"]
+                max_size = (
+                    table_schema_by_cname[col]["maximumSize"]
+                    if "maximumSize" in table_schema_by_cname[col].keys()
+                    else 100
+                )
+                max_list_len = 250
+                if max_size and max_list_len:
+                    cols.append(
+                        Column(
+                            name=col,
+                            columnType=col_type,
+                            maximumSize=max_size,
+                            maximumListLength=max_list_len,
+                        )
+                    )
+                elif max_size:
+                    cols.append(
+                        Column(name=col, columnType=col_type, maximumSize=max_size)
+                    )
+                else:
+                    cols.append(Column(name=col, columnType=col_type))
+            else:
+                # TODO add warning that the given col was not found and it's max size is set to 100
+                cols.append(Column(name=col, columnType="STRING", maximumSize=100))
+        return cols
+
+    @staticmethod
+    def _columns_match(current_columns: List[Column], cols: List[Column]) -> bool:
+        """Checks whether the columns of a table are the ones that would be created
+
+        Args:
+            current_columns: the columns of the existing table
+            cols: the columns built from the manifest
+
+        Returns:
+            bool: whether names, types and sizes are the same, in the same order
+        """
+
+        def column_key(column: Column) -> tuple:
+            column_type = column.get("columnType")
+            max_list_len = column.get("maximumListLength")
+            return (
+                column.get("name"),
+                column_type,
+                str(column.get("maximumSize")),
+                str(max_list_len) if str(column_type).endswith("_LIST") else None,
+            )
+
+        return [column_key(column) for column in current_columns] == [
+            column_key(column) for column in cols
+        ]
+
+    @tracer.start_as_current_span("TableOperations::_replace_changed_rows")
+    def _replace_changed_rows(
+        self, existing_table: pd.DataFrame, existing_results: CsvFileTable
+    ) -> None:
+        """Replaces the rows of a table with the rows of the manifest, sending only changes
+
+        Rows of the table identical to a row of the manifest are kept. The other rows of
+        the table are updated with the remaining rows of the manifest, and the rows left
+        over on either side are inserted or deleted.
+
+        Args:
+            existing_table: the rows of the table, with ROW_ID and ROW_VERSION columns
+            existing_results: the query result the rows were taken from
+        """
+        columns = list(self.tableToLoad.columns)
+        numeric_columns = _get_numeric_columns(existing_results)
+        positions_by_hash: Dict[int, List[int]] = {}
+        for position, row_hash in enumerate(
+            hash_table_rows(existing_table, columns, numeric_columns)
+        ):
+            positions_by_hash.setdefault(row_hash, []).append(position)
+
+        new_positions = []
+        for position, row_hash in enumerate(
+            hash_table_rows(self.tableToLoad, columns, numeric_columns)
+        ):
+            if positions_by_hash.get(row_hash):
+                positions_by_hash[row_hash].pop()
+            else:
+                new_positions.append(position)
+        stale_positions = sorted(
+            position
+            for positions in positions_by_hash.values()
+            for position in positions
+        )
+
+        updated_count = min(len(stale_positions), len(new_positions))
+        self.synStore.submission_summary.table_rows_skipped += len(
+            self.tableToLoad
+        ) - len(new_positions)
+        changes = self.tableToLoad.iloc[new_positions].reset_index(drop=True)
+        changes["ROW_ID"] = pd.Series(
+            existing_table["ROW_ID"].iloc[stale_positions[:updated_count]].values,
+            dtype="Int64",
+        )
+        changes["ROW_VERSION"] = pd.Series(
+            existing_table["ROW_VERSION"].iloc[stale_positions[:updated_count]].values,
+            dtype="Int64",
+        )
+        logger.info(
+            f"Replacing rows of {self.existingTableId}: {len(existing_table) - len(stale_positions)} "
+            f"unchanged, {updated_count} updated, {len(new_positions) - updated_count} "
+            f"inserted, {len(stale_positions) - updated_count} deleted"
+        )
+
+        if not changes.empty:
+            self.synStore.syn.store(
+                Table(self.existingTableId, changes, etag=existing_results.etag),
+                isRestricted=self.restrict,
+            )
+        deleted_row_ids = (
+            existing_table["ROW_ID"].iloc[stale_positions[updated_count:]].tolist()
+        )
+        for start in range(0, len(deleted_row_ids), TABLE_ROW_BATCH_SIZE):
+            batch = deleted_row_ids[start : start + TABLE_ROW_BATCH_SIZE]
+            rows_to_delete = self.synStore.syn.tableQuery(
+                f"SELECT ROW_ID FROM {self.existingTableId} "
+                f"WHERE ROW_ID IN ({', '.join(str(int(row_id)) for row_id in batch)})"
+            )
+            self.synStore.syn.delete(rows_to_delete)
+        # Data changes cause the eTag to change.
+        self.synapse_entity_tracker.remove(synapse_id=self.existingTableId)
+
     @tracer.start_as_current_span("TableOperations::createTable")
     def createTable(
         self,
@@ -3057,43 +4238,18 @@ class TableOperations:
             synapse_id=self.datasetId, syn=self.synStore.syn, download_file=False
         )
         datasetName = datasetEntity.name
-        table_schema_by_cname = self.synStore._get_table_schema_by_cname(columnTypeDict)
+        table_schema_by_cname = self.synStore._get_table_schema_by_cname(
+            columnTypeDict
+        )
+        datasetParentProject = self.synStore.getDatasetProject(self.datasetId)
 
         if not self.tableName:
             self.tableName = datasetName + "table"
-        datasetParentProject = self.synStore.getDatasetProject(self.datasetId)
         if specifySchema:
             if columnTypeDict == {}:
                 logger.error("Did not provide a columnTypeDict.")
             # create list of columns:
-            cols = []
-            for col in self.tableToLoad.columns:
-                if col in table_schema_by_cname:
-                    col_type = table_schema_by_cname[col]["columnType"]
-                    max_size = (
-                        table_schema_by_cname[col]["maximumSize"]
-                        if "maximumSize" in table_schema_by_cname[col].keys()
-                        else 100
-                    )
-                    max_list_len = 250
-                    if max_size and max_list_len:
-                        cols.append(
-                            Column(
-                                name=col,
-                                columnType=col_type,
-                                maximumSize=max_size,
-                                maximumListLength=max_list_len,
-                            )
-                        )
-                    elif max_size:
-                        cols.append(
-                            Column(name=col, columnType=col_type, maximumSize=max_size)
-                        )
-                    else:
-                        cols.append(Column(name=col, columnType=col_type))
-                else:
-                    # TODO add warning that the given col was not found and it's max size is set to 100
-                    cols.append(Column(name=col, columnType="STRING", maximumSize=100))
+            cols = self._get_table_columns(table_schema_by_cname)
             schema = Schema(
                 name=self.tableName, columns=cols, parent=datasetParentProject
             )
@@ -3138,62 +4294,99 @@ class TableOperations:
         existing_table, existing_results = self.synStore.get_synapse_table(
             self.existingTableId
         )
-        # remove rows
-        self.synStore.syn.delete(existing_results)
-        # Data changes such as removing all rows causes the eTag to change.
-        self.synapse_entity_tracker.remove(synapse_id=self.existingTableId)
-        # wait for row deletion to finish on synapse before getting empty table
-        sleep(10)
 
-        # removes all current columns
-        current_table = self.synapse_entity_tracker.get(
-            synapse_id=self.existingTableId, syn=self.synStore.syn, download_file=False
+        # when the columns do not change, only the rows that changed are sent
+        if specifySchema and self._columns_match(
+            self.synStore.syn.getTableColumns(self.existingTableId),
+            self._get_table_columns(table_schema_by_cname),
+        ):
+            self._replace_changed_rows(existing_table, existing_results)
+            return self.existingTableId
+
+        # the project is looked up before the table changes, as the Synapse client, the
+        # storage object and its entity tracker are not shared between threads
+        datasetParentProject = self.synStore.getDatasetProject(self.datasetId)
+        self._replace_table_schema(
+            existing_results, specifySchema, columnTypeDict, datasetName
         )
 
-        current_columns = self.synStore.syn.getTableColumns(current_table)
+        if specifySchema:
+            cols = self._get_table_columns(
+                self.synStore._get_table_schema_by_cname(columnTypeDict)
+            )
+            with tracer.start_as_current_span(
+                "TableOperations::replaceTable::store_rows"
+            ):
+                # build schema and table from columns and store with necessary restrictions
+                schema = Schema(
+                    name=self.tableName, columns=cols, parent=datasetParentProject
+                )
+                schema.id = self.existingTableId
+                table = Table(schema, self.tableToLoad, etag=existing_results.etag)
+                table = self.synStore.syn.store(table, isRestricted=self.restrict)
+                # Commented out until https://sagebionetworks.jira.com/browse/PLFM-8605 is resolved
+                # self.synapse_entity_tracker.add(synapse_id=table.schema.id, entity=table.schema)
+                self.synapse_entity_tracker.remove(synapse_id=table.schema.id)
+        else:
+            logging.error("Must specify a schema for table replacements")
 
-        for col in current_columns:
-            current_table.removeColumn(col)
+        # remove system metadata from manifest
+        existing_table.drop(columns=["ROW_ID", "ROW_VERSION"], inplace=True)
+        return self.existingTableId
 
-        if not self.tableName:
-            self.tableName = datasetName + "table"
+    def _replace_table_schema(
+        self,
+        existing_results: CsvFileTable,
+        specifySchema: bool,
+        columnTypeDict: dict,
+        datasetName: str,
+    ) -> None:
+        """Removes the rows and columns of the existing table, and adds the columns of the
+        manifest. Waits for Synapse to apply each change by polling the table instead of
+        waiting a fixed time.
 
-        # Process columns according to manifest entries
-        table_schema_by_cname = self.synStore._get_table_schema_by_cname(columnTypeDict)
-        datasetParentProject = self.synStore.getDatasetProject(self.datasetId)
-        if specifySchema:
+        Args:
+            existing_results: the query result with all rows of the table
+            specifySchema: whether the columns of the manifest are added
+            columnTypeDict: dictionary schema for table columns: type, size, etc
+            datasetName: name of the dataset, used to name the table
+        """
+        with tracer.start_as_current_span("TableOperations::replaceTable::delete_rows"):
+            # remove rows
+            self.synStore.syn.delete(existing_results)
+            # Data changes such as removing all rows causes the eTag to change.
+            self.synapse_entity_tracker.remove(synapse_id=self.existingTableId)
+            # wait for row deletion to finish on synapse before getting empty table
+            wait_for_table_row_count(self.synStore.syn, self.existingTableId, 0)
+
+        with tracer.start_as_current_span(
+            "TableOperations::replaceTable::update_columns"
+        ):
+            # removes all current columns
+            current_table = self.synapse_entity_tracker.get(
+                synapse_id=self.existingTableId,
+                syn=self.synStore.syn,
+                download_file=False,
+            )
+
+            current_columns = self.synStore.syn.getTableColumns(current_table)
+
+            for col in current_columns:
+                current_table.removeColumn(col)
+
+            if not self.tableName:
+                self.tableName = datasetName + "table"
+
+            if not specifySchema:
+                return
             if columnTypeDict == {}:
                 logger.error("Did not provide a columnTypeDict.")
+            # Process columns according to manifest entries
+            table_schema_by_cname = self.synStore._get_table_schema_by_cname(
+                columnTypeDict
+            )
             # create list of columns:
-            cols = []
-
-            for col in self.tableToLoad.columns:
-                if col in table_schema_by_cname:
-                    col_type = table_schema_by_cname[col]["columnType"]
-                    max_size = (
-                        table_schema_by_cname[col]["maximumSize"]
-                        if "maximumSize" in table_schema_by_cname[col].keys()
-                        else 100
-                    )
-                    max_list_len = 250
-                    if max_size and max_list_len:
-                        cols.append(
-                            Column(
-                                name=col,
-                                columnType=col_type,
-                                maximumSize=max_size,
-                                maximumListLength=max_list_len,
-                            )
-                        )
-                    elif max_size:
-                        cols.append(
-                            Column(name=col, columnType=col_type, maximumSize=max_size)
-                        )
-                    else:
-                        cols.append(Column(name=col, columnType=col_type))
-                else:
-                    # TODO add warning that the given col was not found and it's max size is set to 100
-                    cols.append(Column(name=col, columnType="STRING", maximumSize=100))
+            cols = self._get_table_columns(table_schema_by_cname)
 
             # adds new columns to schema
             for col in cols:
@@ -3207,24 +4400,9 @@ class TableOperations:
             self.synapse_entity_tracker.remove(synapse_id=table_result.id)
 
             # wait for synapse store to finish
-            sleep(1)
-
-            # build schema and table from columns and store with necessary restrictions
-            schema = Schema(
-                name=self.tableName, columns=cols, parent=datasetParentProject
+            wait_for_table_columns(
+                self.synStore.syn, self.existingTableId, [col.name for col in cols]
             )
-            schema.id = self.existingTableId
-            table = Table(schema, self.tableToLoad, etag=existing_results.etag)
-            table = self.synStore.syn.store(table, isRestricted=self.restrict)
-            # Commented out until https://sagebionetworks.jira.com/browse/PLFM-8605 is resolved
-            # self.synapse_entity_tracker.add(synapse_id=table.schema.id, entity=table.schema)
-            self.synapse_entity_tracker.remove(synapse_id=table.schema.id)
-        else:
-            logging.error("Must specify a schema for table replacements")
-
-        # remove system metadata from manifest
-        existing_table.drop(columns=["ROW_ID", "ROW_VERSION"], inplace=True)
-        return self.existingTableId
 
     @tracer.start_as_current_span("TableOperations::_get_auth_token")
     def _get_auth_token(
@@ -3376,11 +4554,16 @@ class TableOperations:
                         ],
                     }
 
-                    self.synStore.syn._async_table_update(
-                        table=self.existingTableId,
-                        changes=[columnChangeDict],
-                        wait=False,
-                    )
+                    # the client polls the schema change job until it completes, so the
+                    # table has its `Id` column before rows are upserted
+                    with tracer.start_as_current_span(
+                        "TableOperations::_update_table_uuid_column::change_column"
+                    ):
+                        self.synStore.syn._async_table_update(
+                            table=self.existingTableId,
+                            changes=[columnChangeDict],
+                            wait=True,
+                        )
                 break
 
         return
@@ -3391,7 +4574,8 @@ class TableOperations:
         update_col: str = "Id",
     ):
         """
-        Method to update an existing table with a new column
+        Method to update an existing table with a new column, only the rows that change
+        are sent
 
         Args:
             updateCol: column to index the old and new tables on
@@ -3404,6 +4588,23 @@ class TableOperations:
         )
 
         self.tableToLoad = update_df(existing_table, self.tableToLoad, update_col)
+        columns = [
+            column
+            for column in existing_table.columns
+            if column not in ("ROW_ID", "ROW_VERSION")
+        ]
+        numeric_columns = _get_numeric_columns(existing_results)
+        is_changed = (
+            hash_table_rows(existing_table, columns, numeric_columns).to_numpy()
+            != hash_table_rows(self.tableToLoad, columns, numeric_columns).to_numpy()
+        )
+        self.synStore.submission_summary.table_rows_skipped += int(
+            (~is_changed).sum()
+        )
+        if not is_changed.any():
+            logger.info(f"Rows of {self.existingTableId} did not change")
+            return self.existingTableId
+        self.tableToLoad = self.tableToLoad[is_changed]
         # store table with existing etag data and impose restrictions as appropriate
         table_result = self.synStore.syn.store(
             Table(self.existingTableId, self.tableToLoad, etag=existing_results.etag),
@@ -3432,6 +4633,7 @@ class DatasetFileView:
         name: str = None,
         temporary: bool = True,
         parentId: str = None,
+        viewId: str = None,
     ) -> None:
         """Create a file view scoped to a dataset folder.
 
@@ -3443,12 +4645,25 @@ class DatasetFileView:
                 of either a 'with' statement or Python entirely.
             parentId (str, optional): Synapse ID specifying where to
                 store the file view. Defaults to datasetId.
+            viewId (str, optional): Synapse ID of an existing file view
+                of the dataset to use instead of storing one.
         """
 
         self.datasetId = datasetId
         self.synapse = synapse
         self.is_temporary = temporary
 
+        # These are filled in after calling `self.query()`
+        self.results = None
+        self.table = None
+
+        if viewId is not None:
+            self.view_schema = self.synapse.get(viewId)
+            self.name = self.view_schema.name
+            self.parentId = self.view_schema.parentId
+            return
+
+        self.name = name
         if name is None:
             self.name = f"schematic annotation file view for {self.datasetId}"
 
@@ -3474,10 +4689,6 @@ class DatasetFileView:
         #       creating a temporary new project to store view
         self.view_schema = self.synapse.store(view_schema)
 
-        # These are filled in after calling `self.query()`
-        self.results = None
-        self.table = None
-
         # Ensure deletion of the file view (last resort)
         if self.is_temporary:
             atexit.register(self.delete)
@@ -3558,7 +4769,17 @@ class DatasetFileView:
         list_types = {"STRING_LIST", "INTEGER_LIST", "BOOLEAN_LIST"}
         list_columns = self._get_columns_of_type(list_types)
         for col in list_columns:
-            self.table[col] = self.table[col].apply(lambda x: ", ".join(x))
+            column = self.table[col].reset_index(drop=True)
+            if column.dtype != object:
+                # only missing values
+                continue
+            # the values of the lists are joined per row, missing values are kept
+            lengths = column.str.len()
+            joined = (
+                column.explode().astype(str).groupby(level=0, sort=False).agg(", ".join)
+            )
+            joined = joined.mask(lengths == 0, "").where(lengths.notna(), column)
+            self.table[col] = joined.to_numpy()
         return self.table
 
     def _fix_int_columns(self):
@@ -3567,8 +4788,7 @@ class DatasetFileView:
         for col in int_columns:
             # Coercing to string because NaN is a floating point value
             # and cannot exist alongside integers in a column
-            def to_int_fn(x):
-                return "" if np.isnan(x) else str(int(x))
-
-            self.table[col] = self.table[col].apply(to_int_fn)
+            is_missing = self.table[col].isna()
+            values = self.table[col].fillna(0).astype("int64").astype(str)
+            self.table[col] = values.mask(is_missing, "")
         return self.table
@@ -0,0 +1,181 @@
+"""Pool of logged in Synapse clients shared by the requests made with the same credentials"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import requests
+import synapseclient
+from requests.adapters import HTTPAdapter
+
+from schematic.configuration.configuration import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# maximum number of clients kept, the oldest are dropped when there are more
+MAX_SESSIONS = 256
+# number of seconds the project headers of a pooled client are reused for, shorter than
+#   the lifetime of the client so that projects the user gained access to show up soon
+PROJECT_HEADERS_TTL = 60
+
+
+def create_requests_session(pool_size: int) -> requests.Session:
+    """
+    Args:
+        pool_size: maximum number of connections kept alive per host
+
+    Returns:
+        requests.Session: a session keeping up to pool_size connections alive per host, so
+          that concurrent requests of a shared client do not open new connections
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@dataclass
+class SynapseSession:
+    """A logged in Synapse client, and the user data cached with it"""
+
+    syn: synapseclient.Synapse
+    created_at: float = field(default_factory=time.monotonic)
+    project_headers: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    """Project headers of the user, shared by the entity trackers of the requests."""
+    project_headers_fetched_at: Dict[str, float] = field(default_factory=dict)
+    """Time the project headers were fetched at, they are fetched again after
+    PROJECT_HEADERS_TTL seconds."""
+
+
+class SynapseSessionPool:
+    """
+    Thread safe pool of logged in Synapse clients, keyed by a hash of the credentials they
+      were logged in with and of their cache folder.
+
+    Clients are reused for ttl seconds, after which the next request logs in again. Only
+      the client and the user data cached with it are shared, the state of each request,
+      such as its entity tracker, is not.
+
+    A pooled client is shared by all the requests made with the same credentials, so it is
+      used by several request threads at once. The Synapse client is not designed to be
+      shared between threads: its credentials, cache and HTTP session are shared state,
+      and concurrent use relies on the requests session and the file locks of the cache.
+      This is why the pool is disabled by default. When it is enabled, a request must not
+      share its client further with threads of its own, and must not change the state of
+      the client, such as its cache location or credentials.
+    """
+
+    def __init__(
+        self, ttl: Optional[float] = None, max_sessions: int = MAX_SESSIONS
+    ) -> None:
+        """
+        Args:
+            ttl: number of seconds a client is reused for, 0 disables the pool, defaults
+              to CONFIG.synapse_session_ttl
+            max_sessions: maximum number of clients kept
+        """
+        self._ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, SynapseSession] = {}
+        self._login_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        """Number of seconds a client is reused for"""
+        return self._ttl if self._ttl is not None else CONFIG.synapse_session_ttl
+
+    @staticmethod
+    def get_key(credentials: str, synapse_cache_path: Optional[str]) -> str:
+        """
+        Args:
+            credentials: access token, or path of the configuration file, used to log in
+            synapse_cache_path: cache folder of the client
+
+        Returns:
+            str: key of the client, the credentials are not kept in the pool
+        """
+        return hashlib.sha256(
+            f"{credentials}\0{synapse_cache_path or ''}".encode("utf-8")
+        ).hexdigest()
+
+    def _get_current(self, key: str) -> Optional[SynapseSession]:
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        if time.monotonic() - session.created_at >= self.ttl:
+            del self._sessions[key]
+            return None
+        return session
+
+    def get(
+        self,
+        credentials: str,
+        synapse_cache_path: Optional[str],
+        login: Callable[[], synapseclient.Synapse],
+    ) -> SynapseSession:
+        """
+        Gets the client logged in with the credentials, logging in if there is none
+
+        Args:
+            credentials: access token, or path of the configuration file, used to log in
+            synapse_cache_path: cache folder of the client
+            login: function logging in a new client
+
+        Returns:
+            SynapseSession: the client and its cached user data
+        """
+        if self.ttl <= 0:
+            return SynapseSession(login())
+
+        key = self.get_key(credentials, synapse_cache_path)
+        with self._lock:
+            session = self._get_current(key)
+            if session is not None:
+                return session
+            login_lock = self._login_locks.setdefault(key, threading.Lock())
+
+        # concurrent requests with the same credentials wait for a single login, while
+        #   requests with other credentials are not blocked
+        with login_lock:
+            with self._lock:
+                session = self._get_current(key)
+            if session is not None:
+                return session
+            session = SynapseSession(login())
+            with self._lock:
+                self._sessions[key] = session
+                self._login_locks.pop(key, None)
+                if len(self._sessions) > self.max_sessions:
+                    oldest = min(
+                        self._sessions, key=lambda k: self._sessions[k].created_at
+                    )
+                    del self._sessions[oldest]
+        logger.debug(f"Logged in a new Synapse client, {len(self)} clients pooled")
+        return session
+
+    def remove(self, credentials: str, synapse_cache_path: Optional[str]) -> None:
+        """
+        Removes the client logged in with the credentials
+
+        Args:
+            credentials: access token, or path of the configuration file, used to log in
+            synapse_cache_path: cache folder of the client
+        """
+        with self._lock:
+            self._sessions.pop(self.get_key(credentials, synapse_cache_path), None)
+
+    def clear(self) -> None:
+        """Removes all clients"""
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+SESSION_POOL = SynapseSessionPool()
@@ -2,25 +2,247 @@
 added through composition to any class where Synapse entities might be used. The idea
 behind this class is to provide a mechanism such that if a Synapse entity is requested
 multiple times, the entity is only downloaded once. This is useful for preventing
-multiple downloads of the same entity, which can be time consuming."""
+multiple downloads of the same entity, which can be time consuming.
+
+Entities can also be shared between requests through the SharedEntityCache, an LRU cache
+kept per user. Entities taken from it are revalidated by etag before they are used, and
+never have the downloaded file of another request."""
+import copy
+import logging
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import synapseclient
 from synapseclient import Entity, File, Folder, Project, Schema
+from synapseclient.core.exceptions import SynapseHTTPError
+
+from schematic.store.cache_janitor import record_download
+
+logger = logging.getLogger(__name__)
+
+# share of the entries evicted at once when the shared cache is full
+EVICTION_FRACTION = 0.1
+
+
+class SharedEntityCache:
+    """Thread safe, size bounded LRU cache of Synapse entities shared by all requests.
+
+    Entries are keyed by (user principal id, entity id, version), so that a user is never given an
+    entity that was retrieved with the permissions of another user. Copies of the entities are
+    stored and returned, as callers modify the entities they get. The copies are stored without
+    their local state, as the files downloaded by a request are in its own folders, and may be
+    moved or deleted by it.
+
+    Reads do not take the lock: the time of the last access is stored with the entry, and the least
+    recently used entries are evicted in batches when the cache is full.
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """
+        Args:
+            max_size: maximum number of entities in the cache, 0 disables the cache, defaults
+              to CONFIG.synapse_entity_cache_size
+        """
+        self._max_size = max_size
+        self._entries: Dict[Tuple[str, str, Optional[str]], list] = {}
+        # (user principal id, parent id, name) -> entity id
+        self._by_parent_and_name: Dict[Tuple[str, str, str], str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of entities in the cache"""
+        if self._max_size is None:
+            # the configuration imports this module
+            from schematic.configuration.configuration import (  # pylint: disable=import-outside-toplevel
+                CONFIG,
+            )
+
+            self._max_size = CONFIG.synapse_entity_cache_size
+        return self._max_size
+
+    @staticmethod
+    def _get_key(
+        principal_id: str, synapse_id: str
+    ) -> Tuple[str, str, Optional[str]]:
+        entity_id, _, version = synapse_id.partition(".")
+        return (principal_id, entity_id, version or None)
+
+    def get(
+        self, principal_id: str, synapse_id: str
+    ) -> Optional[Union[Entity, Project, File, Folder, Schema]]:
+        """
+        Args:
+            principal_id: principal id of the user
+            synapse_id: Synapse ID of the entity, optionally with a version (syn123.4)
+
+        Returns:
+            A copy of the cached entity, None if it is not cached
+        """
+        entry = self._entries.get(self._get_key(principal_id, synapse_id))
+        if entry is None:
+            return None
+        entry[1] = time.monotonic()
+        return copy.deepcopy(entry[0])
+
+    def get_id_by_parent_and_name(
+        self, principal_id: str, parent_id: str, name: str
+    ) -> Optional[str]:
+        """
+        Args:
+            principal_id: principal id of the user
+            parent_id: Synapse ID of the parent of the entity
+            name: name of the entity
+
+        Returns:
+            The Synapse ID of the cached entity with that parent and name, None if there is none
+        """
+        return self._by_parent_and_name.get((principal_id, parent_id, name))
+
+    def put(
+        self,
+        principal_id: str,
+        synapse_id: str,
+        entity: Union[Entity, Project, File, Folder, Schema],
+    ) -> None:
+        """Adds a copy of an entity to the cache, without the path of its downloaded file.
+
+        Args:
+            principal_id: principal id of the user
+            synapse_id: Synapse ID of the entity, optionally with a version (syn123.4)
+            entity: the entity
+        """
+        if self.max_size <= 0:
+            return
+        key = self._get_key(principal_id, synapse_id)
+        entity_copy = copy.deepcopy(entity)
+        if "path" in entity_copy.local_state():
+            entity_copy.local_state({"path": None, "cacheDir": None, "files": []})
+        with self._lock:
+            self._entries[key] = [entity_copy, time.monotonic()]
+            if entity_copy.get("parentId") and entity_copy.get("name"):
+                self._by_parent_and_name[
+                    (principal_id, entity_copy["parentId"], entity_copy["name"])
+                ] = synapse_id
+            if len(self._entries) > self.max_size:
+                self._evict()
+
+    def remove(self, principal_id: str, synapse_id: str) -> None:
+        """Removes an entity from the cache.
+
+        Args:
+            principal_id: principal id of the user
+            synapse_id: Synapse ID of the entity, optionally with a version (syn123.4)
+        """
+        with self._lock:
+            entry = self._entries.pop(self._get_key(principal_id, synapse_id), None)
+            if entry is not None:
+                self._remove_parent_and_name(principal_id, entry[0])
+
+    def clear(self) -> None:
+        """Removes all entities from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._by_parent_and_name.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove_parent_and_name(
+        self, principal_id: str, entity: Union[Entity, Project, File, Folder, Schema]
+    ) -> None:
+        self._by_parent_and_name.pop(
+            (principal_id, entity.get("parentId"), entity.get("name")), None
+        )
+
+    def _evict(self) -> None:
+        """Evicts the least recently used entries, must be called with the lock held"""
+        number_to_evict = max(1, int(self.max_size * EVICTION_FRACTION))
+        least_recently_used = sorted(
+            self._entries.items(), key=lambda item: item[1][1]
+        )[:number_to_evict]
+        for key, entry in least_recently_used:
+            del self._entries[key]
+            self._remove_parent_and_name(key[0], entry[0])
+
+
+SHARED_ENTITY_CACHE = SharedEntityCache()
 
 
 @dataclass
 class SynapseEntityTracker:
     """The SynapseEntityTracker class handles tracking synapse entities throughout the
     lifecycle of a request to schematic. It is used to prevent multiple downloads of
-    the same entity."""
+    the same entity.
+
+    Entities not yet tracked in the request are looked up in the SharedEntityCache, and
+    used if their etag is still current. Files are always downloaded through the Synapse
+    client, which reuses the files of its cache that are unchanged."""
 
     synapse_entities: Dict[str, Union[Entity, Project, File, Folder, Schema]] = field(
         default_factory=dict
     )
     project_headers: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
     """A dictionary of project headers for each user requested."""
+    project_headers_fetched_at: Dict[str, float] = field(default_factory=dict)
+    """Time the project headers of each user were fetched at."""
+    project_headers_ttl: Optional[float] = None
+    """Number of seconds project headers are reused for, None to reuse them as long as the tracker."""
+    principal_id: Optional[str] = None
+    """Principal id of the user the entities are retrieved for, used to share entities between requests."""
+    shared_cache: SharedEntityCache = field(
+        default_factory=lambda: SHARED_ENTITY_CACHE
+    )
+    etag_lookup: Optional[Callable[[str], Optional[str]]] = None
+    """Gets the etag of an entity from data queried anyway, such as the fileview, None if it is not known."""
+    _by_parent_and_name: Dict[Tuple[str, str], str] = field(default_factory=dict)
+
+    def _track(
+        self, synapse_id: str, entity: Union[Entity, Project, File, Folder, Schema]
+    ) -> None:
+        self.synapse_entities.update({synapse_id: entity})
+        if entity.get("parentId") and entity.get("name"):
+            self._by_parent_and_name[(entity["parentId"], entity["name"])] = synapse_id
+
+    def _is_current(
+        self,
+        synapse_id: str,
+        entity: Union[Entity, Project, File, Folder, Schema],
+        syn: synapseclient.Synapse,
+    ) -> bool:
+        """Checks that an entity of the shared cache has the etag of the entity in Synapse,
+        the entity is removed from the shared cache if it does not. The etag is requested
+        from Synapse when etag_lookup does not know it.
+        """
+        known_etag = None
+        if self.etag_lookup is not None and "." not in synapse_id:
+            known_etag = self.etag_lookup(synapse_id)
+        if known_etag is not None:
+            if known_etag != entity.get("etag"):
+                self.shared_cache.remove(self.principal_id, synapse_id)
+                return False
+            return True
+        try:
+            current = syn.restGET(f"/entity/{synapse_id.split('.')[0]}")
+        except SynapseHTTPError:
+            # removed, or not accessible anymore
+            self.shared_cache.remove(self.principal_id, synapse_id)
+            return False
+        if "." not in synapse_id and current.get("etag") != entity.get("etag"):
+            self.shared_cache.remove(self.principal_id, synapse_id)
+            return False
+        return True
+
+    def _get_from_shared_cache(
+        self, synapse_id: str, syn: synapseclient.Synapse
+    ) -> Optional[Union[Entity, Project, File, Folder, Schema]]:
+        """Gets an entity from the shared cache if its etag is current."""
+        entity = self.shared_cache.get(self.principal_id, synapse_id)
+        if entity is None or not self._is_current(synapse_id, entity, syn):
+            return None
+        return entity
 
     def get(
         self,
@@ -55,15 +277,28 @@ class SynapseEntityTracker:
         entity = self.synapse_entities.get(synapse_id, None)
 
         if entity is None or (download_file and not entity.path):
-            if not retrieve_if_not_present:
-                return None
-            entity = syn.get(
-                synapse_id,
-                downloadFile=download_file,
-                downloadLocation=download_location,
-                ifcollision=if_collision,
-            )
-        self.synapse_entities.update({synapse_id: entity})
+            if self.principal_id is None:
+                self.principal_id = syn.credentials.owner_id
+            shared_entity = None
+            # the shared entities have no downloaded file
+            if self.shared_cache.max_size > 0 and not download_file:
+                shared_entity = self._get_from_shared_cache(synapse_id, syn)
+            if shared_entity is not None:
+                logger.debug(f"Using shared cache entry of {synapse_id}")
+                entity = shared_entity
+            else:
+                if not retrieve_if_not_present:
+                    return None
+                entity = syn.get(
+                    synapse_id,
+                    downloadFile=download_file,
+                    downloadLocation=download_location,
+                    ifcollision=if_collision,
+                )
+                if download_file:
+                    record_download(entity.get("path"))
+                self.shared_cache.put(self.principal_id, synapse_id, entity)
+        self._track(synapse_id, entity)
         return entity
 
     def add(
@@ -75,7 +310,9 @@ class SynapseEntityTracker:
             synapse_id: The Synapse ID of the entity to add.
             entity: The Synapse entity to add.
         """
-        self.synapse_entities.update({synapse_id: entity})
+        self._track(synapse_id, entity)
+        if self.principal_id is not None:
+            self.shared_cache.put(self.principal_id, synapse_id, entity)
 
     def remove(self, synapse_id: str) -> None:
         """Removes a Synapse entity from the cache.
@@ -83,10 +320,16 @@ class SynapseEntityTracker:
         Args:
             synapse_id: The Synapse ID of the entity to remove.
         """
-        self.synapse_entities.pop(synapse_id, None)
+        entity = self.synapse_entities.pop(synapse_id, None)
+        if entity is not None:
+            self._by_parent_and_name.pop(
+                (entity.get("parentId"), entity.get("name")), None
+            )
+        if self.principal_id is not None:
+            self.shared_cache.remove(self.principal_id, synapse_id)
 
     def search_local_by_parent_and_name(
-        self, name: str, parent_id: str
+        self, name: str, parent_id: str, syn: Optional[synapseclient.Synapse] = None
     ) -> Union[Entity, Project, File, Folder, Schema, None]:
         """
         Searches the local cache for an entity with the given name and parent_id. The
@@ -96,13 +339,35 @@ class SynapseEntityTracker:
         Args:
             name: The name of the entity to search for.
             parent_id: The parent ID of the entity to search for.
+            syn: A Synapse object, used to check the etag of entities found in the shared
+                cache. The shared cache is not searched without it.
 
         Returns:
             The entity if it exists, otherwise None.
         """
-        for entity in self.synapse_entities.values():
-            if entity.name == name and entity.parentId == parent_id:
+        synapse_id = self._by_parent_and_name.get((parent_id, name))
+        if synapse_id is not None:
+            entity = self.synapse_entities.get(synapse_id)
+            if (
+                entity is not None
+                and entity.name == name
+                and entity.parentId == parent_id
+            ):
                 return entity
+        if self.principal_id is not None and syn is not None:
+            synapse_id = self.shared_cache.get_id_by_parent_and_name(
+                self.principal_id, parent_id, name
+            )
+            if synapse_id is not None:
+                entity = self.shared_cache.get(self.principal_id, synapse_id)
+                if (
+                    entity is not None
+                    and entity.get("name") == name
+                    and entity.get("parentId") == parent_id
+                    and self._is_current(synapse_id, entity, syn)
+                ):
+                    self._track(synapse_id, entity)
+                    return entity
         return None
 
     def get_project_headers(
@@ -118,7 +383,12 @@ class SynapseEntityTracker:
             A list of dictionaries matching <https://rest-docs.synapse.org/rest/org/sagebionetworks/repo/model/ProjectHeader.html>
         """
         project_headers = self.project_headers.get(current_user_id, None)
-        if project_headers:
+        if project_headers and (
+            self.project_headers_ttl is None
+            or time.monotonic()
+            - self.project_headers_fetched_at.get(current_user_id, 0)
+            < self.project_headers_ttl
+        ):
             return project_headers
 
         all_results = syn.restGET(
@@ -143,5 +413,6 @@ class SynapseEntityTracker:
 
         results = all_results["results"]
         self.project_headers.update({current_user_id: results})
+        self.project_headers_fetched_at[current_user_id] = time.monotonic()
 
         return results
@@ -6,7 +6,7 @@ import logging
 from copy import deepcopy
 from datetime import datetime
 from time import perf_counter
-from typing import Any, Optional, Union
+from typing import Any, Collection, Optional, Union
 
 import dateparser as dp
 import numpy as np
@@ -332,3 +332,122 @@ def populate_df_col_with_another_col(
     # Copy the contents over
     dataframe[target_col] = dataframe[source_col]
     return dataframe
+
+
+def hash_table_rows(
+    dataframe: pd.DataFrame,
+    columns: list[str],
+    numeric_columns: Collection[str] = (),
+) -> pd.Series:
+    """Hash the values of each row of a table, so that rows can be compared between a local
+      data frame and the same table queried from Synapse
+
+    Values are normalized before hashing: missing values and empty strings are equal.
+      Numbers of numeric columns are compared as floats, so that 1 and 1.0 are equal. Values
+      of other columns are compared as stripped strings, so that "01234" and "1234" differ.
+
+    Args:
+        dataframe: the table
+        columns: the columns to hash, in order
+        numeric_columns: columns compared as numbers whatever their type in dataframe, ie
+          the columns of the table with a numeric type in Synapse. Columns with a numeric
+          type in dataframe are always compared as numbers.
+
+    Returns:
+        pd.Series: the hash of each row, with the index of the dataframe
+    """
+    normalized = pd.DataFrame(index=dataframe.index)
+    for column in columns:
+        values = dataframe[column]
+        strings = values.astype(str).str.strip().where(values.notna(), "")
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(
+            values
+        ):
+            values = values.astype(float)
+            normalized[column] = values.astype(str).where(values.notna(), "")
+        elif column in numeric_columns:
+            numbers = pd.to_numeric(values, errors="coerce")
+            normalized[column] = strings.where(
+                numbers.isna(), numbers.astype(float).astype(str)
+            )
+        else:
+            normalized[column] = strings
+    return pd.util.hash_pandas_object(normalized, index=False)
+
+
+def convert_column(column: pd.Series) -> pd.Series:
+    """Converts the strings of a manifest column to the types load_df converts them to,
+      one column at a time and without parsing each cell separately
+
+    Args:
+        column: column of a manifest read with read_csv, nulls masked as empty strings
+
+    Returns:
+        pd.Series: the column, of type object, with the values of load_df
+    """
+    # strings that represent floats are floats, as in convert_floats
+    numbers = pd.to_numeric(column, errors="coerce").astype("object")
+    converted = numbers.where(numbers.notna(), column)
+    # strings of digits are integers, as in find_and_convert_ints
+    if column.dtype == object:
+        # object columns can hold values of other types than strings
+        is_int = pd.Series(
+            [isinstance(value, str) and value.isdigit() for value in column],
+            index=column.index,
+        )
+        if is_int.any():
+            converted = converted.astype("object")
+            converted[is_int] = [np.int64(value) for value in column[is_int]]
+    return converted.astype("object")
+
+
+def _to_native(value: Any) -> Any:
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def profile_df(file_path: str, **load_args: Any) -> pd.DataFrame:
+    """Profiles the columns of a manifest CSV in a single pass, without converting the
+      whole manifest with load_df
+
+    The types are those of the manifest loaded by load_df with preserve_raw_input=False,
+      then converted by convert_dtypes.
+
+    Args:
+        file_path (str): path of csv to open
+        **load_args(dict): dict of key value pairs to be passed to the pd.read_csv function
+
+    Returns:
+        pd.DataFrame: a row per column of the manifest, with its dtype, null_count,
+          distinct_count, and the min and max of its non null values, None if they can
+          not be compared
+    """
+    # start performance timer
+    t_profile_df = perf_counter()
+
+    org_df = read_csv(file_path, encoding="utf8", **load_args)  # type: ignore
+    org_df = trim_commas_df(org_df, allow_na_values=True)
+
+    profiles = []
+    for col in org_df.columns:
+        is_null = org_df[col].isna()
+        # as in load_df, nulls are empty strings when the type is inferred
+        values = convert_column(org_df[col].where(~is_null, "")).convert_dtypes()
+        # the statistics are of the values, with their own type
+        non_null = values[~is_null.to_numpy()].astype("object").convert_dtypes()
+        minimum, maximum = None, None
+        if len(non_null) and non_null.dtype != object:
+            minimum, maximum = non_null.min(), non_null.max()
+        profiles.append(
+            {
+                "dtype": str(values.dtype),
+                "null_count": int(is_null.sum()),
+                "distinct_count": int(non_null.nunique()),
+                "min": _to_native(minimum),
+                "max": _to_native(maximum),
+            }
+        )
+
+    logger.debug(f"Profile Elapsed time {perf_counter()-t_profile_df}")
+    return pd.DataFrame(profiles, index=org_df.columns, dtype="object")
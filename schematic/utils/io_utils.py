@@ -2,6 +2,7 @@
 
 import json
 import os
+import stat
 import time
 import urllib.request
 from typing import Any, Optional
@@ -79,3 +80,31 @@ def cleanup_temporary_storage(
                 dir_path = os.path.join(root, all_dir)
                 if not os.listdir(dir_path):
                     os.rmdir(dir_path)
+
+
+def make_private_folder(path: str) -> None:
+    """Creates a folder only the current user can access, or checks that an existing
+    folder is one. Files read back from shared locations, such as the temporary
+    folder, can then not have been written by other users. An existing folder of the
+    current user that other users can read, but not write to, is made private.
+
+    Args:
+        path: Path to the folder.
+
+    Raises:
+        PermissionError: If the path is not a folder, or if the folder is owned by
+            another user or can be accessed by other users.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    folder_stat = os.lstat(path)
+    if not stat.S_ISDIR(folder_stat.st_mode):
+        raise PermissionError(f"{path} is not a folder")
+    # ownership and permission bits are not meaningful on Windows
+    if not hasattr(os, "getuid"):
+        return
+    if folder_stat.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+    if folder_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{path} can be written to by other users")
+    if folder_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        os.chmod(path, 0o700)
@@ -91,6 +91,86 @@ def convert_nan_entries_to_empty_strings(
     return manifest
 
 
+def _strip_string_entries(col: pd.Series) -> pd.Series:
+    """
+    Remove leading/trailing whitespace from the string entries of a column,
+    leaving non-string entries (numbers, lists, nulls) untouched.
+    """
+    if not (
+        pd.api.types.is_object_dtype(col.dtype) or pd.api.types.is_string_dtype(col.dtype)
+    ):
+        return col
+    try:
+        stripped = col.str.strip()
+    except AttributeError:
+        # The column does not hold any string entries
+        return col
+    return stripped.where(stripped.notna(), col)
+
+
+def normalize_manifest(manifest: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalization stage run once on a loaded manifest, before any validation.
+    String entries are stripped of leading/trailing whitespace and null entries in
+    object columns (None, np.nan, pd.NA) are canonicalized to pd.NA, so that GE,
+    the in house rules and JSON Schema validation all see the same values.
+
+    Args:
+        manifest: pd.DataFrame, manifest as returned by load_df
+    Returns:
+        pd.DataFrame, normalized manifest. The input manifest is not modified.
+    """
+    normalized = {}
+    for col in manifest.columns:
+        series = _strip_string_entries(manifest[col])
+        if pd.api.types.is_object_dtype(series.dtype):
+            series = series.where(series.notna(), pd.NA)
+        normalized[col] = series
+    return pd.DataFrame(normalized, index=manifest.index)
+
+
+def _to_json_schema_entry(value: Any) -> Any:
+    """
+    Convert a single manifest entry to the representation expected by
+    JSON Schema validation. See get_json_schema_view.
+    """
+    if isinstance(value, list):
+        return [""] if value == ["<NA>"] else value
+    if isinstance(value, np.ndarray):
+        return value
+    if pd.isnull(value):
+        return ""
+    if isinstance(value, Number):
+        return str(value)
+    return value
+
+
+def get_json_schema_view(manifest: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the string view of a (normalized, rule validated) manifest used for
+    JSON Schema validation. Nulls become empty strings, a list holding a single
+    '<NA>' becomes [''] and numerical entries are converted to strings.
+    Each column is converted once, numerical columns without a per-cell pass. Object
+    columns without nulls have their type inferred first, so a column mixing ints and
+    floats is represented as floats.
+
+    Args:
+        manifest: pd.DataFrame, manifest after rule validation
+    Returns:
+        pd.DataFrame, string view of the manifest. The input manifest is not modified.
+    """
+    view = {}
+    for col in manifest.columns:
+        series = manifest[col]
+        if pd.api.types.is_object_dtype(series.dtype) and not series.isna().any():
+            series = series.infer_objects()
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            view[col] = series.astype("string").fillna("")
+        else:
+            view[col] = series.map(_to_json_schema_entry).astype(object)
+    return pd.DataFrame(view, index=manifest.index)
+
+
 def rule_in_rule_list(rule: str, rule_list: list[str]) -> Optional[re.Match[str]]:
     """
     Function to standardize
@@ -5,20 +5,23 @@ import pickle
 import shutil
 import tempfile
 import urllib.request
+from dataclasses import asdict
 from typing import List, Tuple
 
 import connexion
 import pandas as pd
 from flask import current_app as app
-from flask import request, send_from_directory
+from flask import Response, request, send_from_directory, stream_with_context
 from flask_cors import cross_origin
 from opentelemetry import trace
 
 from schematic.configuration.configuration import CONFIG
 from schematic.manifest.generator import ManifestGenerator
 from schematic.models.metadata import MetadataModel
+from schematic.models.validation_cache import ValidationCache
 from schematic.schemas.data_model_graph import DataModelGraph, DataModelGraphExplorer
 from schematic.schemas.data_model_parser import DataModelParser
+from schematic.store.fileview_export import DEFAULT_PAGE_SIZE, EXPORT_FORMATS
 from schematic.store.synapse import ManifestDownload, SynapseStorage
 from schematic.utils.df_utils import read_csv
 from schematic.utils.general import create_temp_folder, entity_type_mapping
@@ -329,6 +332,8 @@ def validate_manifest_route(
     asset_view=None,
     project_scope=None,
     dataset_scope=None,
+    incremental=None,
+    dataset_id=None,
 ):
     # Access token now stored in request header
     access_token = get_access_token()
@@ -370,10 +375,30 @@ def validate_manifest_route(
         project_scope=project_scope,
         access_token=access_token,
         dataset_scope=dataset_scope,
+        incremental=bool(incremental),
+        dataset_id=dataset_id,
     )
 
     res_dict = {"errors": errors, "warnings": warnings}
 
+    # cache the validation result, so that submitting the same manifest with the
+    # returned receipt id does not validate it again
+    validation_cache = ValidationCache()
+    if validation_cache.enabled:
+        res_dict["receipt_id"] = validation_cache.store(
+            key=metadata_model.get_validation_cache_key(
+                manifest_path=temp_path,
+                root_node=data_type,
+                restrict_rules=restrict_rules,
+                project_scope=project_scope,
+                dataset_scope=dataset_scope,
+                access_token=access_token,
+            ),
+            errors=errors,
+            warnings=warnings,
+            censored_manifest_path=temp_path.replace(".csv", "_censored.csv"),
+        )
+
     return res_dict
 
 
@@ -392,6 +417,8 @@ def submit_manifest_route(
     table_column_names=None,
     annotation_keys=None,
     file_annotations_upload: bool = True,
+    receipt_id=None,
+    include_summary: bool = False,
 ):
     # call config_handler()
     config_handler(asset_view=asset_view)
@@ -447,8 +474,14 @@ def submit_manifest_route(
         table_column_names=table_column_names,
         annotation_keys=annotation_keys,
         file_annotations_upload=file_annotations_upload,
+        validation_receipt=receipt_id,
     )
 
+    if include_summary:
+        return {
+            "manifest_id": manifest_id,
+            "submission_summary": asdict(metadata_model.submission_summary),
+        }
     return manifest_id
 
 
@@ -733,6 +766,29 @@ def get_asset_view_table(asset_view, return_type):
         return export_path
 
 
+def export_asset_view_table(
+    asset_view, export_format="ndjson", columns=None, where=None, page_size=None
+):
+    # Access token now stored in request header
+    access_token = get_access_token()
+
+    # call config handler
+    config_handler(asset_view=asset_view)
+
+    # the view is exported in pages, instead of being queried at initialization
+    store = SynapseStorage(access_token=access_token, perform_query=False)
+    chunks = store.export_fileview(
+        export_format=export_format,
+        columns=columns,
+        where_clauses=[where] if where else None,
+        page_size=page_size or DEFAULT_PAGE_SIZE,
+    )
+    # the response is sent in chunks as the pages are queried
+    return Response(
+        stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format]
+    )
+
+
 def get_project_manifests(project_id, asset_view):
     # Access token now stored in request header
     access_token = get_access_token()
@@ -749,18 +805,20 @@ def get_project_manifests(project_id, asset_view):
     return lst_manifest
 
 
-def get_manifest_datatype(manifest_id, asset_view):
+def get_manifest_datatype(manifest_id, asset_view, include_stats=False):
     # Access token now stored in request header
     access_token = get_access_token()
 
     # use the default asset view from config
     config_handler(asset_view=asset_view)
 
-    # use Synapse Storage
-    store = SynapseStorage(access_token=access_token)
+    # use Synapse Storage, the fileview is not needed to read a manifest
+    store = SynapseStorage(access_token=access_token, perform_query=False)
 
     # get data types of an existing manifest
-    manifest_dtypes_dict = store.getDataTypeFromManifest(manifest_id)
+    manifest_dtypes_dict = store.getDataTypeFromManifest(
+        manifest_id, include_stats=include_stats
+    )
 
     return manifest_dtypes_dict
 
@@ -0,0 +1,240 @@
+"""
+Benchmark of submission, validation and manifest retrieval against the offline Synapse
+  stand-in.
+
+The stand-in answers each request after a fixed latency, so that timings are
+  reproducible and scale with the number of requests made, as they do against Synapse.
+  The number of rows of the large file view can be set with the
+  SCHEMATIC_BENCHMARK_FILEVIEW_ROWS environment variable, up to 1M rows.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Generator, Tuple
+
+import pandas as pd
+import pytest
+from synapseclient.core import cache
+
+from schematic.configuration.configuration import CONFIG
+from schematic.models.metadata import MetadataModel
+from schematic.schemas.data_model_graph import DataModelGraphExplorer
+from schematic.store.synapse import SynapseStorage
+from tests.synapse_standin import (
+    SynapseStandIn,
+    get_synthetic_fileview_rows,
+    seed_projects,
+)
+
+logger = logging.getLogger(__name__)
+
+TOKEN = "benchmark-token"
+# number of seconds each request to the stand-in is delayed by
+LATENCY = 0.005
+FILES_PER_DATASET = 100
+FILEVIEW_ROWS = int(os.environ.get("SCHEMATIC_BENCHMARK_FILEVIEW_ROWS", 100_000))
+
+
+@pytest.fixture(name="standin", scope="function")
+def fixture_standin(
+    tmp_path, monkeypatch
+) -> Generator[Tuple[SynapseStandIn, Dict[str, Any]], None, None]:
+    """A started stand-in with latency, seeded with two projects of two datasets"""
+    with SynapseStandIn(latency=LATENCY) as standin:
+        standin.add_user(TOKEN)
+        seeded = seed_projects(
+            standin,
+            projects=2,
+            files_per_dataset=FILES_PER_DATASET,
+            component="MockComponent",
+        )
+        monkeypatch.setattr(CONFIG._synapse_config, "endpoint", standin.endpoint)
+        monkeypatch.setattr(
+            CONFIG._synapse_config, "master_fileview_id", seeded["fileview"]
+        )
+        monkeypatch.setattr(
+            CONFIG._manifest_config, "manifest_folder", str(tmp_path / "manifests")
+        )
+        # Synapse IDs of the stand-in are reused across runs
+        monkeypatch.setattr(cache, "CACHE_ROOT_DIR", str(tmp_path / "synapse_cache"))
+        yield standin, seeded
+
+
+def record_timing(
+    record_property, standin: SynapseStandIn, name: str, start: float
+) -> None:
+    """Records the duration and the number of requests of a benchmarked step"""
+    duration = time.perf_counter() - start
+    requests = sum(standin.request_counts.values())
+    record_property(f"{name}_seconds", duration)
+    record_property(f"{name}_requests", requests)
+    logger.info(f"{name}: {duration:.2f} seconds, {requests} requests")
+
+
+def write_submitted_manifest(store: SynapseStorage, dataset_id: str, path) -> str:
+    """Writes the manifest of a seeded dataset, filled in for submission"""
+    manifest = store.getDatasetManifest(dataset_id, downloadFile=True)
+    manifest_df = pd.read_csv(manifest.path)
+    manifest_df["Patient ID"] = 1
+    manifest_df["Tissue Status"] = "Healthy"
+    manifest_df["Id"] = ""
+    manifest_df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.synapse_benchmark
+class TestSynapseBenchmark:
+    @pytest.mark.parametrize("manifest_record_type", ["file_only", "table_and_file"])
+    @pytest.mark.parametrize("bulk_annotation_upload", [False, True])
+    def test_submit(
+        self,
+        standin,
+        tmp_path,
+        record_property,
+        monkeypatch,
+        dmge: DataModelGraphExplorer,
+        manifest_record_type: str,
+        bulk_annotation_upload: bool,
+    ) -> None:
+        standin, seeded = standin
+        monkeypatch.setattr(
+            CONFIG._synapse_config, "bulk_annotation_upload", bulk_annotation_upload
+        )
+        store = SynapseStorage(access_token=TOKEN)
+        manifest_path = write_submitted_manifest(
+            store, seeded["datasets"][0], tmp_path / "submitted.csv"
+        )
+
+        standin.request_counts.clear()
+        start = time.perf_counter()
+        manifest_id = store.associateMetadataWithFiles(
+            dmge,
+            manifest_path,
+            seeded["datasets"][0],
+            manifest_record_type=manifest_record_type,
+        )
+        annotation_mode = "bulk" if bulk_annotation_upload else "entity"
+        record_timing(
+            record_property,
+            standin,
+            f"submit_{manifest_record_type}_{annotation_mode}_annotations",
+            start,
+        )
+        assert manifest_id in standin.entities
+
+    def test_submit_bulk_annotations(
+        self,
+        standin,
+        tmp_path,
+        record_property,
+        monkeypatch,
+        dmge: DataModelGraphExplorer,
+    ) -> None:
+        """Compares annotating the files one entity at a time and in bulk through a
+        file view, each for a dataset of the same size"""
+        standin, seeded = standin
+        results = {}
+        for dataset_id, bulk in zip(seeded["datasets"], [False, True]):
+            monkeypatch.setattr(
+                CONFIG._synapse_config, "bulk_annotation_upload", bulk
+            )
+            store = SynapseStorage(access_token=TOKEN)
+            manifest_path = write_submitted_manifest(
+                store, dataset_id, tmp_path / f"submitted_{dataset_id}.csv"
+            )
+            name = "submit_bulk_annotations" if bulk else "submit_entity_annotations"
+
+            standin.request_counts.clear()
+            start = time.perf_counter()
+            store.associateMetadataWithFiles(
+                dmge, manifest_path, dataset_id, manifest_record_type="file_only"
+            )
+            record_timing(record_property, standin, name, start)
+            results[bulk] = dict(standin.request_counts)
+
+            annotated = [
+                entity_id
+                for entity_id, entity in standin.entities.items()
+                if entity.get("parentId") == dataset_id
+                and "TissueStatus" in standin.annotations.get(entity_id, {})
+            ]
+            assert len(annotated) == FILES_PER_DATASET
+
+        transaction = ("POST", "/repo/v1/entity/{id}/table/transaction/async/start")
+        annotation_update = ("PUT", "/repo/v1/entity/{id}/annotations2")
+        # the annotations of the manifest file are stored on their own in both modes
+        assert results[False].get(annotation_update, 0) == FILES_PER_DATASET + 1
+        assert results[True].get(annotation_update, 0) == 1
+        assert results[True].get(transaction, 0) == 1
+        assert sum(results[True].values()) < sum(results[False].values())
+
+    def test_validate(self, standin, tmp_path, record_property, helpers) -> None:
+        standin, seeded = standin
+        manifest_df = helpers.get_data_frame(
+            "mock_manifests/Valid_Test_Manifest.csv", preserve_raw_input=False
+        )
+        # URLs are checked over the network, the missing column is reported as an error
+        manifest_path = str(tmp_path / "validated.csv")
+        manifest_df.drop(columns=["Check URL"]).to_csv(manifest_path, index=False)
+        metadata_model = MetadataModel(
+            inputMModelLocation=helpers.get_data_path("example.model.jsonld"),
+            inputMModelLocationType="local",
+            data_model_labels="class_label",
+        )
+
+        standin.request_counts.clear()
+        start = time.perf_counter()
+        errors, _ = metadata_model.validateModelManifest(
+            manifestPath=manifest_path,
+            rootNode="MockComponent",
+            restrict_rules=True,
+            project_scope=seeded["projects"],
+            access_token=TOKEN,
+        )
+        record_timing(record_property, standin, "validate", start)
+        # the target manifests of the cross manifest rules are downloaded
+        assert standin.request_counts[("GET", "/files/{id}")] > 0
+        assert isinstance(errors, list)
+
+    def test_manifest_retrieval(
+        self, standin, record_property, dmge: DataModelGraphExplorer
+    ) -> None:
+        standin, seeded = standin
+
+        standin.request_counts.clear()
+        start = time.perf_counter()
+        # the Synapse part of manifest generation for an existing dataset, each request
+        #   of the API creates its own SynapseStorage
+        for dataset_id in seeded["datasets"]:
+            store = SynapseStorage(access_token=TOKEN)
+            _, manifest_df = store.updateDatasetManifestFiles(
+                dmge, datasetId=dataset_id, store=False
+            )
+            assert len(manifest_df) == FILES_PER_DATASET
+        record_timing(record_property, standin, "manifest_retrieval", start)
+
+    def test_large_fileview(self, standin, record_property) -> None:
+        standin, seeded = standin
+        standin.add_fileview_rows(
+            seeded["fileview"],
+            get_synthetic_fileview_rows(FILEVIEW_ROWS, seeded["projects"][0]),
+        )
+
+        # the fileview is queried on first use, not when the store is created
+        store = SynapseStorage(access_token=TOKEN)
+        standin.request_counts.clear()
+        start = time.perf_counter()
+        fileview = store.storageFileviewTable
+        record_timing(record_property, standin, "fileview_query", start)
+        assert len(fileview) >= FILEVIEW_ROWS
+
+        # the methods that need a few columns share a planned query of them
+        store = SynapseStorage(access_token=TOKEN)
+        standin.request_counts.clear()
+        start = time.perf_counter()
+        projects = store.getStorageProjects()
+        dataset_project = store.getDatasetProject(seeded["datasets"][0])
+        record_timing(record_property, standin, "fileview_planned_query", start)
+        assert (seeded["projects"][0], "Project 0") in projects
+        assert dataset_project == seeded["projects"][0]
@@ -0,0 +1,1477 @@
+"""Offline stand-in for the subset of the Synapse REST API used by schematic
+
+SynapseStandIn is a local HTTP server keeping projects, folders, files, annotations,
+tables and file views in memory. Synapse clients, and SynapseStorage through the
+synapse.endpoint setting of the configuration, can be pointed at it to run the storage
+code paths without network access, with deterministic latency, throttling and failures.
+
+Table and file view queries are run by SQLite on a materialized copy of the rows, which
+covers the SELECT ... WHERE ... statements schematic builds. File views can be given
+synthetic rows that are not backed by entities, to measure queries on large views.
+"""
+
+# pylint: disable=too-many-lines,too-many-instance-attributes,too-many-public-methods
+
+import csv
+import hashlib
+import io
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import synapseclient
+
+PROJECT = "org.sagebionetworks.repo.model.Project"
+FOLDER = "org.sagebionetworks.repo.model.Folder"
+FILE = "org.sagebionetworks.repo.model.FileEntity"
+TABLE = "org.sagebionetworks.repo.model.table.TableEntity"
+ENTITY_VIEW = "org.sagebionetworks.repo.model.table.EntityView"
+S3_FILE_HANDLE = "org.sagebionetworks.repo.model.file.S3FileHandle"
+
+TYPE_NAMES = {
+    PROJECT: "project",
+    FOLDER: "folder",
+    FILE: "file",
+    TABLE: "table",
+    ENTITY_VIEW: "entityview",
+}
+
+# columns of every file view, see
+#   https://rest-docs.synapse.org/rest/GET/column/tableview/defaults.html
+DEFAULT_VIEW_COLUMNS = [
+    ("id", "ENTITYID"),
+    ("name", "STRING"),
+    ("createdOn", "DATE"),
+    ("createdBy", "USERID"),
+    ("etag", "STRING"),
+    ("type", "STRING"),
+    ("currentVersion", "INTEGER"),
+    ("parentId", "ENTITYID"),
+    ("benefactorId", "ENTITYID"),
+    ("projectId", "ENTITYID"),
+    ("modifiedOn", "DATE"),
+    ("modifiedBy", "USERID"),
+    ("dataFileHandleId", "FILEHANDLEID"),
+    ("path", "STRING"),
+]
+
+
+class StandInError(Exception):
+    """Error answered to a request, with its HTTP status code"""
+
+    def __init__(self, status: int, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _to_annotation_value(value: Any) -> Dict[str, Any]:
+    values = value if isinstance(value, list) else [value]
+    if all(isinstance(item, bool) for item in values):
+        return {"type": "BOOLEAN", "value": [str(item).lower() for item in values]}
+    if all(isinstance(item, int) for item in values):
+        return {"type": "LONG", "value": [str(item) for item in values]}
+    if all(isinstance(item, (int, float)) for item in values):
+        return {"type": "DOUBLE", "value": [str(item) for item in values]}
+    return {"type": "STRING", "value": [str(item) for item in values]}
+
+
+def _get_partial_row_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    # the values of a partial row are sent as a list of column IDs and values
+    values = row.get("values") or {}
+    if isinstance(values, list):
+        return {value["key"]: value["value"] for value in values}
+    return values
+
+
+def _to_view_annotation_value(value: str, column_type: str) -> Dict[str, Any]:
+    # values written through a view are converted to the type of their column
+    if column_type.endswith("_LIST"):
+        values = json.loads(value)
+        column_type = column_type[: -len("_LIST")]
+    else:
+        values = [value]
+    annotation_type = {
+        "INTEGER": "LONG",
+        "DOUBLE": "DOUBLE",
+        "BOOLEAN": "BOOLEAN",
+        "DATE": "TIMESTAMP_MS",
+    }.get(column_type, "STRING")
+    values = [str(item) for item in values]
+    if annotation_type == "BOOLEAN":
+        values = [item.lower() for item in values]
+    return {"type": annotation_type, "value": values}
+
+
+def _from_annotation_value(annotation: Dict[str, Any]) -> Any:
+    values = annotation["value"]
+    if annotation["type"] in ("LONG", "TIMESTAMP_MS"):
+        values = [int(value) for value in values]
+    elif annotation["type"] == "DOUBLE":
+        values = [float(value) for value in values]
+    elif annotation["type"] == "BOOLEAN":
+        values = [value == "true" for value in values]
+    return values[0] if len(values) == 1 else values
+
+
+class SynapseStandIn:
+    """
+    In memory Synapse server, serving the REST API over HTTP on a local port.
+
+    Requests can be slowed down by latency seconds, every throttle_every-th request is
+      answered with 429, and requests fail with 503 at failure_rate. Failures are drawn
+      from a random generator seeded with seed, so that runs are reproducible. Requests
+      are counted per route in request_counts, and responses per status code in
+      status_counts.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Args:
+            latency: number of seconds each request is delayed by
+            throttle_every: every throttle_every-th request is answered with 429, 0 for
+              none
+            failure_rate: share of the requests answered with 503
+            seed: seed of the failures
+        """
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.failure_rate = failure_rate
+        self.request_counts: Counter = Counter()
+        self.status_counts: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._next_id = 1000
+        self._request_number = 0
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.annotations: Dict[str, Dict[str, Any]] = {}
+        self.file_handles: Dict[str, Dict[str, Any]] = {}
+        self.file_contents: Dict[str, bytes] = {}
+        self.table_columns: Dict[str, List[Dict[str, str]]] = {}
+        self.table_rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.view_scopes: Dict[str, List[str]] = {}
+        self.synthetic_rows: Dict[str, pd.DataFrame] = {}
+        self.columns: Dict[str, Dict[str, Any]] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self._databases: Dict[str, Tuple[int, sqlite3.Connection]] = {}
+        self._version = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = self._get_routes()
+
+    # server
+
+    @property
+    def endpoint(self) -> str:
+        """Base URL of the server"""
+        if self._server is None:
+            raise RuntimeError("The stand-in is not started")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SynapseStandIn":
+        """Starts serving on a free local port"""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Handler passing the requests to the stand-in"""
+
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                standin._handle(self)  # pylint: disable=protected-access
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "SynapseStandIn":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def create_client(self, token: str) -> synapseclient.Synapse:
+        """
+        Args:
+            token: access token of a user added with add_user
+
+        Returns:
+            synapseclient.Synapse: a client logged in to the stand-in
+        """
+        syn = synapseclient.Synapse(
+            repoEndpoint=f"{self.endpoint}/repo/v1",
+            authEndpoint=f"{self.endpoint}/auth/v1",
+            fileHandleEndpoint=f"{self.endpoint}/file/v1",
+            portalEndpoint=f"{self.endpoint}/",
+            debug=False,
+            skip_checks=True,
+            cache_client=False,
+        )
+        syn.login(authToken=token, silent=True)
+        return syn
+
+    # seeding
+
+    def _new_id(self) -> str:
+        with self._lock:
+            self._next_id += 1
+            return str(self._next_id)
+
+    def _changed(self) -> None:
+        self._version += 1
+
+    def add_user(self, token: str, user_name: str = "user") -> str:
+        """
+        Args:
+            token: access token the user logs in with
+            user_name: name of the user
+
+        Returns:
+            str: principal id of the user
+        """
+        owner_id = self._new_id()
+        self.users[token] = {
+            "ownerId": owner_id,
+            "userName": user_name,
+            "displayName": user_name,
+            "etag": str(uuid.uuid4()),
+        }
+        return owner_id
+
+    def _get_project_id(self, parent_id: Optional[str]) -> Optional[str]:
+        while parent_id is not None:
+            parent = self.entities[parent_id]
+            if parent["concreteType"] == PROJECT:
+                return parent_id
+            parent_id = parent.get("parentId")
+        return None
+
+    def get_path(self, synapse_id: str) -> str:
+        """Path of an entity, from its project, as in the path column of file views"""
+        return self._get_path(self.entities[synapse_id])
+
+    def _get_path(self, entity: Dict[str, Any]) -> str:
+        names = [entity["name"]]
+        parent_id = entity.get("parentId")
+        while parent_id is not None and parent_id in self.entities:
+            names.append(self.entities[parent_id]["name"])
+            parent_id = self.entities[parent_id].get("parentId")
+        return "/".join(reversed(names))
+
+    def _check_name(self, name: str, parent_id: Optional[str]) -> None:
+        for entity in self.entities.values():
+            if entity.get("parentId") == parent_id and entity["name"] == name:
+                raise StandInError(
+                    409, f"An entity with the name: {name} already exists"
+                )
+
+    def add_entity(
+        self,
+        concrete_type: str,
+        name: str,
+        parent_id: Optional[str] = None,
+        annotations: Optional[Dict[str, Any]] = None,
+        **properties: Any,
+    ) -> str:
+        """
+        Args:
+            concrete_type: concrete type of the entity
+            name: name of the entity
+            parent_id: Synapse ID of the parent of the entity
+            annotations: annotations of the entity, as plain values
+            **properties: other properties of the entity
+
+        Returns:
+            str: Synapse ID of the entity
+        """
+        with self._lock:
+            if parent_id is not None:
+                self._check_name(name, parent_id)
+            synapse_id = f"syn{self._new_id()}"
+            now = _now()
+            self.entities[synapse_id] = {
+                "id": synapse_id,
+                "name": name,
+                "parentId": parent_id,
+                "concreteType": concrete_type,
+                "etag": str(uuid.uuid4()),
+                "createdOn": now,
+                "modifiedOn": now,
+                "createdBy": "1",
+                "modifiedBy": "1",
+                "versionNumber": 1,
+                "versionLabel": "1",
+                "isLatestVersion": True,
+                **properties,
+            }
+            self.annotations[synapse_id] = {
+                key: _to_annotation_value(value)
+                for key, value in (annotations or {}).items()
+            }
+            self._changed()
+            return synapse_id
+
+    def add_project(self, name: str) -> str:
+        """Adds a project, and returns its Synapse ID"""
+        return self.add_entity(PROJECT, name)
+
+    def add_folder(
+        self, name: str, parent_id: str, annotations: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Adds a folder, and returns its Synapse ID"""
+        return self.add_entity(FOLDER, name, parent_id, annotations)
+
+    def add_file_handle(self, file_name: str, content: bytes) -> str:
+        """Adds a file handle with the content, and returns its id"""
+        with self._lock:
+            file_handle_id = self._new_id()
+            self.file_handles[file_handle_id] = {
+                "id": file_handle_id,
+                "concreteType": S3_FILE_HANDLE,
+                "etag": str(uuid.uuid4()),
+                "createdBy": "1",
+                "createdOn": _now(),
+                "fileName": file_name,
+                "contentType": "text/csv",
+                "contentMd5": hashlib.md5(content).hexdigest(),
+                "contentSize": len(content),
+                "storageLocationId": 1,
+                "bucketName": "standin",
+                "key": f"{file_handle_id}/{file_name}",
+            }
+            self.file_contents[file_handle_id] = content
+            return file_handle_id
+
+    def add_file(
+        self,
+        name: str,
+        parent_id: str,
+        content: bytes,
+        annotations: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Adds a file with the content, and returns its Synapse ID"""
+        file_handle_id = self.add_file_handle(name, content)
+        return self.add_entity(
+            FILE, name, parent_id, annotations, dataFileHandleId=file_handle_id
+        )
+
+    def add_column(self, name: str, column_type: str = "STRING") -> Dict[str, Any]:
+        """Adds a column model, and returns it"""
+        with self._lock:
+            column = {"id": self._new_id(), "name": name, "columnType": column_type}
+            if column_type == "STRING":
+                column["maximumSize"] = 250
+            self.columns[column["id"]] = column
+            return column
+
+    def add_table(
+        self, name: str, parent_id: str, columns: List[Tuple[str, str]]
+    ) -> str:
+        """
+        Args:
+            name: name of the table
+            parent_id: Synapse ID of the project of the table
+            columns: names and types of the columns
+
+        Returns:
+            str: Synapse ID of the table
+        """
+        column_models = [self.add_column(*column) for column in columns]
+        table_id = self.add_entity(
+            TABLE,
+            name,
+            parent_id,
+            columnIds=[column["id"] for column in column_models],
+        )
+        self.table_columns[table_id] = column_models
+        self.table_rows[table_id] = []
+        return table_id
+
+    def add_fileview(
+        self,
+        name: str,
+        parent_id: str,
+        scope_ids: List[str],
+        columns: Optional[List[Tuple[str, str]]] = None,
+    ) -> str:
+        """
+        Args:
+            name: name of the file view
+            parent_id: Synapse ID of the project of the file view
+            scope_ids: Synapse IDs of the projects and folders in the scope of the view
+            columns: names and types of the annotation columns of the view
+
+        Returns:
+            str: Synapse ID of the file view
+        """
+        column_models = [
+            self.add_column(*column) for column in DEFAULT_VIEW_COLUMNS + (columns or [])
+        ]
+        view_id = self.add_entity(
+            ENTITY_VIEW,
+            name,
+            parent_id,
+            columnIds=[column["id"] for column in column_models],
+            scopeIds=[scope_id.replace("syn", "") for scope_id in scope_ids],
+            viewTypeMask=0x1 | 0x8,
+        )
+        self.table_columns[view_id] = column_models
+        self.view_scopes[view_id] = list(scope_ids)
+        return view_id
+
+    def add_fileview_rows(self, view_id: str, rows: pd.DataFrame) -> None:
+        """
+        Adds rows to a file view that are not backed by entities
+
+        Args:
+            view_id: Synapse ID of the file view
+            rows: the rows, with columns of the view
+        """
+        with self._lock:
+            self.synthetic_rows[view_id] = pd.concat(
+                [self.synthetic_rows.get(view_id, pd.DataFrame()), rows],
+                ignore_index=True,
+            )
+            self._changed()
+
+    # rows of tables and views
+
+    def _get_column_names(self, table_id: str) -> List[str]:
+        return [column["name"] for column in self.table_columns[table_id]]
+
+    @staticmethod
+    def _get_sqlite_names(names: List[str]) -> List[str]:
+        # SQLite column names are case insensitive, Synapse column names are not
+        sqlite_names, seen = [], set()
+        for position, name in enumerate(names):
+            sqlite_name = name if name.lower() not in seen else f"{name}__{position}"
+            seen.add(sqlite_name.lower())
+            sqlite_names.append(sqlite_name)
+        return sqlite_names
+
+    def _get_scope_entity_ids(self, scope_ids: List[str]) -> List[str]:
+        """Synapse IDs of the files and folders in projects or folders of the scope"""
+        scope = {f"syn{str(scope_id).replace('syn', '')}" for scope_id in scope_ids}
+        return [
+            synapse_id
+            for synapse_id, entity in self.entities.items()
+            if entity["concreteType"] in (FILE, FOLDER)
+            and (
+                self._get_project_id(entity.get("parentId")) in scope
+                or entity.get("parentId") in scope
+            )
+        ]
+
+    def _get_view_rows(self, view_id: str) -> List[Dict[str, Any]]:
+        rows = []
+        for synapse_id in self._get_scope_entity_ids(self.view_scopes[view_id]):
+            entity = self.entities[synapse_id]
+            project_id = self._get_project_id(entity.get("parentId"))
+            row = {
+                "id": synapse_id,
+                "name": entity["name"],
+                "createdOn": entity["createdOn"],
+                "createdBy": entity["createdBy"],
+                "etag": entity["etag"],
+                "type": TYPE_NAMES[entity["concreteType"]],
+                "currentVersion": entity["versionNumber"],
+                "parentId": entity.get("parentId"),
+                "benefactorId": project_id,
+                "projectId": project_id,
+                "modifiedOn": entity["modifiedOn"],
+                "modifiedBy": entity["modifiedBy"],
+                "dataFileHandleId": entity.get("dataFileHandleId"),
+                "path": self._get_path(entity),
+            }
+            for key, annotation in self.annotations[synapse_id].items():
+                value = _from_annotation_value(annotation)
+                row.setdefault(
+                    key,
+                    ", ".join(str(item) for item in value)
+                    if isinstance(value, list)
+                    else value,
+                )
+            rows.append(row)
+        return rows
+
+    def _get_database(self, table_id: str) -> sqlite3.Connection:
+        """SQLite database with the rows of the table or view, in a table named rows"""
+        with self._lock:
+            version, database = self._databases.get(table_id, (None, None))
+            if version == self._version:
+                return database
+            columns = self._get_column_names(table_id)
+            if table_id in self.view_scopes:
+                rows = pd.concat(
+                    [
+                        pd.DataFrame(self._get_view_rows(table_id)),
+                        self.synthetic_rows.get(table_id, pd.DataFrame()),
+                    ],
+                    ignore_index=True,
+                )
+                # the rows of a view are the entities, by their numeric IDs
+                row_ids = rows["id"].str[3:].astype(int) if len(rows) else []
+                etags = rows["etag"] if len(rows) else []
+                rows = rows.reindex(columns=columns)
+                rows.insert(0, "ROW_ID", row_ids)
+                rows.insert(1, "ROW_VERSION", 1)
+                # the etags of the entities, that are not necessarily view columns
+                rows.insert(2, "ROW_ETAG", etags)
+            else:
+                rows = pd.DataFrame(self.table_rows[table_id])
+                rows = rows.reindex(columns=["ROW_ID", "ROW_VERSION"] + columns)
+            system_columns = list(rows.columns[: len(rows.columns) - len(columns)])
+            rows.columns = system_columns + self._get_sqlite_names(columns)
+            database = sqlite3.connect(":memory:", check_same_thread=False)
+            rows.to_sql("rows", database, index=False)
+            self._databases[table_id] = (self._version, database)
+            return database
+
+    def _query(self, sql: str) -> Tuple[str, List[str], List[tuple]]:
+        """
+        Runs a Synapse SQL query
+
+        Returns:
+            Tuple[str, List[str], List[tuple]]: id of the queried table, names of the
+              selected columns and selected rows, with ROW_ID and ROW_VERSION first
+        """
+        match = re.search(r"\bFROM\s+(syn\d+)", sql, flags=re.IGNORECASE)
+        if match is None or match.group(1) not in self.table_columns:
+            raise StandInError(404, "The table does not exist")
+        table_id = match.group(1)
+        translated = sql[: match.start(1)] + "rows" + sql[match.end(1) :]
+        translated = translated.strip().rstrip(";")
+        select = re.match(
+            r"\s*SELECT\s+(.*?)\s+FROM\s", translated, flags=re.IGNORECASE | re.DOTALL
+        )
+        is_aggregate = select is not None and re.search(
+            r"\b(COUNT|SUM|MAX|MIN|AVG)\s*\(|\bDISTINCT\b",
+            select.group(1),
+            flags=re.IGNORECASE,
+        )
+        if select is not None and not is_aggregate:
+            selected = select.group(1)
+            if selected.strip() == "*":
+                names = self._get_column_names(table_id)
+                selected = ", ".join(
+                    f'"{sqlite_name}" AS "{name}"'
+                    for name, sqlite_name in zip(names, self._get_sqlite_names(names))
+                )
+            translated = (
+                translated[: select.start(1)]
+                + "ROW_ID, ROW_VERSION, "
+                + selected
+                + translated[select.end(1) :]
+            )
+        database = self._get_database(table_id)
+        with self._lock:
+            try:
+                cursor = database.execute(translated)
+            except sqlite3.Error as exc:
+                raise StandInError(400, f"Invalid query: {exc}") from exc
+            names = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        if is_aggregate:
+            names = ["ROW_ID", "ROW_VERSION"] + names
+            rows = [(None, None) + tuple(row) for row in rows]
+        return table_id, names, rows
+
+    # request handling
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        path, _, query = handler.path.partition("?")
+        status, payload, content_type = 200, None, "application/json"
+        try:
+            route, function, arguments = self._route(handler.command, path)
+            self.request_counts[(handler.command, route)] += 1
+            self._inject_faults()
+            user = None
+            if route not in ("/files/{id}", "/upload/{id}"):
+                user = self._get_user(handler)
+            payload = function(
+                *arguments,
+                body=json.loads(body) if body and route != "/upload/{id}" else body,
+                query=query,
+                user=user,
+            )
+            if isinstance(payload, bytes):
+                content_type = "application/octet-stream"
+                status, payload = self._get_range(handler, payload)
+        except StandInError as exc:
+            status, payload = exc.status, {"reason": exc.reason}
+        self.status_counts[status] += 1
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        if payload is None:
+            data = b""
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    @staticmethod
+    def _get_range(
+        handler: BaseHTTPRequestHandler, content: bytes
+    ) -> Tuple[int, bytes]:
+        # large files are downloaded in parts by range requests
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", handler.headers.get("Range", ""))
+        if not match:
+            return 200, content
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(content) - 1
+        return 206, content[start : end + 1]
+
+    def _inject_faults(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._request_number += 1
+            request_number = self._request_number
+            failed = self.failure_rate and self._random.random() < self.failure_rate
+        if self.throttle_every and request_number % self.throttle_every == 0:
+            raise StandInError(429, "Too many requests")
+        if failed:
+            raise StandInError(503, "Service unavailable")
+
+    def _get_user(self, handler: BaseHTTPRequestHandler) -> Dict[str, Any]:
+        authorization = handler.headers.get("Authorization", "")
+        token = authorization.replace("Bearer ", "")
+        if token not in self.users:
+            raise StandInError(401, "Invalid access token")
+        return self.users[token]
+
+    def _route(
+        self, method: str, path: str
+    ) -> Tuple[str, Callable[..., Any], Tuple[str, ...]]:
+        for route_method, route, pattern, function in self._routes:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                return route, function, match.groups()
+        raise StandInError(404, f"{method} {path} is not supported by the stand-in")
+
+    def _get_routes(self) -> List[Tuple[str, str, re.Pattern, Callable[..., Any]]]:
+        routes = [
+            ("GET", "/repo/v1/userProfile", self._get_user_profile),
+            ("GET", "/repo/v1/entity/{id}", self._get_entity),
+            ("PUT", "/repo/v1/entity/{id}", self._update_entity),
+            ("DELETE", "/repo/v1/entity/{id}", self._delete_entity),
+            ("POST", "/repo/v1/entity", self._create_entity),
+            ("POST", "/repo/v1/entity/{id}/bundle2", self._get_bundle),
+            (
+                "POST",
+                "/repo/v1/entity/{id}/version/{id}/bundle2",
+                self._get_version_bundle,
+            ),
+            ("GET", "/repo/v1/entity/{id}/version/{id}", self._get_entity_version),
+            ("GET", "/repo/v1/entity/{id}/annotations2", self._get_annotations),
+            ("PUT", "/repo/v1/entity/{id}/annotations2", self._update_annotations),
+            ("POST", "/repo/v1/entity/children", self._get_children),
+            ("POST", "/repo/v1/entity/child", self._get_child),
+            ("GET", "/repo/v1/entity/{id}/path", self._get_entity_path),
+            ("GET", "/repo/v1/entity/{id}/column", self._get_entity_columns),
+            ("GET", "/repo/v1/column/{id}", self._get_column),
+            ("POST", "/repo/v1/column/batch", self._create_columns),
+            ("GET", "/repo/v1/projects/user/{id}", self._get_project_headers),
+            (
+                "POST",
+                "/repo/v1/column/view/scope/async/start",
+                self._start_view_columns,
+            ),
+            ("GET", "/repo/v1/column/view/scope/async/get/{token}", self._get_job),
+            (
+                "POST",
+                "/repo/v1/entity/{id}/table/query/async/start",
+                self._start_query,
+            ),
+            (
+                "GET",
+                "/repo/v1/entity/{id}/table/query/async/get/{token}",
+                self._get_job,
+            ),
+            (
+                "POST",
+                "/repo/v1/entity/{id}/table/download/csv/async/start",
+                self._start_csv_download,
+            ),
+            (
+                "GET",
+                "/repo/v1/entity/{id}/table/download/csv/async/get/{token}",
+                self._get_job,
+            ),
+            (
+                "POST",
+                "/repo/v1/entity/{id}/table/transaction/async/start",
+                self._start_transaction,
+            ),
+            (
+                "GET",
+                "/repo/v1/entity/{id}/table/transaction/async/get/{token}",
+                self._get_job,
+            ),
+            ("POST", "/file/v1/fileHandle/batch", self._get_file_handles),
+            ("GET", "/file/v1/fileHandle/{id}", self._get_file_handle),
+            ("GET", "/file/v1/fileHandle/{id}/url", self._get_file_handle_url),
+            (
+                "GET",
+                "/file/v1/entity/{id}/uploadDestination",
+                self._get_upload_destination,
+            ),
+            ("POST", "/file/v1/file/multipart", self._start_upload),
+            (
+                "POST",
+                "/file/v1/file/multipart/{token}/presigned/url/batch",
+                self._get_upload_urls,
+            ),
+            ("PUT", "/upload/{id}", self._upload_part),
+            (
+                "PUT",
+                "/file/v1/file/multipart/{token}/add/{id}",
+                self._add_upload_part,
+            ),
+            (
+                "PUT",
+                "/file/v1/file/multipart/{token}/complete",
+                self._complete_upload,
+            ),
+            ("GET", "/files/{id}", self._download_file),
+        ]
+        return [
+            (
+                method,
+                route,
+                re.compile(
+                    re.escape(route)
+                    .replace(re.escape("{id}"), r"([\w.-]+)")
+                    .replace(re.escape("{token}"), r"([\w-]+)")
+                ),
+                function,
+            )
+            for method, route, function in routes
+        ]
+
+    # entities
+
+    def _get_entity_or_404(self, synapse_id: str) -> Dict[str, Any]:
+        entity = self.entities.get(synapse_id.split(".")[0])
+        if entity is None:
+            raise StandInError(404, f"Entity {synapse_id} does not exist")
+        return entity
+
+    def _get_user_profile(self, user: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        return user
+
+    def _get_entity(self, synapse_id: str, **_: Any) -> Dict[str, Any]:
+        return self._get_entity_or_404(synapse_id)
+
+    def _get_entity_version(
+        self, synapse_id: str, version: str, **_: Any
+    ) -> Dict[str, Any]:
+        return self._get_entity_or_404(synapse_id)
+
+    def _create_entity(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        properties = {
+            key: value
+            for key, value in body.items()
+            if key not in ("name", "parentId", "concreteType", "id", "etag")
+        }
+        name = body.get("name") or str(uuid.uuid4())
+        synapse_id = self.add_entity(
+            body["concreteType"], name, body.get("parentId"), **properties
+        )
+        if body["concreteType"] == TABLE and "columnIds" in body:
+            self.table_columns[synapse_id] = [
+                self.columns[column_id] for column_id in body["columnIds"]
+            ]
+            self.table_rows[synapse_id] = []
+        if body["concreteType"] == ENTITY_VIEW:
+            self.table_columns[synapse_id] = [
+                self.columns[column_id] for column_id in body.get("columnIds", [])
+            ]
+            self.view_scopes[synapse_id] = [
+                f"syn{scope_id}" for scope_id in body.get("scopeIds", [])
+            ]
+        return self.entities[synapse_id]
+
+    def _update_entity(
+        self, synapse_id: str, body: Dict[str, Any], **_: Any
+    ) -> Dict[str, Any]:
+        with self._lock:
+            entity = self._get_entity_or_404(synapse_id)
+            if body.get("etag") != entity["etag"]:
+                raise StandInError(412, "The entity was updated since it was read")
+            new_version = (
+                body.get("dataFileHandleId") is not None
+                and body.get("dataFileHandleId") != entity.get("dataFileHandleId")
+            )
+            entity.update(body)
+            entity["etag"] = str(uuid.uuid4())
+            entity["modifiedOn"] = _now()
+            if new_version:
+                entity["versionNumber"] += 1
+                entity["versionLabel"] = str(entity["versionNumber"])
+            if entity["concreteType"] in (TABLE, ENTITY_VIEW) and "columnIds" in body:
+                self.table_columns[synapse_id] = [
+                    self.columns[column_id] for column_id in body["columnIds"]
+                ]
+            if "scopeIds" in body and synapse_id in self.view_scopes:
+                self.view_scopes[synapse_id] = [
+                    f"syn{scope_id}" for scope_id in body["scopeIds"]
+                ]
+            self._changed()
+            return entity
+
+    def _delete_entity(self, synapse_id: str, **_: Any) -> None:
+        with self._lock:
+            self._get_entity_or_404(synapse_id)
+            removed = {synapse_id}
+            # children are removed with their parent
+            while True:
+                children = {
+                    child_id
+                    for child_id, child in self.entities.items()
+                    if child.get("parentId") in removed and child_id not in removed
+                }
+                if not children:
+                    break
+                removed |= children
+            for removed_id in removed:
+                self.entities.pop(removed_id, None)
+                self.annotations.pop(removed_id, None)
+            self._changed()
+
+    def _get_bundle(self, synapse_id: str, **_: Any) -> Dict[str, Any]:
+        entity = self._get_entity_or_404(synapse_id)
+        file_handles = []
+        if entity.get("dataFileHandleId") in self.file_handles:
+            file_handles.append(self.file_handles[entity["dataFileHandleId"]])
+        return {
+            "entity": entity,
+            "annotations": self._get_annotations(synapse_id),
+            "fileHandles": file_handles,
+            "restrictionInformation": {
+                "objectId": int(synapse_id.split(".")[0].replace("syn", "")),
+                "restrictionLevel": "OPEN",
+                "hasUnmetAccessRequirement": False,
+            },
+        }
+
+    def _get_version_bundle(
+        self, synapse_id: str, version: str, **kwargs: Any
+    ) -> Dict[str, Any]:
+        # versions are not kept, the current one is answered
+        return self._get_bundle(synapse_id, **kwargs)
+
+    def _get_annotations(self, synapse_id: str, **_: Any) -> Dict[str, Any]:
+        entity = self._get_entity_or_404(synapse_id)
+        return {
+            "id": entity["id"],
+            "etag": entity["etag"],
+            "annotations": self.annotations[entity["id"]],
+        }
+
+    def _update_annotations(
+        self, synapse_id: str, body: Dict[str, Any], **_: Any
+    ) -> Dict[str, Any]:
+        with self._lock:
+            entity = self._get_entity_or_404(synapse_id)
+            if body.get("etag") != entity["etag"]:
+                raise StandInError(412, "The entity was updated since it was read")
+            self.annotations[entity["id"]] = body.get("annotations", {})
+            entity["etag"] = str(uuid.uuid4())
+            self._changed()
+            return self._get_annotations(synapse_id)
+
+    def _get_children(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        parent_id = body.get("parentId")
+        include_types = [
+            type_name.lower() for type_name in body.get("includeTypes", ["file"])
+        ]
+        children = [
+            {
+                "id": entity["id"],
+                "name": entity["name"],
+                "type": entity["concreteType"],
+                "versionNumber": entity["versionNumber"],
+                "versionLabel": entity["versionLabel"],
+                "isLatestVersion": True,
+                "createdOn": entity["createdOn"],
+                "modifiedOn": entity["modifiedOn"],
+                "createdBy": entity["createdBy"],
+                "modifiedBy": entity["modifiedBy"],
+            }
+            for entity in list(self.entities.values())
+            if entity.get("parentId") == parent_id
+            and TYPE_NAMES[entity["concreteType"]] in include_types
+        ]
+        return {"page": sorted(children, key=lambda child: child["name"])}
+
+    def _get_child(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        for entity in list(self.entities.values()):
+            if (
+                entity.get("parentId") == body.get("parentId")
+                and entity["name"] == body["entityName"]
+            ):
+                return {"id": entity["id"]}
+        raise StandInError(404, "Entity does not exist")
+
+    def _get_entity_path(self, synapse_id: str, **_: Any) -> Dict[str, Any]:
+        entity = self._get_entity_or_404(synapse_id)
+        path = []
+        while entity is not None:
+            path.append(
+                {
+                    "id": entity["id"],
+                    "name": entity["name"],
+                    "type": entity["concreteType"],
+                }
+            )
+            entity = self.entities.get(entity.get("parentId"))
+        path.append({"id": "syn4489", "name": "root", "type": FOLDER})
+        return {"path": list(reversed(path))}
+
+    def _get_project_headers(self, principal_id: str, **_: Any) -> Dict[str, Any]:
+        return {
+            "results": [
+                {"id": entity["id"], "name": entity["name"]}
+                for entity in list(self.entities.values())
+                if entity["concreteType"] == PROJECT
+            ]
+        }
+
+    # columns and tables
+
+    def _get_entity_columns(self, synapse_id: str, **_: Any) -> Dict[str, Any]:
+        self._get_entity_or_404(synapse_id)
+        columns = self.table_columns.get(synapse_id, [])
+        return {"results": columns, "totalNumberOfResults": len(columns)}
+
+    def _get_column(self, column_id: str, **_: Any) -> Dict[str, Any]:
+        if column_id not in self.columns:
+            raise StandInError(404, f"Column {column_id} does not exist")
+        return self.columns[column_id]
+
+    def _create_columns(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        columns = []
+        for column in body["list"]:
+            created = self.add_column(column["name"], column["columnType"])
+            created.update(
+                {
+                    key: value
+                    for key, value in column.items()
+                    if key not in ("id", "concreteType")
+                }
+            )
+            columns.append(created)
+        return {
+            "concreteType": "org.sagebionetworks.repo.model.ListWrapper",
+            "list": columns,
+        }
+
+    def _start_view_columns(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        # a column per annotation of the entities in the scope, multiple values are
+        #   joined in a string
+        column_types = {}
+        for synapse_id in self._get_scope_entity_ids(body["viewScope"]["scope"]):
+            for key, annotation in self.annotations[synapse_id].items():
+                column_type = {
+                    "LONG": "INTEGER",
+                    "DOUBLE": "DOUBLE",
+                    "BOOLEAN": "BOOLEAN",
+                }.get(annotation["type"], "STRING")
+                if len(annotation["value"]) > 1:
+                    column_type = "STRING"
+                if column_types.get(key, column_type) != column_type:
+                    column_type = "STRING"
+                column_types[key] = column_type
+        results = [
+            {"name": name, "columnType": column_type}
+            for name, column_type in column_types.items()
+        ]
+        return self._new_job({"results": results})
+
+    def _new_job(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        token = self._new_id()
+        self.jobs[token] = response
+        return {"token": token}
+
+    def _get_job(self, *arguments: str, **_: Any) -> Dict[str, Any]:
+        token = arguments[-1]
+        if token not in self.jobs:
+            raise StandInError(404, f"Job {token} does not exist")
+        return self.jobs[token]
+
+    def _get_select_columns(
+        self, table_id: str, names: List[str]
+    ) -> List[Dict[str, Any]]:
+        columns = {column["name"]: column for column in self.table_columns[table_id]}
+        return [
+            {
+                "name": name,
+                "columnType": columns.get(name, {}).get("columnType", "STRING"),
+                "id": columns.get(name, {}).get("id"),
+            }
+            for name in names
+        ]
+
+    def _start_query(self, synapse_id: str, body: Dict[str, Any], **_: Any) -> Dict:
+        query = body["query"]
+        sql = query["sql"]
+        if query.get("limit") is not None:
+            sql = f"{sql.rstrip().rstrip(';')} LIMIT {query['limit']}"
+            if query.get("offset"):
+                sql += f" OFFSET {query['offset']}"
+        table_id, names, rows = self._query(sql)
+        select_columns = self._get_select_columns(table_id, names[2:])
+        rowset = {
+            "concreteType": "org.sagebionetworks.repo.model.table.RowSet",
+            "tableId": table_id,
+            "etag": self.entities[table_id]["etag"],
+            "headers": select_columns,
+            "rows": [
+                {
+                    "rowId": row[0],
+                    "versionNumber": row[1],
+                    "values": [
+                        None if value is None else str(value) for value in row[2:]
+                    ],
+                }
+                for row in rows
+            ],
+        }
+        return self._new_job(
+            {
+                "concreteType": "org.sagebionetworks.repo.model.table.QueryResultBundle",
+                "queryResult": {
+                    "concreteType": "org.sagebionetworks.repo.model.table.QueryResult",
+                    "queryResults": rowset,
+                },
+                "queryCount": len(rows),
+                "selectColumns": select_columns,
+                "maxRowsPerPage": max(len(rows), 1),
+                "columnModels": self.table_columns[table_id],
+            }
+        )
+
+    def _start_csv_download(
+        self, synapse_id: str, body: Dict[str, Any], **_: Any
+    ) -> Dict[str, Any]:
+        table_id, names, rows = self._query(body["sql"])
+        include_row_ids = body.get("includeRowIdAndRowVersion", True)
+        if (
+            include_row_ids
+            and body.get("includeEntityEtag")
+            and table_id in self.view_scopes
+        ):
+            # the etags of the entities follow the row IDs and versions of views
+            database = self._get_database(table_id)
+            with self._lock:
+                etags = dict(database.execute("SELECT ROW_ID, ROW_ETAG FROM rows"))
+            names = names[:2] + ["ROW_ETAG"] + names[2:]
+            rows = [row[:2] + (etags.get(row[0]),) + row[2:] for row in rows]
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        if include_row_ids:
+            writer.writerow(names)
+            writer.writerows(
+                ["" if value is None else value for value in row] for row in rows
+            )
+        else:
+            writer.writerow(names[2:])
+            writer.writerows(
+                ["" if value is None else value for value in row[2:]] for row in rows
+            )
+        file_handle_id = self.add_file_handle(
+            f"Job-{table_id}.csv", output.getvalue().encode("utf-8")
+        )
+        return self._new_job(
+            {
+                "concreteType": "org.sagebionetworks.repo.model.table.DownloadFromTableResult",
+                "resultsFileHandleId": file_handle_id,
+                "tableId": table_id,
+                "etag": self.entities[table_id]["etag"],
+                "headers": self._get_select_columns(
+                    table_id, [name for name in names[2:] if name != "ROW_ETAG"]
+                ),
+            }
+        )
+
+    def _start_transaction(
+        self, synapse_id: str, body: Dict[str, Any], **_: Any
+    ) -> Dict[str, Any]:
+        responses = []
+        with self._lock:
+            for change in body.get("changes", []):
+                concrete_type = change["concreteType"].rsplit(".", 1)[-1]
+                if concrete_type == "TableSchemaChangeRequest":
+                    responses.append(self._change_schema(synapse_id, change))
+                elif concrete_type == "UploadToTableRequest":
+                    responses.append(self._upload_rows(synapse_id, change))
+                elif concrete_type == "AppendableRowSetRequest":
+                    responses.append(self._append_rows(synapse_id, change["toAppend"]))
+                else:
+                    raise StandInError(400, f"{concrete_type} is not supported")
+            self._changed()
+        return self._new_job(
+            {
+                "concreteType": "org.sagebionetworks.repo.model.table.TableUpdateTransactionResponse",
+                "results": responses,
+            }
+        )
+
+    def _change_schema(self, table_id: str, change: Dict[str, Any]) -> Dict[str, Any]:
+        columns = self.table_columns[table_id]
+        for column_change in change.get("changes", []):
+            old_id = column_change.get("oldColumnId")
+            new_id = column_change.get("newColumnId")
+            position = next(
+                (i for i, column in enumerate(columns) if column["id"] == old_id), None
+            )
+            if position is not None and new_id is None:
+                columns.pop(position)
+            elif position is not None:
+                old_name = columns[position]["name"]
+                columns[position] = self.columns[new_id]
+                for row in self.table_rows.get(table_id, []):
+                    row[self.columns[new_id]["name"]] = row.pop(old_name, None)
+            elif new_id is not None:
+                columns.append(self.columns[new_id])
+        if change.get("orderedColumnIds"):
+            columns[:] = [self.columns[column_id] for column_id in change["orderedColumnIds"]]
+        self.entities[table_id]["columnIds"] = [column["id"] for column in columns]
+        return {
+            "concreteType": "org.sagebionetworks.repo.model.table.TableSchemaChangeResponse",
+            "schema": columns,
+        }
+
+    def _apply_rows(self, table_id: str, rows: List[Dict[str, Any]]) -> int:
+        table_rows = self.table_rows[table_id]
+        by_id = {row["ROW_ID"]: row for row in table_rows}
+        next_row_id = max(by_id, default=0) + 1
+        for row in rows:
+            row_id = row.pop("ROW_ID", None)
+            row.pop("ROW_VERSION", None)
+            if row_id is not None and row_id in by_id:
+                if all(value is None for value in row.values()):
+                    table_rows.remove(by_id.pop(row_id))
+                    continue
+                by_id[row_id].update(row)
+                by_id[row_id]["ROW_VERSION"] += 1
+            else:
+                new_row = {"ROW_ID": next_row_id, "ROW_VERSION": 1, **row}
+                next_row_id += 1
+                table_rows.append(new_row)
+                by_id[new_row["ROW_ID"]] = new_row
+        self.entities[table_id]["etag"] = str(uuid.uuid4())
+        return len(rows)
+
+    def _upload_rows(self, table_id: str, change: Dict[str, Any]) -> Dict[str, Any]:
+        content = self.file_contents[str(change["uploadFileHandleId"])]
+        frame = pd.read_csv(
+            io.BytesIO(content), dtype=str, keep_default_na=False, na_values=[""]
+        )
+        frame = frame.astype(object).where(frame.notna(), None)
+        rows = frame.to_dict("records")
+        for row in rows:
+            if row.get("ROW_ID") is not None:
+                row["ROW_ID"] = int(float(row["ROW_ID"]))
+        count = self._apply_rows(table_id, rows)
+        return {
+            "concreteType": "org.sagebionetworks.repo.model.table.UploadToTableResult",
+            "rowsProcessed": count,
+            "etag": self.entities[table_id]["etag"],
+        }
+
+    def _append_rows(self, table_id: str, rowset: Dict[str, Any]) -> Dict[str, Any]:
+        if rowset["concreteType"].endswith("PartialRowSet"):
+            if table_id in self.view_scopes:
+                return self._update_view_rows(table_id, rowset["rows"])
+            rows = [
+                {
+                    "ROW_ID": row.get("rowId"),
+                    **{
+                        self.columns[column_id]["name"]: value
+                        for column_id, value in _get_partial_row_values(row).items()
+                    },
+                }
+                for row in rowset["rows"]
+            ]
+        else:
+            names = [
+                self.columns[header["id"]]["name"] if header.get("id") else header["name"]
+                for header in rowset["headers"]
+            ]
+            rows = [
+                {"ROW_ID": row.get("rowId"), **dict(zip(names, row["values"]))}
+                for row in rowset["rows"]
+            ]
+        self._apply_rows(table_id, rows)
+        return {
+            "concreteType": "org.sagebionetworks.repo.model.table.RowReferenceSetResults",
+            "rowReferenceSet": {"tableId": table_id, "rows": []},
+        }
+
+    def _update_view_rows(
+        self, view_id: str, rows: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        default_columns = {name for name, _ in DEFAULT_VIEW_COLUMNS}
+        for row in rows:
+            synapse_id = f"syn{row['rowId']}"
+            entity = self._get_entity_or_404(synapse_id)
+            annotations = self.annotations[synapse_id]
+            for column_id, value in _get_partial_row_values(row).items():
+                name = self.columns[column_id]["name"]
+                if name in default_columns:
+                    continue
+                if value is None or value == "":
+                    annotations.pop(name, None)
+                else:
+                    annotations[name] = _to_view_annotation_value(
+                        value, self.columns[column_id]["columnType"]
+                    )
+            entity["etag"] = str(uuid.uuid4())
+        return {
+            "concreteType": "org.sagebionetworks.repo.model.table.RowReferenceSetResults",
+            "rowReferenceSet": {"tableId": view_id, "rows": []},
+        }
+
+    # files
+
+    def _get_file_handle_or_404(self, file_handle_id: str) -> Dict[str, Any]:
+        file_handle = self.file_handles.get(str(file_handle_id))
+        if file_handle is None:
+            raise StandInError(404, f"File handle {file_handle_id} does not exist")
+        return file_handle
+
+    def _get_file_handle(self, file_handle_id: str, **_: Any) -> Dict[str, Any]:
+        return self._get_file_handle_or_404(file_handle_id)
+
+    def _get_file_handle_url(self, file_handle_id: str, **_: Any) -> Dict[str, Any]:
+        self._get_file_handle_or_404(file_handle_id)
+        return self._get_presigned_url(file_handle_id)
+
+    def _get_file_handles(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        results = []
+        for request in body["requestedFiles"]:
+            file_handle = self._get_file_handle_or_404(request["fileHandleId"])
+            result = {
+                "fileHandleId": file_handle["id"],
+                "fileHandle": file_handle,
+            }
+            if body.get("includePreSignedURLs"):
+                result["preSignedURL"] = self._get_presigned_url(file_handle["id"])
+            results.append(result)
+        return {"requestedFiles": results}
+
+    def _get_presigned_url(self, file_handle_id: str) -> str:
+        # the client reads the expiration of the URL from its S3 parameters
+        signed_on = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        return (
+            f"{self.endpoint}/files/{file_handle_id}"
+            f"?X-Amz-Date={signed_on}&X-Amz-Expires=900"
+        )
+
+    def _download_file(self, file_handle_id: str, **_: Any) -> bytes:
+        self._get_file_handle_or_404(file_handle_id)
+        return self.file_contents[file_handle_id]
+
+    def _get_upload_destination(self, synapse_id: str, **_: Any) -> Dict[str, Any]:
+        return {
+            "concreteType": "org.sagebionetworks.repo.model.file.S3UploadDestination",
+            "storageLocationId": 1,
+            "uploadType": "S3",
+        }
+
+    def _start_upload(self, body: Dict[str, Any], **_: Any) -> Dict[str, Any]:
+        upload_id = self._new_id()
+        number_of_parts = max(
+            1, -(-int(body.get("fileSizeBytes", 0)) // int(body.get("partSizeBytes", 1)))
+        )
+        self.uploads[upload_id] = {
+            "request": body,
+            "parts": {},
+            "number_of_parts": number_of_parts,
+        }
+        return self._get_upload_status(upload_id)
+
+    def _get_upload_status(self, upload_id: str) -> Dict[str, Any]:
+        upload = self.uploads[upload_id]
+        parts = "".join(
+            "1" if number in upload["parts"] else "0"
+            for number in range(1, upload["number_of_parts"] + 1)
+        )
+        status = {
+            "uploadId": upload_id,
+            "startedBy": "1",
+            "state": "COMPLETED" if "resultFileHandleId" in upload else "UPLOADING",
+            "partsState": parts,
+        }
+        if "resultFileHandleId" in upload:
+            status["resultFileHandleId"] = upload["resultFileHandleId"]
+        return status
+
+    def _get_upload_urls(
+        self, upload_id: str, body: Dict[str, Any], **_: Any
+    ) -> Dict[str, Any]:
+        return {
+            "partPresignedUrls": [
+                {
+                    "partNumber": number,
+                    "uploadPresignedUrl": f"{self.endpoint}/upload/{upload_id}-{number}",
+                    "signedHeaders": {},
+                }
+                for number in body["partNumbers"]
+            ]
+        }
+
+    def _upload_part(self, part: str, body: bytes, **_: Any) -> None:
+        upload_id, number = part.rsplit("-", 1)
+        self.uploads[upload_id]["parts"][int(number)] = body
+
+    def _add_upload_part(self, upload_id: str, number: str, **_: Any) -> Dict:
+        return {"uploadId": upload_id, "addPartState": "ADD_SUCCESS"}
+
+    def _complete_upload(self, upload_id: str, **_: Any) -> Dict[str, Any]:
+        upload = self.uploads[upload_id]
+        if "resultFileHandleId" not in upload:
+            content = b"".join(
+                upload["parts"][number] for number in sorted(upload["parts"])
+            )
+            upload["resultFileHandleId"] = self.add_file_handle(
+                upload["request"]["fileName"], content
+            )
+        return self._get_upload_status(upload_id)
+
+
+def get_manifest_csv(rows: List[Dict[str, Any]]) -> bytes:
+    """Content of a manifest CSV with the rows"""
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+def seed_projects(
+    standin: SynapseStandIn,
+    projects: int = 1,
+    datasets_per_project: int = 2,
+    files_per_dataset: int = 10,
+    component: str = "Biospecimen",
+    manifest_basename: str = "synapse_storage_manifest",
+) -> Dict[str, Any]:
+    """
+    Seeds the stand-in with projects holding datasets of files, each annotated and
+      described by a manifest, and a file view of all of them
+
+    Args:
+        standin: the stand-in
+        projects: number of projects
+        datasets_per_project: number of dataset folders per project
+        files_per_dataset: number of files per dataset
+        component: component of the files
+        manifest_basename: base name of the manifest files
+
+    Returns:
+        Dict[str, Any]: Synapse IDs of the fileview, projects, datasets and manifests
+    """
+    seeded: Dict[str, Any] = {"projects": [], "datasets": [], "manifests": []}
+    for project_number in range(projects):
+        project_id = standin.add_project(f"Project {project_number}")
+        seeded["projects"].append(project_id)
+        for dataset_number in range(datasets_per_project):
+            dataset_id = standin.add_folder(
+                f"Dataset {project_number}-{dataset_number}", project_id
+            )
+            seeded["datasets"].append(dataset_id)
+            rows = []
+            for file_number in range(files_per_dataset):
+                name = f"file_{project_number}_{dataset_number}_{file_number}.txt"
+                annotations = {"Component": component, "Sample ID": file_number}
+                file_id = standin.add_file(
+                    name, dataset_id, name.encode("utf-8"), annotations
+                )
+                rows.append(
+                    {
+                        "Filename": standin.get_path(file_id),
+                        "Sample ID": file_number,
+                        "Component": component,
+                        "Id": str(uuid.uuid4()),
+                        "entityId": file_id,
+                    }
+                )
+            seeded["manifests"].append(
+                standin.add_file(
+                    f"{manifest_basename}.csv",
+                    dataset_id,
+                    get_manifest_csv(rows),
+                    {"Component": component},
+                )
+            )
+    view_project = standin.add_project("Fileview project")
+    seeded["fileview"] = standin.add_fileview(
+        "Fileview",
+        view_project,
+        seeded["projects"],
+        [("Component", "STRING"), ("Sample ID", "STRING")],
+    )
+    return seeded
+
+
+def get_synthetic_fileview_rows(count: int, project_id: str) -> pd.DataFrame:
+    """
+    Args:
+        count: number of rows
+        project_id: Synapse ID put in the projectId column of the rows
+
+    Returns:
+        pd.DataFrame: rows of files that are not backed by entities, for large file views
+    """
+    ids = [f"syn{10**8 + number}" for number in range(count)]
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "name": [f"synthetic_{number}.txt" for number in range(count)],
+            "etag": [hashlib.md5(synapse_id.encode()).hexdigest() for synapse_id in ids],
+            "type": "file",
+            "currentVersion": 1,
+            "parentId": f"syn{10**8 - 1}",
+            "benefactorId": project_id,
+            "projectId": project_id,
+            "path": [f"Synthetic/synthetic_{number}.txt" for number in range(count)],
+            "Component": "Synthetic",
+        }
+    )
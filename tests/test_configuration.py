@@ -31,6 +31,26 @@ class TestDataclasses:
             ),
             SynapseConfig,
         )
+        with pytest.raises(ValidationError):
+            SynapseConfig(fileview_cache_max_age=-1)
+        with pytest.raises(ValidationError):
+            SynapseConfig(fileview_cache_folder="")
+        with pytest.raises(ValidationError):
+            SynapseConfig(entity_cache_size=-1)
+        with pytest.raises(ValidationError):
+            SynapseConfig(max_concurrent_requests=0)
+        with pytest.raises(ValidationError):
+            SynapseConfig(requests_per_second=0)
+        with pytest.raises(ValidationError):
+            SynapseConfig(cache_max_size=0)
+        with pytest.raises(ValidationError):
+            SynapseConfig(cache_min_age=-1)
+        with pytest.raises(ValidationError):
+            SynapseConfig(session_ttl=-1)
+        with pytest.raises(ValidationError):
+            SynapseConfig(manifest_cache_folder="")
+        with pytest.raises(ValidationError):
+            SynapseConfig(annotation_view_refresh_interval=-1)
 
     with pytest.raises(ValidationError):
         SynapseConfig(
@@ -64,6 +84,16 @@ class TestDataclasses:
             ManifestConfig(title="title", data_type="type")
         with pytest.raises(ValidationError):
             ManifestConfig(title="", data_type="type")
+        with pytest.raises(ValidationError):
+            ManifestConfig(validation_cache_ttl=-1)
+        with pytest.raises(ValidationError):
+            ManifestConfig(validation_cache_folder="")
+        with pytest.raises(ValidationError):
+            ManifestConfig(validation_max_messages=0)
+        with pytest.raises(ValidationError):
+            ManifestConfig(validation_max_errors_per_column=-1)
+        with pytest.raises(ValidationError):
+            ManifestConfig(validation_max_workers=0)
 
     def test_model_config(self) -> None:
         """Testing for ModelConfig"""
@@ -108,9 +138,31 @@ class TestConfiguration:
         assert os.path.basename(config.synapse_configuration_path) == ".synapseConfig"
         assert config.synapse_manifest_basename == "synapse_storage_manifest"
         assert config.synapse_master_fileview_id == "syn23643253"
+        assert os.path.basename(config.synapse_fileview_cache_folder) == "fileview_cache"
+        assert config.synapse_fileview_cache_max_age is None
+        assert config.synapse_entity_cache_size == 0
+        assert config.synapse_max_concurrent_requests == 25
+        assert config.synapse_requests_per_second is None
+        assert config.synapse_request_max_retries == 5
+        assert not config.synapse_bulk_annotation_upload
+        assert config.synapse_cache_max_size == 1
+        assert config.synapse_cache_janitor_interval == 300
+        assert config.synapse_cache_min_age == 15
+        assert config.synapse_session_ttl == 0
+        assert (
+            os.path.basename(config.synapse_manifest_cache_folder) == "manifest_cache"
+        )
+        assert config.synapse_manifest_cache_max_size == 0
+        assert config.synapse_endpoint is None
+        assert config.synapse_annotation_view_refresh_interval == 0
         assert config.manifest_folder == "manifests"
         assert config.manifest_title == "example"
         assert config.manifest_data_type == ["Biospecimen", "Patient"]
+        assert os.path.basename(config.validation_cache_folder) == "validation_cache"
+        assert config.validation_cache_ttl == 600
+        assert config.validation_max_messages is None
+        assert config.validation_max_errors_per_column is None
+        assert config.validation_max_workers == 1
         assert config.model_location == "tests/data/example.model.jsonld"
         assert (
             config.service_account_credentials_path
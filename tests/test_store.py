@@ -565,6 +565,66 @@ class TestSynapseStorage:
                     datasetId="syn_mock", fileNames=None, fullpath=full_path
                 )
 
+    def test_getProjectManifests(self, synapse_store):
+        mock_table_dataframe = pd.DataFrame(
+            {
+                "id": ["syn1", "syn2", "syn3", "syn4", "syn5", "syn6"],
+                "name": [
+                    "dataset_1",
+                    "dataset_2",
+                    "dataset_3",
+                    "synapse_storage_manifest.csv",
+                    "synapse_storage_manifest.csv",
+                    "file.txt",
+                ],
+                "type": ["folder", "folder", "folder", "file", "file", "file"],
+                "parentId": ["syn0", "syn0", "syn0", "syn1", "syn2", "syn3"],
+                "projectId": ["syn0"] * 6,
+                "etag": ["a", "b", "c", "d", "e", "f"],
+                "Component": ["", "", "", "Patient", "", ""],
+            }
+        )
+        mock_bundle = {
+            "entity": {"name": "synapse_storage_manifest.csv"},
+            "annotations": {
+                "annotations": {"Component": {"type": "STRING", "value": ["Biospecimen"]}}
+            },
+        }
+        expected = [
+            (
+                ("syn1", "dataset_1"),
+                ("syn4", "synapse_storage_manifest.csv"),
+                ("Patient", "Patient"),
+            ),
+            (
+                ("syn2", "dataset_2"),
+                ("syn5", "synapse_storage_manifest.csv"),
+                ("Biospecimen", "Biospecimen"),
+            ),
+            (("syn3", "dataset_3"), ("", ""), ("", "")),
+        ]
+
+        with patch.object(
+            synapse_store, "storageFileviewTable", mock_table_dataframe
+        ), patch(
+            "schematic.store.synapse.get_entity_id_bundle2",
+            new_callable=AsyncMock,
+            return_value=mock_bundle,
+        ) as mock_get_bundle, patch.dict(
+            "schematic.store.synapse.PROJECT_MANIFESTS_CACHE", clear=True
+        ):
+            assert synapse_store.getProjectManifests("syn0") == expected
+            # only the manifest without a Component column value in the fileview is requested
+            mock_get_bundle.assert_called_once()
+            assert mock_get_bundle.call_args.kwargs["entity_id"] == "syn5"
+
+            # the result is cached until an etag changes
+            assert synapse_store.getProjectManifests("syn0") == expected
+            mock_get_bundle.assert_called_once()
+            mock_table_dataframe.loc[4, "etag"] = "changed"
+            assert synapse_store.getProjectManifests("syn0") == expected
+            assert mock_get_bundle.call_count == 2
+
     @pytest.mark.parametrize("downloadFile", [True, False])
     def test_getDatasetManifest(self, synapse_store, downloadFile):
         # get a test manifest
@@ -581,20 +641,11 @@ class TestSynapseStorage:
             assert manifest_data == "syn51204513"
 
     @pytest.mark.parametrize(
-        "existing_manifest_df,fill_in_return_value,expected_df",
+        "existing_manifest_df,dataset_files,expected_df",
         [
             (
-                pd.DataFrame(),
-                [
-                    {
-                        "Filename": ["new_mock_file_path"],
-                        "entityId": ["new_mock_entity_id"],
-                    },
-                    {
-                        "Filename": ["new_mock_file_path"],
-                        "entityId": ["new_mock_entity_id"],
-                    },
-                ],
+                pd.DataFrame(columns=["Filename", "entityId"]),
+                [("new_mock_entity_id", "new_mock_file_path")],
                 pd.DataFrame(
                     {
                         "Filename": ["new_mock_file_path"],
@@ -610,40 +661,48 @@ class TestSynapseStorage:
                     }
                 ),
                 [
+                    ("existing_mock_entity_id", "existing_mock_file_path"),
+                    ("new_mock_entity_id", "new_mock_file_path"),
+                ],
+                pd.DataFrame(
                     {
                         "Filename": ["existing_mock_file_path", "new_mock_file_path"],
                         "entityId": ["existing_mock_entity_id", "new_mock_entity_id"],
-                    },
+                    }
+                ),
+            ),
+            (
+                pd.DataFrame(
                     {
-                        "Filename": ["new_mock_file_path"],
-                        "entityId": ["new_mock_entity_id"],
-                    },
-                ],
+                        "entityId": ["existing_mock_entity_id", "removed_entity_id"],
+                        "Filename": ["old_mock_file_path", "removed_file_path"],
+                        "Sample ID": ["1", "2"],
+                    }
+                ),
+                [("existing_mock_entity_id", "moved_mock_file_path")],
                 pd.DataFrame(
                     {
-                        "Filename": ["existing_mock_file_path", "new_mock_file_path"],
-                        "entityId": ["existing_mock_entity_id", "new_mock_entity_id"],
+                        "Filename": ["moved_mock_file_path", ""],
+                        "Sample ID": ["1", "2"],
+                        "entityId": ["existing_mock_entity_id", "removed_entity_id"],
                     }
                 ),
             ),
         ],
     )
     def test_fill_in_entity_id_filename(
-        self, synapse_store, existing_manifest_df, fill_in_return_value, expected_df
+        self, synapse_store, existing_manifest_df, dataset_files, expected_df
     ):
         with patch(
             "schematic.store.synapse.SynapseStorage.getFilesInStorageDataset",
-            return_value=["syn123", "syn124", "syn125"],
-        ) as mock_get_file_storage, patch(
-            "schematic.store.synapse.SynapseStorage._get_file_entityIds",
-            side_effect=fill_in_return_value,
-        ) as mock_get_file_entity_id:
-            dataset_files, new_manifest = synapse_store.fill_in_entity_id_filename(
+            return_value=dataset_files,
+        ):
+            returned_files, new_manifest = synapse_store.fill_in_entity_id_filename(
                 datasetId="test_syn_id", manifest=existing_manifest_df
             )
 
             assert_frame_equal(new_manifest, expected_df)
-            assert dataset_files == ["syn123", "syn124", "syn125"]
+            assert returned_files == dataset_files
 
     # Test case: make sure that Filename and entityId column get filled and component column has the same length as filename column
     def test_add_entity_id_and_filename_with_component_col(self, synapse_store):
@@ -735,6 +794,36 @@ class TestSynapseStorage:
                 assert "entity syn123 is in the trash can" in caplog.text
                 assert formatted_annotations == None
 
+    @pytest.mark.parametrize(
+        "annotation_keys, expected_keys",
+        [
+            ("display_label", ["Component", "PatientID", "entityId"]),
+            ("class_label", ["Component", "PatientID", "EntityId"]),
+        ],
+    )
+    def test_get_annotation_values(
+        self, annotation_keys: str, expected_keys: list[str]
+    ) -> None:
+        """make sure annotation keys are resolved and long values truncated column wise"""
+        manifest = pd.DataFrame(
+            {
+                "Filename": ["a.txt", "b.txt"],
+                "Component": ["Patient", "x" * 500],
+                "Patient ID": [1, 2],
+                "entityId": ["syn1", "syn2"],
+            }
+        )
+        annotation_values = SynapseStorage._get_annotation_values(
+            manifest, annotation_keys
+        )
+
+        assert [list(values) for values in annotation_values] == [expected_keys] * 2
+        assert annotation_values[0]["Component"] == "Patient"
+        assert annotation_values[1]["Component"] == (
+            "x" * 472 + "[truncatedByDataCuratorApp]"
+        )
+        assert annotation_values[1]["PatientID"] == 2
+
     def test_get_files_metadata_from_dataset(self, synapse_store):
         patch_get_children = [
             ("syn123", "parent_folder/test_A.txt"),
@@ -1589,6 +1678,52 @@ class TestManifestUpload:
             assert mock_format_row.call_count == len(expected_entity_ids)
             assert mock_process_store.call_count == 1
 
+    def test_store_annotations_through_view(
+        self, synapse_store: SynapseStorage, dmge: DataModelGraphExplorer
+    ) -> None:
+        """test annotating entities in bulk through a file view, entities missing from the
+        file view are returned to be annotated one by one"""
+        mock_fileview = MagicMock()
+        mock_fileview.__enter__.return_value = mock_fileview
+        mock_fileview.query.return_value = pd.DataFrame(
+            {"ROW_ID": [1, 2], "ROW_ETAG": ["etag1", "etag2"], "Component": ["", ""]}
+        )
+        mock_fileview.table = mock_fileview.query.return_value
+        view_schema = mock_fileview.view_schema
+
+        with patch(
+            "schematic.store.synapse.DatasetFileView", return_value=mock_fileview
+        ), patch(
+            "schematic.store.synapse.PartialRowset.from_mapping"
+        ) as mock_from_mapping, patch.object(
+            synapse_store.syn, "store"
+        ) as mock_store:
+            not_annotated = synapse_store.store_annotations_through_view(
+                dmge,
+                datasetId="syn10",
+                entity_annotations={
+                    "syn1": {"Component": "Biospecimen", "SampleID": 1},
+                    "syn2": {"Component": "Biospecimen", "SampleID": ""},
+                    "syn3": {"Component": "Biospecimen", "SampleID": 3},
+                },
+                hideBlanks=True,
+                annotation_keys="class_label",
+            )
+
+        assert not_annotated == ["syn3"]
+        # a column is added for the new annotation
+        new_columns = view_schema.addColumns.call_args[0][0]
+        assert [(column.name, column.columnType) for column in new_columns] == [
+            ("SampleID", "INTEGER")
+        ]
+        # a single transaction updates both rows, the blank value removes the annotation
+        mapping = mock_from_mapping.call_args[0][0]
+        assert mapping == {
+            1: {"Component": "Biospecimen", "SampleID": "1"},
+            2: {"Component": "Biospecimen", "SampleID": None},
+        }
+        assert mock_store.call_count == 2
+
     @pytest.mark.parametrize(
         "mock_manifest_file_path",
         [
@@ -1031,6 +1031,50 @@ class TestValidateUtils:
         else:
             assert output == False
 
+    def test_normalize_manifest(self):
+        manifest = pd.DataFrame(
+            {
+                "Component": [" Patient", "Patient ", "Patient"],
+                "Check String": ["  valid", None, np.nan],
+                "Check Int": [1, 2, 3],
+                "Check List": [["a", "b"], " c ", pd.NA],
+            }
+        )
+        original = manifest.copy()
+
+        output = validate_utils.normalize_manifest(manifest)
+
+        # input manifest is left untouched
+        assert_frame_equal(manifest, original)
+        assert output["Component"].tolist() == ["Patient", "Patient", "Patient"]
+        assert output["Check String"][0] == "valid"
+        assert output["Check String"][1] is pd.NA
+        assert output["Check String"][2] is pd.NA
+        assert output["Check Int"].tolist() == [1, 2, 3]
+        assert output["Check List"][0] == ["a", "b"]
+        assert output["Check List"][1] == "c"
+        assert output["Check List"][2] is pd.NA
+
+    def test_get_json_schema_view(self):
+        manifest = pd.DataFrame(
+            {
+                "Check String": ["valid", pd.NA, "None"],
+                "Check Int": [1, 2, 3],
+                "Check Num": pd.Series([6, 6.5, 7], dtype=object),
+                "Check Mixed": ["a", 8, pd.NA],
+                "Check List": [["a", "b"], ["<NA>"], []],
+            }
+        )
+
+        output = validate_utils.get_json_schema_view(manifest)
+
+        assert output["Check String"].tolist() == ["valid", "", "None"]
+        assert output["Check Int"].tolist() == ["1", "2", "3"]
+        assert output["Check Num"].tolist() == ["6.0", "6.5", "7.0"]
+        assert output["Check Mixed"].tolist() == ["a", "8", ""]
+        assert output["Check List"].tolist() == [["a", "b"], [""], []]
+        assert manifest["Check List"][1] == ["<NA>"]
+
 
 class TestCsvUtils:
     def test_csv_to_schemaorg(self, helpers, tmp_path):
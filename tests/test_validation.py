@@ -2,11 +2,12 @@ import logging
 import os
 import re
 
+import pandas as pd
 import pytest
 
 from schematic.models.metadata import MetadataModel
 from schematic.models.validate_attribute import GenerateError, ValidateAttribute
-from schematic.models.validate_manifest import ValidateManifest
+from schematic.models.validate_manifest import ValidateManifest, validate_all
 from schematic.schemas.data_model_graph import DataModelGraph, DataModelGraphExplorer
 from schematic.schemas.data_model_json_schema import DataModelJSONSchema
 from schematic.utils.validate_rules_utils import validation_rule_info
@@ -1020,6 +1021,110 @@ class TestManifestValidation:
                 and vmr_warnings[0][-1] == ["123"]
             )
 
+    def test_validate_manifest_rules_parallel(self, helpers, dmge, mocker):
+        """Validating columns in parallel gives the same results, in the same order"""
+        manifest = helpers.get_data_frame(
+            helpers.get_data_path("mock_manifests/Invalid_Test_Manifest.csv")
+        )
+        # cross manifest and url rules need Synapse and network access
+        manifest = manifest.drop(
+            columns=[
+                col
+                for col in manifest.columns
+                if col.startswith("Check Match") or col == "Check URL"
+            ]
+        )
+
+        results = {}
+        # the 4 worker run is repeated, as races between the column tasks are
+        # intermittent
+        for run, max_workers in enumerate([1] + [4] * 10):
+            mocker.patch(
+                "schematic.configuration.configuration.Configuration.validation_max_workers",
+                new_callable=mocker.PropertyMock,
+                return_value=max_workers,
+            )
+            validateManifest = ValidateManifest(
+                errors=[],
+                manifest=manifest,
+                manifestPath="",
+                dmge=dmge,
+                jsonSchema={},
+            )
+            _, vmr_errors, vmr_warnings = validateManifest.validate_manifest_rules(
+                manifest=manifest.copy(),
+                dmge=dmge,
+                restrict_rules=True,
+                project_scope=None,
+            )
+            results[run] = (vmr_errors, vmr_warnings)
+
+        assert results[0][0]
+        assert all(result == results[0] for result in results.values())
+
+    def test_incremental_validation(self, helpers, dmge, mocker, tmp_path):
+        """Incremental validation gives the same results as validating all rows"""
+        mocker.patch(
+            "schematic.configuration.configuration.Configuration.validation_cache_folder",
+            new_callable=mocker.PropertyMock,
+            return_value=str(tmp_path),
+        )
+        manifest = helpers.get_data_frame(
+            helpers.get_data_path("mock_manifests/Invalid_Test_Manifest.csv")
+        )
+        # cross manifest and url rules need Synapse and network access
+        manifest = manifest.drop(
+            columns=[
+                col
+                for col in manifest.columns
+                if col.startswith("Check Match") or col == "Check URL"
+            ]
+        )
+        manifest["entityId"] = [f"syn{i}" for i in range(len(manifest))]
+        json_schema = DataModelJSONSchema(
+            jsonld_path=helpers.get_data_path("example.model.csv"),
+            graph=dmge.graph,
+        ).get_json_validation_schema(
+            source_node="MockComponent", schema_name="MockComponent_validation"
+        )
+
+        def validate(manifest, snapshot_key=None):
+            errors, warnings, _ = validate_all(
+                None,
+                errors=[],
+                warnings=[],
+                manifest=manifest,
+                manifestPath="",
+                dmge=dmge,
+                jsonSchema=json_schema,
+                restrict_rules=True,
+                project_scope=None,
+                dataset_scope=None,
+                access_token=None,
+                component="MockComponent",
+                snapshot_key=snapshot_key,
+            )
+            return errors, warnings
+
+        assert validate(manifest, "key") == validate(manifest)
+
+        # fix the int column of one row, and break it in another
+        changed_manifest = manifest.copy()
+        changed_manifest.loc[0, "Check Int"] = "5"
+        changed_manifest.loc[1, "Check Int"] = "not an int"
+        errors, warnings = validate(changed_manifest, "key")
+        assert (errors, warnings) == validate(changed_manifest)
+        assert errors != validate(manifest)[0]
+
+        # edit a later row and add a row before the others, so that the stored messages
+        # of the unchanged rows move to other row numbers
+        changed_manifest.loc[2, "Check Num"] = "not a number"
+        new_row = changed_manifest.iloc[[0]].assign(entityId="syn100")
+        changed_manifest = pd.concat([new_row, changed_manifest], ignore_index=True)
+        errors, warnings = validate(changed_manifest, "key")
+        assert (errors, warnings) == validate(changed_manifest)
+        assert any(error[0] == "5" for error in errors)
+
     @pytest.mark.rule_combos(
         reason="This introduces a great number of tests covering every possible rule combination that are only necessary on occasion."
     )
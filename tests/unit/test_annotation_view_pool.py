@@ -0,0 +1,59 @@
+"""Unit tests for the pool of annotation views"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from schematic.store.annotation_view_pool import AnnotationViewPool
+
+
+class TestAnnotationViewPool:
+    def test_get(self) -> None:
+        pool = AnnotationViewPool(refresh_interval=60)
+        refresh = MagicMock(return_value="syn1")
+
+        assert pool.get("syn0", refresh) == ("syn1", True)
+        assert pool.get("syn0", refresh) == ("syn1", False)
+        assert refresh.call_count == 1
+        assert len(pool) == 1
+
+    def test_refresh_after_interval(self, monkeypatch) -> None:
+        pool = AnnotationViewPool(refresh_interval=60)
+        refresh = MagicMock(return_value="syn1")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        pool.get("syn0", refresh)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        assert pool.get("syn0", refresh) == ("syn1", True)
+        assert refresh.call_count == 2
+
+    def test_remove(self) -> None:
+        pool = AnnotationViewPool(refresh_interval=60)
+        refresh = MagicMock(side_effect=["syn1", "syn2"])
+        pool.get("syn0", refresh)
+
+        pool.remove("syn0")
+        assert pool.get("syn0", refresh) == ("syn2", True)
+        pool.clear()
+        assert len(pool) == 0
+
+    def test_concurrent_get(self) -> None:
+        pool = AnnotationViewPool(refresh_interval=60)
+        started = threading.Event()
+        calls = []
+
+        def refresh() -> str:
+            calls.append(1)
+            started.wait(1)
+            return "syn1"
+
+        # requests for the same dataset wait for a single refresh
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(pool.get, "syn0", refresh) for _ in range(4)]
+            time.sleep(0.1)
+            started.set()
+            view_ids = [future.result()[0] for future in futures]
+        assert view_ids == ["syn1"] * 4
+        assert len(calls) == 1
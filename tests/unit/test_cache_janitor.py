@@ -0,0 +1,78 @@
+"""Unit tests for the Synapse cache janitor"""
+
+import os
+import time
+
+from schematic.store import cache_janitor
+from schematic.store.cache_janitor import SynapseCacheJanitor
+
+
+def add_cached_file(cache_root, file_handle_id: int, size: int, age: float) -> str:
+    """Adds a file of size bytes, last used age seconds ago, to a cache folder"""
+    folder = cache_root / str(file_handle_id % 1000) / str(file_handle_id)
+    folder.mkdir(parents=True)
+    path = folder / "file.txt"
+    path.write_bytes(b"0" * size)
+    last_used = time.time() - age
+    os.utime(path, (last_used, last_used))
+    return str(path)
+
+
+class TestSynapseCacheJanitor:
+    def test_clean_under_max_size(self, tmp_path) -> None:
+        add_cached_file(tmp_path, 1001, 100, 3600)
+        janitor = SynapseCacheJanitor(str(tmp_path), 1000, interval=60, min_age=0)
+
+        assert janitor.clean() == 0
+        assert janitor.size == 100
+
+    def test_clean_least_recently_used(self, tmp_path) -> None:
+        oldest = add_cached_file(tmp_path, 1001, 500, 3600)
+        older = add_cached_file(tmp_path, 2002, 500, 1800)
+        recent = add_cached_file(tmp_path, 3003, 500, 0)
+        janitor = SynapseCacheJanitor(str(tmp_path), 1000, interval=60, min_age=600)
+
+        # the cache is brought under 80% of its maximum size
+        assert janitor.clean() == 2
+        assert not os.path.exists(oldest)
+        assert not os.path.exists(older)
+        assert os.path.exists(recent)
+        assert janitor.size == 500
+
+    def test_clean_keeps_recently_used(self, tmp_path) -> None:
+        add_cached_file(tmp_path, 1001, 800, 60)
+        add_cached_file(tmp_path, 2002, 800, 0)
+        janitor = SynapseCacheJanitor(str(tmp_path), 1000, interval=60, min_age=600)
+
+        assert janitor.clean() == 0
+        assert janitor.size == 1600
+
+    def test_record_download(self, tmp_path, monkeypatch) -> None:
+        janitor = SynapseCacheJanitor(str(tmp_path), 1000, interval=60, min_age=0)
+        monkeypatch.setitem(cache_janitor.JANITORS, janitor.cache_root, janitor)
+
+        cache_janitor.record_download(add_cached_file(tmp_path, 1001, 600, 0))
+        assert janitor.size == 600
+        assert not janitor._wake_up.is_set()
+        # files outside of the cache are not counted
+        outside = tmp_path.parent / "outside.txt"
+        outside.write_bytes(b"0" * 600)
+        cache_janitor.record_download(str(outside))
+        assert janitor.size == 600
+
+        # going over the maximum size wakes the janitor up
+        cache_janitor.record_download(add_cached_file(tmp_path, 2002, 600, 0))
+        assert janitor.size == 1200
+        assert janitor._wake_up.is_set()
+
+    def test_background_thread(self, tmp_path) -> None:
+        path = add_cached_file(tmp_path, 1001, 2000, 3600)
+        janitor = SynapseCacheJanitor(str(tmp_path), 1000, interval=60, min_age=0)
+        janitor.start()
+        try:
+            deadline = time.monotonic() + 10
+            while os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert not os.path.exists(path)
+        finally:
+            janitor.stop()
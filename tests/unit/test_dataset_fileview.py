@@ -0,0 +1,53 @@
+"""Unit tests of the table fixes of DatasetFileView, without Synapse credentials"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from schematic.store.synapse import DatasetFileView
+
+
+def get_fileview(table: pd.DataFrame, column_types: dict) -> DatasetFileView:
+    """A DatasetFileView of a queried table, without a file view on Synapse"""
+    fileview = DatasetFileView.__new__(DatasetFileView)
+    fileview.table = table
+    fileview.results = SimpleNamespace(
+        headers=[
+            SimpleNamespace(name=name, columnType=column_type)
+            for name, column_type in column_types.items()
+        ]
+    )
+    return fileview
+
+
+class TestDatasetFileView:
+    def test_fix_list_columns(self) -> None:
+        table = pd.DataFrame(
+            {
+                "Sex": [["Female", "Male"], [], np.nan, ["Male"]],
+                "Age": [[1, 2], np.nan, [3], []],
+                "Empty": np.nan,
+                "Name": ["a", "b", "c", "d"],
+            },
+            index=[3, 3, 1, 0],
+        )
+        fileview = get_fileview(
+            table,
+            {
+                "Sex": "STRING_LIST",
+                "Age": "INTEGER_LIST",
+                "Empty": "BOOLEAN_LIST",
+                "Name": "STRING",
+            },
+        )
+
+        fixed = fileview._fix_list_columns()
+        assert fixed["Sex"].tolist()[:2] == ["Female, Male", ""]
+        assert pd.isna(fixed["Sex"].iloc[2])
+        assert fixed["Sex"].iloc[3] == "Male"
+        assert fixed["Age"].iloc[0] == "1, 2"
+        assert pd.isna(fixed["Age"].iloc[1])
+        assert fixed["Age"].tolist()[2:] == ["3", ""]
+        assert fixed["Empty"].isna().all()
+        assert fixed["Name"].tolist() == ["a", "b", "c", "d"]
@@ -2,9 +2,10 @@ from io import BytesIO
 
 import numpy as np
 import pandas as pd
+import pytest
 from pandas._libs.parsers import STR_NA_VALUES
 
-from schematic.utils.df_utils import read_csv
+from schematic.utils.df_utils import hash_table_rows, load_df, profile_df, read_csv
 
 
 class TestReadCsv:
@@ -47,3 +48,83 @@ class TestReadCsv:
         assert result["col1"][0] == "AAA"
         assert result["col1"][1] == "BBB"
         assert result["col1"][2] == "None"
+
+
+class TestHashTableRows:
+    def test_normalized_values(self) -> None:
+        # GIVEN a local data frame
+        df = pd.DataFrame({"col1": [1, 2, None], "col2": ["A", "", "1"]})
+
+        # AND the same rows as read back from a Synapse table
+        table = pd.DataFrame({"col1": [1.0, 2.0, np.nan], "col2": ["A", np.nan, 1]})
+
+        # THEN the rows have the same hashes
+        assert (
+            hash_table_rows(df, ["col1", "col2"]).tolist()
+            == hash_table_rows(table, ["col1", "col2"]).tolist()
+        )
+
+    def test_changed_values(self) -> None:
+        # GIVEN two data frames where one value changed
+        df = pd.DataFrame({"col1": [1, 2], "col2": ["A", "B"]})
+        changed = pd.DataFrame({"col1": [1, 2], "col2": ["A", "C"]})
+
+        # THEN only the hash of the changed row differs
+        columns = ["col1", "col2"]
+        assert (
+            hash_table_rows(df, columns) == hash_table_rows(changed, columns)
+        ).tolist() == [True, False]
+
+    def test_string_columns(self) -> None:
+        # GIVEN edits of a string column that are equal as numbers
+        df = pd.DataFrame({"Zip": ["01234", "1e3", "7 "]})
+        edited = pd.DataFrame({"Zip": ["1234", "1000", "7"]})
+
+        # THEN the edited values differ, only surrounding whitespace is ignored
+        assert (
+            hash_table_rows(df, ["Zip"]) == hash_table_rows(edited, ["Zip"])
+        ).tolist() == [False, False, True]
+
+        # AND the values of a numeric column are compared as numbers
+        assert (
+            hash_table_rows(df, ["Zip"], numeric_columns=["Zip"])
+            == hash_table_rows(edited, ["Zip"], numeric_columns=["Zip"])
+        ).tolist() == [True, True, True]
+
+
+class TestProfileDf:
+    @pytest.mark.parametrize(
+        "manifest",
+        [
+            "mock_manifests/Valid_Test_Manifest.csv",
+            "mock_manifests/Invalid_Test_Manifest.csv",
+            "mock_manifests/Patient_test_no_entry_for_cond_required_column.manifest.csv",
+        ],
+    )
+    def test_dtypes(self, helpers, manifest) -> None:
+        # GIVEN a manifest
+        path = helpers.get_data_path(manifest)
+
+        # THEN its dtypes are those of the manifest converted by load_df
+        expected = load_df(path, preserve_raw_input=False).convert_dtypes().dtypes
+        assert profile_df(path)["dtype"].to_dict() == expected.astype(str).to_dict()
+
+    def test_stats(self, tmp_path) -> None:
+        # GIVEN a manifest with missing and mixed values
+        path = tmp_path / "manifest.csv"
+        path.write_text("Sample ID,Score,Tissue,Mixed\n3,1.5,b,1\n1,,a,x\n3,0.5,,2.5\n")
+
+        # THEN the statistics of each column are computed with its dtype
+        profile = profile_df(str(path)).to_dict(orient="index")
+        assert profile["Sample ID"] == {
+            "dtype": "Int64",
+            "null_count": 0,
+            "distinct_count": 2,
+            "min": 1,
+            "max": 3,
+        }
+        assert profile["Score"]["null_count"] == 1
+        assert (profile["Score"]["min"], profile["Score"]["max"]) == (0.5, 1.5)
+        assert profile["Tissue"]["distinct_count"] == 2
+        assert profile["Mixed"]["dtype"] == "object"
+        assert profile["Mixed"]["min"] is None
@@ -0,0 +1,33 @@
+"""Unit tests for the journal of entity migrations"""
+
+from schematic.store.entity_migration import EntityMove, MigrationJournal
+
+
+class TestMigrationJournal:
+    def test_record(self, tmp_path) -> None:
+        journal = MigrationJournal(str(tmp_path / "migrations" / "journal.jsonl"))
+        assert journal.get_completed() == set()
+
+        journal.record([EntityMove("syn1", "syn10"), EntityMove("syn2", "syn10")])
+        journal.record([EntityMove("syn3", "syn11")])
+        assert journal.get_completed() == {
+            EntityMove("syn1", "syn10"),
+            EntityMove("syn2", "syn10"),
+            EntityMove("syn3", "syn11"),
+        }
+
+    def test_interrupted_record(self, tmp_path) -> None:
+        journal = MigrationJournal(str(tmp_path / "journal.jsonl"))
+        journal.record([EntityMove("syn1", "syn10")])
+        with open(journal.path, "a", encoding="utf-8") as journal_file:
+            journal_file.write('{"entity_id": "syn2", "par')
+
+        assert journal.get_completed() == {EntityMove("syn1", "syn10")}
+
+    def test_clear(self, tmp_path) -> None:
+        journal = MigrationJournal(str(tmp_path / "journal.jsonl"))
+        journal.clear()
+        journal.record([EntityMove("syn1", "syn10")])
+
+        journal.clear()
+        assert journal.get_completed() == set()
@@ -0,0 +1,157 @@
+"""Unit tests for the fileview snapshot cache"""
+
+import os
+import re
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from schematic.store.fileview_cache import FileviewSnapshotCache
+
+FILEVIEW = pd.DataFrame(
+    {
+        "id": ["syn1", "syn2", "syn3"],
+        "name": ["dataset", "file.txt", "synapse_storage_manifest.csv"],
+        "parentId": ["syn0", "syn1", "syn1"],
+        "etag": ["a", "b", "c"],
+    }
+)
+
+
+class MockSynapse:
+    """Answers fileview queries from a DataFrame, and records the queries"""
+
+    def __init__(self, fileview: pd.DataFrame) -> None:
+        self.fileview = fileview
+        self.queries: list[str] = []
+        self.credentials = MagicMock(owner_id="1")
+
+    def tableQuery(self, query: str) -> MagicMock:
+        self.queries.append(query)
+        columns, where = re.match(
+            r"SELECT (.*) FROM syn\d+ (?:WHERE )?(.*);", query
+        ).groups()
+        result = self.fileview
+        ids = re.search(r"id IN \((.*)\)", where)
+        if ids:
+            result = result[result["id"].isin(re.findall(r"'(\w+)'", ids.group(1)))]
+        limit = re.search(r"LIMIT (\d+)", where)
+        if limit:
+            result = result.head(int(limit.group(1)))
+        if columns != "*":
+            result = result[[column.strip() for column in columns.split(",")]]
+        return MagicMock(asDataFrame=MagicMock(return_value=result.copy()))
+
+
+@pytest.fixture(name="syn")
+def fixture_syn() -> MockSynapse:
+    return MockSynapse(FILEVIEW)
+
+
+class TestFileviewSnapshotCache:
+    def test_get_uses_snapshot(self, tmp_path, syn: MockSynapse) -> None:
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(tmp_path), max_age=60
+        )
+        pd.testing.assert_frame_equal(cache.get(), FILEVIEW)
+        assert syn.queries == ["SELECT * FROM syn100 ;"]
+
+        # a second cache object shares the stored snapshot
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(tmp_path), max_age=60
+        )
+        pd.testing.assert_frame_equal(cache.get(), FILEVIEW)
+        assert len(syn.queries) == 1
+
+    def test_get_refreshes_changed_rows(self, tmp_path) -> None:
+        fileview = pd.DataFrame(
+            {
+                "id": [f"syn{i}" for i in range(1, 9)],
+                "name": [f"file{i}.txt" for i in range(1, 9)],
+                "etag": [f"etag{i}" for i in range(1, 9)],
+            }
+        )
+        syn = MockSynapse(fileview)
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(tmp_path), max_age=0
+        )
+        cache.get()
+
+        # syn2 is changed, syn3 removed and syn9 added
+        syn.fileview = pd.concat(
+            [
+                fileview[fileview["id"] != "syn3"],
+                pd.DataFrame(
+                    {"id": ["syn9"], "name": ["file9.txt"], "etag": ["etag9"]}
+                ),
+            ]
+        )
+        syn.fileview.loc[syn.fileview["id"] == "syn2", ["name", "etag"]] = [
+            "renamed.txt",
+            "new etag",
+        ]
+        syn.queries = []
+        table = cache.get()
+
+        pd.testing.assert_frame_equal(
+            table.reset_index(drop=True), syn.fileview.reset_index(drop=True)
+        )
+        assert syn.queries == [
+            "SELECT * FROM syn100 LIMIT 1 ;",
+            "SELECT id, etag FROM syn100 ;",
+            "SELECT * FROM syn100 WHERE id IN ('syn2', 'syn9') ;",
+        ]
+
+    def test_get_force_refresh(self, tmp_path, syn: MockSynapse) -> None:
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(tmp_path), max_age=60
+        )
+        cache.get()
+        syn.queries = []
+        cache.get(force_refresh=True)
+        assert syn.queries[1] == "SELECT id, etag FROM syn100 ;"
+        # nothing changed, so no rows are queried in full
+        assert len(syn.queries) == 2
+
+    def test_get_changed_columns(self, tmp_path, syn: MockSynapse) -> None:
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(tmp_path), max_age=0
+        )
+        cache.get()
+        syn.fileview = FILEVIEW.assign(Component=["", "", "Patient"])
+        table = cache.get()
+        pd.testing.assert_frame_equal(table, syn.fileview)
+        assert syn.queries[-1] == "SELECT * FROM syn100 ;"
+
+    def test_get_expired(self, tmp_path, syn: MockSynapse) -> None:
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(tmp_path), max_age=60
+        )
+        cache.get()
+        snapshot_path = os.path.join(str(tmp_path), os.listdir(tmp_path)[0])
+        past = time.time() - 120
+        os.utime(snapshot_path, (past, past))
+
+        syn.queries = []
+        cache.get()
+        assert syn.queries[1] == "SELECT id, etag FROM syn100 ;"
+        # the refreshed snapshot is used again
+        syn.queries = []
+        cache.get()
+        assert syn.queries == []
+
+    def test_get_shared_folder(self, tmp_path, syn: MockSynapse) -> None:
+        cache_folder = tmp_path / "snapshots"
+        cache = FileviewSnapshotCache(
+            syn=syn, fileview_id="syn100", cache_folder=str(cache_folder), max_age=60
+        )
+        cache.get()
+        assert cache_folder.stat().st_mode & 0o777 == 0o700
+
+        # snapshots other users could have written are not read
+        cache_folder.chmod(0o777)
+        syn.queries = []
+        pd.testing.assert_frame_equal(cache.get(), FILEVIEW)
+        assert syn.queries == ["SELECT * FROM syn100 ;"]
@@ -0,0 +1,94 @@
+"""Unit tests for the export of fileviews in pages"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from schematic.store.fileview_export import (
+    check_where_clause,
+    export_fileview,
+    iter_fileview_pages,
+)
+
+
+def get_synapse(pages):
+    """A Synapse client returning a page of rows for each table query"""
+    syn = MagicMock()
+    syn.tableQuery.return_value.asDataFrame.side_effect = pages
+    return syn
+
+
+ROWS = pd.DataFrame(
+    {
+        "ROW_ID": [1, 2, 5],
+        "ROW_VERSION": [1, 1, 1],
+        "id": ["syn1", "syn2", "syn5"],
+        "name": ["a", "b", None],
+    }
+)
+
+
+class TestFileviewExport:
+    def test_iter_fileview_pages(self) -> None:
+        syn = get_synapse([ROWS.iloc[:2], ROWS.iloc[2:]])
+
+        pages = list(
+            iter_fileview_pages(
+                syn, "syn0", columns=["id", "name"], where_clause="a = 1", page_size=2
+            )
+        )
+        assert [list(page["id"]) for page in pages] == [["syn1", "syn2"], ["syn5"]]
+        assert list(pages[0].columns) == ["id", "name"]
+        queries = [call.kwargs["query"] for call in syn.tableQuery.call_args_list]
+        assert queries == [
+            'SELECT "id", "name" FROM syn0 WHERE (a = 1) ORDER BY ROW_ID LIMIT 2;',
+            'SELECT "id", "name" FROM syn0 WHERE (a = 1) AND ROW_ID > 2 '
+            "ORDER BY ROW_ID LIMIT 2;",
+        ]
+
+    def test_export_fileview(self) -> None:
+        syn = get_synapse([ROWS.iloc[:2], ROWS.iloc[2:]])
+        csv = b"".join(export_fileview(syn, "syn0", export_format="csv", page_size=2))
+        assert csv.decode("utf-8").splitlines() == [
+            "id,name",
+            "syn1,a",
+            "syn2,b",
+            "syn5,",
+        ]
+
+        syn = get_synapse([ROWS])
+        ndjson = b"".join(export_fileview(syn, "syn0", page_size=10))
+        assert ndjson.decode("utf-8").splitlines()[-1] == '{"id":"syn5","name":null}'
+
+    def test_export_fileview_unknown_format(self) -> None:
+        with pytest.raises(ValueError):
+            export_fileview(get_synapse([]), "syn0", export_format="xml")
+
+    @pytest.mark.parametrize(
+        "where_clause",
+        ["a = 1", "(a = 1) OR (b = 2)", "name = 'a) OR (1=1'", '"a;b" = 1', ""],
+    )
+    def test_check_where_clause(self, where_clause: str) -> None:
+        check_where_clause(where_clause)
+
+    @pytest.mark.parametrize(
+        "where_clause",
+        ["1=1) OR (1=1", "(a = 1", "a = 1; DROP", "a = 1 --", "a = 1 /*", "a = 'b"],
+    )
+    def test_check_invalid_where_clause(self, where_clause: str) -> None:
+        with pytest.raises(ValueError):
+            check_where_clause(where_clause)
+
+        syn = get_synapse([ROWS])
+        with pytest.raises(ValueError):
+            export_fileview(syn, "syn0", where_clause=where_clause)
+        syn.tableQuery.assert_not_called()
+
+    def test_iter_fileview_pages_repeated_rows(self) -> None:
+        # the same rows are returned for every page
+        syn = get_synapse([ROWS.iloc[:2], ROWS.iloc[:2], ROWS.iloc[:2]])
+        pages = iter_fileview_pages(syn, "syn0", page_size=2)
+        next(pages)
+        with pytest.raises(RuntimeError):
+            next(pages)
@@ -0,0 +1,58 @@
+"""Unit tests for the fileview index"""
+
+import pandas as pd
+import pytest
+
+from schematic.store.fileview_index import FileviewIndex
+
+FILEVIEW = pd.DataFrame(
+    {
+        "id": ["syn1", "syn2", "syn3", "syn4", "syn5", "syn6"],
+        "name": [
+            "dataset",
+            "file.txt",
+            "synapse_storage_manifest.csv",
+            "synapse_storage_manifest_censored.csv",
+            "dataset 2",
+            "synapse_storage_manifest.csv",
+        ],
+        "parentId": ["syn0", "syn1", "syn1", "syn1", "syn0", "syn5"],
+        "projectId": ["syn0", "syn0", "syn0", "syn0", "syn0", None],
+    },
+    index=["1_1", "2_1", "3_1", "4_1", "5_1", "6_1"],
+)
+
+
+@pytest.fixture(name="fileview_index")
+def fixture_fileview_index() -> FileviewIndex:
+    return FileviewIndex(table=FILEVIEW, manifest_basename="synapse_storage_manifest")
+
+
+class TestFileviewIndex:
+    def test_get_rows(self, fileview_index: FileviewIndex) -> None:
+        pd.testing.assert_frame_equal(
+            fileview_index.get_rows("parentId", "syn1"),
+            FILEVIEW[FILEVIEW["parentId"] == "syn1"],
+        )
+        assert fileview_index.get_rows("parentId", "syn100").empty
+        assert fileview_index.get_rows("id", "syn5")["name"].tolist() == ["dataset 2"]
+
+    def test_get_values(self, fileview_index: FileviewIndex) -> None:
+        assert fileview_index.get_values("projectId") == ["syn0"]
+
+    def test_contains_id(self, fileview_index: FileviewIndex) -> None:
+        assert fileview_index.contains_id("syn3")
+        assert not fileview_index.contains_id("syn100")
+
+    def test_get_manifests(self, fileview_index: FileviewIndex) -> None:
+        assert fileview_index.get_manifests("syn1")["id"].tolist() == ["syn3", "syn4"]
+        assert fileview_index.get_manifests("syn5")["id"].tolist() == ["syn6"]
+        assert fileview_index.get_manifests("syn0").empty
+
+    def test_missing_column(self) -> None:
+        fileview_index = FileviewIndex(
+            table=FILEVIEW[["id", "name"]], manifest_basename="synapse_storage_manifest"
+        )
+        assert fileview_index.contains_id("syn1")
+        with pytest.raises(KeyError):
+            fileview_index.get_rows("parentId", "syn1")
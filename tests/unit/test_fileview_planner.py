@@ -0,0 +1,89 @@
+"""Unit tests for the planner of fileview queries"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+from synapseclient import Column
+
+from schematic.store.fileview_planner import FileviewQueryPlanner
+
+
+def get_planner() -> FileviewQueryPlanner:
+    """A planner of a fileview with the columns id, name, parentId and path"""
+    syn = MagicMock()
+    syn.getTableColumns.return_value = [
+        Column(name=name, columnType="STRING")
+        for name in ["id", "name", "parentId", "path"]
+    ]
+    syn.tableQuery.return_value.asDataFrame.side_effect = lambda **_: pd.DataFrame(
+        {"id": ["syn1"]}
+    )
+    return FileviewQueryPlanner(syn=syn, fileview_id="syn0")
+
+
+def get_queries(planner: FileviewQueryPlanner) -> list:
+    return [call.kwargs["query"] for call in planner.syn.tableQuery.call_args_list]
+
+
+class TestFileviewQueryPlanner:
+    def test_reuse(self) -> None:
+        planner = get_planner()
+        table = planner.get(["projectId IN ('syn2', '')"], columns=["id", "name"])
+
+        # requests with the same conditions and fewer columns reuse the result
+        assert planner.get(["projectId IN ('syn2', '')"], columns=["id"]) is table
+        assert get_queries(planner) == [
+            "SELECT id,name FROM syn0 WHERE projectId IN ('syn2', '') ;"
+        ]
+
+    def test_merge_columns(self) -> None:
+        planner = get_planner()
+        planner.get(columns=["id"])
+        planner.get(columns=["path"])
+
+        # the result with the columns of both requests replaces the first one
+        planner.get(columns=["id", "path"])
+        assert get_queries(planner) == [
+            "SELECT id FROM syn0 ;",
+            "SELECT path,id FROM syn0 ;",
+        ]
+
+    def test_optional_columns(self) -> None:
+        planner = get_planner()
+
+        # optional columns the fileview does not have are not selected
+        planner.get(optional_columns=["id", "name", "Component"])
+        planner.get(optional_columns=["name", "Component"])
+        assert get_queries(planner) == ["SELECT id,name FROM syn0 ;"]
+        planner.syn.getTableColumns.assert_called_once()
+
+    def test_where_clauses(self) -> None:
+        planner = get_planner()
+        planner.get(columns=None)
+
+        # all columns serve any request with the same conditions
+        planner.get(columns=["id"])
+        planner.get(["type='file'"], columns=["id"])
+        assert get_queries(planner) == [
+            "SELECT * FROM syn0 ;",
+            "SELECT id FROM syn0 WHERE type='file' ;",
+        ]
+
+    def test_force_requery(self) -> None:
+        planner = get_planner()
+        planner.get(columns=["id"])
+        planner.get(columns=["id"], force_requery=True)
+        assert len(get_queries(planner)) == 2
+
+    def test_get_etag(self) -> None:
+        planner = get_planner()
+        assert planner.get_etag("syn1") is None
+        planner.syn.tableQuery.return_value.asDataFrame.side_effect = lambda **_: (
+            pd.DataFrame({"id": ["syn1", "syn2"], "etag": ["a", "b"]})
+        )
+
+        # the etags of the kept results are used, without querying
+        planner.get(columns=["id", "etag"])
+        assert planner.get_etag("syn2") == "b"
+        assert planner.get_etag("syn3") is None
+        assert len(get_queries(planner)) == 1
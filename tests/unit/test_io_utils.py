@@ -2,8 +2,10 @@ import asyncio
 import os
 import tempfile
 
+import pytest
+
 from schematic.utils.general import create_temp_folder
-from schematic.utils.io_utils import cleanup_temporary_storage
+from schematic.utils.io_utils import cleanup_temporary_storage, make_private_folder
 
 
 class TestCleanup:
@@ -94,3 +96,31 @@ class TestCleanup:
 
         # AND the file should not exist
         assert not os.path.exists(os.path.join(temp_folder_2, "file.txt"))
+
+
+class TestMakePrivateFolder:
+    def test_make_private_folder(self, tmp_path) -> None:
+        folder = tmp_path / "private"
+        make_private_folder(str(folder))
+        assert folder.stat().st_mode & 0o777 == 0o700
+        # an existing private folder is used as it is
+        make_private_folder(str(folder))
+
+        # a folder other users can only read is made private
+        folder.chmod(0o755)
+        make_private_folder(str(folder))
+        assert folder.stat().st_mode & 0o777 == 0o700
+
+    def test_shared_folder(self, tmp_path) -> None:
+        # a folder created by another process, that other users can write to
+        folder = tmp_path / "shared"
+        folder.mkdir()
+        folder.chmod(0o777)
+        with pytest.raises(PermissionError):
+            make_private_folder(str(folder))
+
+    def test_symbolic_link(self, tmp_path) -> None:
+        (tmp_path / "target").mkdir(mode=0o700)
+        (tmp_path / "link").symlink_to(tmp_path / "target")
+        with pytest.raises(PermissionError):
+            make_private_folder(str(tmp_path / "link"))
@@ -0,0 +1,46 @@
+"""Unit tests for the polling of asynchronous Synapse changes"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from schematic.store.job_polling import (
+    poll_until,
+    wait_for_table_columns,
+    wait_for_table_row_count,
+)
+
+
+class TestJobPolling:
+    def test_poll_until(self) -> None:
+        results = [None, None, "done"]
+        check = MagicMock(side_effect=results)
+
+        result = poll_until(check, timeout=5, description="test", initial_delay=0.001)
+        assert result == "done"
+        assert check.call_count == 3
+
+    def test_poll_until_timeout(self) -> None:
+        with pytest.raises(TimeoutError, match="waiting for test"):
+            poll_until(
+                lambda: None, timeout=0.01, description="test", initial_delay=0.001
+            )
+
+    def test_wait_for_table_row_count(self) -> None:
+        syn = MagicMock()
+        syn.tableQuery.side_effect = [
+            [MagicMock(values=[2])],
+            [MagicMock(values=[0])],
+        ]
+
+        wait_for_table_row_count(syn, "syn1", 0)
+        assert syn.tableQuery.call_count == 2
+
+    def test_wait_for_table_columns(self) -> None:
+        syn = MagicMock()
+        column = MagicMock()
+        column.name = "Id"
+        syn.getTableColumns.return_value = [column]
+
+        wait_for_table_columns(syn, "syn1", ["Id"])
+        syn.getTableColumns.assert_called_once_with("syn1")
@@ -0,0 +1,114 @@
+"""Unit tests for the content addressed manifest store"""
+
+import os
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+from synapseclient.core.utils import md5_for_file_hex
+
+from schematic.store import manifest_cache
+from schematic.store.manifest_cache import ManifestCache
+from schematic.store.synapse import ManifestDownload
+from schematic.utils.df_utils import read_csv
+
+
+def write_manifest(path, rows: int = 3) -> str:
+    """Writes a manifest with the given number of rows"""
+    pd.DataFrame(
+        {"Filename": [f"file{i}.txt" for i in range(rows)], "Component": "Patient"}
+    ).to_csv(path, index=False)
+    return str(path)
+
+
+class TestManifestCache:
+    def test_add_and_get(self, tmp_path) -> None:
+        cache = ManifestCache(str(tmp_path / "cache"), max_size=10**6)
+        source = write_manifest(tmp_path / "downloaded.csv")
+        md5 = md5_for_file_hex(source)
+
+        assert cache.get(md5, "manifest.csv") is None
+        stored_path = cache.add(source, md5, "manifest.csv")
+        assert cache.get(md5, "manifest.csv") == stored_path
+        assert os.path.basename(stored_path) == "manifest.csv"
+        # stored manifests are read-only
+        assert not os.stat(stored_path).st_mode & 0o222
+        # content not matching the MD5 is not stored
+        assert cache.add(source, "0" * 32, "manifest.csv") is None
+
+    def test_read(self, tmp_path) -> None:
+        cache = ManifestCache(str(tmp_path / "cache"), max_size=10**6)
+        path = write_manifest(tmp_path / "manifest.csv")
+        md5 = md5_for_file_hex(path)
+        reader = MagicMock(side_effect=read_csv, __module__="test", __qualname__="read")
+
+        first = cache.read(md5, path, reader)
+        second = cache.read(md5, path, reader)
+        pd.testing.assert_frame_equal(first, second)
+        assert first is not second
+        assert reader.call_count == 1
+        # other arguments are parsed again
+        cache.read(md5, path, reader, dtype="string")
+        assert reader.call_count == 2
+        # arguments that cannot be stored in a key are not cached
+        cache.read(md5, path, reader, usecols=lambda column: column == "Component")
+        cache.read(md5, path, reader, usecols=lambda column: column == "Component")
+        assert reader.call_count == 4
+
+    def test_evict(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(manifest_cache, "MIN_ENTRY_AGE", 0)
+        cache = ManifestCache(str(tmp_path / "cache"), max_size=10**6)
+        old = write_manifest(tmp_path / "old.csv", rows=1)
+        new = write_manifest(tmp_path / "new.csv", rows=2)
+        old_path = cache.add(old, md5_for_file_hex(old), "manifest.csv")
+        old_folder = os.path.dirname(old_path)
+        os.utime(old_folder, (time.time() - 3600, time.time() - 3600))
+
+        cache.max_size = os.path.getsize(old) + os.path.getsize(new)
+        new_path = cache.add(new, md5_for_file_hex(new), "manifest.csv")
+        assert os.path.exists(old_path)
+
+        # the least recently used manifest is removed first
+        cache.max_size = os.path.getsize(new)
+        assert cache.evict() == 1
+        assert not os.path.exists(old_folder)
+        assert os.path.exists(new_path)
+
+    def test_shared_folder(self, tmp_path) -> None:
+        cache_folder = tmp_path / "cache"
+        cache = ManifestCache(str(cache_folder), max_size=10**6)
+        path = write_manifest(tmp_path / "manifest.csv")
+        md5 = md5_for_file_hex(path)
+        cache.add(path, md5, "manifest.csv")
+        assert cache_folder.stat().st_mode & 0o777 == 0o700
+
+        # files other users could have written are not read
+        cache_folder.chmod(0o777)
+        reader = MagicMock(side_effect=read_csv, __module__="test", __qualname__="read")
+        assert cache.get(md5, "manifest.csv") is None
+        cache.read(md5, path, reader)
+        cache.read(md5, path, reader)
+        assert reader.call_count == 2
+
+
+class TestStoredManifest:
+    def test_download_permission(self, tmp_path) -> None:
+        cache = ManifestCache(str(tmp_path / "cache"), max_size=10**6)
+        path = write_manifest(tmp_path / "manifest.csv")
+        md5 = md5_for_file_hex(path)
+        stored_path = cache.add(path, md5, "manifest.csv")
+        manifest = MagicMock(id="syn1")
+        manifest.get.return_value = {"contentMd5": md5}
+        manifest._file_handle.fileName = "manifest.csv"
+        tracker = MagicMock()
+        tracker.get.return_value = manifest
+        syn = MagicMock()
+        download = ManifestDownload(syn, "syn1", synapse_entity_tracker=tracker)
+
+        syn.restGET.return_value = {"canDownload": True}
+        assert download._get_stored_manifest(cache).path == stored_path
+        syn.restGET.assert_called_with("/entity/syn1/permissions")
+
+        # a user who cannot download the manifest does not get the stored copy
+        syn.restGET.return_value = {"canDownload": False}
+        assert download._get_stored_manifest(cache) is None
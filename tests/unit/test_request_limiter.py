@@ -0,0 +1,83 @@
+"""Unit tests for the Synapse request limiter"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from synapseclient.core.exceptions import SynapseHTTPError
+
+from schematic.store.request_limiter import (
+    RequestLimiter,
+    TokenBucket,
+    is_retryable_error,
+)
+
+
+def get_http_error(status_code: int) -> SynapseHTTPError:
+    """Synapse error with a response of the given status code"""
+    return SynapseHTTPError("error", response=MagicMock(status_code=status_code))
+
+
+class TestRequestLimiter:
+    def test_is_retryable_error(self) -> None:
+        assert is_retryable_error(get_http_error(429))
+        assert is_retryable_error(get_http_error(503))
+        assert not is_retryable_error(get_http_error(404))
+        assert not is_retryable_error(ValueError("error"))
+
+    async def test_max_in_flight(self) -> None:
+        limiter = RequestLimiter(max_in_flight=2, max_retries=0)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def request() -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        await asyncio.gather(*[limiter.call(request) for _ in range(6)])
+        assert max_in_flight == 2
+        assert limiter.requests == 6
+
+    async def test_retry(self) -> None:
+        limiter = RequestLimiter(max_in_flight=1, max_retries=2, backoff=0.001)
+        errors = [get_http_error(429), get_http_error(503)]
+
+        async def request() -> str:
+            if errors:
+                raise errors.pop(0)
+            return "result"
+
+        assert await limiter.call(request) == "result"
+        assert limiter.retries == 2
+
+    async def test_retry_limit(self) -> None:
+        limiter = RequestLimiter(max_in_flight=1, max_retries=1, backoff=0.001)
+
+        async def request() -> None:
+            raise get_http_error(429)
+
+        with pytest.raises(SynapseHTTPError):
+            await limiter.call(request)
+        assert limiter.requests == 2
+
+    async def test_no_retry_on_other_errors(self) -> None:
+        limiter = RequestLimiter(max_in_flight=1, max_retries=3, backoff=0.001)
+
+        async def request() -> None:
+            raise get_http_error(404)
+
+        with pytest.raises(SynapseHTTPError):
+            await limiter.call(request)
+        assert limiter.retries == 0
+
+    async def test_token_bucket(self) -> None:
+        bucket = TokenBucket(rate=100, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        # the first token is available right away, the others at 100 per second
+        assert loop.time() - start >= 0.025
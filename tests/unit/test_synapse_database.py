@@ -0,0 +1,51 @@
+"""Unit tests for the SynapseDatabase"""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from schematic.store.database.synapse_database import SynapseDatabase
+
+
+class TestSynapseDatabase:
+    def test_upsert_table_rows_only_changed_rows(self) -> None:
+        # GIVEN a table in Synapse
+        database = SynapseDatabase(auth_token="", project_id="syn1", syn=MagicMock())
+        existing_table = pd.DataFrame(
+            {
+                "ROW_ID": [1, 2],
+                "ROW_VERSION": [3, 3],
+                "Patient_id": ["p1", "p2"],
+                "Age": [10, 20],
+            }
+        )
+        # AND rows to upsert where one row is unchanged, one is updated and one is new
+        data = pd.DataFrame(
+            {"Patient_id": ["p1", "p2", "p3"], "Age": [10.0, 21.0, 30.0]}
+        )
+
+        with patch.object(
+            database.synapse, "query_table", return_value=existing_table
+        ), patch.object(database.synapse, "upsert_table_rows") as mock_upsert:
+            database._upsert_table_rows("syn2", data, "Patient_id")
+
+        # THEN only the updated and new rows are sent
+        sent_rows = mock_upsert.call_args[0][1]
+        assert sent_rows["Patient_id"].tolist() == ["p2", "p3"]
+        assert sent_rows["ROW_ID"].fillna(0).tolist() == [2, 0]
+
+    def test_upsert_table_rows_no_changes(self) -> None:
+        # GIVEN rows identical to the rows of the table
+        database = SynapseDatabase(auth_token="", project_id="syn1", syn=MagicMock())
+        existing_table = pd.DataFrame(
+            {"ROW_ID": [1], "ROW_VERSION": [3], "Patient_id": ["p1"], "Age": [10]}
+        )
+        data = pd.DataFrame({"Patient_id": ["p1"], "Age": [10]})
+
+        with patch.object(
+            database.synapse, "query_table", return_value=existing_table
+        ), patch.object(database.synapse, "upsert_table_rows") as mock_upsert:
+            database._upsert_table_rows("syn2", data, "Patient_id")
+
+        # THEN nothing is sent
+        mock_upsert.assert_not_called()
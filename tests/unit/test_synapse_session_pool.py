@@ -0,0 +1,72 @@
+"""Unit tests for the pool of logged in Synapse clients"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from schematic.store.synapse_session_pool import SynapseSessionPool
+
+
+class TestSynapseSessionPool:
+    def test_get(self) -> None:
+        pool = SynapseSessionPool(ttl=60)
+        login = MagicMock(side_effect=lambda: MagicMock())
+
+        session = pool.get("token", None, login)
+        assert pool.get("token", None, login) is session
+        # other credentials, or another cache folder, get another client
+        assert pool.get("other token", None, login) is not session
+        assert pool.get("token", "cache", login) is not session
+        assert login.call_count == 3
+        # the credentials are not kept in the pool
+        assert all("token" not in key for key in pool._sessions)
+
+        pool.remove("token", None)
+        assert pool.get("token", None, login) is not session
+
+    def test_ttl(self) -> None:
+        pool = SynapseSessionPool(ttl=0.05)
+        login = MagicMock(side_effect=lambda: MagicMock())
+
+        session = pool.get("token", None, login)
+        time.sleep(0.06)
+        assert pool.get("token", None, login) is not session
+        assert login.call_count == 2
+
+    def test_disabled(self) -> None:
+        pool = SynapseSessionPool(ttl=0)
+        login = MagicMock(side_effect=lambda: MagicMock())
+
+        assert pool.get("token", None, login) is not pool.get("token", None, login)
+        assert len(pool) == 0
+
+    def test_max_sessions(self) -> None:
+        pool = SynapseSessionPool(ttl=60, max_sessions=2)
+        login = MagicMock(side_effect=lambda: MagicMock())
+        first = pool.get("first", None, login)
+        pool.get("second", None, login)
+        pool.get("third", None, login)
+
+        assert len(pool) == 2
+        assert pool.get("first", None, login) is not first
+
+    def test_concurrent_logins(self) -> None:
+        pool = SynapseSessionPool(ttl=60)
+        logins = 0
+        lock = threading.Lock()
+
+        def login() -> MagicMock:
+            nonlocal logins
+            with lock:
+                logins += 1
+            time.sleep(0.05)
+            return MagicMock()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(
+                executor.map(lambda _: pool.get("token", None, login), range(8))
+            )
+        # requests with the same credentials wait for a single login
+        assert logins == 1
+        assert all(session is sessions[0] for session in sessions)
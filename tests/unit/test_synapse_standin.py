@@ -0,0 +1,422 @@
+"""Tests of SynapseStorage against the offline Synapse stand-in"""
+
+import io
+import os
+from typing import Any, Dict, Generator, Tuple
+
+import pandas as pd
+import pytest
+
+from schematic.configuration.configuration import CONFIG
+from schematic.models.metadata import MetadataModel
+from schematic.schemas.data_model_graph import DataModelGraphExplorer
+from schematic.store import synapse
+from schematic.store.annotation_view_pool import AnnotationViewPool
+from schematic.store.entity_migration import EntityMove, MigrationJournal
+from schematic.store.synapse import SynapseStorage
+from tests.synapse_standin import SynapseStandIn, seed_projects
+
+TOKEN = "standin-token"
+
+
+@pytest.fixture(name="standin")
+def fixture_standin(
+    tmp_path, monkeypatch
+) -> Generator[Tuple[SynapseStandIn, Dict[str, Any]], None, None]:
+    """A started stand-in, seeded with a project of two datasets"""
+    with SynapseStandIn() as standin:
+        standin.add_user(TOKEN)
+        seeded = seed_projects(standin, files_per_dataset=5)
+        monkeypatch.setattr(CONFIG._synapse_config, "endpoint", standin.endpoint)
+        monkeypatch.setattr(
+            CONFIG._synapse_config, "master_fileview_id", seeded["fileview"]
+        )
+        monkeypatch.setattr(
+            CONFIG._manifest_config, "manifest_folder", str(tmp_path / "manifests")
+        )
+        yield standin, seeded
+
+
+def get_store(tmp_path) -> SynapseStorage:
+    return SynapseStorage(
+        access_token=TOKEN, synapse_cache_path=str(tmp_path / "synapse_cache")
+    )
+
+
+class TestSynapseStandIn:
+    def test_query_fileview(self, standin, tmp_path) -> None:
+        _, seeded = standin
+        store = get_store(tmp_path)
+
+        assert store.getStorageProjects() == [(seeded["projects"][0], "Project 0")]
+        datasets = store.getStorageDatasetsInProject(seeded["projects"][0])
+        assert [dataset_id for dataset_id, _ in datasets] == seeded["datasets"]
+        files = store.getFilesInStorageDataset(seeded["datasets"][0])
+        assert len(files) == 5
+
+    def test_planned_fileview_queries(self, standin, tmp_path) -> None:
+        standin, seeded = standin
+        query_route = ("POST", "/repo/v1/entity/{id}/table/download/csv/async/start")
+        store = get_store(tmp_path)
+        # the fileview is not queried at initialization
+        assert standin.request_counts[query_route] == 0
+
+        # the methods share a query of the columns they need
+        store.getStorageProjects()
+        store.getStorageDatasetsInProject(seeded["projects"][0])
+        assert store.checkIfinAssetView(seeded["datasets"][0])
+        assert standin.request_counts[query_route] == 1
+        (result,) = store.fileview_planner._results.values()
+        assert {"id", "name", "parentId", "path", "etag"} <= result.columns
+        assert "Sample ID" not in result.columns
+
+        # the files of a dataset are queried separately, without replacing the rows
+        # used by the other methods
+        assert len(store.getFilesInStorageDataset(seeded["datasets"][0])) == 5
+        assert store.getDatasetManifest(seeded["datasets"][0]) == seeded["manifests"][0]
+        assert standin.request_counts[query_route] == 2
+
+        # storageFileviewTable still has all columns
+        assert "Sample ID" in store.storageFileviewTable.columns
+        assert standin.request_counts[query_route] == 3
+
+    def test_get_dataset_manifest(self, standin, tmp_path) -> None:
+        _, seeded = standin
+        store = get_store(tmp_path)
+
+        manifest = store.getDatasetManifest(seeded["datasets"][0], downloadFile=True)
+        assert manifest.id == seeded["manifests"][0]
+        manifest_df = pd.read_csv(manifest.path)
+        assert len(manifest_df) == 5
+        assert set(manifest_df["Component"]) == {"Biospecimen"}
+
+    def test_get_data_type_from_manifest(self, standin, tmp_path) -> None:
+        _, seeded = standin
+        store = SynapseStorage(
+            access_token=TOKEN,
+            synapse_cache_path=str(tmp_path / "synapse_cache"),
+            perform_query=False,
+        )
+
+        dtypes = store.getDataTypeFromManifest(seeded["manifests"][0])
+        assert dtypes["Sample ID"] == "Int64"
+        assert dtypes["Component"] == "string"
+        stats = store.getDataTypeFromManifest(
+            seeded["manifests"][0], include_stats=True
+        )
+        assert stats["Sample ID"] == {
+            "dtype": "Int64",
+            "null_count": 0,
+            "distinct_count": 5,
+            "min": 0,
+            "max": 4,
+        }
+
+    def test_associate_metadata_with_files(
+        self, standin, tmp_path, dmge: DataModelGraphExplorer
+    ) -> None:
+        standin, seeded = standin
+        store = get_store(tmp_path)
+        manifest = store.getDatasetManifest(seeded["datasets"][0], downloadFile=True)
+        manifest_df = pd.read_csv(manifest.path)
+        manifest_df["Patient ID"] = 1
+        manifest_df["Tissue Status"] = "Healthy"
+        manifest_df["Id"] = ""
+        manifest_path = str(tmp_path / "submitted.csv")
+        manifest_df.to_csv(manifest_path, index=False)
+
+        manifest_id = store.associateMetadataWithFiles(
+            dmge, manifest_path, seeded["datasets"][0], manifest_record_type="file_only"
+        )
+        assert manifest_id in standin.entities
+        annotations = standin.annotations[manifest_df["entityId"][0]]
+        assert annotations["TissueStatus"]["value"] == ["Healthy"]
+
+    def test_resubmit_unchanged_manifest(
+        self, standin, tmp_path, dmge: DataModelGraphExplorer
+    ) -> None:
+        standin, seeded = standin
+        manifest = get_store(tmp_path).getDatasetManifest(
+            seeded["datasets"][0], downloadFile=True
+        )
+        manifest_df = pd.read_csv(manifest.path)
+        manifest_df["Patient ID"] = 1
+        manifest_df["Tissue Status"] = "Healthy"
+        manifest_df["Id"] = ""
+        manifest_path = str(tmp_path / "submitted.csv")
+        manifest_df.to_csv(manifest_path, index=False)
+        manifest_id = get_store(tmp_path).associateMetadataWithFiles(
+            dmge, manifest_path, seeded["datasets"][0], manifest_record_type="file_only"
+        )
+        version = standin.entities[manifest_id]["versionNumber"]
+
+        # the manifest written by the first submission is submitted again
+        store = get_store(tmp_path)
+        standin.request_counts.clear()
+        assert (
+            store.associateMetadataWithFiles(
+                dmge,
+                manifest_path,
+                seeded["datasets"][0],
+                manifest_record_type="file_only",
+            )
+            == manifest_id
+        )
+        assert store.submission_summary.manifest_file_skipped
+        assert store.submission_summary.annotations_skipped == 5
+        assert standin.entities[manifest_id]["versionNumber"] == version
+        # only the annotations of the manifest itself are stored
+        assert standin.request_counts[("PUT", "/repo/v1/entity/{id}/annotations2")] == 1
+
+    def test_submit_metadata_manifest_summary(
+        self, standin, tmp_path, helpers, monkeypatch
+    ) -> None:
+        standin, seeded = standin
+        # the store created by submit_metadata_manifest uses the default cache folder
+        monkeypatch.setattr(
+            "synapseclient.core.cache.CACHE_ROOT_DIR", str(tmp_path / "synapse_cache")
+        )
+        manifest = get_store(tmp_path).getDatasetManifest(
+            seeded["datasets"][0], downloadFile=True
+        )
+        manifest_df = pd.read_csv(manifest.path)
+        manifest_df["Id"] = ""
+        manifest_path = str(tmp_path / "submitted.csv")
+        manifest_df.to_csv(manifest_path, index=False)
+        metadata_model = MetadataModel(
+            inputMModelLocation=helpers.get_data_path("example.model.jsonld"),
+            inputMModelLocationType="local",
+            data_model_labels="class_label",
+        )
+        submit_args = {
+            "manifest_path": manifest_path,
+            "dataset_id": seeded["datasets"][0],
+            "manifest_record_type": "file_only",
+            "restrict_rules": False,
+            "access_token": TOKEN,
+        }
+        manifest_id = metadata_model.submit_metadata_manifest(**submit_args)
+
+        assert not metadata_model.submission_summary.manifest_file_skipped
+
+        # the summary of the second submission is kept by the model
+        assert metadata_model.submit_metadata_manifest(**submit_args) == manifest_id
+        assert metadata_model.submission_summary.manifest_file_skipped
+        assert metadata_model.submission_summary.annotations_skipped == 5
+
+    def test_create_row_entities(
+        self, standin, tmp_path, dmge: DataModelGraphExplorer
+    ) -> None:
+        standin, seeded = standin
+        dataset_id = seeded["datasets"][1]
+        manifest_path = str(tmp_path / "patients.csv")
+        pd.DataFrame(
+            {
+                "Patient ID": range(20),
+                "Sex": "Female",
+                "Component": "Patient",
+                "Id": [f"patient-{number}" for number in range(20)],
+                "entityId": "",
+            }
+        ).to_csv(manifest_path, index=False)
+
+        def get_folders():
+            return {
+                synapse_id
+                for synapse_id, entity in standin.entities.items()
+                if entity["parentId"] == dataset_id
+                and entity["concreteType"].endswith(".Folder")
+            }
+
+        get_store(tmp_path).associateMetadataWithFiles(
+            dmge, manifest_path, dataset_id, manifest_record_type="file_and_entities"
+        )
+        folders = get_folders()
+        assert len(folders) == 20
+        assert all(
+            standin.annotations[folder]["Component"]["value"] == ["Patient"]
+            for folder in folders
+        )
+
+        # the folders of a manifest submitted again without entityId are reused
+        get_store(tmp_path).associateMetadataWithFiles(
+            dmge, manifest_path, dataset_id, manifest_record_type="file_and_entities"
+        )
+        assert get_folders() == folders
+
+        # a manifest of another component with the same Ids gets its own folders
+        biospecimen_path = str(tmp_path / "biospecimens.csv")
+        pd.DataFrame(
+            {
+                "Sample ID": range(20),
+                "Patient ID": range(20),
+                "Tissue Status": "Healthy",
+                "Component": "Biospecimen",
+                "Id": [f"patient-{number}" for number in range(20)],
+                "entityId": "",
+            }
+        ).to_csv(biospecimen_path, index=False)
+        get_store(tmp_path).associateMetadataWithFiles(
+            dmge, biospecimen_path, dataset_id, manifest_record_type="file_and_entities"
+        )
+        assert len(get_folders() - folders) == 20
+        assert all(
+            standin.annotations[folder]["Component"]["value"] == ["Patient"]
+            for folder in folders
+        )
+
+    def test_move_entities_to_new_project(
+        self, standin, tmp_path, dmge: DataModelGraphExplorer
+    ) -> None:
+        standin, seeded = standin
+        project_id = seeded["projects"][0]
+        dataset_id = standin.add_folder("Patients", project_id)
+        archive_id = standin.add_project("Archive")
+        # the archived folders are found in the fileview when they are returned
+        standin.view_scopes[seeded["fileview"]].append(archive_id)
+        manifest_path = str(tmp_path / "patients.csv")
+        pd.DataFrame(
+            {
+                "Patient ID": range(10),
+                "Sex": "Female",
+                "Component": "Patient",
+                "Id": [f"patient-{number}" for number in range(10)],
+                "entityId": "",
+            }
+        ).to_csv(manifest_path, index=False)
+        get_store(tmp_path).associateMetadataWithFiles(
+            dmge, manifest_path, dataset_id, manifest_record_type="file_and_entities"
+        )
+        folders = {
+            synapse_id
+            for synapse_id, entity in standin.entities.items()
+            if entity["parentId"] == dataset_id
+            and entity["concreteType"].endswith(".Folder")
+        }
+        assert len(folders) == 10
+
+        # a dry run creates and moves nothing
+        entity_count = len(standin.entities)
+        get_store(tmp_path).move_entities_to_new_project(
+            project_id, archive_id, dry_run=True
+        )
+        assert len(standin.entities) == entity_count
+        assert all(
+            standin.entities[folder]["parentId"] == dataset_id for folder in folders
+        )
+
+        journal_path = str(tmp_path / "migration.jsonl")
+        get_store(tmp_path).move_entities_to_new_project(
+            project_id, archive_id, journal_path=journal_path
+        )
+        archive_folders = {standin.entities[folder]["parentId"] for folder in folders}
+        assert len(archive_folders) == 1
+        archive_folder = standin.entities[archive_folders.pop()]
+        assert archive_folder["name"] == f"{dataset_id}_Patients_archive"
+
+        # the journal of a finished migration is cleared, and the entities already
+        # in their folder are not updated again
+        assert not os.path.exists(journal_path)
+        standin.request_counts.clear()
+        get_store(tmp_path).move_entities_to_new_project(
+            project_id, archive_id, journal_path=journal_path
+        )
+        assert standin.request_counts[("PUT", "/repo/v1/entity/{id}")] == 0
+
+        # the moves recorded in the journal of an interrupted migration are skipped
+        MigrationJournal(journal_path).record(
+            [EntityMove(folder, dataset_id) for folder in sorted(folders)[:4]]
+        )
+        standin.request_counts.clear()
+        get_store(tmp_path).move_entities_to_new_project(
+            project_id, archive_id, returnEntities=True, journal_path=journal_path
+        )
+        assert standin.request_counts[("PUT", "/repo/v1/entity/{id}")] == 6
+
+        # a later migration between the same projects moves every entity again
+        store = get_store(tmp_path)
+        store.move_entities_to_new_project(
+            project_id, archive_id, returnEntities=True, journal_path=journal_path
+        )
+        store.move_entities_to_new_project(project_id, archive_id)
+        store.move_entities_to_new_project(project_id, archive_id)
+        assert all(
+            standin.entities[folder]["parentId"] == archive_folder["id"]
+            for folder in folders
+        )
+
+    def test_export_fileview(self, standin, tmp_path) -> None:
+        _, seeded = standin
+        store = SynapseStorage(
+            access_token=TOKEN,
+            synapse_cache_path=str(tmp_path / "synapse_cache"),
+            perform_query=False,
+        )
+
+        # the fileview is queried in pages of 4 rows
+        chunks = list(store.export_fileview(export_format="ndjson", page_size=4))
+        exported = pd.read_json(io.BytesIO(b"".join(chunks)), lines=True)
+        assert len(chunks) == len(exported) // 4 + 1
+        assert exported["id"].is_unique
+        assert set(seeded["manifests"]) <= set(exported["id"])
+
+        # the columns and conditions are part of the query
+        chunks = store.export_fileview(
+            export_format="csv",
+            columns=["id", "name"],
+            where_clauses=[f"parentId = '{seeded['datasets'][0]}'"],
+            page_size=4,
+        )
+        exported = pd.read_csv(io.BytesIO(b"".join(chunks)))
+        assert list(exported.columns) == ["id", "name"]
+        assert len(exported) == 6
+
+        # a condition cannot close its parentheses to escape the other conditions
+        with pytest.raises(ValueError):
+            store.export_fileview(where_clauses=["1=1) OR (1=1"])
+
+    def test_fault_injection(self, standin, tmp_path) -> None:
+        standin, seeded = standin
+        standin.throttle_every = 4
+        standin.failure_rate = 0.5
+        store = get_store(tmp_path)
+
+        # throttled and failed requests are retried by the client
+        files = store.getFilesInStorageDataset(seeded["datasets"][1])
+        assert len(files) == 5
+        assert standin.status_counts[429] > 0
+        assert standin.status_counts[503] > 0
+
+    def test_get_dataset_annotations(self, standin, tmp_path) -> None:
+        standin, seeded = standin
+        store = get_store(tmp_path)
+
+        # the annotations of the files of small datasets are requested concurrently
+        annotations = store.getDatasetAnnotations(seeded["datasets"][0])
+        assert len(annotations) == 5
+        assert list(annotations.columns[-2:]) == ["entityId", "eTag"]
+        assert set(annotations["Component"]) == {"Biospecimen"}
+        assert sorted(annotations["Sample ID"]) == ["0", "1", "2", "3", "4"]
+
+    def test_get_dataset_annotations_pooled_view(
+        self, standin, tmp_path, monkeypatch
+    ) -> None:
+        standin, seeded = standin
+        monkeypatch.setattr(
+            CONFIG._synapse_config, "annotation_view_refresh_interval", 60
+        )
+        monkeypatch.setattr(synapse, "ANNOTATION_VIEW_POOL", AnnotationViewPool())
+
+        first = get_store(tmp_path).getDatasetAnnotations(
+            seeded["datasets"][0], force_batch=True
+        )
+        assert standin.request_counts[("POST", "/repo/v1/entity")] == 1
+        # the view of the dataset is kept and queried again by the next request
+        standin.request_counts.clear()
+        second = get_store(tmp_path).getDatasetAnnotations(
+            seeded["datasets"][0], force_batch=True
+        )
+        assert standin.request_counts[("POST", "/repo/v1/entity")] == 0
+        assert standin.request_counts[("DELETE", "/repo/v1/entity/{id}")] == 0
+        pd.testing.assert_frame_equal(first, second)
+        assert sorted(second["Sample ID"]) == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,155 @@
+"""Unit tests for the Synapse entity tracker and the shared entity cache"""
+
+from unittest.mock import MagicMock
+
+from synapseclient import File, Folder
+
+from schematic.store.synapse_tracker import SharedEntityCache, SynapseEntityTracker
+
+
+def get_mock_synapse(entities: dict) -> MagicMock:
+    """Mock Synapse client returning copies of the given entities"""
+    syn = MagicMock()
+    syn.credentials.owner_id = "1"
+    syn.get.side_effect = lambda synapse_id, **kwargs: Folder(
+        **entities[synapse_id]
+    )
+    syn.restGET.side_effect = lambda uri: dict(entities[uri.split("/")[-1]])
+    return syn
+
+
+class TestSharedEntityCache:
+    def test_put_and_get(self) -> None:
+        cache = SharedEntityCache(max_size=10)
+        folder = Folder(id="syn1", name="folder", parent="syn2", etag="a")
+        cache.put("1", "syn1", folder)
+
+        cached = cache.get("1", "syn1")
+        assert cached["etag"] == "a"
+        # copies are returned, so changes do not reach the cache
+        cached["etag"] = "b"
+        assert cache.get("1", "syn1")["etag"] == "a"
+        # entities are kept per user and version
+        assert cache.get("2", "syn1") is None
+        assert cache.get("1", "syn1.2") is None
+        assert cache.get_id_by_parent_and_name("1", "syn2", "folder") == "syn1"
+
+        cache.remove("1", "syn1")
+        assert cache.get("1", "syn1") is None
+        assert cache.get_id_by_parent_and_name("1", "syn2", "folder") is None
+
+    def test_eviction(self) -> None:
+        cache = SharedEntityCache(max_size=3)
+        for i in range(3):
+            cache.put("1", f"syn{i}", Folder(id=f"syn{i}", parent="syn100"))
+        cache.get("1", "syn0")
+        cache.put("1", "syn3", Folder(id="syn3", parent="syn100"))
+
+        assert len(cache) == 3
+        # syn1 is the least recently used
+        assert cache.get("1", "syn1") is None
+        assert cache.get("1", "syn0") is not None
+
+    def test_disabled(self) -> None:
+        cache = SharedEntityCache(max_size=0)
+        cache.put("1", "syn1", Folder(id="syn1", parent="syn2"))
+        assert cache.get("1", "syn1") is None
+
+
+class TestSynapseEntityTracker:
+    def test_get_from_shared_cache(self) -> None:
+        entities = {"syn1": {"id": "syn1", "name": "a", "parent": "syn2", "etag": "a"}}
+        syn = get_mock_synapse(entities)
+        shared_cache = SharedEntityCache(max_size=10)
+
+        SynapseEntityTracker(shared_cache=shared_cache).get("syn1", syn, False)
+        assert syn.get.call_count == 1
+
+        # another request reuses the entity, after checking its etag
+        tracker = SynapseEntityTracker(shared_cache=shared_cache)
+        assert tracker.get("syn1", syn, False)["etag"] == "a"
+        assert syn.get.call_count == 1
+        assert tracker.search_local_by_parent_and_name("a", "syn2", syn).id == "syn1"
+
+        # the entity changed in Synapse
+        entities["syn1"]["etag"] = "b"
+        tracker = SynapseEntityTracker(shared_cache=shared_cache)
+        assert tracker.get("syn1", syn, False)["etag"] == "b"
+        assert syn.get.call_count == 2
+
+    def test_search_shared_cache_by_parent_and_name(self) -> None:
+        entities = {"syn1": {"id": "syn1", "name": "a", "parent": "syn2", "etag": "a"}}
+        syn = get_mock_synapse(entities)
+        shared_cache = SharedEntityCache(max_size=10)
+        SynapseEntityTracker(shared_cache=shared_cache).get("syn1", syn, False)
+
+        tracker = SynapseEntityTracker(principal_id="1", shared_cache=shared_cache)
+        assert tracker.search_local_by_parent_and_name("a", "syn2", syn).id == "syn1"
+
+        # the entity was renamed by another request
+        entities["syn1"].update(name="b", etag="b")
+        tracker = SynapseEntityTracker(principal_id="1", shared_cache=shared_cache)
+        assert tracker.search_local_by_parent_and_name("a", "syn2", syn) is None
+        assert shared_cache.get("1", "syn1") is None
+
+    def test_shared_cache_has_no_downloaded_file(self, tmp_path) -> None:
+        path = tmp_path / "file.txt"
+        path.write_text("content")
+        file = File(path=str(path), id="syn1", name="file.txt", parent="syn2")
+        file["etag"] = "a"
+        syn = MagicMock()
+        syn.credentials.owner_id = "1"
+        syn.restGET.return_value = {"etag": "a"}
+        shared_cache = SharedEntityCache(max_size=10)
+        SynapseEntityTracker(principal_id="1", shared_cache=shared_cache).add(
+            "syn1", file
+        )
+        # the file downloaded by the request is kept by it
+        assert file.path == str(path)
+
+        # another request gets the entity without the path of the file
+        tracker = SynapseEntityTracker(shared_cache=shared_cache)
+        assert tracker.get("syn1", syn, False).path is None
+        syn.get.assert_not_called()
+
+        # and downloads the file itself
+        tracker = SynapseEntityTracker(shared_cache=shared_cache)
+        tracker.get("syn1", syn, True)
+        syn.get.assert_called_once()
+
+    def test_etag_lookup(self) -> None:
+        entities = {"syn1": {"id": "syn1", "name": "a", "parent": "syn2", "etag": "a"}}
+        syn = get_mock_synapse(entities)
+        shared_cache = SharedEntityCache(max_size=10)
+        SynapseEntityTracker(shared_cache=shared_cache).get("syn1", syn, False)
+
+        # the known etag is used instead of requesting the entity
+        etags = {"syn1": "a"}
+        tracker = SynapseEntityTracker(shared_cache=shared_cache, etag_lookup=etags.get)
+        assert tracker.get("syn1", syn, False)["etag"] == "a"
+        syn.restGET.assert_not_called()
+        assert syn.get.call_count == 1
+
+        # the entity changed since it was cached
+        entities["syn1"]["etag"] = etags["syn1"] = "b"
+        tracker = SynapseEntityTracker(shared_cache=shared_cache, etag_lookup=etags.get)
+        assert tracker.get("syn1", syn, False)["etag"] == "b"
+        syn.restGET.assert_not_called()
+        assert syn.get.call_count == 2
+
+    def test_project_headers_ttl(self) -> None:
+        syn = MagicMock()
+        syn.restGET.return_value = {"results": [{"id": "syn1"}]}
+        fetched_at: dict = {}
+        tracker = SynapseEntityTracker(
+            project_headers_fetched_at=fetched_at, project_headers_ttl=60
+        )
+        assert tracker.get_project_headers(syn, "1") == [{"id": "syn1"}]
+        tracker.get_project_headers(syn, "1")
+        assert syn.restGET.call_count == 1
+
+        # the user gained access to a project, and the headers expired
+        syn.restGET.return_value = {"results": [{"id": "syn1"}, {"id": "syn2"}]}
+        fetched_at["1"] -= 60
+        assert tracker.get_project_headers(syn, "1") == [{"id": "syn1"}, {"id": "syn2"}]
+        assert syn.restGET.call_count == 2
@@ -0,0 +1,38 @@
+"""Unit tests of the comparisons SynapseStorage uses to skip unchanged annotations
+
+These only test static methods, so that they run without Synapse credentials.
+"""
+
+import pytest
+
+from schematic.store.synapse import SynapseStorage
+
+
+class TestUnchangedAnnotations:
+    @pytest.mark.parametrize(
+        "updated, expected",
+        [
+            ({"Sex": "Female", "Age": 30, "Smoker": False}, True),
+            ({"Sex": "Female", "Age": 30, "Smoker": False, "Stage": "I"}, False),
+            ({"Sex": "Male", "Age": 30, "Smoker": False}, False),
+            ({"Sex": "Female", "Age": "30", "Smoker": False}, False),
+            ({"Sex": ["Female", "Male"], "Age": 30, "Smoker": False}, False),
+        ],
+        ids=["unchanged", "added", "changed", "type_changed", "list"],
+    )
+    def test_annotations_match(self, updated, expected) -> None:
+        current = {
+            "Sex": {"type": "STRING", "value": ["Female"]},
+            "Age": {"type": "LONG", "value": ["30"]},
+            "Smoker": {"type": "BOOLEAN", "value": ["false"]},
+        }
+        assert SynapseStorage._annotations_match(current, updated) == expected
+
+    @pytest.mark.parametrize(
+        "cell, value",
+        [(2.0, 2), (float("nan"), None), (["a", "b"], ["a", "b"]), (True, True)],
+    )
+    def test_format_view_cell(self, cell, value) -> None:
+        assert SynapseStorage._format_view_cell(
+            cell
+        ) == SynapseStorage._format_view_value(value)
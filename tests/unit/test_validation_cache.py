@@ -0,0 +1,131 @@
+"""Unit tests for the validation cache"""
+
+import os
+import time
+
+import pytest
+
+from schematic.models.validation_cache import ValidationCache
+
+
+@pytest.fixture(name="manifest_path")
+def fixture_manifest_path(tmp_path) -> str:
+    path = tmp_path / "manifest.csv"
+    path.write_text("Component,Patient ID\nPatient,1\n")
+    return str(path)
+
+
+@pytest.fixture(name="model_path")
+def fixture_model_path(tmp_path) -> str:
+    path = tmp_path / "model.csv"
+    path.write_text("Attribute,Description\nPatient,A patient\n")
+    return str(path)
+
+
+def build_key(manifest_path: str, model_path: str, **kwargs) -> str:
+    args = {
+        "manifest_path": manifest_path,
+        "model_path": model_path,
+        "data_model_labels": "class_label",
+        "component": "Patient",
+        "restrict_rules": False,
+        "project_scope": ["syn1", "syn2"],
+        "dataset_scope": None,
+        "access_token": "token",
+    }
+    args.update(kwargs)
+    return ValidationCache.build_key(**args)
+
+
+class TestValidationCache:
+    def test_build_key(self, manifest_path: str, model_path: str) -> None:
+        key = build_key(manifest_path, model_path)
+        assert key == build_key(manifest_path, model_path)
+        # project scope order does not matter
+        assert key == build_key(manifest_path, model_path, project_scope=["syn2", "syn1"])
+        assert key != build_key(manifest_path, model_path, component="Biospecimen")
+        assert key != build_key(manifest_path, model_path, restrict_rules=True)
+        assert key != build_key(manifest_path, model_path, dataset_scope="syn3")
+        assert key != build_key(manifest_path, model_path, access_token="other")
+
+        with open(manifest_path, "a", encoding="utf-8") as file:
+            file.write("Patient,2\n")
+        assert key != build_key(manifest_path, model_path)
+
+    def test_store_and_lookup(
+        self, tmp_path, manifest_path: str, model_path: str
+    ) -> None:
+        cache = ValidationCache(cache_folder=str(tmp_path / "cache"), ttl=60)
+        key = build_key(manifest_path, model_path)
+        errors = [["2", "Patient ID", "error message", "1"]]
+        warnings = [["3", "Patient ID", "warning message", "2"]]
+
+        receipt_id = cache.store(key=key, errors=errors, warnings=warnings)
+        result = cache.lookup(receipt_id=receipt_id, key=key)
+
+        assert result is not None
+        assert result.errors == errors
+        assert result.warnings == warnings
+        assert result.censored_manifest is None
+        # a different manifest can not use the receipt
+        assert cache.lookup(receipt_id=receipt_id, key="other key") is None
+        # unknown or malformed receipt ids
+        assert cache.lookup(receipt_id="f" * 32, key=key) is None
+        assert cache.lookup(receipt_id="../../etc/passwd", key=key) is None
+
+    def test_store_censored_manifest(
+        self, tmp_path, manifest_path: str, model_path: str
+    ) -> None:
+        cache = ValidationCache(cache_folder=str(tmp_path / "cache"), ttl=60)
+        key = build_key(manifest_path, model_path)
+        censored_manifest_path = tmp_path / "manifest_censored.csv"
+        censored_manifest_path.write_text("Component,Age\nPatient,age censored\n")
+
+        receipt_id = cache.store(
+            key=key,
+            errors=[],
+            warnings=[],
+            censored_manifest_path=str(censored_manifest_path),
+        )
+        result = cache.lookup(receipt_id=receipt_id, key=key)
+
+        assert result.censored_manifest == "Component,Age\nPatient,age censored\n"
+
+    def test_expired(self, tmp_path, manifest_path: str, model_path: str) -> None:
+        cache_folder = str(tmp_path / "cache")
+        cache = ValidationCache(cache_folder=cache_folder, ttl=60)
+        key = build_key(manifest_path, model_path)
+        receipt_id = cache.store(key=key, errors=[], warnings=[])
+
+        # pretend the result was stored two minutes ago
+        receipt_path = os.path.join(cache_folder, receipt_id + ".json")
+        past = time.time() - 120
+        os.utime(receipt_path, (past, past))
+        cache.purge_expired()
+        assert not os.path.exists(receipt_path)
+
+        receipt_id = cache.store(key=key, errors=[], warnings=[])
+        expired_cache = ValidationCache(cache_folder=cache_folder, ttl=1)
+        time.sleep(1.1)
+        assert expired_cache.lookup(receipt_id=receipt_id, key=key) is None
+
+    def test_disabled(self, tmp_path, manifest_path: str, model_path: str) -> None:
+        cache = ValidationCache(cache_folder=str(tmp_path / "cache"), ttl=0)
+        key = build_key(manifest_path, model_path)
+
+        assert not cache.enabled
+        assert cache.store(key=key, errors=[], warnings=[]) is None
+        assert not os.path.exists(tmp_path / "cache")
+
+    def test_shared_folder(self, tmp_path, manifest_path: str, model_path: str) -> None:
+        key = build_key(manifest_path, model_path)
+        cache_folder = tmp_path / "cache"
+        cache = ValidationCache(cache_folder=str(cache_folder), ttl=60)
+        errors = [["2", "Patient ID", "error message", "1"]]
+        receipt_id = cache.store(key, errors=errors, warnings=[])
+        assert cache_folder.stat().st_mode & 0o777 == 0o700
+
+        # a receipt rewritten by another user is not used
+        cache_folder.chmod(0o777)
+        assert cache.lookup(receipt_id, key) is None
+        assert cache.store(key, errors=[], warnings=[]) is None
@@ -0,0 +1,73 @@
+"""Unit tests for the validation error collector"""
+
+import logging
+
+import pytest
+
+from schematic.models.validation_error_collector import ValidationErrorCollector
+
+ERRORS = [
+    ["2", "Check Int", "error 1", "a"],
+    ["3", "Check Int", "error 2", "b"],
+    ["4", "Check Int", "error 3", "c"],
+]
+WARNINGS = [["2", "Check String", "warning 1", 1]]
+
+
+class TestValidationErrorCollector:
+    def test_add_results(self) -> None:
+        collector = ValidationErrorCollector()
+        collector.add_results(ERRORS[:2], WARNINGS, rule="int")
+        collector.add_results(ERRORS[2:], [], rule="int error")
+
+        assert collector.errors == ERRORS
+        assert collector.warnings == WARNINGS
+        assert collector.rules == ["int", "int", "int", "int error"]
+        assert collector.counts == {
+            ("Check Int", "int", "error"): 2,
+            ("Check String", "int", "warning"): 1,
+            ("Check Int", "int error", "error"): 1,
+        }
+        assert collector.dropped_messages == 0
+
+    def test_max_messages(self) -> None:
+        collector = ValidationErrorCollector(max_messages=2)
+        collector.add_results(ERRORS, WARNINGS, rule="int")
+
+        assert collector.errors == ERRORS[:2]
+        assert collector.warnings == []
+        # messages over the maximum are still counted
+        assert collector.counts[("Check Int", "int", "error")] == 3
+        assert collector.dropped_messages == 2
+
+    def test_max_errors_per_column(self) -> None:
+        collector = ValidationErrorCollector(max_errors_per_column=2)
+
+        assert not collector.column_limit_reached("Check Int")
+        collector.add_results(ERRORS, WARNINGS, rule="int")
+
+        assert collector.column_limit_reached("Check Int")
+        assert not collector.column_limit_reached("Check String")
+        assert collector.errors == ERRORS[:2]
+        # warnings do not count towards the maximum
+        assert collector.warnings == WARNINGS
+        assert collector.dropped_messages == 1
+
+    def test_log_summary(self, caplog: pytest.LogCaptureFixture) -> None:
+        collector = ValidationErrorCollector(max_messages=1)
+        collector.add_results(ERRORS, WARNINGS, rule="int")
+
+        with caplog.at_level(logging.WARNING):
+            collector.log_summary()
+
+        messages = [(record.levelname, record.message) for record in caplog.records]
+        assert (
+            "ERROR",
+            "3 error(s) for rule 'int' on attribute 'Check Int', first error: error 1",
+        ) in messages
+        assert (
+            "WARNING",
+            "1 warning(s) for rule 'int' on attribute 'Check String', "
+            "first warning: warning 1",
+        ) in messages
+        assert len(messages) == 3
@@ -0,0 +1,102 @@
+"""Unit tests for incremental validation snapshots"""
+
+import pandas as pd
+
+from schematic.models.validation_snapshot import (
+    IncrementalValidation,
+    ValidationSnapshot,
+    get_row_key_column,
+)
+
+MANIFEST = pd.DataFrame(
+    {
+        "Component": ["Patient", "Patient", "Patient"],
+        "Patient_id": ["a", "b", "c"],
+        "Age": ["1", "x", "y"],
+    }
+)
+
+
+def validate(incremental: IncrementalValidation, manifest: pd.DataFrame) -> list:
+    """Mock row local rule, that returns an error for each non integer age"""
+    rows = incremental.select_rows(manifest)
+    messages = [
+        ("error", "int", [str(i + 2), "Age", f"On row {i + 2} Age is not an int", age])
+        for i, age in enumerate(rows["Age"])
+        if not age.isdigit()
+    ]
+    return incremental.merge("2:0", messages)
+
+
+class TestIncrementalValidation:
+    def test_get_row_key_column(self) -> None:
+        assert get_row_key_column(MANIFEST, "Patient") == "Patient_id"
+        assert get_row_key_column(MANIFEST, "Biospecimen") is None
+
+        manifest = MANIFEST.assign(Filename=["f1", "f2", "f3"])
+        assert get_row_key_column(manifest, "Patient") == "Filename"
+        # keys must be unique and not empty
+        manifest = MANIFEST.assign(entityId=["syn1", "syn1", "syn2"])
+        assert get_row_key_column(manifest, "Patient") == "Patient_id"
+        manifest = MANIFEST.assign(entityId=["syn1", "", "syn2"])
+        assert get_row_key_column(manifest, "Patient") == "Patient_id"
+
+    def test_merge(self, tmp_path) -> None:
+        snapshot_store = ValidationSnapshot(snapshot_folder=str(tmp_path))
+        incremental = IncrementalValidation(MANIFEST, "Patient")
+        assert incremental.enabled and not incremental.is_partial
+        first_messages = validate(incremental, MANIFEST)
+        assert [message[0] for _, _, message in first_messages] == ["3", "4"]
+        snapshot_store.save("key", incremental.get_snapshot())
+
+        # fix row b, remove row a and add row d
+        manifest = pd.DataFrame(
+            {
+                "Component": ["Patient", "Patient", "Patient"],
+                "Patient_id": ["b", "c", "d"],
+                "Age": ["2", "y", "z"],
+            }
+        )
+        incremental = IncrementalValidation(
+            manifest, "Patient", previous_snapshot=snapshot_store.load("key")
+        )
+        assert incremental.is_partial
+        assert incremental.changed_positions == [0, 2]
+
+        messages = validate(incremental, manifest)
+        # the stored message of row c and the new one of row d are numbered as in the
+        # manifest, in their text as well
+        assert messages == [
+            ("error", "int", ["3", "Age", "On row 3 Age is not an int", "y"]),
+            ("error", "int", ["4", "Age", "On row 4 Age is not an int", "z"]),
+        ]
+        # the result is the same as validating all rows
+        assert messages == validate(IncrementalValidation(manifest, "Patient"), manifest)
+
+    def test_changed_columns(self, tmp_path) -> None:
+        snapshot_store = ValidationSnapshot(snapshot_folder=str(tmp_path))
+        incremental = IncrementalValidation(MANIFEST, "Patient")
+        validate(incremental, MANIFEST)
+        snapshot_store.save("key", incremental.get_snapshot())
+
+        manifest = MANIFEST.assign(Sex=["F", "M", "F"])
+        incremental = IncrementalValidation(
+            manifest, "Patient", previous_snapshot=snapshot_store.load("key")
+        )
+        assert not incremental.is_partial
+        assert snapshot_store.load("other key") is None
+
+    def test_build_key(self, tmp_path) -> None:
+        model_path = tmp_path / "model.csv"
+        model_path.write_text("Attribute\n")
+        args = {
+            "model_path": str(model_path),
+            "data_model_labels": "class_label",
+            "component": "Patient",
+            "restrict_rules": False,
+        }
+        key = ValidationSnapshot.build_key(**args)
+        assert key == ValidationSnapshot.build_key(**args)
+        # snapshots are kept per dataset and per user
+        assert key != ValidationSnapshot.build_key(**args, dataset_id="syn1")
+        assert key != ValidationSnapshot.build_key(**args, access_token="token")